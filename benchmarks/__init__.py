@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for DeepTrace's CPU-bound hot paths.
+
+Run them with scripts/bench_hot_paths.py; results are tracked in benchmarks/history.jsonl.
+"""
@@ -0,0 +1,196 @@
+"""
+Synthetic, seeded corpora for the hot-path benchmarks (no network, no fixtures).
+
+Everything is derived from random.Random(seed), so the same parameters always
+produce the same inputs and results stay comparable across commits.
+"""
+
+import datetime
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from src.core.models.events import EventNode
+from src.core.models.evidence import Evidence, EvidenceSource
+
+EN_WORDS = (
+    "agency announced policy review officials rules effect regional offices market report model release "
+    "training safety update version users data platform statement company launch investigation court "
+    "government response analysts growth network service customers record shares quarterly evidence "
+    "source interview spokesperson confirmed denied delayed expanded research team system public"
+).split()
+CJK_PHRASES = (
+    "官方发布 监管部门 调查结果 网友质疑 公司回应 数据显示 专家表示 消息人士 正式上线 版本更新 "
+    "安全测试 市场反应 用户反馈 事件经过 相关负责人 新闻发布会 社交媒体 舆论关注 时间线 证据链"
+).split()
+EN_TOPICS = (
+    "model launch", "safety review", "data breach", "pricing change", "court ruling",
+    "factory recall", "policy update", "earnings report", "leadership change", "service outage",
+)
+CJK_TOPICS = ("产品发布", "安全事故", "价格调整", "法院判决", "召回事件", "服务中断", "人事变动", "政策更新")
+SOURCES = ("Reuters", "新华网", "Daily Times", "weibo", "xhs", "Tech Report", "twitter", "unknown blog")
+URL_HOSTS = ("openai.com", "reuters.com", "example-news.com", "weibo.com", "blog.example.org", "techcrunch.com")
+
+
+@dataclass
+class SyntheticDocument:
+    text: str
+    sentences: List[Tuple[int, int]]  # (start, end) of each generated sentence
+
+
+def make_document(n_chars: int, cjk_ratio: float = 0.5, seed: int = 0) -> SyntheticDocument:
+    """Mixed English/CJK prose of about n_chars characters, paragraphs every few sentences."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    sentences: List[Tuple[int, int]] = []
+    length = 0
+    while length < n_chars:
+        if rng.random() < cjk_ratio:
+            sentence = "".join(rng.choice(CJK_PHRASES) for _ in range(rng.randint(3, 9))) + "。"
+        else:
+            words = [rng.choice(EN_WORDS) for _ in range(rng.randint(8, 22))]
+            sentence = " ".join(words).capitalize() + "."
+        sep = "\n\n" if sentences and rng.random() < 0.2 else ("" if sentence.endswith("。") else " ")
+        if parts:
+            parts.append(sep)
+            length += len(sep)
+        sentences.append((length, length + len(sentence)))
+        parts.append(sentence)
+        length += len(sentence)
+    return SyntheticDocument("".join(parts), sentences)
+
+
+def make_phase1_events(doc: SyntheticDocument, n_events: int, fuzzy_ratio: float = 0.02, seed: int = 0) -> List[dict]:
+    """Sidecar events whose evidence_hint quotes the document (a few perturbed / missing)."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n_events):
+        start, end = doc.sentences[rng.randrange(len(doc.sentences))]
+        hint = doc.text[start:min(end, start + 120)]
+        roll = rng.random()
+        if roll < fuzzy_ratio:
+            # Not an exact substring: exercises the approximate-match path
+            pos = rng.randrange(len(hint))
+            hint = hint[:pos] + "#" + hint[pos + 1:]
+        elif roll < fuzzy_ratio + 0.05:
+            hint = None
+        events.append({
+            "event_id": f"ev_{i}",
+            "url": f"https://{rng.choice(URL_HOSTS)}/a/{i}",
+            "credibility_tier": rng.choice(["high", "medium", "low"]),
+            "evidence_hint": hint,
+        })
+    return events
+
+
+def make_structured_report(event_ids: List[str], items_per_section: int = 50, seed: int = 0) -> dict:
+    """structured_report citing the given events (roles, disputes, URLs mixed in)."""
+    rng = random.Random(seed)
+    sections = []
+    items = []
+    for n, event_id in enumerate(event_ids):
+        cited = [event_id] + ([rng.choice(event_ids)] if rng.random() < 0.3 else [])
+        if rng.random() < 0.02:
+            cited.append(f"missing_{n}")
+        disputed = rng.random() < 0.1
+        items.append({
+            "item_id": f"item_{n}",
+            "item_text": (
+                f"On 2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)} the {rng.choice(EN_TOPICS)} led to a "
+                f"{rng.randint(1, 90)}% change, see https://{rng.choice(URL_HOSTS)}/a/{n}"
+            ),
+            "event_ids": cited if rng.random() > 0.03 else [],
+            "role": "key_claim" if rng.random() < 0.3 else "context",
+            "dispute_status": "disputed" if disputed else "none",
+            "assertion_strength": "hedged" if disputed and rng.random() < 0.7 else "asserted",
+        })
+    for k in range(0, len(items), items_per_section):
+        sections.append({"title": f"Section {k // items_per_section}", "items": items[k:k + items_per_section]})
+    return {"sections": sections}
+
+
+def make_facts_index(event_ids: List[str], seed: int = 0) -> dict:
+    """Phase0 facts_index ({facts: [{event_id, evidences: [{url}]}]}) for _gate2_audit."""
+    rng = random.Random(seed)
+    return {
+        "facts": [
+            {"event_id": event_id, "evidences": [{"url": f"https://{rng.choice(URL_HOSTS)}/a/{n}"}]}
+            for n, event_id in enumerate(event_ids)
+        ]
+    }
+
+
+def _title(rng: random.Random, topic: str, cjk: bool, variant: int) -> str:
+    if cjk:
+        return f"{topic}{rng.choice(CJK_PHRASES)}" + ("（更新）" if variant % 3 == 1 else "")
+    suffix = ("", " update", " confirmed", " v2")[variant % 4]
+    return f"Company {topic} announced{suffix}"
+
+
+def make_timeline_events(
+    n_events: int,
+    cjk_ratio: float = 0.3,
+    duplicate_ratio: float = 0.3,
+    span_days: int = 365,
+    seed: int = 0,
+) -> List[EventNode]:
+    """EventNodes with clusters of near-duplicate reports (same topic, close in time)."""
+    rng = random.Random(seed)
+    base = datetime.datetime(2024, 1, 1)
+    events: List[EventNode] = []
+    while len(events) < n_events:
+        cjk = rng.random() < cjk_ratio
+        topic = rng.choice(CJK_TOPICS if cjk else EN_TOPICS)
+        when = base + datetime.timedelta(seconds=rng.uniform(0, span_days * 86400))
+        copies = 1 + (rng.randint(1, 3) if rng.random() < duplicate_ratio else 0)
+        for variant in range(copies):
+            if len(events) >= n_events:
+                break
+            events.append(EventNode(
+                title=_title(rng, topic, cjk, variant),
+                description=" ".join(rng.choice(EN_WORDS) for _ in range(rng.randint(10, 30))),
+                time=when + datetime.timedelta(hours=rng.uniform(0, 36)),
+                source=rng.choice(SOURCES),
+                confidence=round(rng.uniform(0.3, 0.95), 2),
+                evidence_ids=[f"evd_{len(events)}"],
+            ))
+    return events
+
+
+def make_timeline_entries(n_entries: int, version_ratio: float = 0.4, seed: int = 0) -> List[dict]:
+    """graph_v2 timeline dicts; some share a topic and date but cite different versions."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n_entries):
+        date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        topic = rng.choice(EN_TOPICS)
+        title = f"{topic.title()} v{rng.randint(1, 4)}.{rng.randint(0, 3)}" if rng.random() < version_ratio else topic.title()
+        entries.append({
+            "date": date,
+            "title": title,
+            "description": " ".join(rng.choice(EN_WORDS) for _ in range(rng.randint(8, 25))),
+            "source": rng.choice(SOURCES),
+        })
+    return entries
+
+
+def make_evidences(n_evidences: int, seed: int = 0) -> List[Evidence]:
+    """Evidence for ProvenanceVerifier: releases, training/successor claims, mixed trust."""
+    rng = random.Random(seed)
+    base = datetime.datetime(2024, 1, 1)
+    kinds = ("official release announced", "model training completed", "successor planned",
+             "safety test results", "release rumor", "market reaction")
+    evidences = []
+    for i in range(n_evidences):
+        kind = rng.choice(kinds)
+        content = " ".join(rng.choice(EN_WORDS) for _ in range(rng.randint(20, 60)))
+        if rng.random() < 0.2:
+            content += ' "We are shipping today" — Sam Altman'
+        evidences.append(Evidence(
+            title=f"{kind.capitalize()} #{i}",
+            content=f"{kind}: {content}",
+            url=f"https://{rng.choice(URL_HOSTS)}/p/{i}",
+            source=rng.choice(list(EvidenceSource)),
+            publish_time=base + datetime.timedelta(days=rng.randint(0, 300)),
+        ))
+    return evidences
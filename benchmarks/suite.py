@@ -0,0 +1,339 @@
+"""
+Offline benchmark suite for the deterministic hot paths.
+
+Each case prepares fresh synthetic inputs (untimed), then times the target call
+`repeat` times; one extra run under tracemalloc records peak Python heap usage.
+Results are appended to a JSON Lines history (benchmarks/history.jsonl by default)
+and compared against the previous record of the same case, parameters and machine.
+"""
+
+import asyncio
+import contextlib
+import copy
+import datetime
+import functools
+import inspect
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from unittest import mock
+
+from benchmarks import corpus
+from benchmarks.stubs import TopicEmbeddings, stub_chat_model
+
+HISTORY_VERSION = 1
+DEFAULT_HISTORY = Path(__file__).parent / "history.jsonl"
+# Differences below this many seconds are treated as noise when flagging regressions
+NOISE_FLOOR_SECONDS = 0.005
+
+
+@dataclass(frozen=True)
+class BenchParams:
+    events: int = 1000
+    doc_chars: int = 200_000
+    cjk_ratio: float = 0.5
+    fuzzy_ratio: float = 0.02
+    seed: int = 0
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    prepare: Callable[[BenchParams], Any]  # untimed, called before every run
+    run: Callable[[Any], Any]  # timed; may return an awaitable
+    items: Callable[[BenchParams], int]  # units of work, for throughput
+
+
+# --- inputs ---
+
+
+@functools.lru_cache(maxsize=4)
+def _document(params: BenchParams) -> corpus.SyntheticDocument:
+    return corpus.make_document(params.doc_chars, params.cjk_ratio, params.seed)
+
+
+@functools.lru_cache(maxsize=4)
+def _indexed_document(params: BenchParams) -> dict:
+    from src.graph.nodes.chunk_and_sentence_index import chunk_and_sentence_index_node
+
+    doc = _document(params)
+    state = {"cleaned_text": doc.text, "doc_id": "bench_doc", "normalization_version": "bench"}
+    state.update(asyncio.run(chunk_and_sentence_index_node(state, config={})))
+    state["events"] = corpus.make_phase1_events(doc, params.events, params.fuzzy_ratio, params.seed)
+    return state
+
+
+@functools.lru_cache(maxsize=4)
+def _facts_state(params: BenchParams) -> dict:
+    from src.graph.nodes.build_facts_index_v2 import build_facts_index_v2_node
+
+    state = dict(_indexed_document(params))
+    state.update(asyncio.run(build_facts_index_v2_node(state, config={})))
+    event_ids = [ev["event_id"] for ev in state["events"]]
+    state["document_snapshot"] = {"doc_key": "bench_doc", "cleaned_text": state["cleaned_text"]}
+    state["structured_report"] = corpus.make_structured_report(event_ids, seed=params.seed)
+    return state
+
+
+def _gate2_inputs(params: BenchParams) -> dict:
+    from src.core.utils.url_index import UrlOccurrenceIndex
+    from src.graph.nodes.finalizer import _load_gate2_severity
+
+    event_ids = [f"ev_{i}" for i in range(params.events)]
+    facts_index = corpus.make_facts_index(event_ids, seed=params.seed)
+    notes = [
+        " ".join(ev["url"] for fact in facts_index["facts"][k:k + 20] for ev in fact["evidences"])
+        for k in range(0, len(event_ids), 20)
+    ]
+    return {
+        "structured_report": corpus.make_structured_report(event_ids, seed=params.seed),
+        "facts_index": facts_index,
+        "severity_map": _load_gate2_severity(),
+        "url_index": UrlOccurrenceIndex(notes),
+    }
+
+
+# --- targets ---
+
+
+def _run_chunk_index(state: dict):
+    from src.graph.nodes.chunk_and_sentence_index import chunk_and_sentence_index_node
+
+    return chunk_and_sentence_index_node(state, config={})
+
+
+def _run_build_facts(state: dict):
+    from src.graph.nodes.build_facts_index_v2 import build_facts_index_v2_node
+
+    return build_facts_index_v2_node(state, config={})
+
+
+def _run_gate1(state: dict):
+    from src.graph.nodes.gate1_evidence_audit import gate1_evidence_audit_node
+
+    return gate1_evidence_audit_node(state, config={})
+
+
+def _prepare_clusterer(params: BenchParams):
+    from src.core.verification.clustering import TimelineClusterer
+
+    clusterer = TimelineClusterer(time_window_days=7, sim_threshold=0.85)
+    clusterer.embeddings_model = TopicEmbeddings(seed=params.seed)
+    return clusterer, corpus.make_timeline_events(params.events, seed=params.seed)
+
+
+def _run_clusterer(inputs):
+    clusterer, events = inputs
+    return clusterer.cluster_events(events)
+
+
+async def _run_dedup(events):
+    from src.agents import timeline_deduplicator
+
+    # Borderline pairs and cross-platform merges go to the stub LLM; dedup logs with print()
+    with mock.patch.object(timeline_deduplicator, "init_llm", stub_chat_model), \
+            contextlib.redirect_stdout(io.StringIO()):
+        return await timeline_deduplicator.deduplicate_events(events)
+
+
+def _run_merge_timeline(entries):
+    from src.graph.nodes.timeline_merge import merge_timeline_entries
+
+    return merge_timeline_entries(entries)
+
+
+def _prepare_provenance(params: BenchParams):
+    from src.core.verification.provenance import ProvenanceVerifier
+
+    return ProvenanceVerifier(), corpus.make_evidences(params.events, seed=params.seed)
+
+
+def _run_provenance(inputs):
+    verifier, evidences = inputs
+    return verifier.verify_all(evidences)
+
+
+def _run_gate2(inputs: dict):
+    from src.graph.nodes.finalizer import _gate2_audit
+
+    return _gate2_audit(
+        inputs["structured_report"],
+        inputs["facts_index"],
+        severity_map=inputs["severity_map"],
+        url_index=inputs["url_index"],
+    )
+
+
+CASES: Dict[str, BenchmarkCase] = {
+    case.name: case
+    for case in (
+        BenchmarkCase(
+            "chunk_and_sentence_index",
+            lambda p: {"cleaned_text": _document(p).text, "doc_id": "bench_doc"},
+            _run_chunk_index,
+            lambda p: p.doc_chars,
+        ),
+        BenchmarkCase("build_facts_index_v2", _indexed_document, _run_build_facts, lambda p: p.events),
+        BenchmarkCase("gate1_evidence_audit", _facts_state, _run_gate1, lambda p: p.events),
+        BenchmarkCase("timeline_clusterer", _prepare_clusterer, _run_clusterer, lambda p: p.events),
+        BenchmarkCase(
+            "deduplicate_events",
+            lambda p: corpus.make_timeline_events(p.events, seed=p.seed),
+            _run_dedup,
+            lambda p: p.events,
+        ),
+        BenchmarkCase(
+            "merge_timeline_entries",
+            lambda p: corpus.make_timeline_entries(p.events, seed=p.seed),
+            _run_merge_timeline,
+            lambda p: p.events,
+        ),
+        BenchmarkCase("provenance_verify_all", _prepare_provenance, _run_provenance, lambda p: p.events),
+        BenchmarkCase("gate2_audit", _gate2_inputs, _run_gate2, lambda p: p.events),
+    )
+}
+
+
+# --- running ---
+
+
+def _resolve(loop: asyncio.AbstractEventLoop, value):
+    return loop.run_until_complete(value) if inspect.isawaitable(value) else value
+
+
+def _fresh(loop: asyncio.AbstractEventLoop, case: BenchmarkCase, params: BenchParams):
+    # Cached inputs are shared between runs; copy so a case may mutate its own input
+    return copy.deepcopy(_resolve(loop, case.prepare(params)))
+
+
+def run_case(case: BenchmarkCase, params: BenchParams, repeat: int = 3) -> dict:
+    loop = asyncio.new_event_loop()
+    try:
+        timings = []
+        for _ in range(max(repeat, 1)):
+            inputs = _fresh(loop, case, params)
+            started = time.perf_counter()
+            _resolve(loop, case.run(inputs))
+            timings.append(time.perf_counter() - started)
+
+        inputs = _fresh(loop, case, params)
+        tracemalloc.start()
+        try:
+            _resolve(loop, case.run(inputs))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        loop.close()
+
+    median = statistics.median(timings)
+    items = case.items(params)
+    return {
+        "case": case.name,
+        "params": asdict(params),
+        "repeat": len(timings),
+        "seconds_min": round(min(timings), 6),
+        "seconds_median": round(median, 6),
+        "items": items,
+        "items_per_second": round(items / median, 1) if median > 0 else None,
+        "peak_mem_bytes": peak,
+    }
+
+
+def environment() -> dict:
+    commit = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu",
+    }
+
+
+def run_suite(
+    names: Optional[Iterable[str]] = None,
+    params: BenchParams = BenchParams(),
+    repeat: int = 3,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> List[dict]:
+    env = environment()
+    recorded_at = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    results = []
+    for name in names or CASES:
+        result = {
+            "history_version": HISTORY_VERSION,
+            "recorded_at": recorded_at,
+            **env,
+            **run_case(CASES[name], params, repeat),
+        }
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+# --- history ---
+
+
+def load_history(path=DEFAULT_HISTORY) -> List[dict]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def append_history(results: Iterable[dict], path=DEFAULT_HISTORY) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False, sort_keys=True) + "\n")
+
+
+def compare(results: Iterable[dict], history: List[dict], threshold: float = 0.25) -> List[dict]:
+    """
+    Each result against the latest earlier record with the same case, params and machine:
+    ratio = median / previous median; regression when the slowdown exceeds threshold.
+    """
+    rows = []
+    for result in results:
+        previous = None
+        for record in reversed(history):
+            if (
+                record.get("case") == result["case"]
+                and record.get("params") == result["params"]
+                and record.get("machine") == result["machine"]
+                and record.get("recorded_at") != result["recorded_at"]
+            ):
+                previous = record
+                break
+        row = {"case": result["case"], "seconds_median": result["seconds_median"], "baseline": None,
+               "ratio": None, "regression": False}
+        if previous is not None:
+            baseline = previous["seconds_median"]
+            row["baseline"] = baseline
+            row["baseline_commit"] = previous.get("git_commit")
+            row["ratio"] = round(result["seconds_median"] / baseline, 3) if baseline > 0 else None
+            row["regression"] = (
+                result["seconds_median"] > baseline * (1 + threshold)
+                and result["seconds_median"] - baseline > NOISE_FLOOR_SECONDS
+            )
+        rows.append(row)
+    return rows
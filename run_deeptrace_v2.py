@@ -9,6 +9,9 @@ Runs the full Orchestrator-Investigator Graph.
 Output:
 - final_report.md: The generated report.
 - execution.log: Detailed trace.
+- data/runs/<run_id>/profile.json: Per-node latency/token/HTTP/cache profile
+  (DEEPTRACE_PROFILE=0 disables; DEEPTRACE_PROFILE_STATE=1 adds per-node state sizes;
+  DEEPTRACE_PROFILE_OTEL_FILE adds an OTLP/JSON span export).
 """
 
 import asyncio
@@ -52,6 +55,8 @@ from src.graph.graph_v2 import app_v2
 from src.config.settings import settings
 from src.core.utils.topic_filter import extract_tokens
 from src.core.utils.llm_safety import safe_ainvoke
+from src.core.profiling import profile_run, profile_span
+from src.core.replay import capture_graph_finished, capture_graph_input, record_run
 
 # Phase1 sidecar (conditional import)
 if PHASE1_SIDECAR_ENABLED:
@@ -155,6 +160,22 @@ def _select_direction(query: str, directions: list[str]) -> str:
 
 
 async def run_deeptrace(query: str):
+    run_id = str(uuid.uuid4())
+    with profile_run(run_id) as profiler, record_run(run_id) as recorder:
+        run_record_path = ""
+        try:
+            accumulated_state = await _run_deeptrace(query, run_id)
+            run_record_path = accumulated_state.get("run_record_path") or ""
+        finally:
+            # profile.json / replay_recording sit next to run_record.json (also written for failed runs)
+            run_dir = os.path.dirname(run_record_path) or os.path.join("data", "runs", run_id)
+            if profiler is not None:
+                logger.info(f"⏱️ Profile saved: {profiler.write(run_dir)}")
+            if recorder is not None:
+                logger.info(f"📼 Replay recording saved: {recorder.write(run_dir)}")
+
+
+async def _run_deeptrace(query: str, run_id: str) -> dict:
     logger.info(f"🚀 Starting DeepTrace V2 | Query: {query}")
     logger.info("==================================================")
     
@@ -167,7 +188,7 @@ async def run_deeptrace(query: str):
 
     initial_state = {
         "original_query": query,
-        "run_id": str(uuid.uuid4()),
+        "run_id": run_id,
         "run_record_path": "",
         "objective": clarified_query,
         "clarification_done": True,
@@ -190,6 +211,7 @@ async def run_deeptrace(query: str):
     
     final_output = None
     accumulated_state = dict(initial_state)  # Track accumulated state for sidecar
+    capture_graph_input(initial_state, config)
     
     async for event in app_v2.astream(initial_state, config=config):
         for node_name, state_update in event.items():
@@ -239,6 +261,7 @@ async def run_deeptrace(query: str):
                 logs = state_update['investigation_log']
                 if logs:
                     logger.warning(f"⚠️  Log: {logs[-1]}")
+    capture_graph_finished()
 
     # Save Report
     if final_output:
@@ -257,13 +280,15 @@ async def run_deeptrace(query: str):
         if evidences:
             logger.info(f"\n🔬 Phase1 Sidecar: Processing {len(evidences)} evidences, {len(timeline)} events...")
             try:
-                sidecar_result = await phase1_sidecar_node(accumulated_state, config)
+                with profile_span("phase1_sidecar", graph="sidecar"):
+                    sidecar_result = await phase1_sidecar_node(accumulated_state, config)
                 logger.info(f"✅ Phase1 Sidecar completed: {sidecar_result.get('phase1_archive', 'N/A')}")
             except Exception as e:
                 logger.warning(f"⚠️ Phase1 Sidecar failed: {e}")
         else:
             logger.info("\n⚠️ Phase1 Sidecar skipped: no evidences available")
     # ========================================
+    return accumulated_state
 
 if __name__ == "__main__":
     # You can change the query here
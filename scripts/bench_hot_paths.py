@@ -0,0 +1,87 @@
+"""
+Offline benchmark suite for the deterministic hot paths (synthetic corpora, stub LLM /
+embeddings, no network).
+
+Cases: chunk_and_sentence_index, build_facts_index_v2, gate1_evidence_audit,
+timeline_clusterer, deduplicate_events, merge_timeline_entries, provenance_verify_all,
+gate2_audit.
+
+Usage:
+    python scripts/bench_hot_paths.py                       # all cases, 1000 events
+    python scripts/bench_hot_paths.py --events 10000 --cases deduplicate_events gate2_audit
+    python scripts/bench_hot_paths.py --no-record --fail-on-regression 0.25
+
+Each run is appended to benchmarks/history.jsonl (time, peak memory, git commit) and
+compared with the previous run of the same case/parameters on the same machine.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from benchmarks.suite import (  # noqa: E402
+    CASES,
+    DEFAULT_HISTORY,
+    BenchParams,
+    append_history,
+    compare,
+    load_history,
+    run_suite,
+)
+
+
+def _print_result(result: dict) -> None:
+    print(
+        f"{result['case']:<26} {result['seconds_median']:>10.4f} {result['seconds_min']:>10.4f} "
+        f"{result['peak_mem_bytes'] / 1e6:>9.1f} {result['items']:>9}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument("--events", type=int, default=BenchParams.events, help="events/evidences/report items")
+    parser.add_argument("--doc-chars", type=int, default=BenchParams.doc_chars, help="synthetic document length")
+    parser.add_argument("--cjk-ratio", type=float, default=BenchParams.cjk_ratio, help="share of CJK sentences")
+    parser.add_argument("--fuzzy-ratio", type=float, default=BenchParams.fuzzy_ratio,
+                        help="share of evidence hints that need approximate matching")
+    parser.add_argument("--seed", type=int, default=BenchParams.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY), help="JSON Lines results history")
+    parser.add_argument("--no-record", action="store_true", help="do not append results to the history")
+    parser.add_argument("--fail-on-regression", type=float, default=None, metavar="RATIO",
+                        help="exit 1 when a case is slower than its baseline by more than RATIO (e.g. 0.25)")
+    args = parser.parse_args()
+
+    params = BenchParams(
+        events=args.events,
+        doc_chars=args.doc_chars,
+        cjk_ratio=args.cjk_ratio,
+        fuzzy_ratio=args.fuzzy_ratio,
+        seed=args.seed,
+    )
+    print(f"{'case':<26} {'median s':>10} {'min s':>10} {'peak MB':>9} {'items':>9}")
+    results = run_suite(args.cases, params, args.repeat, on_result=_print_result)
+
+    threshold = args.fail_on_regression if args.fail_on_regression is not None else 0.25
+    rows = compare(results, load_history(args.history), threshold=threshold)
+    compared = [row for row in rows if row["baseline"] is not None]
+    if compared:
+        print(f"\n{'case':<26} {'baseline s':>10} {'now s':>10} {'ratio':>7}")
+        for row in compared:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['case']:<26} {row['baseline']:>10.4f} {row['seconds_median']:>10.4f} {row['ratio']:>7.2f}{flag}")
+
+    if not args.no_record:
+        append_history(results, args.history)
+        print(f"\nRecorded {len(results)} results in {args.history}")
+    if args.fail_on_regression is not None and any(row["regression"] for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark TimelineClusterer scaling (synthetic events, no network).
+
+Usage:
+    python scripts/bench_timeline_clustering.py --sizes 1000 5000 10000 20000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from src.core.models.events import EventNode  # noqa: E402
+from src.core.verification.clustering import TimelineClusterer  # noqa: E402
+
+
+class SyntheticEmbeddings:
+    """Topic centroid + noise, so clusters are real but not trivial."""
+
+    def __init__(self, dim: int = 256, topics: int = 200, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.centroids = rng.normal(size=(topics, dim))
+        self.rng = rng
+
+    async def aembed_documents(self, texts):
+        topic_ids = [hash(t.split(":", 1)[0]) % len(self.centroids) for t in texts]
+        noise = self.rng.normal(scale=0.3, size=(len(texts), self.centroids.shape[1]))
+        return (self.centroids[topic_ids] + noise).tolist()
+
+
+def make_events(n: int, span_days: int = 365):
+    rng = np.random.default_rng(n)
+    base = datetime.datetime(2024, 1, 1)
+    offsets = rng.uniform(0, span_days * 86400, n)
+    topics = rng.integers(0, 200, n)
+    return [
+        EventNode(
+            title=f"topic-{topics[i]}",
+            description=f"event {i}",
+            time=base + datetime.timedelta(seconds=float(offsets[i])),
+        )
+        for i in range(n)
+    ]
+
+
+async def run(sizes):
+    clusterer = TimelineClusterer(time_window_days=7, sim_threshold=0.85)
+    clusterer.embeddings_model = SyntheticEmbeddings()
+    print(f"{'events':>8} {'clusters':>9} {'seconds':>9}")
+    for n in sizes:
+        events = make_events(n)
+        started = time.perf_counter()
+        clusters = await clusterer.cluster_events(events)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>8} {len(clusters):>9} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes))
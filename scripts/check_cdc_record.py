@@ -1,9 +1,15 @@
 """Check example CDC record."""
-import json
-from pathlib import Path
+import os
+import sys
 
-p = list(Path('data/doc_versions').glob('*.json'))[0]
-d = json.loads(p.read_text(encoding='utf-8'))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.graph.nodes.doc_version_cdc import get_doc_version_store  # noqa: E402
+
+d = next(get_doc_version_store().iter_records(limit=1), None)
+if d is None:
+    print('No CDC records found')
+    sys.exit(0)
 print('Example CDC record:')
 doc_key = d.get('doc_key', '')
 print(f'  doc_key: {doc_key[:60]}...')
@@ -1,13 +1,17 @@
 """Check facts_index_v2 doc_version_id binding."""
-import json
+import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.artifact_io import load_artifact  # noqa: E402
+
 # 找一个文档的 facts_index_v2
 base = Path('artifacts/phase1')
 doc_dirs = [d for d in base.iterdir() if d.is_dir() and 'e1e155b3' in d.name and '_' in d.name]
 if doc_dirs:
-    f = doc_dirs[0] / 'facts_index_v2.json'
-    d = json.loads(f.read_text(encoding='utf-8'))
+    d = load_artifact(doc_dirs[0], 'facts_index_v2', default={})
     items = d.get('items', [])
     print(f'facts_index_v2 items count: {len(items)}')
     if items:
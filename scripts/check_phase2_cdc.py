@@ -1,12 +1,19 @@
 """Check Phase2 CDC artifacts from latest run."""
 import json
+import os
+import sys
 from pathlib import Path
 
-base = Path('artifacts/phase1')
-run_dirs = [d for d in base.iterdir() if d.is_dir() and '_' not in d.name]
-if run_dirs:
-    latest = sorted(run_dirs, key=lambda d: d.stat().st_mtime)[-1]
-    print(f'Latest run: {latest.name}')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.artifact_catalog import ArtifactCatalog  # noqa: E402
+
+catalog = ArtifactCatalog(os.getenv("DEEPTRACE_CATALOG_DB") or "data/catalog.sqlite3")
+catalog.ingest_all()  # incremental: only runs archived since the last check are read
+latest_run = catalog.latest_run(with_phase1=True)
+if latest_run:
+    latest = Path(latest_run['phase1_dir'])
+    print(f'Latest run: {latest_run["run_id"]}')
     
     # 检查 doc_versions_summary.json
     dvs_path = latest / 'doc_versions_summary.json'
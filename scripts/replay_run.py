@@ -0,0 +1,74 @@
+"""
+Replay a recorded DeepTrace V2 run offline and check it end to end.
+
+Record a run first (DEEPTRACE_RECORD_RUN=1 python run_deeptrace_v2.py); its
+replay_recording artifact is written next to run_record.json. The replay serves every
+LLM / search / fetch interaction from the recording, so no API keys or network are
+needed, then compares facts_index and gate_report with the recorded run (timestamps
+and run ids ignored) and reports end-to-end timing.
+
+Usage:
+    python scripts/replay_run.py data/runs/<run_id>                     # recorded latencies
+    python scripts/replay_run.py data/runs/<run_id> --latency none --repeat 3
+    python scripts/replay_run.py data/runs/<run_id> --latency-scale 0.5 --llm-latency 2.0
+
+Exits 1 when a replay's outputs differ from the recorded ones.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("OPENAI_API_KEY", "replay")
+# Replays are archived under their own run id but kept out of the artifact catalog
+os.environ["DEEPTRACE_CATALOG_DB"] = ""
+
+from src.core.replay import LatencyModel, replay_run  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("run_dir", help="run archive directory containing replay_recording")
+    parser.add_argument("--latency", type=LatencyModel.parse, default="recorded",
+                        help='"recorded", "none" or fixed seconds for every interaction')
+    parser.add_argument("--llm-latency", type=LatencyModel.parse, default=None, help="override for LLM calls")
+    parser.add_argument("--search-latency", type=LatencyModel.parse, default=None, help="override for searches")
+    parser.add_argument("--fetch-latency", type=LatencyModel.parse, default=None, help="override for page fetches")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for recorded latencies")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the full reports as JSON")
+    args = parser.parse_args()
+
+    latency = LatencyModel(
+        llm=args.llm_latency if args.llm_latency is not None else args.latency,
+        search=args.search_latency if args.search_latency is not None else args.latency,
+        fetch=args.fetch_latency if args.fetch_latency is not None else args.latency,
+        scale=args.latency_scale,
+    )
+    reports = [asyncio.run(replay_run(args.run_dir, latency)) for _ in range(max(args.repeat, 1))]
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        recorded = reports[0]["recorded_graph_wall_s"]
+        print(f"run {reports[0]['run_id']}  recorded graph wall: {recorded if recorded is not None else '?'} s")
+        for report in reports:
+            stats = report["interactions"]
+            print(
+                f"{report['replay_run_id']}  wall {report['wall_s']:.3f} s  "
+                f"(simulated latency {stats['simulated_latency_s']:.3f} s)  "
+                f"served {stats['served']}/{stats['recorded']}  fallback {stats['fallback_key']}  "
+                f"missed {stats['missed']}  identical={report['identical']}"
+            )
+            for name, comparison in report["comparisons"].items():
+                for diff in comparison["differences"]:
+                    print(f"    {name}{diff}")
+            if report["profile_path"]:
+                print(f"    profile: {report['profile_path']}")
+    return 0 if all(report["identical"] for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,48 @@
 """
 Offline verifier for Phase1 Gate1 locatability.
 Loads facts_index_v2, document_snapshot, sentence_meta and reports failures.
+Snapshots archived with cleaned_text_ref are read from the snapshot store by offsets.
 """
 
-import json
+import os
 import sys
-from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.artifact_io import load_artifact_file  # noqa: E402
+from src.core.snapshot_store import get_snapshot_store  # noqa: E402
 
 def load_json(path):
-    return json.loads(Path(path).read_text(encoding="utf-8"))
+    # Accepts <name>.json or streamed <name>.jsonl.gz archives
+    return load_artifact_file(path)
 
 def find_sentence_text(doc, sentences, sentence_ids):
+    """doc is the cleaned_text, or a callable (start, end) -> text; sentences maps sentence_id -> meta."""
     spans = []
     for sid in sentence_ids or []:
-        for s in sentences:
-            if s.get("sentence_id") == sid:
-                spans.append((s.get("start"), s.get("end")))
+        s = sentences.get(sid)
+        if s:
+            spans.append((s.get("start"), s.get("end")))
     if not spans:
         return ""
     start = min(s for s,_ in spans)
     end = max(e for _,e in spans)
-    return doc[start:end]
+    return doc(start, end) if callable(doc) else doc[start:end]
+
+def _text_reader(doc):
+    if doc.get("cleaned_text") is not None:
+        return doc["cleaned_text"]
+    store = get_snapshot_store()
+    digest = doc.get("cleaned_text_ref")
+    if store is None or not digest or digest not in store:
+        return ""
+    return lambda start, end: store.slice(digest, start, end)
 
 def main(facts_path, doc_path, sentences_path):
     facts = load_json(facts_path)
     doc = load_json(doc_path)
-    sentences = load_json(sentences_path)
+    sentences = {s.get("sentence_id"): s for s in load_json(sentences_path)}
+    text = _text_reader(doc)
     failures = []
     for item in facts.get("items", []):
         event_id = item.get("event_id")
@@ -35,7 +52,7 @@ def main(facts_path, doc_path, sentences_path):
         if reason:
             failures.append((event_id, reason))
             continue
-        ref_text = find_sentence_text(doc.get("cleaned_text",""), sentences, ref.get("sentence_ids"))
+        ref_text = find_sentence_text(text, sentences, ref.get("sentence_ids"))
         if not quote or not ref_text or quote not in ref_text:
             failures.append((event_id, "quote_not_reproducible"))
     if failures:
@@ -48,6 +65,6 @@ def main(facts_path, doc_path, sentences_path):
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
-        print("Usage: python scripts/verify_locatability.py facts_index_v2.json document_snapshot.json sentence_meta.json")
+        print("Usage: python scripts/verify_locatability.py facts_index_v2.jsonl.gz document_snapshot.json sentence_meta.jsonl.gz")
         sys.exit(1)
     main(sys.argv[1], sys.argv[2], sys.argv[3])
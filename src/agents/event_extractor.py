@@ -11,6 +11,7 @@ from ..core.models.evidence import Evidence
 from ..core.models.events import EventNode, EventStatus
 from ..core.models.claim import Claim
 from ..core.models.credibility import evaluate_credibility
+from ..core.models.domain_registry import is_official_domain
 from ..config.settings import settings
 from .prompts import EVENT_EXTRACTOR_SYSTEM_PROMPT
 from ..llm.factory import init_json_llm
@@ -257,15 +258,9 @@ Title: {evidence.title if evidence.title else 'N/A'}
         ev_type = data.get("evidence_type", "media")
         
         # 1. Force Official if domain in whitelist
-        if evidence.url:
-            from urllib.parse import urlparse
-            try:
-                domain = urlparse(evidence.url).netloc.lower()
-                # Check exact or subdomain match
-                if any(domain == d or domain.endswith("." + d) for d in settings.OFFICIAL_DOMAINS):
-                    ev_type = "official"
-            except:
-                pass
+        # Exact or subdomain match against the registry
+        if evidence.url and is_official_domain(evidence.url):
+            ev_type = "official"
                 
         # 2. Force Rumor if keywords detected (and not already official)
         if ev_type != "official":
@@ -37,7 +37,17 @@ class ConsistencyAuditor:
         if not previous_drafts:
             # No context to contradict
             return AuditResult(passed=True, conflict_detected=False)
+        return self._build_chain(current_draft, previous_drafts).invoke({})
 
+    async def acheck_consistency(self, current_draft: str, previous_drafts: List[str]) -> AuditResult:
+        """
+        Async variant of check_consistency (used by the parallel swarm graph).
+        """
+        if not previous_drafts:
+            return AuditResult(passed=True, conflict_detected=False)
+        return await self._build_chain(current_draft, previous_drafts).ainvoke({})
+
+    def _build_chain(self, current_draft: str, previous_drafts: List[str]):
         # Optimization: Concatenate previous drafts (might need truncation if too long)
         # For MVP, we assume manageable length or take last N sections.
         context = "\n\n".join([f"--- Previous Section ---\n{d}" for d in previous_drafts[-3:]])
@@ -57,8 +67,7 @@ Task: Check for Entity and Date inconsistencies.
             ("user", user_prompt)
         ])
         
-        chain = prompt | self.llm | self.parser
-        return chain.invoke({})
+        return prompt | self.llm | self.parser
 
     def _get_system_prompt(self) -> str:
         return """You are the **Consistency Auditor**.
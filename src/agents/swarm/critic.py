@@ -7,7 +7,7 @@ Review Stages:
 2.  Evidence Verification (NLI)
 """
 import logging
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
@@ -39,6 +39,21 @@ class CriticAgent:
         """
         Main verification pipeline.
         """
+        local_result = self._structural_check(draft)
+        if local_result is not None:
+            return local_result
+        return self._build_chain(draft, evidences).invoke({})
+
+    async def averify_section(self, draft: str, section: SectionPlan, evidences: str) -> CritiqueResult:
+        """
+        Async variant of verify_section (used by the parallel swarm graph).
+        """
+        local_result = self._structural_check(draft)
+        if local_result is not None:
+            return local_result
+        return await self._build_chain(draft, evidences).ainvoke({})
+
+    def _structural_check(self, draft: str) -> Optional[CritiqueResult]:
         # Stage 1: Fast Structural Checks (Local)
         # Check for empty content
         if not draft or len(draft) < 50:
@@ -57,7 +72,9 @@ class CriticAgent:
                 nli_state="NEI",
                 revision_needed=True
             )
+        return None
 
+    def _build_chain(self, draft: str, evidences: str):
         # Stage 2: NLI & Contract Check (LLM)
         check_prompt = self._get_system_prompt()
         user_prompt = f"""
@@ -74,10 +91,7 @@ Task: Verify if the Draft is fully supported by the Evidence.
             ("user", user_prompt)
         ])
         
-        chain = prompt | self.llm | self.parser
-        result = chain.invoke({})
-        
-        return result
+        return prompt | self.llm | self.parser
 
     def _get_system_prompt(self) -> str:
         return """You are the **Citadel Critic**, the gatekeeper of truth.
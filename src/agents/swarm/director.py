@@ -24,6 +24,15 @@ class DirectorAgent:
         """
         Main entry point for Director.
         """
+        return self._build_chain(state).invoke({})
+
+    async def acreate_outline(self, state: SwarmState) -> ReportOutline:
+        """
+        Async variant of create_outline (used by the parallel swarm graph).
+        """
+        return await self._build_chain(state).ainvoke({})
+
+    def _build_chain(self, state: SwarmState):
         # 1. Prepare Context
         events_context = self._format_events(state["events"])
         claims_context = self._format_claims(state["claims"])
@@ -35,11 +44,7 @@ class DirectorAgent:
             ("user", f"Topic: {topic}\n\nEvents Timeline:\n{events_context}\n\nKey Claims:\n{claims_context}")
         ])
         
-        # 3. Invoke LLM
-        chain = prompt | self.llm | self.parser
-        outline = chain.invoke({})
-        
-        return outline
+        return prompt | self.llm | self.parser
 
     def _format_events(self, events: List[Any]) -> str:
         """Format events for LLM input, emphasizing clusters (if they were clustered)."""
@@ -2,14 +2,18 @@
 Layer 3: Swarm Graph Controller.
 Integrates Director, Writer, and Critic into a coherent workflow.
 Enforces Loop Budgets (Circuit Breaker).
+The parallel variant drafts and critiques independent sections concurrently and audits
+all drafts in one concurrent pass, under the same per-section revision budget.
 """
 
+import asyncio
 import logging
-from typing import Literal, Dict, Any, List
+from typing import Literal, Dict, Any, List, Tuple
 
 from langgraph.graph import StateGraph, START, END
 
-from .state import SwarmState
+from ...config.settings import settings
+from .state import SwarmState, SectionPlan
 from .director import DirectorAgent
 from .writer import WriterAgent
 from .critic import CriticAgent, CritiqueResult
@@ -207,6 +211,103 @@ def finalize_node(state: SwarmState) -> Dict[str, Any]:
     return {"final_report": full_report}
 
 
+async def parallel_director_node(state: SwarmState) -> Dict[str, Any]:
+    """
+    Node: Director (async)
+    Action: Generate Outline
+    """
+    logger.info("--- Director Node: Generating Outline ---")
+    outline = await director.acreate_outline(state)
+    return {
+        "outline": outline,
+        "current_section_idx": 0,
+        "draft_sections": {},
+        "revision_count": 0,
+        "global_revision_count": 0,
+        "final_report": "",
+        "audit_results": {},
+    }
+
+
+async def _draft_section(section: SectionPlan, state: SwarmState, evidences_str: str) -> Tuple[str, int]:
+    """
+    Write -> critique loop for one section with the same budget as the sequential router:
+    at most MAX_REVISION_LOOPS_PER_SECTION drafts, then forced progress.
+    Returns (draft, revisions requested).
+    """
+    draft = ""
+    revisions = 0
+    section_state = dict(state)
+    for attempt in range(MAX_REVISION_LOOPS_PER_SECTION):
+        draft = await writer.awrite_section(section, section_state)
+        result: CritiqueResult = await critic.averify_section(draft, section, evidences_str)
+        logger.info(
+            f"Critic Result [{section.id}]: Score={result.score}, NLI={result.nli_state}, R={result.revision_needed}"
+        )
+        if not result.revision_needed:
+            break
+        revisions += 1
+        section_state["critique_feedback"] = result.feedback
+    else:
+        logger.warning(
+            f"Section {section.id}: MAX REVISIONS ({MAX_REVISION_LOOPS_PER_SECTION}) reached. Forcing progress."
+        )
+    return draft, revisions
+
+
+async def parallel_sections_node(state: SwarmState) -> Dict[str, Any]:
+    """
+    Node: Writer + Critic for all sections concurrently
+    (bounded by SWARM_SECTION_CONCURRENCY).
+    """
+    outline = state["outline"]
+    if not outline or not outline.sections:
+        return {}
+
+    logger.info(f"--- Parallel Writer/Critic: {len(outline.sections)} sections ---")
+    evidences_str = str(state["evidences"])
+    semaphore = asyncio.Semaphore(max(settings.SWARM_SECTION_CONCURRENCY, 1))
+
+    async def _bounded(section: SectionPlan) -> Tuple[str, int]:
+        async with semaphore:
+            return await _draft_section(section, state, evidences_str)
+
+    results = await asyncio.gather(*[_bounded(section) for section in outline.sections])
+
+    drafts = dict(state.get("draft_sections") or {})
+    total_revisions = 0
+    for section, (draft, revisions) in zip(outline.sections, results):
+        drafts[section.id] = draft
+        total_revisions += revisions
+
+    return {
+        "draft_sections": drafts,
+        "current_section_idx": len(outline.sections) - 1,
+        "critique_feedback": None,
+        "revision_count": 0,
+        "global_revision_count": state.get("global_revision_count", 0) + total_revisions,
+    }
+
+
+async def parallel_auditor_node(state: SwarmState) -> Dict[str, Any]:
+    """
+    Node: Consistency Auditor (async)
+    All drafts exist up front, so every section-vs-previous-sections check runs concurrently.
+    """
+    logger.info("--- Auditor Node: Consistency Check (parallel) ---")
+    drafts = state["draft_sections"]
+    outline = state["outline"]
+
+    if not outline:
+        return {"audit_results": {}}
+
+    ordered = [drafts.get(section.id, "") for section in outline.sections]
+    results = await asyncio.gather(
+        *[auditor.acheck_consistency(ordered[i], ordered[:i]) for i in range(len(ordered))]
+    )
+    return {"audit_results": {section.id: res for section, res in zip(outline.sections, results)}}
+
+
 def create_swarm_graph():
     """Build the LangGraph"""
     builder = StateGraph(SwarmState)
@@ -238,3 +339,21 @@ def create_swarm_graph():
     builder.add_edge("finalizer", END)
 
     return builder.compile()
+
+
+def create_parallel_swarm_graph():
+    """Build the async LangGraph: sections are drafted/critiqued concurrently."""
+    builder = StateGraph(SwarmState)
+
+    builder.add_node("director", parallel_director_node)
+    builder.add_node("sections", parallel_sections_node)
+    builder.add_node("auditor", parallel_auditor_node)
+    builder.add_node("finalizer", finalize_node)
+
+    builder.add_edge(START, "director")
+    builder.add_edge("director", "sections")
+    builder.add_edge("sections", "auditor")
+    builder.add_edge("auditor", "finalizer")
+    builder.add_edge("finalizer", END)
+
+    return builder.compile()
@@ -39,6 +39,24 @@ class WriterAgent:
         """
         Generates markdown for the given section.
         """
+        content = self._build_chain(section, state).invoke({})
+
+        # Post-Check (Contract 1)
+        # We can implement a retry loop here if banned words are found.
+        # For now, just log warning. The Critic will catch this later.
+        self._check_causal_ban(content)
+
+        return content
+
+    async def awrite_section(self, section: SectionPlan, state: SwarmState) -> str:
+        """
+        Async variant of write_section (used by the parallel swarm graph).
+        """
+        content = await self._build_chain(section, state).ainvoke({})
+        self._check_causal_ban(content)
+        return content
+
+    def _build_chain(self, section: SectionPlan, state: SwarmState):
         # 1. Filter Context
         # Only include events/claims assigned to this section
         related_events = [e for e in state["events"] if e.id in section.assigned_event_ids]
@@ -62,16 +80,7 @@ class WriterAgent:
             ("user", user_prompt)
         ])
         
-        # 3. Invoke
-        chain = prompt | self.llm | self.parser
-        content = chain.invoke({})
-        
-        # 4. Post-Check (Contract 1)
-        # We can implement a retry loop here if banned words are found.
-        # For now, just log warning. The Critic will catch this later.
-        self._check_causal_ban(content)
-        
-        return content
+        return prompt | self.llm | self.parser
 
     def _format_evidence(self, evidences: List[Evidence]) -> str:
         # Format: [Ev{id}] {content}...
@@ -1,17 +1,39 @@
-from typing import List, Set, Tuple
+import asyncio
+import re
+from collections import Counter, deque
+from typing import Dict, List, Set, Tuple
 from datetime import datetime
 from difflib import SequenceMatcher
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from pydantic import BaseModel, Field
 
+from ..config.settings import settings
 from ..core.models.events import EventNode, OpenQuestion
+from ..core.utils.structured_output import parse_structured
 from ..llm.factory import init_llm
 
+# Phase 18: Split Thresholds
+AUTO_MERGE_THRESHOLD = 0.90         # Very high similarity -> merge without LLM
+NEAR_DUPLICATE_THRESHOLD = 0.8      # High similarity -> LLM decides merge
+POTENTIAL_CONFLICT_THRESHOLD = 0.6  # Moderate similarity -> check logic conflict
+DEDUP_WINDOW_DAYS = 2               # Events further apart are never compared
+# Blocking: only pairs within the time window sharing this much of their title bigrams are scored
+# (loose on purpose: pairs above POTENTIAL_CONFLICT_THRESHOLD practically always clear it)
+BLOCKING_MIN_DICE = 0.2
+
 class DeduplicationResult(BaseModel):
     is_duplicate: bool = Field(..., description="是否为重复事件")
     reason: str = Field(..., description="判断理由")
 
+class PairVerdict(BaseModel):
+    pair: int = Field(..., description="事件对编号")
+    is_duplicate: bool = Field(..., description="是否为重复事件")
+    reason: str = Field(default="", description="判断理由")
+
+class BatchDeduplicationResult(BaseModel):
+    results: List[PairVerdict] = Field(default_factory=list)
+
 def extract_versions(text: str) -> Set[str]:
     """Extract version numbers like '1.0', '2.0', '3.0', 'v4', 'GPT-4'."""
     import re
@@ -73,9 +95,9 @@ def calculate_similarity(text1: str, text2: str) -> float:
     """计算两个文本的相似度 (0.0 - 1.0)"""
     return SequenceMatcher(None, text1, text2).ratio()
 
-async def are_events_duplicate_llm(event1: EventNode, event2: EventNode) -> bool:
+async def are_events_duplicate_llm(event1: EventNode, event2: EventNode, llm=None) -> bool:
     """使用 LLM 判断两个事件是否描述同一件事"""
-    llm = init_llm()
+    llm = llm or init_llm()
     parser = JsonOutputParser(pydantic_object=DeduplicationResult)
     
     prompt = ChatPromptTemplate.from_messages([
@@ -111,6 +133,52 @@ async def are_events_duplicate_llm(event1: EventNode, event2: EventNode) -> bool
         print(f"[WARN] Deduplication LLM check failed: {e}")
         return False
 
+def _format_event(label: str, event: EventNode) -> str:
+    return f"""事件 {label}:
+时间: {event.time}
+标题: {event.title}
+描述: {event.description}"""
+
+async def are_event_pairs_duplicate_llm(
+    pairs: List[Tuple[EventNode, EventNode]], llm=None
+) -> List[bool]:
+    """
+    一次 LLM 调用判断多对事件是否重复（批量版 are_events_duplicate_llm）。
+    缺失或解析失败的事件对视为不重复。
+    """
+    if not pairs:
+        return []
+    if len(pairs) == 1:
+        return [await are_events_duplicate_llm(pairs[0][0], pairs[0][1], llm=llm)]
+    llm = llm or init_llm()
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", """你是一个事件去重专家。请逐对判断以下事件对是否描述的是同一个具体事件。
+
+        判断标准：
+        1. **核心事实一致**：主体、动作、结果基本相同。
+        2. **时间相近**：发生时间非常接近（允许有少量误差）。
+        3. **跨平台兼容**：即使一个是新闻报道（侧重事实），一个是社交媒体评论（侧重观点），只要它们讨论的是同一个具体事件节点，也视为同一事件。
+
+        请为每一对输出结果，JSON：{{"results": [{{"pair": 1, "is_duplicate": true/false, "reason": "..."}}]}}
+        """),
+        ("user", "{input}")
+    ])
+    chain = prompt | llm | StrOutputParser()
+
+    user_content = "\n\n".join(
+        f"### 事件对 {n}\n{_format_event('A', a)}\n{_format_event('B', b)}"
+        for n, (a, b) in enumerate(pairs, start=1)
+    )
+    try:
+        raw = await chain.ainvoke({"input": user_content})
+        result = parse_structured(raw, BatchDeduplicationResult)
+    except Exception as e:
+        print(f"[WARN] Batched deduplication LLM check failed: {e}")
+        return [False] * len(pairs)
+    verdicts = {v.pair: v.is_duplicate for v in result.results}
+    return [verdicts.get(n, False) for n in range(1, len(pairs) + 1)]
+
 def get_source_priority(source: str) -> int:
     """Determine source priority: News (2) > Social (1) > Unknown (0)"""
     source = (source or "").lower()
@@ -152,7 +220,7 @@ def merge_event_content(target: EventNode, source: EventNode):
     target.evidence_ids = list(set(target.evidence_ids + source.evidence_ids))
     target.confidence = max(target.confidence, source.confidence)
 
-async def rewrite_and_merge_event(target: EventNode, source: EventNode):
+async def rewrite_and_merge_event(target: EventNode, source: EventNode, llm=None):
     """
     Use LLM to rewrite the target event description by fusing content from source.
     """
@@ -172,9 +240,8 @@ async def rewrite_and_merge_event(target: EventNode, source: EventNode):
     target.confidence = max(target.confidence, source.confidence)
     
     # 2. Call LLM for Description Rewrite
-    llm = init_llm()
-    from langchain_core.output_parsers import StrOutputParser
-    
+    llm = llm or init_llm()
+
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are an expert editor. Combine the following two event descriptions into a single, cohesive narrative.
         
@@ -204,111 +271,197 @@ async def rewrite_and_merge_event(target: EventNode, source: EventNode):
         target.description = f"{base.description}\n\n【补充视角】({supplement.source or '其他'}): {supplement.description}"
 
 
+def _title_bigrams(text: str) -> Set[str]:
+    normalized = re.sub(r"\s+", " ", (text or "").lower()).strip()
+    if len(normalized) < 2:
+        return {normalized} if normalized else set()
+    return {normalized[k:k + 2] for k in range(len(normalized) - 1)}
+
+def _within_window(e1: EventNode, e2: EventNode) -> bool:
+    if e1.time and e2.time:
+        return abs((e1.time - e2.time).days) <= DEDUP_WINDOW_DAYS
+    return True
+
+def block_candidate_pairs(events: List[EventNode], texts: List[str]) -> List[Tuple[int, int]]:
+    """
+    Candidate pairs (i < j) for scoring: within the time window and sharing enough
+    title bigrams (Dice >= BLOCKING_MIN_DICE). Events must be sorted by time.
+
+    Dated events are swept in time order against an inverted bigram index of the
+    events still inside the window; undated events are matched against every event.
+    """
+    grams = [_title_bigrams(t) for t in texts]
+    pairs: Set[Tuple[int, int]] = set()
+
+    def _collect(j: int, counts: Counter):
+        for i, shared in counts.items():
+            if i == j:
+                continue
+            if 2 * shared / (len(grams[i]) + len(grams[j])) >= BLOCKING_MIN_DICE:
+                pairs.add((min(i, j), max(i, j)))
+
+    # 1. Dated events: sliding window
+    active: deque = deque()
+    index: Dict[str, Set[int]] = {}
+    for j, event in enumerate(events):
+        if not event.time:
+            continue
+        while active and (event.time - events[active[0]].time).days > DEDUP_WINDOW_DAYS:
+            expired = active.popleft()
+            for g in grams[expired]:
+                index[g].discard(expired)
+        _collect(j, Counter(i for g in grams[j] for i in index.get(g, ())))
+        active.append(j)
+        for g in grams[j]:
+            index.setdefault(g, set()).add(j)
+
+    # 2. Undated events: no time filter
+    undated = [j for j, event in enumerate(events) if not event.time]
+    if undated:
+        full_index: Dict[str, List[int]] = {}
+        for i, bigrams in enumerate(grams):
+            for g in bigrams:
+                full_index.setdefault(g, []).append(i)
+        for j in undated:
+            _collect(j, Counter(i for g in grams[j] for i in full_index.get(g, ())))
+
+    return sorted(pairs)
+
+
+async def _adjudicate_borderline(
+    sorted_events: List[EventNode], borderline: List[Tuple[int, int]], llm
+) -> Dict[Tuple[int, int], bool]:
+    """Borderline pairs -> LLM verdicts, DEDUP_LLM_BATCH_SIZE pairs per prompt, batches concurrently."""
+    if not borderline:
+        return {}
+    batch_size = max(settings.DEDUP_LLM_BATCH_SIZE, 1)
+    batches = [borderline[k:k + batch_size] for k in range(0, len(borderline), batch_size)]
+    sem = asyncio.Semaphore(settings.DEDUP_LLM_CONCURRENCY)
+
+    async def _run(batch):
+        async with sem:
+            return await are_event_pairs_duplicate_llm(
+                [(sorted_events[i], sorted_events[j]) for i, j in batch], llm=llm
+            )
+
+    results = await asyncio.gather(*[_run(batch) for batch in batches])
+    return {
+        pair: verdict
+        for batch, verdicts in zip(batches, results)
+        for pair, verdict in zip(batch, verdicts)
+    }
+
+
 async def deduplicate_events(events: List[EventNode]) -> Tuple[List[EventNode], List[OpenQuestion]]:
     """
     对事件列表进行语义去重 (Layer 2)。
     策略：
     1. 按时间排序。
-    2. 两两比较：
-       - Filter: 时间窗口 (2天) & 标题相似度 (>0.6)
-       - Check: LLM 判断是否为同一具体事件
-    3. 合并: News为主，Social为辅。
-    4. 冲突检测: 若合并事件时间差异过大，生成 OpenQuestion。
+    2. 候选对 (Blocking)：时间窗口 (2天) 内且标题 bigram 重叠足够的事件对。
+    3. 批量打分：候选对计算标题相似度
+       - > 0.9: 直接合并
+       - 0.8 ~ 0.9: 全部交给 LLM 批量并发判断是否为同一具体事件
+       - 0.6 ~ 0.8: 逻辑冲突检测
+    4. 合并（打分与裁决完成后统一执行）：按时间顺序贪心合并，News为主，Social为辅；
+       跨平台合并的 LLM 改写按目标事件并发执行。
+    5. 冲突检测: 若合并事件时间差异过大，生成 OpenQuestion。
     """
     if not events:
         return [], []
-        
+
     # 按时间排序 (None 视为最早)
     sorted_events = sorted(events, key=lambda x: x.time or datetime.min)
-    merged_events: List[EventNode] = []
+    texts = [event.title or event.description[:50] for event in sorted_events]
+
+    # 1. Blocking + bulk scoring (similarities use the pre-merge texts)
+    candidates = block_candidate_pairs(sorted_events, texts)
+    scored = [
+        (i, j, calculate_similarity(texts[i], texts[j]))
+        for i, j in candidates
+        if _within_window(sorted_events[i], sorted_events[j])
+    ]
+    scored = [(i, j, sim) for i, j, sim in scored if sim > POTENTIAL_CONFLICT_THRESHOLD]
+
+    # 2. Batched LLM adjudication of all borderline pairs at once
+    llm = None
+    borderline = [
+        (i, j) for i, j, sim in scored
+        if NEAR_DUPLICATE_THRESHOLD < sim <= AUTO_MERGE_THRESHOLD
+    ]
+    if borderline:
+        print(f"[Dedup] Checking LLM for {len(borderline)} borderline pairs")
+        llm = init_llm()
+    llm_verdicts = await _adjudicate_borderline(sorted_events, borderline, llm)
+
+    # 3. Greedy merge plan in time order: a merged event is absorbed and never compared again
     open_questions: List[OpenQuestion] = []
-    
-    skip_indices: Set[int] = set()
-    
-    for i in range(len(sorted_events)):
-        if i in skip_indices:
+    absorbed: Set[int] = set()
+    merge_plan: Dict[int, List[int]] = {}
+    for i, j, similarity in scored:
+        if i in absorbed or j in absorbed:
             continue
-            
-        current_event = sorted_events[i]
-        
-        # 向后寻找重复项
-        for j in range(i + 1, len(sorted_events)):
-            if j in skip_indices:
+        current_event, candidate = sorted_events[i], sorted_events[j]
+        text1, text2 = texts[i], texts[j]
+
+        # A. Check for Merge (High Sim)
+        if similarity > NEAR_DUPLICATE_THRESHOLD:
+            if similarity > AUTO_MERGE_THRESHOLD:
+                is_duplicate = True
+                print(f"[Dedup] Auto-merge (High Sim {similarity:.2f}): '{text1}' vs '{text2}'")
+            else:
+                is_duplicate = llm_verdicts.get((i, j), False)
+
+            if is_duplicate:
+                print(f"[Dedup] Merging: {candidate.title} -> {current_event.title}")
+                if current_event.time and candidate.time:
+                    delta = abs((current_event.time - candidate.time).days)
+                    if delta > 1:
+                        # Still notify date mismatch inside a merge (could be an error)
+                        q = OpenQuestion(
+                            question=f"[CONFLICT] 关于事件 '{current_event.title}' 的发生时间存在争议。",
+                            context=f"合并事件中发现时间不一致：{current_event.time} vs {candidate.time}",
+                            related_event_ids=[current_event.id, candidate.id],
+                            tags=["conflict", "structural", "date"],
+                            priority=0.8
+                        )
+                        open_questions.append(q)
+                merge_plan.setdefault(i, []).append(j)
+                absorbed.add(j)
                 continue
-                
-            candidate = sorted_events[j]
-            
-            # 0. Time Window Filter (2 days)
-            if current_event.time and candidate.time:
-                delta = abs((current_event.time - candidate.time).days)
-                if delta > 2:
-                    continue # Skip if too far apart
-            
-            # 1. Similarity Calculation
-            text1 = current_event.title or current_event.description[:50]
-            text2 = candidate.title or candidate.description[:50]
-            similarity = calculate_similarity(text1, text2)
-            
-            # Phase 18: Split Thresholds
-            # Thresholds
-            near_duplicate_threshold = 0.8  # High similarity -> potential merge
-            potential_conflict_threshold = 0.6 # Moderate similarity -> check logic conflict
-            
-            is_duplicate = False
-            
-            # A. Check for Merge (High Sim)
-            if similarity > near_duplicate_threshold:
-                # Use strict LLM check
-                if similarity > 0.90:
-                    is_duplicate = True
-                    print(f"[Dedup] Auto-merge (High Sim {similarity:.2f}): '{text1}' vs '{text2}'")
-                else:
-                    print(f"[Dedup] Checking LLM (Sim {similarity:.2f}): '{text1}' vs '{text2}'")
-                    is_duplicate = await are_events_duplicate_llm(current_event, candidate)
-                    
-                if is_duplicate:
-                    print(f"[Dedup] Merging: {candidate.title} -> {current_event.title}")
-                    
-                    # Merge Logic (Preserve logic)
-                    if current_event.time and candidate.time:
-                        delta = abs((current_event.time - candidate.time).days)
-                        if delta > 1:
-                            # Still notify date mismatch inside a merge (could be an error)
-                            q = OpenQuestion(
-                                question=f"[CONFLICT] 关于事件 '{current_event.title}' 的发生时间存在争议。",
-                                context=f"合并事件中发现时间不一致：{current_event.time} vs {candidate.time}",
-                                related_event_ids=[current_event.id, candidate.id],
-                                tags=["conflict", "structural", "date"],
-                                priority=0.8
-                            )
-                            open_questions.append(q)
-
-                    # Cross-platform rewrite
-                    p_current = get_source_priority(current_event.source)
-                    p_candidate = get_source_priority(candidate.source)
-                    
-                    if p_current != p_candidate and abs(p_current - p_candidate) > 0:
-                         await rewrite_and_merge_event(current_event, candidate)
-                    else:
-                         merge_event_content(current_event, candidate)
-                         
-                    skip_indices.add(j)
-                    continue # Merged, move to next candidate
-
-            # B. Check for Conflict (Moderate Sim but NOT merged)
-            if similarity > potential_conflict_threshold:
-                 # Only check conflicts if they talk about similar things
-                 if check_conflicts(current_event, candidate):
-                     print(f"[Dedup] Conflict detected (Logic): '{text1}' vs '{text2}'")
-                     conflict_q = OpenQuestion(
-                        question=f"[CONFLICT] 事件 '{current_event.title}' 与 '{candidate.title}' 存在事实冲突。",
-                        context=f"两者描述相似话题 (Sim {similarity:.2f}) 但关键细节冲突。事件A: {text1}；事件B: {text2}。",
-                        related_event_ids=[current_event.id, candidate.id],
-                        tags=["conflict", "structural", "logic"],
-                        priority=0.85
-                    )
-                     open_questions.append(conflict_q)
-        
-        merged_events.append(current_event)
-        
+
+        # B. Check for Conflict (Moderate Sim but NOT merged)
+        if check_conflicts(current_event, candidate):
+            print(f"[Dedup] Conflict detected (Logic): '{text1}' vs '{text2}'")
+            conflict_q = OpenQuestion(
+                question=f"[CONFLICT] 事件 '{current_event.title}' 与 '{candidate.title}' 存在事实冲突。",
+                context=f"两者描述相似话题 (Sim {similarity:.2f}) 但关键细节冲突。事件A: {text1}；事件B: {text2}。",
+                related_event_ids=[current_event.id, candidate.id],
+                tags=["conflict", "structural", "logic"],
+                priority=0.85
+            )
+            open_questions.append(conflict_q)
+
+    # 4. Apply merges: sequential per target, targets concurrently
+    sem = asyncio.Semaphore(settings.DEDUP_LLM_CONCURRENCY)
+    needs_rewrite = any(
+        get_source_priority(sorted_events[i].source) != get_source_priority(sorted_events[j].source)
+        for i, sources in merge_plan.items() for j in sources
+    )
+    if needs_rewrite and llm is None:
+        llm = init_llm()
+
+    async def _apply(target_idx: int, source_indices: List[int]):
+        target = sorted_events[target_idx]
+        for source_idx in source_indices:
+            source = sorted_events[source_idx]
+            # Cross-platform rewrite
+            if get_source_priority(target.source) != get_source_priority(source.source):
+                async with sem:
+                    await rewrite_and_merge_event(target, source, llm=llm)
+            else:
+                merge_event_content(target, source)
+
+    await asyncio.gather(*[_apply(i, sources) for i, sources in merge_plan.items()])
+
+    merged_events = [event for idx, event in enumerate(sorted_events) if idx not in absorbed]
     return merged_events, open_questions
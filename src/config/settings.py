@@ -32,6 +32,15 @@ class Settings:
     openai_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     model_name = os.getenv("MODEL_NAME", "gpt-4o")
     embedding_model_name = os.getenv("EMBEDDING_MODEL_NAME", "text-embedding-v2")
+    # Embedding backend: openai (remote, OpenAI-compatible) / local (offline hashed n-gram TF-IDF, IDF per batch)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+    LOCAL_EMBEDDING_FEATURES = int(os.getenv("LOCAL_EMBEDDING_FEATURES", "2048"))
+    LOCAL_EMBEDDING_REDUCED_DIM = int(os.getenv("LOCAL_EMBEDDING_REDUCED_DIM", "0"))  # 0 disables random projection
+    # Persistent embedding cache (memory-mapped, shared by clusterers; "" disables)
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/cache/embeddings")
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+    # Small/fast model for cascade routing (empty disables the cascade)
+    SMALL_MODEL_NAME = os.getenv("SMALL_MODEL_NAME", "")
     
     @property
     def openai_api_key(self):
@@ -151,6 +160,36 @@ class Settings:
     # Concurrency control
     EXTRACTION_BATCH_SIZE = 10        # Process evidences in batches of 3 (increased from 1 for better speed)
 
+    # --- LLM Resilience ---
+    LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))            # Attempts per call on 429/timeout/5xx
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30.0"))
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30.0"))
+    LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))  # 0 disables hedging
+    LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "")              # Empty disables fallback routing
+
+    # --- Token Budgets ---
+    # Search-result tokens packed into a single extraction prompt (highest score first)
+    EXTRACTION_CONTEXT_TOKEN_BUDGET = int(os.getenv("EXTRACTION_CONTEXT_TOKEN_BUDGET", "8000"))
+
+    # Map-reduce extraction: one call per query/source chunk (EXTRACTION_BATCH_SIZE in flight)
+    EXTRACTION_CHUNKED = os.getenv("EXTRACTION_CHUNKED", "True").lower() == "true"
+    EXTRACTION_CHUNK_TOKEN_BUDGET = int(os.getenv("EXTRACTION_CHUNK_TOKEN_BUDGET", "3000"))
+    EXTRACTION_MAX_CHUNKS = int(os.getenv("EXTRACTION_MAX_CHUNKS", "12"))
+
+    # --- Debate ---
+    DEBATE_MAX_BATCH = int(os.getenv("DEBATE_MAX_BATCH", "4"))  # Conflicts auto-triggered per supervisor turn
+    # Persistent verdict memo (append-only JSON Lines) keyed by conflict key, shared across runs ("" disables)
+    DEBATE_VERDICT_CACHE = os.getenv("DEBATE_VERDICT_CACHE", "data/cache/debate_verdicts.jsonl")
+
+    # --- Timeline Dedup ---
+    DEDUP_LLM_BATCH_SIZE = int(os.getenv("DEDUP_LLM_BATCH_SIZE", "8"))     # Borderline event pairs per adjudication prompt
+    DEDUP_LLM_CONCURRENCY = int(os.getenv("DEDUP_LLM_CONCURRENCY", "4"))   # Adjudication / rewrite calls in flight
+
+    # --- Swarm Report ---
+    SWARM_SECTION_CONCURRENCY = int(os.getenv("SWARM_SECTION_CONCURRENCY", "4"))  # Sections drafted at once (parallel graph)
+
     
     @classmethod
     def get_evidence_depth_config(cls, mode: str = None) -> EvidenceDepthConfig:
@@ -0,0 +1,361 @@
+"""
+Cross-run artifact catalog.
+
+Run outputs stay where the archive nodes write them (data/runs/<run_id>/ and
+artifacts/phase1/<run_id>/); the catalog ingests the small, queryable parts into one
+indexed SQLite database (default data/catalog.sqlite3, DEEPTRACE_CATALOG_DB overrides,
+"" disables ingestion on archive):
+
+- run_record / facts_index / gate_report       -> runs, facts, citations, gate_violations
+- metrics_summary / doc_versions_summary       -> runs (locatable rates), documents
+
+(artifacts are read through src.core.artifact_io, streamed or legacy JSON)
+
+Ingestion is incremental: each source file's (mtime, size) is recorded and a run is
+re-read only when one of its files changed.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.core.artifact_io import artifact_files, load_artifact
+from src.core.utils.url_canonicalization import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+RUN_ARTIFACTS = ("run_record", "facts_index", "gate_report")
+PHASE1_ARTIFACTS = ("metrics_summary", "doc_versions_summary")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    objective TEXT,
+    original_query TEXT,
+    archived_at TEXT,
+    renderer_version TEXT,
+    run_dir TEXT,
+    facts_count INTEGER,
+    gate_hard INTEGER,
+    gate_soft INTEGER,
+    gate_warn INTEGER,
+    phase1_dir TEXT,
+    key_claim_locatable_rate REAL,
+    locatable_rate_overall REAL,
+    docs_total INTEGER,
+    docs_changed INTEGER,
+    docs_unchanged INTEGER,
+    docs_first_seen INTEGER,
+    ingested_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_archived_at ON runs (archived_at);
+CREATE INDEX IF NOT EXISTS idx_runs_objective ON runs (objective);
+CREATE TABLE IF NOT EXISTS facts (
+    run_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    title TEXT,
+    date TEXT,
+    topic TEXT,
+    PRIMARY KEY (run_id, event_id)
+);
+CREATE TABLE IF NOT EXISTS citations (
+    run_id TEXT NOT NULL,
+    event_id TEXT,
+    url TEXT,
+    url_key TEXT,
+    credibility_tier TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_citations_url_key ON citations (url_key);
+CREATE INDEX IF NOT EXISTS idx_citations_run ON citations (run_id);
+CREATE TABLE IF NOT EXISTS gate_violations (
+    run_id TEXT NOT NULL,
+    rule_id TEXT,
+    severity TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_gate_violations_run ON gate_violations (run_id);
+CREATE INDEX IF NOT EXISTS idx_gate_violations_rule ON gate_violations (rule_id);
+CREATE TABLE IF NOT EXISTS documents (
+    run_id TEXT NOT NULL,
+    doc_id TEXT,
+    doc_key TEXT,
+    doc_version_id TEXT,
+    drift_status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_doc_key ON documents (doc_key);
+CREATE INDEX IF NOT EXISTS idx_documents_run ON documents (run_id);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+"""
+
+def _read_artifact(directory: Path, name: str) -> Any:
+    try:
+        return load_artifact(directory, name)
+    except Exception:
+        return None
+
+
+def _source_files(directory: Path, names: Iterable[str]) -> List[Path]:
+    return list(dict.fromkeys(p for name in names for p in artifact_files(directory, name)))
+
+
+class ArtifactCatalog:
+    """Indexed catalog of archived runs."""
+
+    def __init__(self, path: Union[str, Path] = Path("data") / "catalog.sqlite3"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --- ingestion ---
+
+    def _changed_files(self, cur, files: Iterable[Path]) -> Optional[List[tuple]]:
+        """New (path, mtime_ns, size) signatures, or None when every existing file is unchanged."""
+        signatures = []
+        changed = False
+        for path in files:
+            if not path.exists():
+                continue
+            stat = path.stat()
+            sig = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+            row = cur.execute("SELECT mtime_ns, size FROM ingested_files WHERE path = ?", (sig[0],)).fetchone()
+            if row is None or (row["mtime_ns"], row["size"]) != sig[1:]:
+                changed = True
+            signatures.append(sig)
+        return signatures if changed else None
+
+    def _upsert_run(self, cur, run_id: str, values: Dict[str, Any]) -> None:
+        columns = list(values) + ["ingested_at"]
+        params = list(values.values()) + [datetime.utcnow().isoformat()]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns)
+        cur.execute(
+            f"INSERT INTO runs (run_id, {', '.join(columns)}) VALUES (?, {', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(run_id) DO UPDATE SET {updates}",
+            [run_id] + params,
+        )
+
+    def _transaction(self, ingest) -> bool:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                result = ingest(cur)
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return result
+
+    def ingest_run_dir(self, run_dir: Union[str, Path], force: bool = False) -> bool:
+        """Ingest data/runs/<run_id>/; returns False when nothing changed since the last ingest."""
+        run_dir = Path(run_dir)
+
+        def ingest(cur) -> bool:
+            signatures = self._changed_files(cur, _source_files(run_dir, RUN_ARTIFACTS))
+            if signatures is None and not force:
+                return False
+            record = _read_artifact(run_dir, "run_record") or {}
+            facts_index = _read_artifact(run_dir, "facts_index") or {}
+            gate_report = _read_artifact(run_dir, "gate_report") or {}
+            run_id = record.get("run_id") or facts_index.get("run_id") or run_dir.name
+            facts = facts_index.get("facts") or []
+            gate_summary = gate_report.get("summary") or {}
+
+            for table in ("facts", "citations", "gate_violations"):
+                cur.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            self._upsert_run(
+                cur,
+                run_id,
+                {
+                    "objective": record.get("objective"),
+                    "original_query": record.get("original_query"),
+                    "archived_at": record.get("archived_at") or facts_index.get("generated_at"),
+                    "renderer_version": record.get("renderer_version"),
+                    "run_dir": str(run_dir),
+                    "facts_count": len(facts),
+                    "gate_hard": gate_summary.get("hard"),
+                    "gate_soft": gate_summary.get("soft"),
+                    "gate_warn": gate_summary.get("warn"),
+                },
+            )
+            cur.executemany(
+                "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, f.get("event_id"), f.get("title"), f.get("date"), f.get("topic"))
+                    for f in facts
+                    if f.get("event_id")
+                ],
+            )
+            cur.executemany(
+                "INSERT INTO citations VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, f.get("event_id"), e.get("url"), canonicalize_url(e.get("url") or ""), e.get("credibility_tier"))
+                    for f in facts
+                    for e in f.get("evidences") or []
+                    if e.get("url")
+                ],
+            )
+            cur.executemany(
+                "INSERT INTO gate_violations VALUES (?, ?, ?)",
+                [(run_id, v.get("rule_id"), v.get("severity")) for v in gate_report.get("violations") or []],
+            )
+            cur.executemany("INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?)", signatures or [])
+            return True
+
+        return self._transaction(ingest)
+
+    def ingest_phase1_dir(self, phase1_dir: Union[str, Path], force: bool = False) -> bool:
+        """Ingest the run-level aggregates under artifacts/phase1/<run_id>/."""
+        phase1_dir = Path(phase1_dir)
+
+        def ingest(cur) -> bool:
+            signatures = self._changed_files(cur, _source_files(phase1_dir, PHASE1_ARTIFACTS))
+            if signatures is None and not force:
+                return False
+            metrics = _read_artifact(phase1_dir, "metrics_summary") or {}
+            versions = _read_artifact(phase1_dir, "doc_versions_summary") or {}
+            run_id = versions.get("run_id") or phase1_dir.name
+            summary = versions.get("summary") or {}
+
+            cur.execute("DELETE FROM documents WHERE run_id = ?", (run_id,))
+            self._upsert_run(
+                cur,
+                run_id,
+                {
+                    "phase1_dir": str(phase1_dir),
+                    "key_claim_locatable_rate": metrics.get("key_claim_locatable_rate"),
+                    "locatable_rate_overall": metrics.get("locatable_rate_overall"),
+                    "docs_total": summary.get("docs_total"),
+                    "docs_changed": summary.get("docs_changed"),
+                    "docs_unchanged": summary.get("docs_unchanged"),
+                    "docs_first_seen": summary.get("docs_first_seen"),
+                },
+            )
+            cur.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, d.get("doc_id"), d.get("doc_key"), d.get("doc_version_id"), d.get("drift_status"))
+                    for d in versions.get("documents") or []
+                ],
+            )
+            cur.executemany("INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?)", signatures or [])
+            return True
+
+        return self._transaction(ingest)
+
+    def ingest_all(
+        self,
+        runs_root: Union[str, Path] = Path("data") / "runs",
+        phase1_root: Union[str, Path] = Path("artifacts") / "phase1",
+    ) -> Dict[str, int]:
+        """Scan both archive roots; only runs whose files changed are re-read."""
+        counts = {"runs": 0, "phase1": 0}
+        runs_root, phase1_root = Path(runs_root), Path(phase1_root)
+        if runs_root.is_dir():
+            for run_dir in sorted(p for p in runs_root.iterdir() if (p / "run_record.json").exists()):
+                counts["runs"] += self.ingest_run_dir(run_dir)
+        if phase1_root.is_dir():
+            # Per-document archives (<run_id>_<doc_id>) have no doc_versions_summary.json
+            for run_dir in sorted(p for p in phase1_root.iterdir() if (p / "doc_versions_summary.json").exists()):
+                counts["phase1"] += self.ingest_phase1_dir(run_dir)
+        return counts
+
+    # --- queries ---
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, tuple(params)).fetchall()]
+
+    def get_run(self, run_id: str) -> Optional[dict]:
+        rows = self._query("SELECT * FROM runs WHERE run_id = ?", (run_id,))
+        return rows[0] if rows else None
+
+    def runs_citing_url(self, url: str) -> List[dict]:
+        """Runs (newest first) whose facts_index cites url (canonicalized), with the citing event ids."""
+        return self._query(
+            "SELECT r.run_id, r.objective, r.archived_at, GROUP_CONCAT(DISTINCT c.event_id) AS event_ids "
+            "FROM citations c JOIN runs r ON r.run_id = c.run_id WHERE c.url_key = ? "
+            "GROUP BY r.run_id ORDER BY r.archived_at DESC",
+            (canonicalize_url(url),),
+        )
+
+    def runs_with_document(self, doc_key: str) -> List[dict]:
+        return self._query(
+            "SELECT d.run_id, d.doc_version_id, d.drift_status FROM documents d WHERE d.doc_key = ? ORDER BY d.run_id",
+            (doc_key,),
+        )
+
+    def locatable_rate_trend(self, objective: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        """Phase1 locatable rates per run in archive order (oldest first)."""
+        where = "WHERE locatable_rate_overall IS NOT NULL"
+        params: List[Any] = []
+        if objective is not None:
+            where += " AND objective = ?"
+            params.append(objective)
+        params.append(-1 if limit is None else limit)
+        rows = self._query(
+            "SELECT run_id, objective, archived_at, key_claim_locatable_rate, locatable_rate_overall FROM runs "
+            f"{where} ORDER BY COALESCE(archived_at, ingested_at) DESC LIMIT ?",
+            params,
+        )
+        return rows[::-1]
+
+    def events_per_objective(self) -> List[dict]:
+        return self._query(
+            "SELECT objective, COUNT(*) AS runs, SUM(facts_count) AS events, AVG(facts_count) AS avg_events_per_run "
+            "FROM runs WHERE run_dir IS NOT NULL GROUP BY objective ORDER BY events DESC"
+        )
+
+    def latest_run(self, with_phase1: bool = False) -> Optional[dict]:
+        where = "WHERE phase1_dir IS NOT NULL" if with_phase1 else ""
+        rows = self._query(f"SELECT * FROM runs {where} ORDER BY COALESCE(archived_at, ingested_at) DESC LIMIT 1")
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_catalogs: Dict[str, ArtifactCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_artifact_catalog() -> Optional[ArtifactCatalog]:
+    """Shared catalog for DEEPTRACE_CATALOG_DB (default data/catalog.sqlite3; "" disables)."""
+    path = os.getenv("DEEPTRACE_CATALOG_DB", str(Path("data") / "catalog.sqlite3"))
+    if not path:
+        return None
+    key = str(Path(path).resolve())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None or not Path(path).exists():
+            if catalog is not None:
+                catalog.close()
+            catalog = ArtifactCatalog(path)
+            _catalogs[key] = catalog
+    return catalog
+
+
+def catalog_ingest(run_dir: Optional[Union[str, Path]] = None, phase1_dir: Optional[Union[str, Path]] = None) -> None:
+    """Incremental ingestion hook for the archive nodes; catalog errors never fail a run."""
+    try:
+        catalog = get_artifact_catalog()
+        if catalog is None:
+            return
+        if run_dir is not None:
+            catalog.ingest_run_dir(run_dir)
+        if phase1_dir is not None:
+            catalog.ingest_phase1_dir(phase1_dir)
+    except Exception as e:
+        logger.warning(f"Artifact catalog ingest failed: {e}")
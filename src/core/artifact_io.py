@@ -0,0 +1,284 @@
+"""
+Streaming artifact format for run archives.
+
+Large collections (facts, gate entries, sentence/chunk meta, citations) are streamed
+one record per line into gzip-compressed JSON Lines (<name>.jsonl.gz) instead of one
+pretty-printed JSON document; the remaining top-level fields of the document are kept
+as the artifact "header" in the directory's manifest.json together with the record
+count, the sha256 of the uncompressed lines and the schema (schemas/<schema>.schema.json)
+name, version and validation result.
+
+load_artifact() reassembles the original document (and reads legacy <name>.json files);
+iter_artifact_records() iterates a collection lazily without loading it. When both
+<name>.jsonl.gz and <name>.json exist, the more recently written one is read.
+
+DEEPTRACE_ARTIFACT_FORMAT=json restores the previous pretty-printed JSON files.
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# collection value meaning "the payload itself is the list of records"
+ROOT_COLLECTION = "."
+MAX_REPORTED_ERRORS = 5
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SCHEMAS_DIR = PROJECT_ROOT / "schemas"
+
+
+def artifact_format() -> str:
+    return (os.getenv("DEEPTRACE_ARTIFACT_FORMAT") or "jsonl.gz").lower()
+
+
+# --- schemas ---
+
+
+@lru_cache(maxsize=None)
+def _schema_validators(schema: str, collection: Optional[str]):
+    """(schema_version, header validator, record validator); validators are None without jsonschema."""
+    path = SCHEMAS_DIR / f"{schema}.schema.json"
+    raw = path.read_bytes()
+    version = hashlib.sha256(raw).hexdigest()[:12]
+    try:
+        import jsonschema
+    except ImportError:
+        return version, None, None
+    document = json.loads(raw)
+    if collection is None:
+        return version, jsonschema.Draft7Validator(document), None
+    if collection == ROOT_COLLECTION:
+        return version, None, jsonschema.Draft7Validator(document.get("items") or {})
+    header = copy.deepcopy(document)
+    record_schema = (header.get("properties") or {}).pop(collection, {}).get("items") or {}
+    header["required"] = [r for r in header.get("required") or [] if r != collection]
+    return version, jsonschema.Draft7Validator(header), jsonschema.Draft7Validator(record_schema)
+
+
+class _SchemaCheck:
+    def __init__(self, schema: Optional[str], collection: Optional[str]):
+        self.schema = schema
+        self.version = None
+        self.header_validator = self.record_validator = None
+        if schema and (SCHEMAS_DIR / f"{schema}.schema.json").exists():
+            self.version, self.header_validator, self.record_validator = _schema_validators(schema, collection)
+        self.errors = 0
+        self.messages: List[str] = []
+
+    def _check(self, validator, value, where: str) -> None:
+        if validator is None:
+            return
+        for error in validator.iter_errors(value):
+            self.errors += 1
+            if len(self.messages) < MAX_REPORTED_ERRORS:
+                self.messages.append(f"{where}: {error.message}")
+
+    def header(self, value) -> None:
+        self._check(self.header_validator, value, "header")
+
+    def record(self, index: int, value) -> None:
+        self._check(self.record_validator, value, f"record {index}")
+
+    def summary(self) -> Optional[dict]:
+        if not self.schema:
+            return None
+        return {
+            "name": self.schema,
+            "version": self.version,
+            "validated": self.header_validator is not None or self.record_validator is not None,
+            "errors": self.errors,
+            "messages": self.messages,
+        }
+
+
+# --- writing ---
+
+
+def read_manifest(directory: Union[str, Path]) -> dict:
+    path = Path(directory) / MANIFEST_NAME
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+    return {"format_version": ARTIFACT_FORMAT_VERSION, "artifacts": {}}
+
+
+class ArtifactWriter:
+    """Writes artifacts into one directory and keeps its manifest.json up to date."""
+
+    def __init__(self, directory: Union[str, Path], fmt: Optional[str] = None):
+        self.directory = Path(directory)
+        self.format = fmt or artifact_format()
+
+    def _update_manifest(self, name: str, entry: dict) -> None:
+        manifest = read_manifest(self.directory)
+        manifest["format_version"] = ARTIFACT_FORMAT_VERSION
+        manifest.setdefault("artifacts", {})[name] = entry
+        _atomic_write(self.directory / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def write(
+        self,
+        name: str,
+        payload: Any,
+        collection: Optional[str] = None,
+        schema: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Write payload as <name>.jsonl.gz (records of `collection`, or the payload itself for
+        ROOT_COLLECTION) or <name>.json (no collection / legacy format). Returns the file path.
+        """
+        if payload is None:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        check = _SchemaCheck(schema, collection if self.format != "json" else None)
+        if collection is None or self.format == "json":
+            check.header(payload)
+            data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+            path = self.directory / f"{name}.json"
+            _atomic_write(path, data)
+            entry = {"file": path.name, "format": "json", "sha256": hashlib.sha256(data).hexdigest()}
+        else:
+            if collection == ROOT_COLLECTION:
+                header, records = None, payload
+            else:
+                header = {k: v for k, v in payload.items() if k != collection}
+                records = payload.get(collection) or []
+                check.header(header)
+            path = self.directory / f"{name}.jsonl.gz"
+            count, digest = _write_jsonl_gz(path, records, check)
+            entry = {
+                "file": path.name,
+                "format": "jsonl.gz",
+                "collection": collection,
+                "header": header,
+                "records": count,
+                "sha256": digest,
+            }
+        schema_summary = check.summary()
+        if schema_summary:
+            entry["schema"] = schema_summary
+        self._update_manifest(name, entry)
+        return str(path)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _write_jsonl_gz(path: Path, records: Iterable[Any], check: _SchemaCheck):
+    hasher = hashlib.sha256()
+    count = 0
+    tmp_path = path.with_name(path.name + ".tmp")
+    # mtime=0 keeps the compressed bytes deterministic for identical content
+    with gzip.GzipFile(tmp_path, mode="wb", compresslevel=6, mtime=0) as gz:
+        for record in records:
+            check.record(count, record)
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            hasher.update(line)
+            gz.write(line)
+            count += 1
+    os.replace(tmp_path, path)
+    return count, hasher.hexdigest()
+
+
+# --- reading ---
+
+
+def _iter_jsonl_gz(path: Path) -> Iterator[Any]:
+    with gzip.open(path, "rb") as gz:
+        for line in gz:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _artifact_file(directory: Path, name: str) -> Optional[Path]:
+    """File backing artifact `name`: the newer of <name>.jsonl.gz / <name>.json (streamed on a tie)."""
+    candidates = [p for p in (directory / f"{name}.jsonl.gz", directory / f"{name}.json") if p.exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: (p.stat().st_mtime_ns, p.suffix == ".gz"))
+
+
+def artifact_files(directory: Union[str, Path], name: str) -> List[Path]:
+    """Existing files backing artifact `name` (manifest included for streamed artifacts)."""
+    directory = Path(directory)
+    path = _artifact_file(directory, name)
+    if path is None:
+        return []
+    files = [path]
+    if path.suffix == ".gz" and (directory / MANIFEST_NAME).exists():
+        files.append(directory / MANIFEST_NAME)
+    return files
+
+
+def iter_artifact_records(directory: Union[str, Path], name: str) -> Iterator[Any]:
+    """Records of a collection artifact, read lazily (legacy .json falls back to a full load)."""
+    directory = Path(directory)
+    path = _artifact_file(directory, name)
+    if path is None:
+        return
+    if path.suffix == ".gz":
+        yield from _iter_jsonl_gz(path)
+        return
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(payload, list):
+        yield from payload
+        return
+    entry = read_manifest(directory).get("artifacts", {}).get(name) or {}
+    collection = entry.get("collection")
+    if collection is None:
+        lists = [k for k, v in payload.items() if isinstance(v, list)]
+        collection = lists[0] if len(lists) == 1 else None
+    yield from (payload.get(collection) or []) if collection else []
+
+
+def load_artifact(directory: Union[str, Path], name: str, default: Any = None) -> Any:
+    """Full document for artifact `name` (streamed or legacy JSON); default if missing."""
+    directory = Path(directory)
+    path = _artifact_file(directory, name)
+    if path is None:
+        return default
+    if path.suffix != ".gz":
+        return json.loads(path.read_text(encoding="utf-8"))
+    entry = read_manifest(directory).get("artifacts", {}).get(name) or {}
+    records = list(_iter_jsonl_gz(path))
+    collection = entry.get("collection", ROOT_COLLECTION)
+    if collection == ROOT_COLLECTION:
+        return records
+    return {**(entry.get("header") or {}), collection: records}
+
+
+def load_artifact_file(path: Union[str, Path]) -> Any:
+    """load_artifact for a concrete file path (<dir>/<name>.json or <dir>/<name>.jsonl.gz)."""
+    path = Path(path)
+    name = path.name[: -len(".jsonl.gz")] if path.name.endswith(".jsonl.gz") else path.stem
+    return load_artifact(path.parent, name)
+
+
+def verify_artifact(directory: Union[str, Path], name: str) -> bool:
+    """Recompute the sha256 recorded in the manifest."""
+    directory = Path(directory)
+    entry = read_manifest(directory).get("artifacts", {}).get(name)
+    if not entry:
+        return False
+    path = directory / entry["file"]
+    if not path.exists():
+        return False
+    hasher = hashlib.sha256()
+    if entry.get("format") == "jsonl.gz":
+        with gzip.open(path, "rb") as gz:
+            for block in iter(lambda: gz.read(1 << 20), b""):
+                hasher.update(block)
+    else:
+        hasher.update(path.read_bytes())
+    return hasher.hexdigest() == entry.get("sha256")
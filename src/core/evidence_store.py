@@ -1,106 +1,407 @@
 """
-Evidence Store: 负责管理证据和评论的存储与检索（内存版）。
+Evidence Store: 负责管理证据和评论的存储与检索（SQLite 版）。
+
+证据与评论以 JSON 形式存放在 SQLite 中，另建二级索引列：
+规范化 URL（canonicalize_url）、域名、source、publish_time 与 content_hash，
+支持按这些字段查询、基于游标（keyset）的流式分页以及批量写入。
+
+默认路径 ":memory:"（进程内，行为与原内存版一致）；传入文件路径即为持久化存储，
+get_evidence_store() 返回 DEEPTRACE_EVIDENCE_DB（默认 data/evidence.sqlite3）的共享实例。
 """
-from typing import Dict, List, Optional
-from collections import defaultdict
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
 from .models.evidence import Evidence
 from .models.comments import Comment
+from .utils.url_canonicalization import canonicalize_url
+
+MEMORY_PATH = ":memory:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evidence (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    url_key TEXT,
+    domain TEXT,
+    source TEXT,
+    publish_time TEXT,
+    content_hash TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_url_key ON evidence (url_key);
+CREATE INDEX IF NOT EXISTS idx_evidence_domain ON evidence (domain);
+CREATE INDEX IF NOT EXISTS idx_evidence_source ON evidence (source);
+CREATE INDEX IF NOT EXISTS idx_evidence_publish_time ON evidence (publish_time);
+CREATE INDEX IF NOT EXISTS idx_evidence_content_hash ON evidence (content_hash);
+CREATE TABLE IF NOT EXISTS comments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    evidence_id TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_comments_evidence ON comments (evidence_id, seq);
+"""
+
+_UPSERT_EVIDENCE = (
+    "INSERT INTO evidence (id, url_key, domain, source, publish_time, content_hash, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET url_key = excluded.url_key, domain = excluded.domain, "
+    "source = excluded.source, publish_time = excluded.publish_time, "
+    "content_hash = excluded.content_hash, payload = excluded.payload"
+)
+_UPSERT_COMMENT = (
+    "INSERT INTO comments (id, evidence_id, payload) VALUES (?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET evidence_id = excluded.evidence_id, payload = excluded.payload"
+)
+
+
+def url_domain(url: Optional[str]) -> Optional[str]:
+    """URL 的主机名（小写，去掉 www. 前缀与端口），无法解析时返回 None。"""
+    if not url:
+        return None
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def evidence_content_hash(evidence: Evidence) -> str:
+    """证据正文的 sha256（优先 full_content，与 to_text 的取值一致）。"""
+    text = evidence.full_content if evidence.full_content else evidence.content
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _time_key(value: Optional[datetime]) -> Optional[str]:
+    """可排序的时间键：带时区的时间统一换算为 UTC 再去掉时区。"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _source_key(source: Any) -> Optional[str]:
+    if source is None:
+        return None
+    return getattr(source, "value", source)
 
 
 class EvidenceStore:
     """
-    基于内存的证据存储。
-    
+    基于 SQLite 的证据存储。
+
     Attributes:
-        _evidence (Dict[str, Evidence]): 存储证据，Key为证据ID
-        _comments (Dict[str, Comment]): 存储评论，Key为评论ID
-        _comments_by_evidence (Dict[str, List[str]]): 索引，EvidenceID -> CommentID列表
+        path (str): 数据库路径，":memory:" 表示进程内存储
     """
-    
-    def __init__(self):
-        self._evidence: Dict[str, Evidence] = {}
-        self._comments: Dict[str, Comment] = {}
-        self._comments_by_evidence: Dict[str, List[str]] = defaultdict(list)
-    
+
+    def __init__(self, path: Union[str, Path] = MEMORY_PATH):
+        self.path = str(path)
+        if self.path != MEMORY_PATH:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        if self.path != MEMORY_PATH:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --- 写入 ---
+
+    def _write_many(self, sql: str, rows: Iterable[tuple]) -> None:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.executemany(sql, rows)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _evidence_row(evidence: Evidence) -> tuple:
+        return (
+            evidence.id,
+            canonicalize_url(evidence.url) if evidence.url else None,
+            url_domain(evidence.url),
+            _source_key(evidence.source),
+            _time_key(evidence.publish_time),
+            evidence_content_hash(evidence),
+            evidence.model_dump_json(),
+        )
+
     def add_evidence(self, evidence: Evidence) -> None:
         """
-        添加一条证据。
-        
+        添加一条证据（ID 已存在时覆盖内容，保留原有顺序）。
+
         Args:
             evidence: Evidence 对象
         """
-        self._evidence[evidence.id] = evidence
-    
+        self.add_evidences([evidence])
+
+    def add_evidences(self, evidences: Iterable[Evidence]) -> int:
+        """
+        批量添加证据（单个事务）。
+
+        Args:
+            evidences: Evidence 对象序列
+
+        Returns:
+            写入的条数
+        """
+        rows = [self._evidence_row(ev) for ev in evidences]
+        if rows:
+            self._write_many(_UPSERT_EVIDENCE, rows)
+        return len(rows)
+
+    # --- 读取 ---
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
     def get_evidence(self, evidence_id: str) -> Optional[Evidence]:
         """
         根据 ID 获取证据。
-        
+
         Args:
             evidence_id: 证据 ID
-            
+
         Returns:
             Evidence 对象，如果不存在则返回 None
         """
-        return self._evidence.get(evidence_id)
-    
+        rows = self._query("SELECT payload FROM evidence WHERE id = ?", (evidence_id,))
+        return Evidence.model_validate_json(rows[0][0]) if rows else None
+
     def list_evidence(self, skip: int = 0, limit: int = 100) -> List[Evidence]:
         """
-        列出所有证据（支持分页）。
-        
+        列出所有证据（按插入顺序，支持分页）。
+
         Args:
             skip: 跳过前 N 条
             limit: 返回最多 N 条
-            
+
         Returns:
             Evidence 列表
         """
-        all_evidence = list(self._evidence.values())
-        # 按创建时间倒序排列（后进先出），或者按需求调整
-        # 这里简单按插入顺序（Python 3.7+ dict有序）
-        return all_evidence[skip : skip + limit]
-    
+        rows = self._query("SELECT payload FROM evidence ORDER BY seq LIMIT ? OFFSET ?", (limit, skip))
+        return [Evidence.model_validate_json(row[0]) for row in rows]
+
+    @staticmethod
+    def _filters(
+        url: Optional[str] = None,
+        domain: Optional[str] = None,
+        source: Any = None,
+        content_hash: Optional[str] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if url is not None:
+            clauses.append("url_key = ?")
+            params.append(canonicalize_url(url))
+        if domain is not None:
+            clauses.append("domain = ?")
+            params.append(url_domain(f"//{domain}") or domain.lower())
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(_source_key(source))
+        if content_hash is not None:
+            clauses.append("content_hash = ?")
+            params.append(content_hash)
+        if published_after is not None:
+            clauses.append("publish_time >= ?")
+            params.append(_time_key(published_after))
+        if published_before is not None:
+            clauses.append("publish_time < ?")
+            params.append(_time_key(published_before))
+        return clauses, params
+
+    def list_evidence_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        **filters: Any,
+    ) -> Tuple[List[Evidence], Optional[str]]:
+        """
+        基于游标的分页（按插入顺序），翻页代价与页码无关。
+
+        Args:
+            cursor: 上一页返回的游标，None 表示从头开始
+            limit: 每页最多 N 条
+            **filters: 过滤条件，同 find_evidence
+
+        Returns:
+            (Evidence 列表, 下一页游标；没有更多数据时为 None)
+        """
+        clauses, params = self._filters(**filters)
+        if cursor:
+            clauses.append("seq > ?")
+            params.append(int(cursor))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self._query(f"SELECT seq, payload FROM evidence {where}ORDER BY seq LIMIT ?", params + [limit + 1])
+        items = [Evidence.model_validate_json(payload) for _, payload in rows[:limit]]
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return items, next_cursor
+
+    def iter_evidence(self, page_size: int = 500, **filters: Any) -> Iterator[Evidence]:
+        """
+        流式遍历证据，每次只加载一页。
+
+        Args:
+            page_size: 每页条数
+            **filters: 过滤条件，同 find_evidence
+
+        Returns:
+            Evidence 迭代器
+        """
+        cursor = None
+        while True:
+            items, cursor = self.list_evidence_page(cursor=cursor, limit=page_size, **filters)
+            yield from items
+            if cursor is None:
+                return
+
+    def find_evidence(
+        self,
+        url: Optional[str] = None,
+        domain: Optional[str] = None,
+        source: Any = None,
+        content_hash: Optional[str] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Evidence]:
+        """
+        按二级索引查询证据（条件之间为 AND）。
+
+        Args:
+            url: 链接（按规范化 URL 匹配）
+            domain: 域名（忽略 www. 前缀）
+            source: EvidenceSource 或其取值
+            content_hash: 正文 sha256（见 evidence_content_hash）
+            published_after: 发布时间下界（含）
+            published_before: 发布时间上界（不含）
+            limit: 返回最多 N 条，None 表示不限
+
+        Returns:
+            Evidence 列表（有时间条件时按发布时间排序，否则按插入顺序）
+        """
+        clauses, params = self._filters(
+            url=url,
+            domain=domain,
+            source=source,
+            content_hash=content_hash,
+            published_after=published_after,
+            published_before=published_before,
+        )
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        order = "publish_time, seq" if published_after is not None or published_before is not None else "seq"
+        sql = f"SELECT payload FROM evidence {where}ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Evidence.model_validate_json(row[0]) for row in self._query(sql, params)]
+
+    def count_evidence(self, **filters: Any) -> int:
+        """
+        统计证据条数。
+
+        Args:
+            **filters: 过滤条件，同 find_evidence
+
+        Returns:
+            条数
+        """
+        clauses, params = self._filters(**filters)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT COUNT(*) FROM evidence{where}", params)[0][0]
+
+    # --- 评论 ---
+
     def add_comment(self, comment: Comment) -> None:
         """
         添加一条评论。
-        
+
         Args:
             comment: Comment 对象
         """
-        self._comments[comment.id] = comment
-        self._comments_by_evidence[comment.evidence_id].append(comment.id)
-    
+        self.add_comments([comment])
+
+    def add_comments(self, comments: Iterable[Comment]) -> int:
+        """
+        批量添加评论（单个事务）。
+
+        Args:
+            comments: Comment 对象序列
+
+        Returns:
+            写入的条数
+        """
+        rows = [(c.id, c.source_evidence_id, c.model_dump_json()) for c in comments]
+        if rows:
+            self._write_many(_UPSERT_COMMENT, rows)
+        return len(rows)
+
     def get_comment(self, comment_id: str) -> Optional[Comment]:
         """
         根据 ID 获取评论。
-        
+
         Args:
             comment_id: 评论 ID
-            
+
         Returns:
             Comment 对象，如果不存在则返回 None
         """
-        return self._comments.get(comment_id)
-    
+        rows = self._query("SELECT payload FROM comments WHERE id = ?", (comment_id,))
+        return Comment.model_validate_json(rows[0][0]) if rows else None
+
     def get_comments_by_evidence(self, evidence_id: str) -> List[Comment]:
         """
         获取指定证据下的所有评论。
-        
+
         Args:
             evidence_id: 证据 ID
-            
+
         Returns:
             Comment 列表
         """
-        comment_ids = self._comments_by_evidence.get(evidence_id, [])
-        comments = []
-        for cid in comment_ids:
-            comment = self._comments.get(cid)
-            if comment:
-                comments.append(comment)
-        return comments
-    
+        rows = self._query("SELECT payload FROM comments WHERE evidence_id = ? ORDER BY seq", (evidence_id,))
+        return [Comment.model_validate_json(row[0]) for row in rows]
+
     def clear(self) -> None:
         """清空存储（主要用于测试）"""
-        self._evidence.clear()
-        self._comments.clear()
-        self._comments_by_evidence.clear()
+        self._write_many("DELETE FROM evidence", [()])
+        self._write_many("DELETE FROM comments", [()])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, EvidenceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_evidence_store() -> Optional[EvidenceStore]:
+    """DEEPTRACE_EVIDENCE_DB 对应的共享存储（默认 data/evidence.sqlite3；"" 表示禁用）。"""
+    path = os.getenv("DEEPTRACE_EVIDENCE_DB", str(Path("data") / "evidence.sqlite3"))
+    if not path:
+        return None
+    key = path if path == MEMORY_PATH else str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = EvidenceStore(path)
+            _stores[key] = store
+    return store
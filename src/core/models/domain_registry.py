@@ -7,7 +7,11 @@ Domain Registry: 统一管理所有可信域名白名单和评分规则。
 - 主流域名 (MAINSTREAM_DOMAINS)
 
 所有其他模块应从此处导入，避免重复定义。
+域名匹配统一通过 domain_resolver（反转标签后缀树 + 主机名 LRU 缓存）完成。
 """
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
 
 # 官方域名：公司/组织的官方网站（最高可信度）
 OFFICIAL_DOMAINS = {
@@ -26,6 +30,7 @@ OFFICIAL_DOMAINS = {
     "ai.meta.com": 95.0,
     "apple.com": 95.0,
     "developer.apple.com": 95.0,
+    "gemini.google.com": 98.0,
     # 政府/官方机构
     "gov.cn": 95.0,
     "xinhuanet.com": 90.0,
@@ -48,6 +53,13 @@ AUTHORITATIVE_DOMAINS = {
     "techcrunch.com": 75.0,
     "wired.com": 75.0,
     "arstechnica.com": 78.0,
+    "cnbc.com": 80.0,
+    "caixin.com": 80.0,
+    "jiemian.com": 75.0,
+    # 学术
+    "arxiv.org": 85.0,
+    "nature.com": 92.0,
+    "science.org": 92.0,
 }
 
 # 主流域名：一般新闻网站、内容平台（中等可信度）
@@ -56,49 +68,126 @@ MAINSTREAM_DOMAINS = {
     "zdnet.com": 72.0,
     "engadget.com": 68.0,
     "venturebeat.com": 70.0,
-    "medium.com": 60.0,
-    "reddit.com": 55.0,
+    "36kr.com": 65.0,
+    "huxiu.com": 60.0,
+    "qbitai.com": 65.0,
     "youtube.com": 50.0,
-    "twitter.com": 45.0,
-    "weibo.com": 40.0,
-    "zhihu.com": 50.0,
+    # 内容平台（平台本身中性，视作者而定）
+    "medium.com": 50.0,
+    "substack.com": 50.0,
+    "juejin.cn": 45.0,
+    "csdn.net": 40.0,
+    # 社交平台（< 50 视为用户生成内容）
+    "zhihu.com": 45.0,
+    "v2ex.com": 40.0,
+    "weibo.com": 30.0,
+    "twitter.com": 30.0,
+    "x.com": 30.0,
+    "reddit.com": 25.0,
 }
 
+# 主流层级中低于该分数的域名视为用户生成内容 (user_generated)
+USER_GENERATED_MAX_SCORE = 50.0
+
+# 社交平台（TrustScorer 的社交层级；juejin / csdn / v2ex 等内容社区不在其中）
+SOCIAL_PLATFORM_DOMAINS = frozenset({"weibo.com", "zhihu.com", "reddit.com", "twitter.com", "x.com"})
+
 # 合并所有域名（用于快速查找）
 ALL_DOMAINS = {**OFFICIAL_DOMAINS, **AUTHORITATIVE_DOMAINS, **MAINSTREAM_DOMAINS}
 
 
+class DomainMatch(NamedTuple):
+    """域名匹配结果"""
+    domain: str        # 命中的注册域名（最长后缀）
+    score: float       # 0.0-100.0 的可信度评分
+    domain_type: str   # "official" / "authoritative" / "mainstream"
+
+
+def normalize_host(url_or_host: str) -> str:
+    """
+    URL 或主机名 -> 规范化主机名（小写、去端口 / 末尾点 / www. 前缀）。
+    无法解析时返回空字符串。
+    """
+    value = (url_or_host or "").strip()
+    if not value:
+        return ""
+    if "://" in value:
+        try:
+            host = urlparse(value).hostname or ""
+        except ValueError:
+            return ""
+    else:
+        host = value.split("/", 1)[0].rsplit(":", 1)[0]
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class DomainResolver:
+    """
+    编译后的域名解析器：按反转标签构建后缀树（com -> openai -> blog），
+    按标签边界做最长后缀匹配；主机名与 URL 的解析结果均带 LRU 缓存。
+    同一域名出现在多个层级时，先出现的层级优先。
+    """
+
+    _TERMINAL = ""
+
+    def __init__(self, tiers: Iterable[Tuple[str, Mapping[str, float]]], cache_size: int = 4096):
+        self._trie: Dict[str, dict] = {}
+        for domain_type, domains in tiers:
+            for domain, score in domains.items():
+                node = self._trie
+                for label in reversed(normalize_host(domain).split(".")):
+                    node = node.setdefault(label, {})
+                node.setdefault(self._TERMINAL, DomainMatch(domain, float(score), domain_type))
+        self.resolve_host = lru_cache(maxsize=cache_size)(self._resolve_host)
+        self.resolve_url = lru_cache(maxsize=cache_size)(self._resolve_url)
+
+    def _resolve_host(self, host: str) -> Optional[DomainMatch]:
+        node = self._trie
+        match = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(self._TERMINAL, match)
+        return match
+
+    def _resolve_url(self, url_or_host: str) -> Optional[DomainMatch]:
+        host = normalize_host(url_or_host)
+        return self.resolve_host(host) if host else None
+
+
+domain_resolver = DomainResolver([
+    ("official", OFFICIAL_DOMAINS),
+    ("authoritative", AUTHORITATIVE_DOMAINS),
+    ("mainstream", MAINSTREAM_DOMAINS),
+])
+
+
 def get_domain_score(domain: str) -> tuple[float, str]:
     """
     获取域名的信任评分和类型。
 
     Args:
-        domain: 域名字符串（如 "openai.com"）
+        domain: 域名字符串或 URL（如 "openai.com"）
 
     Returns:
         (score, domain_type) 元组
         - score: 0.0-100.0 的可信度评分
         - domain_type: "official" / "authoritative" / "mainstream" / "unknown"
     """
-    domain = domain.lower().replace("www.", "")
-
-    # 检查是否为官方域名
-    for d, score in OFFICIAL_DOMAINS.items():
-        if domain.endswith(d):
-            return score, "official"
-
-    # 检查是否为权威域名
-    for d, score in AUTHORITATIVE_DOMAINS.items():
-        if domain.endswith(d):
-            return score, "authoritative"
+    match = domain_resolver.resolve_url(domain)
+    if match is None:
+        return 0.0, "unknown"
+    return match.score, match.domain_type
 
-    # 检查是否为主流域名
-    for d, score in MAINSTREAM_DOMAINS.items():
-        if domain.endswith(d):
-            return score, "mainstream"
 
-    # 未知域名
-    return 0.0, "unknown"
+def is_official_domain(url_or_host: str) -> bool:
+    """URL / 主机名是否属于官方域名（含子域名）。"""
+    match = domain_resolver.resolve_url(url_or_host)
+    return match is not None and match.domain_type == "official"
 
 
 # 用于配置的官方域名集合（仅包含名称，不含评分）
@@ -12,7 +12,8 @@ class DocumentSnapshot(BaseModel):
     final_url: Optional[str] = None
     doc_key: Optional[str] = None  # normalized URL key for CDC
     doc_version_id: Optional[str] = None  # stable version id for this doc_key+content
-    cleaned_text: str
+    cleaned_text: Optional[str] = None  # None once archived into the snapshot store
+    cleaned_text_ref: Optional[str] = None  # snapshot store digest (== text_digest) of the archived text
     text_digest: str
     normalization_version: str
     content_hash: Optional[str] = None
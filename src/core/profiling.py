@@ -0,0 +1,408 @@
+"""
+Per-node run profiling.
+
+instrument_node() wraps a graph node (build_graph_v2 / build_worker_subgraph). While a
+RunProfiler is active (profile_run()), every node execution becomes a span recording:
+
+- wall time and queue wait (gap since the previous sibling span finished, or since the
+  parent started: scheduling/routing overhead between nodes)
+- LLM calls and tokens in/out (fed by token_ledger, i.e. every safe_ainvoke call)
+- HTTP requests and response bytes (record_http)
+- cache hits/misses per cache (record_cache)
+- optionally (DEEPTRACE_PROFILE_STATE=1 or measure_state=True) the serialized size of the
+  node's input state and of the update it returns; off by default, since it JSON-encodes
+  the whole state (evidence full_content included) on entry and exit of every node
+
+Nested graphs (the worker subgraph invoked from the "worker" node) produce child spans;
+counters are attributed to the innermost span. Without an active profiler the wrappers
+call the node directly.
+
+RunProfiler.write(run_dir) emits profile.json next to run_record.json;
+DEEPTRACE_PROFILE_OTEL_FILE additionally appends the spans to that file as one
+OTLP/JSON ExportTraceServiceRequest per line (the OpenTelemetry file exporter format).
+DEEPTRACE_PROFILE=0 disables profiling.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+PROFILE_VERSION = 1
+PROFILE_NAME = "profile.json"
+ROOT_SPAN = "(run)"
+
+_active_profiler: ContextVar[Optional["RunProfiler"]] = ContextVar("deeptrace_profiler", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("deeptrace_profile_span", default=None)
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("DEEPTRACE_PROFILE", "1") != "0"
+
+
+def state_measurement_enabled() -> bool:
+    return os.getenv("DEEPTRACE_PROFILE_STATE", "0") == "1"
+
+
+def serialized_size(value: Any) -> int:
+    """UTF-8 size of value as JSON (messages and other objects via str())."""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
+
+
+@dataclass
+class Span:
+    name: str
+    graph: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    wall_ms: float = 0.0
+    queue_wait_ms: float = 0.0
+    llm_calls: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    tokens_estimated: int = 0  # calls whose usage was estimated (no provider metadata)
+    http_requests: int = 0
+    http_bytes: int = 0
+    cache_hits: Dict[str, int] = field(default_factory=dict)
+    cache_misses: Dict[str, int] = field(default_factory=dict)
+    state_in_bytes: Optional[int] = None
+    state_out_bytes: Optional[int] = None
+    error: Optional[str] = None
+    _started: float = 0.0
+
+
+class RunProfiler:
+    """Collects the spans of one run."""
+
+    def __init__(self, run_id: Optional[str] = None, measure_state: Optional[bool] = None):
+        self.run_id = run_id or str(uuid.uuid4())
+        self.measure_state = state_measurement_enabled() if measure_state is None else measure_state
+        self.started_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self.spans: List[Span] = []
+        # Counters recorded outside any node (e.g. pre-graph LLM calls, the sidecar)
+        self.root = Span(ROOT_SPAN, "", "0" * 16, None, self.started_ns)
+        self._last_end: Dict[Optional[str], float] = {}
+        self._lock = threading.Lock()
+
+    # --- spans ---
+
+    def start_span(self, name: str, graph: str, state: Any = None) -> Span:
+        parent = _current_span.get()
+        parent_id = parent.span_id if parent is not None else None
+        span = Span(name, graph, uuid.uuid4().hex[:16], parent_id, time.time_ns())
+        if self.measure_state and state is not None:
+            span.state_in_bytes = serialized_size(state)
+        span._started = time.perf_counter()
+        with self._lock:
+            previous_end = self._last_end.get(parent_id)
+            if previous_end is None:
+                previous_end = parent._started if parent is not None else self._started
+            span.queue_wait_ms = max(0.0, (span._started - previous_end) * 1000)
+        return span
+
+    def end_span(self, span: Span, result: Any = None, error: Optional[BaseException] = None) -> None:
+        ended = time.perf_counter()
+        span.end_ns = time.time_ns()
+        span.wall_ms = (ended - span._started) * 1000
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        elif self.measure_state and result is not None:
+            span.state_out_bytes = serialized_size(result)
+        with self._lock:
+            self._last_end[span.parent_id] = ended
+            self.spans.append(span)
+
+    # --- counters ---
+
+    def _target(self) -> Span:
+        return _current_span.get() or self.root
+
+    def record_llm(self, tokens_in: int, tokens_out: int, estimated: bool = False) -> None:
+        span = self._target()
+        with self._lock:
+            span.llm_calls += 1
+            span.tokens_in += int(tokens_in or 0)
+            span.tokens_out += int(tokens_out or 0)
+            span.tokens_estimated += int(bool(estimated))
+
+    def record_http(self, nbytes: int, requests: int = 1) -> None:
+        span = self._target()
+        with self._lock:
+            span.http_requests += requests
+            span.http_bytes += int(nbytes or 0)
+
+    def record_cache(self, cache: str, hits: int = 0, misses: int = 0) -> None:
+        span = self._target()
+        with self._lock:
+            if hits:
+                span.cache_hits[cache] = span.cache_hits.get(cache, 0) + hits
+            if misses:
+                span.cache_misses[cache] = span.cache_misses.get(cache, 0) + misses
+
+    # --- reports ---
+
+    @staticmethod
+    def _span_record(span: Span) -> dict:
+        return {k: v for k, v in asdict(span).items() if not k.startswith("_")}
+
+    def summary(self) -> dict:
+        """Per-node totals (keyed by "<graph>/<name>") plus whole-run totals."""
+        with self._lock:
+            spans = list(self.spans) + [self.root]
+        nodes: Dict[str, dict] = {}
+        totals = {"llm_calls": 0, "tokens_in": 0, "tokens_out": 0, "http_requests": 0, "http_bytes": 0,
+                  "cache_hits": 0, "cache_misses": 0}
+        for span in spans:
+            key = f"{span.graph}/{span.name}" if span.graph else span.name
+            agg = nodes.setdefault(key, {
+                "calls": 0, "errors": 0, "wall_ms": 0.0, "max_wall_ms": 0.0, "queue_wait_ms": 0.0,
+                "llm_calls": 0, "tokens_in": 0, "tokens_out": 0, "http_requests": 0, "http_bytes": 0,
+                "cache_hits": 0, "cache_misses": 0, "max_state_in_bytes": 0, "max_state_out_bytes": 0,
+            })
+            if span is not self.root:
+                agg["calls"] += 1
+                agg["errors"] += int(span.error is not None)
+                agg["wall_ms"] += span.wall_ms
+                agg["max_wall_ms"] = max(agg["max_wall_ms"], span.wall_ms)
+                agg["queue_wait_ms"] += span.queue_wait_ms
+                agg["max_state_in_bytes"] = max(agg["max_state_in_bytes"], span.state_in_bytes or 0)
+                agg["max_state_out_bytes"] = max(agg["max_state_out_bytes"], span.state_out_bytes or 0)
+            for counter in ("llm_calls", "tokens_in", "tokens_out", "http_requests", "http_bytes"):
+                agg[counter] += getattr(span, counter)
+                totals[counter] += getattr(span, counter)
+            for counter in ("cache_hits", "cache_misses"):
+                count = sum(getattr(span, counter).values())
+                agg[counter] += count
+                totals[counter] += count
+        for agg in nodes.values():
+            agg["wall_ms"] = round(agg["wall_ms"], 3)
+            agg["max_wall_ms"] = round(agg["max_wall_ms"], 3)
+            agg["queue_wait_ms"] = round(agg["queue_wait_ms"], 3)
+        totals["wall_ms"] = round((time.perf_counter() - self._started) * 1000, 3)
+        return {"nodes": nodes, "totals": totals}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        return {
+            "profile_version": PROFILE_VERSION,
+            "run_id": self.run_id,
+            "started_at_unix_ns": self.started_ns,
+            **self.summary(),
+            "outside_nodes": self._span_record(self.root),
+            "spans": [self._span_record(s) for s in spans],
+        }
+
+    def write(self, directory: Union[str, Path]) -> str:
+        """Write profile.json into directory (and the OTLP export when configured)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / PROFILE_NAME
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+        otel_path = os.getenv("DEEPTRACE_PROFILE_OTEL_FILE")
+        if otel_path:
+            self.export_otel(otel_path)
+        return str(path)
+
+    def to_otlp(self) -> dict:
+        """Spans as an OTLP/JSON ExportTraceServiceRequest."""
+        trace_id = hashlib.sha256(self.run_id.encode("utf-8")).hexdigest()[:32]
+
+        def attr(key: str, value: Any) -> dict:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        otlp_spans = []
+        for span in spans:
+            attributes = [
+                attr("deeptrace.graph", span.graph),
+                attr("deeptrace.queue_wait_ms", span.queue_wait_ms),
+                attr("llm.calls", span.llm_calls),
+                attr("llm.tokens_in", span.tokens_in),
+                attr("llm.tokens_out", span.tokens_out),
+                attr("http.requests", span.http_requests),
+                attr("http.response_bytes", span.http_bytes),
+                attr("cache.hits", sum(span.cache_hits.values())),
+                attr("cache.misses", sum(span.cache_misses.values())),
+            ]
+            for key in ("state_in_bytes", "state_out_bytes"):
+                if getattr(span, key) is not None:
+                    attributes.append(attr(f"deeptrace.{key}", getattr(span, key)))
+            record = {
+                "traceId": trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": attributes,
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                record["parentSpanId"] = span.parent_id
+            otlp_spans.append(record)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [attr("service.name", "deeptrace"), attr("deeptrace.run_id", self.run_id)]},
+                "scopeSpans": [{"scope": {"name": __name__, "version": str(PROFILE_VERSION)}, "spans": otlp_spans}],
+            }]
+        }
+
+    def export_otel(self, path: Union[str, Path]) -> str:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_otlp(), ensure_ascii=False, separators=(",", ":")) + "\n")
+        return str(path)
+
+
+@contextmanager
+def profile_run(run_id: Optional[str] = None, measure_state: Optional[bool] = None) -> Iterator[Optional[RunProfiler]]:
+    """Activate a RunProfiler for the enclosed run (yields None when DEEPTRACE_PROFILE=0)."""
+    if not profiling_enabled():
+        yield None
+        return
+    profiler = RunProfiler(run_id, measure_state=measure_state)
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+
+
+def get_active_profiler() -> Optional[RunProfiler]:
+    return _active_profiler.get()
+
+
+# --- counter hooks (no-ops without an active profiler) ---
+
+
+def record_llm_usage(tokens_in: int, tokens_out: int, estimated: bool = False) -> None:
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_llm(tokens_in, tokens_out, estimated)
+
+
+def record_http(nbytes: int, requests: int = 1) -> None:
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_http(nbytes, requests)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_cache(cache, hits, misses)
+
+
+# --- node instrumentation ---
+
+
+@contextmanager
+def profile_span(name: str, graph: str = "", state: Any = None) -> Iterator[Optional[Span]]:
+    """Span around arbitrary code (e.g. the post-graph sidecar); None without a profiler."""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield None
+        return
+    span = profiler.start_span(name, graph, state)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        _current_span.reset(token)
+        profiler.end_span(span, error=e)
+        raise
+    _current_span.reset(token)
+    profiler.end_span(span)
+
+
+def _run_sync(name: str, graph: str, fn: Callable, state: Any, args, kwargs):
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return fn(state, *args, **kwargs)
+    span = profiler.start_span(name, graph, state)
+    token = _current_span.set(span)
+    try:
+        result = fn(state, *args, **kwargs)
+    except BaseException as e:
+        profiler.end_span(span, error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+    profiler.end_span(span, result)
+    return result
+
+
+async def _run_async(name: str, graph: str, fn: Callable, state: Any, args, kwargs):
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return await fn(state, *args, **kwargs)
+    span = profiler.start_span(name, graph, state)
+    token = _current_span.set(span)
+    try:
+        result = await fn(state, *args, **kwargs)
+    except BaseException as e:
+        profiler.end_span(span, error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+    profiler.end_span(span, result)
+    return result
+
+
+def instrument_node(name: str, node: Any, graph: str = "main") -> Any:
+    """
+    Wrap a node for StateGraph.add_node. Functions keep their signature (LangGraph still
+    sees the config parameter); runnables such as ToolNode become a RunnableLambda.
+    """
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_node(state, *args, **kwargs):
+            return await _run_async(name, graph, node, state, args, kwargs)
+
+        return async_node
+
+    if inspect.isfunction(node) or inspect.ismethod(node):
+        @functools.wraps(node)
+        def sync_node(state, *args, **kwargs):
+            return _run_sync(name, graph, node, state, args, kwargs)
+
+        return sync_node
+
+    if hasattr(node, "ainvoke"):
+        from langchain_core.runnables import RunnableLambda
+
+        def invoke(state, config):
+            return _run_sync(name, graph, node.invoke, state, (config,), {})
+
+        async def ainvoke(state, config):
+            return await _run_async(name, graph, node.ainvoke, state, (config,), {})
+
+        return RunnableLambda(invoke, afunc=ainvoke, name=name)
+
+    return node
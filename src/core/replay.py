@@ -0,0 +1,436 @@
+"""
+Record / replay of a run's external interactions.
+
+record_run() captures everything a V2 run fetches from the outside world:
+
+- chat model generations (invoke/ainvoke/batch, whatever the model's cache setting; token
+  streaming through astream is not captured), keyed by the serialized prompt and model string
+- Tavily search responses (tavily_search_async), per query
+- scraped pages (ContentScraper.scrape), per URL
+
+together with the graph input, and archives them next to run_record.json as the
+replay_recording artifact (streamed through src.core.artifact_io).
+
+Only calls made in the context (contextvars, inherited by asyncio tasks) of an active
+record_run() / replay_run() are intercepted; other runs in the same process are not.
+
+replay_run() re-executes the graph against a recording without network access: every
+interaction is served from the recording after a simulated latency (LatencyModel),
+then facts_index / gate_report are compared with the archived ones (volatile
+timestamps and run ids ignored) and end-to-end timing is reported, with a per-node
+profile.json for the replayed run.
+
+DEEPTRACE_RECORD_RUN=1 makes run_deeptrace_v2.py record its run.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumpd, dumps, load, loads
+from langchain_core.outputs import ChatResult
+
+from src.core.artifact_io import ArtifactWriter, load_artifact
+from src.core.profiling import profile_run
+
+logger = logging.getLogger(__name__)
+
+RECORDING_NAME = "replay_recording"
+RECORDING_VERSION = 1
+# Keys whose values legitimately differ between a run and its replay
+VOLATILE_KEYS = frozenset({"run_id", "generated_at", "retrieval_ts", "archived_at", "created_at"})
+# Masked for the fallback prompt key: dates/timestamps (e.g. "today is ...") and message ids
+# (langgraph assigns a fresh uuid to every message added to the state)
+_PROMPT_DATES = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?")
+_PROMPT_IDS = re.compile(r'"id":\s*"[^"]*"')
+
+_active_session: ContextVar[Optional["_Session"]] = ContextVar("deeptrace_replay_session", default=None)
+
+
+class ReplayMissError(LookupError):
+    """The replayed run made a call that is not in the recording."""
+
+
+class ReplayedCallError(RuntimeError):
+    """A recorded call that failed during the original run fails again on replay."""
+
+
+def recording_enabled() -> bool:
+    return os.getenv("DEEPTRACE_RECORD_RUN", "0") == "1"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _llm_keys(prompt: str, llm_string: str) -> List[str]:
+    """Exact key first, then the masked prompt with the same / any model string."""
+    masked = _digest(_PROMPT_IDS.sub('"id": ""', _PROMPT_DATES.sub("<date>", prompt)))
+    return [f"{_digest(prompt)}:{_digest(llm_string)}", f"{masked}:{_digest(llm_string)}", f"{masked}:*"]
+
+
+@dataclass
+class LatencyModel:
+    """
+    Simulated latency of replayed calls: "recorded" (as measured while recording,
+    times scale), "none", or a fixed number of seconds; set per kind (llm/search/fetch).
+    """
+
+    llm: Union[str, float] = "recorded"
+    search: Union[str, float] = "recorded"
+    fetch: Union[str, float] = "recorded"
+    scale: float = 1.0
+
+    @staticmethod
+    def parse(value: str) -> Union[str, float]:
+        return value if value in ("recorded", "none") else float(value)
+
+    def delay(self, kind: str, recorded_s: float) -> float:
+        setting = getattr(self, kind, "recorded")
+        if setting == "none":
+            return 0.0
+        if setting == "recorded":
+            return max(recorded_s, 0.0) * self.scale
+        return float(setting)
+
+
+def _load_generation(text: str):
+    return loads(text, allowed_objects="core", secrets_from_env=False)
+
+
+class _Session(ABC):
+    replaying = False
+
+    @abstractmethod
+    async def intercept(self, kind: str, keys: Sequence[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of call() for (kind, keys), recorded or served from the recording."""
+
+
+class RunRecorder(_Session):
+    """Collects the interactions of one run."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.interactions: List[dict] = []
+        self.graph_input: Optional[dict] = None
+        self.graph_config: Dict[str, Any] = {}
+        self.graph_wall_s: Optional[float] = None
+        self._graph_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _add(self, kind: str, keys: Sequence[str], latency_s: float, response: Any = None,
+             error: Optional[str] = None) -> None:
+        with self._lock:
+            self.interactions.append({
+                "seq": len(self.interactions),
+                "kind": kind,
+                "keys": list(keys),
+                "latency_s": round(latency_s, 6),
+                "response": response,
+                "error": error,
+            })
+
+    async def intercept(self, kind: str, keys: Sequence[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            self._add(kind, keys, time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+            raise
+        self._add(kind, keys, time.perf_counter() - started, response=result)
+        return result
+
+    def record_llm(self, prompt: str, llm_string: str, generations: Sequence[Any], latency_s: float) -> None:
+        self._add("llm", _llm_keys(prompt, llm_string), latency_s, response=[dumps(g) for g in generations])
+
+    # --- graph input / output ---
+
+    def capture_graph_input(self, state: dict, config: Optional[dict] = None) -> None:
+        self.graph_input = dumpd(state)
+        self.graph_config = {"recursion_limit": (config or {}).get("recursion_limit")}
+        self._graph_started = time.perf_counter()
+
+    def capture_graph_finished(self) -> None:
+        if self._graph_started is not None:
+            self.graph_wall_s = round(time.perf_counter() - self._graph_started, 6)
+
+    def write(self, directory: Union[str, Path]) -> Optional[str]:
+        counts: Dict[str, int] = {}
+        for interaction in self.interactions:
+            counts[interaction["kind"]] = counts.get(interaction["kind"], 0) + 1
+        payload = {
+            "recording_version": RECORDING_VERSION,
+            "run_id": self.run_id,
+            "recorded_at": datetime.utcnow().isoformat(),
+            "graph_input": self.graph_input,
+            "graph_config": self.graph_config,
+            "graph_wall_s": self.graph_wall_s,
+            "counts": counts,
+            "interactions": self.interactions,
+        }
+        return ArtifactWriter(directory).write(RECORDING_NAME, payload, collection="interactions")
+
+
+class ReplayPlayer(_Session):
+    """Serves recorded interactions in place of the real calls."""
+
+    replaying = True
+
+    def __init__(self, interactions: Sequence[dict], latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self.interactions = list(interactions)
+        self._used = [False] * len(self.interactions)
+        self._by_key: Dict[str, List[int]] = {}
+        for idx, interaction in enumerate(self.interactions):
+            for key in interaction.get("keys") or []:
+                self._by_key.setdefault(key, []).append(idx)
+        self.stats = {"served": 0, "fallback_key": 0, "reused": 0, "missed": 0, "simulated_latency_s": 0.0}
+        self._lock = threading.Lock()
+
+    def _take(self, kind: str, keys: Sequence[str]) -> dict:
+        with self._lock:
+            for rank, key in enumerate(keys):
+                candidates = [i for i in self._by_key.get(key, ()) if self.interactions[i]["kind"] == kind]
+                if not candidates:
+                    continue
+                fresh = [i for i in candidates if not self._used[i]]
+                # Repeated identical calls (hedged requests, re-asked prompts) reuse the last answer
+                idx = fresh[0] if fresh else candidates[-1]
+                self.stats["served"] += 1
+                self.stats["fallback_key"] += int(rank > 0)
+                self.stats["reused"] += int(not fresh)
+                self._used[idx] = True
+                return self.interactions[idx]
+            self.stats["missed"] += 1
+        raise ReplayMissError(f"no recorded {kind} interaction for key {keys[0]}")
+
+    async def _serve(self, kind: str, keys: Sequence[str]) -> dict:
+        interaction = self._take(kind, keys)
+        delay = self.latency.delay(kind, interaction.get("latency_s") or 0.0)
+        if delay > 0:
+            with self._lock:
+                self.stats["simulated_latency_s"] += delay
+            await asyncio.sleep(delay)
+        if interaction.get("error"):
+            raise ReplayedCallError(interaction["error"])
+        return interaction
+
+    async def intercept(self, kind: str, keys: Sequence[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        return (await self._serve(kind, keys))["response"]
+
+    def llm_lookup(self, prompt: str, llm_string: str) -> list:
+        return [_load_generation(g) for g in self._take("llm", _llm_keys(prompt, llm_string))["response"]]
+
+    async def allm_lookup(self, prompt: str, llm_string: str) -> list:
+        return [_load_generation(g) for g in (await self._serve("llm", _llm_keys(prompt, llm_string)))["response"]]
+
+    def unused(self) -> int:
+        return self._used.count(False)
+
+
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+def _install_chat_model_hook() -> None:
+    """
+    Route chat model generations through the session of the current context.
+
+    Wraps BaseChatModel._generate_with_cache / _agenerate_with_cache once per process; the
+    wrappers are pass-through unless a session is active in the calling context. They sit
+    in front of the model's own LLM cache, so models built with cache=False are covered.
+    """
+    global _hook_installed
+    with _hook_lock:
+        if _hook_installed:
+            return
+        original_sync = BaseChatModel._generate_with_cache
+        original_async = BaseChatModel._agenerate_with_cache
+
+        @functools.wraps(original_sync)
+        def _generate_with_cache(self, messages, stop=None, run_manager=None, **kwargs):
+            session = _active_session.get()
+            if session is None:
+                return original_sync(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            prompt, llm_string = dumps(messages), self._get_llm_string(stop=stop, **kwargs)
+            if session.replaying:
+                return ChatResult(generations=session.llm_lookup(prompt, llm_string))
+            started = time.perf_counter()
+            result = original_sync(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            session.record_llm(prompt, llm_string, result.generations, time.perf_counter() - started)
+            return result
+
+        @functools.wraps(original_async)
+        async def _agenerate_with_cache(self, messages, stop=None, run_manager=None, **kwargs):
+            session = _active_session.get()
+            if session is None:
+                return await original_async(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            prompt, llm_string = dumps(messages), self._get_llm_string(stop=stop, **kwargs)
+            if session.replaying:
+                return ChatResult(generations=await session.allm_lookup(prompt, llm_string))
+            started = time.perf_counter()
+            result = await original_async(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            session.record_llm(prompt, llm_string, result.generations, time.perf_counter() - started)
+            return result
+
+        BaseChatModel._generate_with_cache = _generate_with_cache
+        BaseChatModel._agenerate_with_cache = _agenerate_with_cache
+        _hook_installed = True
+
+
+@contextmanager
+def _activate(session: _Session) -> Iterator[_Session]:
+    _install_chat_model_hook()
+    token = _active_session.set(session)
+    try:
+        yield session
+    finally:
+        _active_session.reset(token)
+
+
+@contextmanager
+def record_run(run_id: str, enabled: Optional[bool] = None) -> Iterator[Optional[RunRecorder]]:
+    """Record the enclosed run's external interactions (yields None unless DEEPTRACE_RECORD_RUN=1)."""
+    if not (recording_enabled() if enabled is None else enabled):
+        yield None
+        return
+    with _activate(RunRecorder(run_id)) as recorder:
+        yield recorder
+
+
+def get_replay_session() -> Optional[_Session]:
+    return _active_session.get()
+
+
+async def intercept_call(kind: str, key: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Hook for external calls: records (kind, key) -> result while recording, serves it
+    from the recording while replaying, and just awaits call() otherwise. Results must
+    be JSON-serializable.
+    """
+    session = _active_session.get()
+    if session is None:
+        return await call()
+    key_text = key if isinstance(key, str) else json.dumps(key, ensure_ascii=False, sort_keys=True)
+    return await session.intercept(kind, [key_text], call)
+
+
+def capture_graph_input(state: dict, config: Optional[dict] = None) -> None:
+    session = _active_session.get()
+    if isinstance(session, RunRecorder):
+        session.capture_graph_input(state, config)
+
+
+def capture_graph_finished() -> None:
+    session = _active_session.get()
+    if isinstance(session, RunRecorder):
+        session.capture_graph_finished()
+
+
+# --- replay ---
+
+
+def strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [strip_volatile(v) for v in value]
+    return value
+
+
+def _differences(expected: Any, actual: Any, path: str = "", limit: int = 20) -> List[str]:
+    diffs: List[str] = []
+
+    def walk(a, b, where):
+        if len(diffs) >= limit:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in sorted(set(a) | set(b), key=str):
+                walk(a.get(key), b.get(key), f"{where}.{key}")
+        elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+            for i, (x, y) in enumerate(zip(a, b)):
+                walk(x, y, f"{where}[{i}]")
+        elif a != b:
+            diffs.append(f"{where or '.'}: recorded={json.dumps(a, ensure_ascii=False)[:120]} "
+                         f"replayed={json.dumps(b, ensure_ascii=False)[:120]}")
+
+    walk(expected, actual, path)
+    return diffs
+
+
+def load_recording(run_dir: Union[str, Path]) -> dict:
+    recording = load_artifact(run_dir, RECORDING_NAME)
+    if not recording:
+        raise FileNotFoundError(f"no {RECORDING_NAME} artifact in {run_dir}")
+    return recording
+
+
+async def replay_run(
+    run_dir: Union[str, Path],
+    latency: Optional[LatencyModel] = None,
+    graph=None,
+    replay_run_id: Optional[str] = None,
+    compare_artifacts: Sequence[str] = ("facts_index", "gate_report"),
+) -> dict:
+    """
+    Re-execute a recorded run offline and report timing and output equality.
+
+    The replay gets its own run_id (default "<run_id>-replay-<8 hex>") so its archive
+    and profile.json do not overwrite the original run.
+    """
+    run_dir = Path(run_dir)
+    recording = load_recording(run_dir)
+    if graph is None:
+        from src.graph.graph_v2 import app_v2 as graph
+
+    player = ReplayPlayer(recording.get("interactions") or [], latency)
+    state = load(recording["graph_input"], allowed_objects="core", secrets_from_env=False)
+    replay_run_id = replay_run_id or f"{recording.get('run_id') or 'run'}-replay-{uuid.uuid4().hex[:8]}"
+    state["run_id"] = replay_run_id
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    if (recording.get("graph_config") or {}).get("recursion_limit"):
+        config["recursion_limit"] = recording["graph_config"]["recursion_limit"]
+
+    with _activate(player), profile_run(replay_run_id) as profiler:
+        started = time.perf_counter()
+        final_state = await graph.ainvoke(state, config=config)
+        wall_s = time.perf_counter() - started
+
+    comparisons = {}
+    for name in compare_artifacts:
+        expected = strip_volatile(load_artifact(run_dir, name))
+        # Round-trip through JSON like the archive does (tuples -> lists)
+        actual = strip_volatile(json.loads(json.dumps(final_state.get(name), ensure_ascii=False, default=str)))
+        comparisons[name] = {"identical": expected == actual, "differences": _differences(expected, actual)}
+
+    profile_path = None
+    if profiler is not None:
+        # Next to the replay's own run_record.json (graphs without an archive node: under run_dir)
+        record_path = final_state.get("run_record_path")
+        profile_path = profiler.write(Path(record_path).parent if record_path else run_dir / "replays" / replay_run_id)
+
+    return {
+        "run_id": recording.get("run_id"),
+        "replay_run_id": replay_run_id,
+        "wall_s": round(wall_s, 6),
+        "recorded_graph_wall_s": recording.get("graph_wall_s"),
+        "identical": all(c["identical"] for c in comparisons.values()),
+        "comparisons": comparisons,
+        "interactions": {**player.stats, "recorded": len(player.interactions), "unused": player.unused()},
+        "profile_path": profile_path,
+    }
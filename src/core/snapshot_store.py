@@ -0,0 +1,228 @@
+"""
+Content-addressed snapshot store for document cleaned_text.
+
+Each distinct text (keyed by its sha256 text_digest, the same value DocumentSnapshot
+records) is stored once, so re-fetched pages and syndicated copies across runs cost
+nothing extra; run artifacts keep the digest instead of the text.
+
+Layout under the store root (default data/snapshot_store):
+  pack-00000.bin  append-only records
+  index.tsv       <digest>\\t<pack>\\t<offset> per record (written after the record)
+
+Record: MAGIC | sha256 (32B) | char_len u32 | block_chars u32 | n_blocks u32 |
+        n_blocks x compressed block length u32 | zlib blocks
+
+Texts are split into blocks of block_chars characters compressed independently, so a
+slice by character offsets (quote extraction) memory-maps the pack and inflates only
+the blocks it covers.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from src.core.utils.file_lock import file_lock
+
+MAGIC = b"DTS1"
+_HEADER = struct.Struct("<4s32sIII")
+_U32 = struct.Struct("<I")
+
+DEFAULT_BLOCK_CHARS = 16384
+DEFAULT_PACK_MAX_BYTES = 256 * 1024 * 1024
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """Deduplicating cleaned_text store with block-level random access."""
+
+    def __init__(
+        self,
+        root: Union[str, Path] = Path("data") / "snapshot_store",
+        block_chars: int = DEFAULT_BLOCK_CHARS,
+        pack_max_bytes: int = DEFAULT_PACK_MAX_BYTES,
+        compress_level: int = 6,
+    ):
+        self.root = Path(root)
+        self.block_chars = block_chars
+        self.pack_max_bytes = pack_max_bytes
+        self.compress_level = compress_level
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._index_pos = 0  # bytes of index.tsv already loaded
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._files = {}
+        self._load_index()
+
+    # --- index ---
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.tsv"
+
+    def _load_index(self) -> None:
+        """Load index lines appended (by any process) since the last call."""
+        if not self._index_path.exists():
+            return
+        with self._index_path.open("rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        # A concurrent writer may be mid-line; only complete lines are consumed
+        data = data[: data.rfind(b"\n") + 1]
+        self._index_pos += len(data)
+        for line in data.decode("utf-8").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 3:
+                self._index[parts[0]] = (parts[1], int(parts[2]))
+
+    def _lookup(self, digest: str) -> Optional[Tuple[str, int]]:
+        location = self._index.get(digest)
+        if location is None:
+            self._load_index()
+            location = self._index.get(digest)
+        return location
+
+    def __contains__(self, digest: str) -> bool:
+        return self._lookup(digest) is not None
+
+    def __len__(self) -> int:
+        self._load_index()
+        return len(self._index)
+
+    # --- write ---
+
+    def _current_pack(self) -> Path:
+        packs = sorted(self.root.glob("pack-*.bin"))
+        if packs and packs[-1].stat().st_size < self.pack_max_bytes:
+            return packs[-1]
+        return self.root / f"pack-{len(packs):05d}.bin"
+
+    def _encode(self, digest: str, text: str) -> bytes:
+        blocks = [
+            zlib.compress(text[i : i + self.block_chars].encode("utf-8"), self.compress_level)
+            for i in range(0, len(text), self.block_chars)
+        ]
+        header = _HEADER.pack(MAGIC, bytes.fromhex(digest), len(text), self.block_chars, len(blocks))
+        table = b"".join(_U32.pack(len(block)) for block in blocks)
+        return header + table + b"".join(blocks)
+
+    def put(self, text: str) -> str:
+        """Store text if not present; returns its digest."""
+        text = text or ""
+        digest = text_digest(text)
+        if digest in self._index:
+            return digest
+        self.root.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.root / ".lock"):
+            # Another run may have stored the same text since our index was loaded
+            if self._lookup(digest) is not None:
+                return digest
+            pack = self._current_pack()
+            with pack.open("ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(self._encode(digest, text))
+                f.flush()
+                os.fsync(f.fileno())
+            with self._index_path.open("a", encoding="utf-8") as f:
+                f.write(f"{digest}\t{pack.name}\t{offset}\n")
+            self._load_index()
+        return digest
+
+    # --- read ---
+
+    def _map(self, pack: str, needed_end: int) -> mmap.mmap:
+        mm = self._maps.get(pack)
+        if mm is None or len(mm) < needed_end:
+            # (Re)map: the pack may have grown since it was first mapped
+            if mm is not None:
+                mm.close()
+                self._files.pop(pack).close()
+            f = (self.root / pack).open("rb")
+            self._files[pack] = f
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[pack] = mm
+        return mm
+
+    def _record(self, digest: str):
+        """(mmap, char_len, block_chars, [(byte_offset, byte_len)] per block)."""
+        location = self._lookup(digest)
+        if location is None:
+            raise KeyError(digest)
+        pack, offset = location
+        mm = self._map(pack, offset + _HEADER.size)
+        magic, raw_digest, char_len, block_chars, n_blocks = _HEADER.unpack_from(mm, offset)
+        if magic != MAGIC or raw_digest.hex() != digest:
+            raise ValueError(f"corrupt snapshot record for {digest}")
+        pos = offset + _HEADER.size
+        lengths = struct.unpack_from(f"<{n_blocks}I", mm, pos)
+        pos += n_blocks * _U32.size
+        blocks = []
+        for length in lengths:
+            blocks.append((pos, length))
+            pos += length
+        if len(mm) < pos:
+            mm = self._map(pack, pos)
+        return mm, char_len, block_chars, blocks
+
+    def char_length(self, digest: str) -> int:
+        return self._record(digest)[1]
+
+    def get(self, digest: str) -> str:
+        mm, _, _, blocks = self._record(digest)
+        return "".join(zlib.decompress(mm[pos : pos + length]).decode("utf-8") for pos, length in blocks)
+
+    def slice(self, digest: str, start: int, end: Optional[int] = None) -> str:
+        """text[start:end] (non-negative character offsets), inflating only the covered blocks."""
+        mm, char_len, block_chars, blocks = self._record(digest)
+        end = char_len if end is None else min(end, char_len)
+        start = max(0, start)
+        if start >= end:
+            return ""
+        first, last = start // block_chars, (end - 1) // block_chars
+        text = "".join(
+            zlib.decompress(mm[pos : pos + length]).decode("utf-8") for pos, length in blocks[first : last + 1]
+        )
+        base = first * block_chars
+        return text[start - base : end - base]
+
+    def stats(self) -> Dict[str, int]:
+        stored = sum(p.stat().st_size for p in self.root.glob("pack-*.bin")) if self.root.exists() else 0
+        return {"documents": len(self), "stored_bytes": stored}
+
+    def close(self) -> None:
+        for mm in self._maps.values():
+            mm.close()
+        for f in self._files.values():
+            f.close()
+        self._maps.clear()
+        self._files.clear()
+
+
+_stores: Dict[str, SnapshotStore] = {}
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Shared store for DEEPTRACE_SNAPSHOT_STORE_DIR (default data/snapshot_store; "" disables)."""
+    root = os.getenv("DEEPTRACE_SNAPSHOT_STORE_DIR", str(Path("data") / "snapshot_store"))
+    if not root:
+        return None
+    key = str(Path(root).resolve())
+    if key not in _stores:
+        _stores[key] = SnapshotStore(root)
+    return _stores[key]
+
+
+def resolve_snapshot_text(snapshot: dict, store: Optional[SnapshotStore] = None) -> str:
+    """cleaned_text of an archived snapshot, whether inlined or referenced by digest."""
+    if snapshot.get("cleaned_text") is not None:
+        return snapshot["cleaned_text"]
+    digest = snapshot.get("cleaned_text_ref")
+    store = store or get_snapshot_store()
+    if not digest or store is None:
+        return ""
+    return store.get(digest)
@@ -1,9 +1,16 @@
 """
 Debater Tool for DeepTrace V2.
 Resolves conflicts in research findings using an LLM Judge.
+Role turns within a round run concurrently; conflicts sharing a topic are adjudicated
+in one batched session, and verdicts can be memoized across runs by conflict key.
 """
 
-from typing import List
+import asyncio
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
 try:
     from langchain.chat_models import init_chat_model  # type: ignore
 except ImportError:
@@ -29,6 +36,8 @@ from src.core.prompts.v2 import (
     DEBATER_AGGREGATOR_SYSTEM_PROMPT,
     DEBATER_ROLE_SYSTEM_PROMPT,
 )
+from src.core.profiling import record_cache
+from src.core.utils.file_lock import file_lock
 from src.core.utils.llm_safety import safe_ainvoke
 
 # Default Model for Debater (Needs high reasoning capability)
@@ -59,93 +68,275 @@ def _extract_consensus_marker(text: str) -> str:
     return ""
 
 
-@tool("ResolveConflict", args_schema=ResolveConflict)
-async def debater_tool(
-    topic: str,
-    claims: List[str],
-    source_ids: List[str],
-    config: RunnableConfig = None
-) -> str:
+# Roles argue independently within a round and see only earlier rounds
+DEBATE_ROLES = ["Scientist", "Philosopher"]
+
+_CONFLICT_SECTION = re.compile(r"^\s*#{0,4}\s*\**\s*Conflict\s+(\d+)\b[^\n]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def conflict_key(topic: str, claims: List[str], source_ids: List[str]) -> tuple:
+    """Order-insensitive identity of a conflict; shared by the verdict memo and the graph nodes."""
+    return (
+        (topic or "").strip().lower(),
+        tuple(sorted(set(source_ids or []))),
+        tuple(sorted(set(claims or []))),
+    )
+
+
+class VerdictMemo:
     """
-    Adjudicates a conflict between two or more claims.
-    Returns a verdict explaining which claim is most likely true based on source credibility and recency.
+    Persistent verdict memo keyed by conflict_key, stored as append-only JSON Lines
+    ({"key", "verdict", "model"} per line, later lines win) so verdicts are reused
+    across runs. Appends from concurrent runs are serialized by a file lock; a miss
+    picks up lines appended by other processes since the last read.
     """
-    
-    # 1. Config
-    configurable = config.get("configurable", {}) if config else {}
-    model_name = configurable.get("debater_model", DEFAULT_DEBATER_MODEL)
-    
-    # 2. Prepare Context
-    claims_text = "\n".join([f"- Claim {i+1}: {claim} (Source: {source_ids[i] if i < len(source_ids) else 'Unknown'})" 
-                             for i, claim in enumerate(claims)])
-    
-    user_msg = f"""
-Topic: {topic}
-
-Conflicting Claims:
-{claims_text}
-
-Please analyze and provide a verdict.
-"""
 
-    # 3. Call LLM
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, dict] = {}
+        self._pos = 0  # bytes of the file already loaded
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_of(topic: str, claims: List[str], source_ids: List[str]) -> str:
+        return json.dumps(conflict_key(topic, claims, source_ids), ensure_ascii=False)
+
+    def _refresh(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self._pos)
+                data = f.read()
+        except OSError:
+            return
+        data = data[: data.rfind(b"\n") + 1]
+        self._pos += len(data)
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            try:
+                entry = json.loads(line)
+                self._entries[entry["key"]] = {"verdict": entry["verdict"], "model": entry.get("model", "")}
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def get(self, topic: str, claims: List[str], source_ids: List[str]) -> Optional[str]:
+        if self.path is None:
+            return None
+        key = self.key_of(topic, claims, source_ids)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._refresh()
+                entry = self._entries.get(key)
+        record_cache("debate_verdict", hits=int(entry is not None), misses=int(entry is None))
+        return entry.get("verdict") if entry else None
+
+    def put(self, topic: str, claims: List[str], source_ids: List[str], verdict: str, model_name: str = "") -> None:
+        if self.path is None or not verdict:
+            return
+        key = self.key_of(topic, claims, source_ids)
+        line = json.dumps({"key": key, "verdict": verdict, "model": model_name}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries[key] = {"verdict": verdict, "model": model_name}
+            try:
+                with file_lock(self.path.with_name(self.path.name + ".lock")):
+                    with self.path.open("a", encoding="utf-8") as f:
+                        f.write(line)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._pos = 0
+            if self.path is not None and self.path.exists():
+                self.path.unlink()
+
+
+# Process-wide memo used by the graph's debater node
+verdict_memo = VerdictMemo(settings.DEBATE_VERDICT_CACHE)
+
+
+def _init_debater_llm(model_name: str):
     if settings.openai_base_url and "openai.com" not in settings.openai_base_url:
         from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(
+        return ChatOpenAI(
             model=model_name,
             openai_api_key=settings.openai_api_key,
             openai_api_base=settings.openai_base_url,
             temperature=0
         )
-    else:
-        llm = init_chat_model(model=model_name, model_provider="openai")
+    return init_chat_model(model=model_name, model_provider="openai")
 
-    # 4. Iterative Debate (Scientist <-> Philosopher loop)
-    debate_rounds = configurable.get("debate_rounds", 2)
+
+def _format_claims(claims: List[str], source_ids: List[str]) -> str:
+    return "\n".join([f"- Claim {i+1}: {claim} (Source: {source_ids[i] if i < len(source_ids) else 'Unknown'})"
+                      for i, claim in enumerate(claims)])
+
+
+def _format_batch(conflicts: List[dict]) -> str:
+    if len(conflicts) == 1:
+        conflict = conflicts[0]
+        return _format_claims(conflict.get("claims") or [], conflict.get("source_ids") or [])
+    blocks = []
+    for i, conflict in enumerate(conflicts):
+        blocks.append(
+            f"Conflict {i+1}:\n"
+            + _format_claims(conflict.get("claims") or [], conflict.get("source_ids") or [])
+        )
+    return "\n\n".join(blocks)
+
+
+def _split_batch_verdict(text: str, count: int) -> Dict[int, str]:
+    """Split a batched judge output into per-conflict verdicts (1-based)."""
+    matches = list(_CONFLICT_SECTION.finditer(text or ""))
+    sections: Dict[int, str] = {}
+    for pos, match in enumerate(matches):
+        index = int(match.group(1))
+        end = matches[pos + 1].start() if pos + 1 < len(matches) else len(text)
+        section = text[match.start():end].strip()
+        if 1 <= index <= count and section and index not in sections:
+            sections[index] = section
+    return sections
+
+
+async def _role_turn(llm, model_name: str, role_name: str, topic: str, document: str, history: List[str]) -> str:
+    history_block = ""
+    if history:
+        history_block = (
+            "The following reponses are from other agents as additional information.\n"
+            + "\n".join(history)
+            + "\n"
+        )
+    role_prompt = DEBATER_AGENT_PROMPT.format(
+        query=topic,
+        document=document,
+        history_block=history_block,
+    )
+    role_messages = [
+        SystemMessage(content=DEBATER_ROLE_SYSTEM_PROMPT.format(role=role_name)),
+        HumanMessage(content=role_prompt),
+    ]
+    role_response = await safe_ainvoke(llm, role_messages, model_name=model_name, call_site="debate_role")
+    return role_response.content.strip()
+
+
+async def _debate_session(llm, model_name: str, topic: str, conflicts: List[dict], debate_rounds: int) -> str:
+    """Run one debate over one or more conflicts sharing a topic; returns the judge output."""
+    document = _format_batch(conflicts)
     debate_history: List[str] = []
-    roles = ["Scientist", "Philosopher"]
 
     for _ in range(debate_rounds):
+        results = await asyncio.gather(
+            *[_role_turn(llm, model_name, role_name, topic, document, debate_history) for role_name in DEBATE_ROLES],
+            return_exceptions=True,
+        )
         round_markers = []
-        for role_name in roles:
-            history_block = ""
-            if debate_history:
-                history_block = (
-                    "The following reponses are from other agents as additional information.\n"
-                    + "\n".join(debate_history)
-                    + "\n"
-                )
-            role_prompt = DEBATER_AGENT_PROMPT.format(
-                query=topic,
-                document=claims_text,
-                history_block=history_block,
-            )
-            role_messages = [
-                SystemMessage(content=DEBATER_ROLE_SYSTEM_PROMPT.format(role=role_name)),
-                HumanMessage(content=role_prompt),
-            ]
-            try:
-                role_response = await safe_ainvoke(llm, role_messages, model_name=model_name)
-                content = role_response.content.strip()
-                debate_history.append(f"{role_name}: {content}")
-                round_markers.append(_extract_consensus_marker(content))
-            except Exception as e:
-                debate_history.append(f"{role_name}: Debate step failed: {str(e)}")
+        for role_name, result in zip(DEBATE_ROLES, results):
+            if isinstance(result, Exception):
+                debate_history.append(f"{role_name}: Debate step failed: {str(result)}")
                 round_markers.append("")
-        if len(round_markers) == len(roles):
+            else:
+                debate_history.append(f"{role_name}: {result}")
+                round_markers.append(_extract_consensus_marker(result))
+        # Consensus markers are only comparable for a single conflict
+        if len(conflicts) == 1:
             non_empty = [m for m in round_markers if m]
             if non_empty and len(set(non_empty)) == 1:
                 break
 
     joined = "\n".join(debate_history)
     judge_prompt = DEBATER_AGGREGATOR_PROMPT.format(query=topic, responses=joined)
+    if len(conflicts) > 1:
+        judge_prompt += (
+            f"\nThe agents debated {len(conflicts)} separate conflicts:\n{document}\n\n"
+            "Give a separate verdict for EACH conflict. Start each verdict on its own line "
+            "with '### Conflict N' (N = conflict number)."
+        )
     judge_messages = [
         SystemMessage(content=DEBATER_AGGREGATOR_SYSTEM_PROMPT),
         HumanMessage(content=judge_prompt),
     ]
+    response = await safe_ainvoke(llm, judge_messages, model_name=model_name, call_site="debate_judge")
+    return response.content
+
+
+async def adjudicate_conflicts(
+    conflicts: List[dict],
+    model_name: str = DEFAULT_DEBATER_MODEL,
+    debate_rounds: int = 2,
+    memo: Optional[VerdictMemo] = None,
+    llm=None,
+) -> List[str]:
+    """
+    Adjudicate several conflicts ({topic, claims, source_ids}); returns one verdict per conflict.
+
+    Memoized verdicts are reused; the rest are grouped by normalized topic and each group
+    is debated in one session, all groups concurrently. Conflicts missing from a batched
+    judge output are re-run individually.
+    """
+    verdicts: List[Optional[str]] = [None] * len(conflicts)
+    groups: Dict[str, List[int]] = {}
+    for i, conflict in enumerate(conflicts):
+        cached = memo.get(conflict.get("topic"), conflict.get("claims"), conflict.get("source_ids")) if memo else None
+        if cached:
+            verdicts[i] = cached
+            continue
+        groups.setdefault((conflict.get("topic") or "").strip().lower(), []).append(i)
+    if not groups:
+        return verdicts
+
+    llm = llm or _init_debater_llm(model_name)
+
+    async def _run_group(indices: List[int]) -> None:
+        group = [conflicts[i] for i in indices]
+        topic = group[0].get("topic") or ""
+        try:
+            text = await _debate_session(llm, model_name, topic, group, debate_rounds)
+        except Exception as e:
+            for i in indices:
+                verdicts[i] = f"Debate failed: {str(e)}"
+            return
+        if len(group) == 1:
+            verdicts[indices[0]] = text
+            return
+        sections = _split_batch_verdict(text, len(group))
+        retry = []
+        for pos, i in enumerate(indices):
+            if pos + 1 in sections:
+                verdicts[i] = sections[pos + 1]
+            else:
+                retry.append(i)
+        if retry:
+            await asyncio.gather(*[_run_group([i]) for i in retry])
+
+    await asyncio.gather(*[_run_group(indices) for indices in groups.values()])
+
+    if memo is not None:
+        for conflict, verdict in zip(conflicts, verdicts):
+            if verdict and not verdict.startswith("Debate failed"):
+                memo.put(conflict.get("topic"), conflict.get("claims"), conflict.get("source_ids"), verdict, model_name)
+    return verdicts
+
+
+@tool("ResolveConflict", args_schema=ResolveConflict)
+async def debater_tool(
+    topic: str,
+    claims: List[str],
+    source_ids: List[str],
+    config: RunnableConfig = None
+) -> str:
+    """
+    Adjudicates a conflict between two or more claims.
+    Returns a verdict explaining which claim is most likely true based on source credibility and recency.
+    """
+    configurable = config.get("configurable", {}) if config else {}
+    model_name = configurable.get("debater_model", DEFAULT_DEBATER_MODEL)
+    debate_rounds = configurable.get("debate_rounds", 2)
 
-    try:
-        response = await safe_ainvoke(llm, judge_messages, model_name=model_name)
-        return response.content
-    except Exception as e:
-        return f"Debate failed: {str(e)}"
+    verdicts = await adjudicate_conflicts(
+        [{"topic": topic, "claims": claims, "source_ids": source_ids}],
+        model_name=model_name,
+        debate_rounds=debate_rounds,
+    )
+    return verdicts[0]
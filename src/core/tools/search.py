@@ -12,6 +12,9 @@ from langchain_core.runnables import RunnableConfig
 from tavily import AsyncTavilyClient
 
 from src.core.models.credibility import evaluate_credibility
+from src.core.profiling import record_http, serialized_size
+from src.core.replay import get_replay_session, intercept_call
+
 TAVILY_SEARCH_DESCRIPTION = (
     "A search engine optimized for comprehensive, accurate, and trusted results. "
     "Useful for when you need to answer questions about current events."
@@ -94,18 +97,25 @@ async def tavily_search_async(
 ):
     """Execute multiple Tavily search queries asynchronously."""
 
+    # Replayed runs are served from the recording (src.core.replay) and need no API key
+    session = get_replay_session()
+    replaying = session is not None and session.replaying
     api_key = get_tavily_api_key(config)
-    if not api_key:
+    if not api_key and not replaying:
         raise ValueError("TAVILY_API_KEY is required. Please set the environment variable.")
 
-    tavily_client = AsyncTavilyClient(api_key=api_key)
+    tavily_client = None if replaying else AsyncTavilyClient(api_key=api_key)
 
     tasks = [
-        tavily_client.search(
-            query,
-            max_results=max_results,
-            include_raw_content=include_raw_content,
-            topic=topic,
+        intercept_call(
+            "search",
+            {"query": query, "max_results": max_results, "topic": topic, "include_raw_content": include_raw_content},
+            lambda query=query: tavily_client.search(
+                query,
+                max_results=max_results,
+                include_raw_content=include_raw_content,
+                topic=topic,
+            ),
         )
         for query in search_queries
     ]
@@ -123,6 +133,7 @@ async def tavily_search_async(
         if isinstance(res, Exception):
             raise res  # Propagate actual errors instead of hiding them
         else:
+            record_http(serialized_size(res))
             cleaned_results.append(res)
     return cleaned_results
 
@@ -151,13 +162,19 @@ def score_result(item: dict) -> float:
         or item.get("date")
         or ""
     )
-    recency_bonus = 0.0
+    bonus = 0.0
     if published:
         try:
             published_dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
             days = max((datetime.now(published_dt.tzinfo) - published_dt).days, 0)
-            if days <= 365:
-                recency_bonus = max(10 - days / 40, 0)  # up to +10 for fresh
+            bonus = recency_bonus(days)
         except Exception:
             pass
-    return cred.score + recency_bonus
+    return cred.score + bonus
+
+
+def recency_bonus(days: Optional[int]) -> float:
+    """Recency bonus used by score_result: up to +10 for fresh, 0 after a year."""
+    if days is None or days > 365:
+        return 0.0
+    return max(10 - days / 40, 0)
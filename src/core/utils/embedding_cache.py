@@ -0,0 +1,342 @@
+"""
+Persistent Embedding Cache for DeepTrace.
+Embeddings keyed by (model name, text digest) in a memory-mapped float32 matrix with an
+append-only key -> row journal, so re-clustering only embeds texts it has never seen.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.core.profiling import record_cache
+from src.core.utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+_KEY_DTYPE = "S40"  # sha1 hexdigest
+_INITIAL_CAPACITY = 1024
+_JOURNAL_DTYPE = np.dtype([("key", _KEY_DTYPE), ("row", "<i8")])
+_COMPACT_FACTOR = 4
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest().encode("ascii")
+
+
+def _model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name or "default")
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding store for one model, shared by concurrent runs.
+
+    Layout (under <root>/<model>/):
+        vectors.f32  float32 matrix (capacity x dim), memory-mapped
+        index.bin    append-only journal of (text digest, row) records, row -1 drops the
+                     digest; replayed in order it yields the key -> row map
+        meta.json    model / dim
+        .lock        flock held (by any process) while rows are allocated or read
+
+    Every operation first replays the journal records other processes appended since the
+    last call, so row allocation and eviction always work on the shared state. Recency
+    for LRU eviction is journal order plus this process's own hits; the journal is
+    compacted once it holds _COMPACT_FACTOR times more records than live entries.
+    """
+
+    def __init__(self, root: str, model_name: str, max_entries: int = 200_000):
+        self.dir = Path(root) / _model_slug(model_name)
+        self.model_name = model_name
+        self.max_entries = max(int(max_entries), 1)
+        self.dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._index: Dict[bytes, int] = {}
+        self._ticks: Dict[bytes, int] = {}  # last use, for LRU eviction
+        self._free: Set[int] = set()
+        self._count = 0  # high-water mark of used rows
+        self._tick = 0
+        self._journal_pos = 0
+        self._journal_ino: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sync()
+
+    # --- persistence ---
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.dir / "vectors.f32"
+
+    @property
+    def _journal_path(self) -> Path:
+        return self.dir / "index.bin"
+
+    @contextmanager
+    def _shared(self) -> Iterator[None]:
+        """Thread lock + inter-process lock, with the journal replayed up to date."""
+        with self._lock, file_lock(self.dir / ".lock"):
+            self._sync()
+            yield
+
+    def _reset(self) -> None:
+        self._index, self._ticks, self._free = {}, {}, set()
+        self._count = 0
+        self._journal_pos = 0
+
+    def _apply(self, key: bytes, row: int) -> None:
+        self._tick += 1
+        if row < 0:
+            old = self._index.pop(key, None)
+            self._ticks.pop(key, None)
+            if old is not None:
+                self._free.add(old)
+            return
+        previous = self._index.get(key)
+        if previous is not None and previous != row:
+            self._free.add(previous)
+        self._index[key] = row
+        self._ticks[key] = self._tick
+        self._free.discard(row)
+        if row >= self._count:
+            self._free.update(range(self._count, row))
+            self._count = row + 1
+
+    def _sync(self) -> None:
+        """Replay journal records appended since the last call (all of them after a compaction)."""
+        if self.dim is None:
+            try:
+                self.dim = int(json.loads((self.dir / "meta.json").read_text(encoding="utf-8"))["dim"])
+            except (OSError, ValueError, KeyError):
+                pass
+        try:
+            stat = self._journal_path.stat()
+        except OSError:
+            if self._journal_ino is not None:
+                self._reset()
+                self._journal_ino = None
+            return
+        if stat.st_ino != self._journal_ino:
+            self._reset()
+            self._journal_ino = stat.st_ino
+        if stat.st_size <= self._journal_pos:
+            return
+        try:
+            with self._journal_path.open("rb") as f:
+                f.seek(self._journal_pos)
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"Embedding cache journal at {self.dir} unreadable: {e}")
+            return
+        data = data[: len(data) - len(data) % _JOURNAL_DTYPE.itemsize]
+        self._journal_pos += len(data)
+        for key, row in np.frombuffer(data, dtype=_JOURNAL_DTYPE).tolist():
+            self._apply(key, row)
+
+    def _append_journal(self, records: List[tuple]) -> None:
+        if not records:
+            return
+        data = np.array(records, dtype=_JOURNAL_DTYPE).tobytes()
+        with self._journal_path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        stat = self._journal_path.stat()
+        if self._journal_ino is None:
+            self._journal_ino = stat.st_ino
+        self._journal_pos = stat.st_size
+        if self._journal_pos // _JOURNAL_DTYPE.itemsize > _COMPACT_FACTOR * max(len(self._index), _INITIAL_CAPACITY):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = sorted(self._index.items(), key=lambda item: self._ticks.get(item[0], 0))
+        tmp_path = self.dir / "index.bin.tmp"
+        tmp_path.write_bytes(np.array(live, dtype=_JOURNAL_DTYPE).tobytes())
+        os.replace(tmp_path, self._journal_path)
+        stat = self._journal_path.stat()
+        self._journal_ino, self._journal_pos = stat.st_ino, stat.st_size
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+
+    # --- storage management ---
+
+    def _ensure_capacity(self, rows_needed: int) -> None:
+        """Map at least rows_needed rows, growing vectors.f32 (under the file lock) if needed."""
+        if self._vectors is not None and rows_needed <= self._vectors.shape[0]:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        row_bytes = self.dim * 4
+        capacity = self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        if rows_needed > capacity:
+            new_capacity = max(_INITIAL_CAPACITY, capacity)
+            while new_capacity < rows_needed:
+                new_capacity *= 2
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(new_capacity * row_bytes)
+            capacity = new_capacity
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _evict(self, incoming: int) -> List[tuple]:
+        """Drop least recently used entries to make room; returns their journal records."""
+        overflow = len(self._index) + incoming - self.max_entries
+        if overflow <= 0:
+            return []
+        # Evict in batches (10% slack) so steady-state inserts do not sort every time
+        evict_count = min(len(self._index), max(overflow, self.max_entries // 10))
+        oldest = heapq.nsmallest(evict_count, self._index, key=self._ticks.__getitem__)
+        records = [(key, -1) for key in oldest]
+        for key, row in records:
+            self._apply(key, row)
+        logger.info(f"Embedding cache {self.model_name}: evicted {len(oldest)} entries")
+        return records
+
+    # --- public API ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._index)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Batched lookup; returns a vector (copy) or None per text."""
+        if not self.dir.exists():
+            # Nothing cached yet; do not create the directory / lock file for a lookup
+            return [None] * len(texts)
+        digests = [text_digest(t) for t in texts]
+        with self._shared():
+            rows = [self._index.get(d) for d in digests]
+            hit_rows = np.array([r for r in rows if r is not None], dtype=np.int64)
+            if hit_rows.size == 0:
+                return [None] * len(texts)
+            self._ensure_capacity(self._count)
+            hit_vectors = np.array(self._vectors[hit_rows])
+            self._tick += 1
+            for digest, row in zip(digests, rows):
+                if row is not None:
+                    self._ticks[digest] = self._tick
+        results: List[Optional[np.ndarray]] = []
+        cursor = 0
+        for row in rows:
+            if row is None:
+                results.append(None)
+            else:
+                results.append(hit_vectors[cursor])
+                cursor += 1
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors) -> None:
+        """Bulk-fill texts -> vectors, evicting least recently used entries past max_entries."""
+        if not len(texts):
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(texts):
+            raise ValueError("vectors must be a (len(texts), dim) matrix")
+        with self._shared():
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self.dir.mkdir(parents=True, exist_ok=True)
+                (self.dir / "meta.json").write_text(
+                    json.dumps({"model": self.model_name, "dim": self.dim}), encoding="utf-8"
+                )
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {matrix.shape[1]} != cached dim {self.dim} for {self.model_name}")
+
+            pending: Dict[bytes, int] = {}
+            for i, text in enumerate(texts):
+                pending[text_digest(text)] = i
+            records = self._evict(sum(1 for d in pending if d not in self._index))
+
+            rows = []
+            for digest in pending:
+                row = self._index.get(digest)
+                if row is None:
+                    row = self._free.pop() if self._free else self._count
+                    records.append((digest, row))
+                    self._apply(digest, row)
+                else:
+                    self._tick += 1
+                    self._ticks[digest] = self._tick
+                rows.append(row)
+            self._ensure_capacity(self._count)
+            self._vectors[np.array(rows, dtype=np.int64)] = matrix[list(pending.values())]
+            # Vectors reach the file before the journal records that point at them
+            self._vectors.flush()
+            self._append_journal(records)
+
+
+class CachedEmbeddings:
+    """
+    Embeddings wrapper: batched cache lookup, one bulk call for the misses, write-back.
+    Unknown attributes are delegated to the wrapped model.
+    """
+
+    def __init__(self, base, store: EmbeddingStore):
+        self.base = base
+        self.store = store
+
+    def _split(self, texts: Sequence[str]):
+        cached = self.store.get_many(texts)
+        misses = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        hits = sum(1 for v in cached if v is not None)
+        record_cache("embeddings", hits=hits, misses=len(texts) - hits)
+        return cached, misses
+
+    def _assemble(self, texts, cached, misses, miss_vectors) -> List[List[float]]:
+        if misses:
+            self.store.put_many(misses, miss_vectors)
+        by_text = dict(zip(misses, miss_vectors))
+        return [
+            (v.tolist() if v is not None else list(by_text[t]))
+            for t, v in zip(texts, cached)
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached, misses = self._split(texts)
+        miss_vectors = self.base.embed_documents(misses) if misses else []
+        return self._assemble(texts, cached, misses, miss_vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached, misses = self._split(texts)
+        miss_vectors = []
+        if misses:
+            try:
+                miss_vectors = await self.base.aembed_documents(misses)
+            except AttributeError:
+                miss_vectors = self.base.embed_documents(misses)
+        return self._assemble(texts, cached, misses, miss_vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def __getattr__(self, name):
+        return getattr(self.base, name)
+
+
+_stores: Dict[tuple, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(root: str, model_name: str, max_entries: int = 200_000) -> EmbeddingStore:
+    """Process-wide store per (root, model) so all clusterers share one memory map."""
+    key = (str(Path(root).resolve()), model_name)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = EmbeddingStore(root, model_name, max_entries=max_entries)
+            _stores[key] = store
+        return store
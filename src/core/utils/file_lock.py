@@ -0,0 +1,44 @@
+"""
+Inter-process advisory file locks for the shared on-disk caches/stores.
+
+Several runs (processes) may write the same data/ directory; writers hold an exclusive
+flock on a sidecar lock file around read-modify-write sections. On platforms without
+fcntl the lock only serializes threads of the current process.
+"""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    key = str(path.resolve())
+    with _registry_lock:
+        if key not in _thread_locks:
+            _thread_locks[key] = threading.Lock()
+        return _thread_locks[key]
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """Exclusive lock on path (created if missing), held for the with-block."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _thread_lock(path):
+        with path.open("a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
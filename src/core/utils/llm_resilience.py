@@ -0,0 +1,335 @@
+"""
+LLM Resilience Utilities for DeepTrace.
+Jittered exponential backoff (honoring Retry-After), per-provider circuit breakers,
+hedged requests and fallback-model routing for transient provider failures.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Exception class names that indicate a transient provider/network failure
+TRANSIENT_ERROR_NAMES = {
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "ServiceUnavailable",
+    "OverloadedError",
+    "TimeoutException",
+    "ReadTimeout",
+    "ConnectTimeout",
+    "ConnectError",
+    "RemoteProtocolError",
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit breaker rejects a call."""
+
+
+def _status_code(exception: Exception) -> Optional[int]:
+    code = getattr(exception, "status_code", None)
+    if code is None:
+        response = getattr(exception, "response", None)
+        code = getattr(response, "status_code", None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient_error(exception: Exception) -> bool:
+    """Determine if an exception is a retryable 429 / timeout / 5xx / connection failure."""
+    if isinstance(exception, CircuitOpenError):
+        return False
+    if isinstance(exception, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    code = _status_code(exception)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    if exception.__class__.__name__ in TRANSIENT_ERROR_NAMES:
+        return True
+    error_str = str(exception).lower()
+    return any(
+        marker in error_str
+        for marker in ("rate limit", "too many requests", "timed out", "service unavailable", "overloaded")
+    )
+
+
+def get_retry_after(exception: Exception) -> Optional[float]:
+    """Extract the Retry-After delay (seconds) from an exception's response headers."""
+    headers = None
+    response = getattr(exception, "response", None)
+    if response is not None:
+        headers = getattr(response, "headers", None)
+    if headers is None:
+        headers = getattr(exception, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return max(float(value) / 1000.0, 0.0)
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    except Exception:
+        return None
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except Exception:
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """Full-jitter exponential backoff; a provider Retry-After acts as a lower bound."""
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, max_delay))
+    return delay
+
+
+def provider_of(model_name: Optional[str], base_url: Optional[str] = None) -> str:
+    """Resolve the provider key used for circuit breaking."""
+    name = (model_name or "").lower()
+    if ":" in name:
+        return name.split(":", 1)[0]
+    if base_url:
+        return base_url.lower().split("//", 1)[-1].split("/", 1)[0]
+    return "default"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    closed -> open after failure_threshold transient failures; open -> half_open after
+    reset_timeout seconds; a half_open probe success closes it, a failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_probe = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._half_open_probe:
+                self._half_open_probe = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._half_open_probe = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._half_open_probe or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._half_open_probe = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, reset_timeout)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+@dataclass
+class CallSiteMetrics:
+    """Resilience counters for one call site (node)."""
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    circuit_rejections: int = 0
+    hedges_launched: int = 0
+    hedge_wins: int = 0
+    fallbacks: int = 0
+    total_latency_s: float = 0.0
+
+
+class ResilienceMetrics:
+    """Thread-safe per-call-site resilience metrics."""
+
+    def __init__(self):
+        self._sites: Dict[str, CallSiteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, call_site: Optional[str], field_name: str, amount: float = 1) -> None:
+        with self._lock:
+            metrics = self._sites.setdefault(call_site or "unknown", CallSiteMetrics())
+            setattr(metrics, field_name, getattr(metrics, field_name) + amount)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {site: asdict(m) for site, m in self._sites.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sites.clear()
+
+
+# Process-wide metrics populated by resilient_ainvoke
+resilience_metrics = ResilienceMetrics()
+
+
+async def _hedged_call(runnable, messages, hedge_after: float, call_site: Optional[str]):
+    """
+    Start the request; if it has not finished after hedge_after seconds, launch a
+    duplicate and return whichever succeeds first (the loser is cancelled).
+    """
+    primary = asyncio.ensure_future(runnable.ainvoke(messages))
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    resilience_metrics.incr(call_site, "hedges_launched")
+    hedge = asyncio.ensure_future(runnable.ainvoke(messages))
+    pending = {primary, hedge}
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        resilience_metrics.incr(call_site, "hedge_wins")
+                    return task.result()
+                last_error = task.exception()
+    finally:
+        for task in pending:
+            task.cancel()
+    raise last_error
+
+
+async def resilient_ainvoke(
+    runnable,
+    messages,
+    model_name: Optional[str] = None,
+    call_site: Optional[str] = None,
+    max_attempts: int = 4,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    hedge_after: Optional[float] = None,
+    fallback=None,
+    fallback_model_name: Optional[str] = None,
+    breaker: Optional[CircuitBreaker] = None,
+):
+    """
+    Invoke runnable.ainvoke(messages) with transient-failure handling.
+
+    Non-transient errors (including token-limit errors) propagate immediately so the
+    caller's own handling (e.g. safe_ainvoke truncation) still applies. When retries
+    are exhausted or the provider circuit is open, the optional fallback runnable is
+    tried once.
+    """
+    resilience_metrics.incr(call_site, "calls")
+    started = time.monotonic()
+    last_error: Optional[Exception] = None
+
+    try:
+        for attempt in range(max(max_attempts, 1)):
+            if breaker is not None and not breaker.allow():
+                resilience_metrics.incr(call_site, "circuit_rejections")
+                last_error = CircuitOpenError(
+                    f"Circuit open for provider of model '{model_name}'; skipping call."
+                )
+                break
+            try:
+                if isinstance(hedge_after, (int, float)) and hedge_after > 0:
+                    response = await _hedged_call(runnable, messages, hedge_after, call_site)
+                else:
+                    response = await runnable.ainvoke(messages)
+            except Exception as e:
+                if not is_transient_error(e):
+                    if breaker is not None:
+                        # The provider answered; only transient failures count against it
+                        breaker.record_success()
+                    raise
+                last_error = e
+                if breaker is not None:
+                    breaker.record_failure()
+                if attempt + 1 >= max_attempts:
+                    break
+                delay = backoff_delay(attempt, base_delay, max_delay, get_retry_after(e))
+                resilience_metrics.incr(call_site, "retries")
+                logger.warning(
+                    f"Transient LLM error at {call_site or 'unknown'} "
+                    f"(attempt {attempt + 1}/{max_attempts}): {e}; retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            resilience_metrics.incr(call_site, "successes")
+            return response
+
+        if fallback is not None:
+            resilience_metrics.incr(call_site, "fallbacks")
+            logger.warning(
+                f"Routing {call_site or 'unknown'} to fallback model {fallback_model_name or 'unknown'} "
+                f"after: {last_error}"
+            )
+            response = await fallback.ainvoke(messages)
+            resilience_metrics.incr(call_site, "successes")
+            return response
+    except Exception:
+        resilience_metrics.incr(call_site, "failures")
+        raise
+    finally:
+        resilience_metrics.incr(call_site, "total_latency_s", time.monotonic() - started)
+
+    resilience_metrics.incr(call_site, "failures")
+    raise last_error
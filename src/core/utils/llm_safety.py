@@ -6,6 +6,20 @@ Ported from Open Deep Research (ODR) to prevent token overflow crashes.
 from typing import List, Optional, Union
 from langchain_core.messages import AIMessage, BaseMessage
 
+from src.config.settings import settings
+from src.core.utils.llm_resilience import (
+    get_circuit_breaker,
+    provider_of,
+    resilient_ainvoke,
+)
+from src.core.utils.token_budget import (
+    estimate_message_tokens,
+    estimate_tokens,
+    extract_usage,
+    token_ledger,
+    truncate_to_tokens,
+)
+
 # Define MessageLike protocol/type alias if not available
 MessageLikeRepresentation = Union[BaseMessage, dict]
 
@@ -30,11 +44,20 @@ MODEL_TOKEN_LIMITS = {
 }
 
 
+# Tokens kept free for the completion when fitting a prompt into the context window
+OUTPUT_TOKEN_RESERVE = 4096
+
+
 def get_model_token_limit(model_string: str) -> Optional[int]:
     """Look up the token limit for a specific model."""
     for model_key, token_limit in MODEL_TOKEN_LIMITS.items():
         if model_key in model_string:
             return token_limit
+    # Bare model names (no provider prefix), e.g. settings.model_name = "gpt-4o"
+    bare = model_string.split(":", 1)[-1]
+    for model_key, token_limit in MODEL_TOKEN_LIMITS.items():
+        if bare.startswith(model_key.split(":", 1)[1]):
+            return token_limit
     return None
 
 
@@ -189,24 +212,124 @@ def _drop_oldest_non_system(
     return messages[1:] if len(messages) > 1 else messages
 
 
+def _with_content(msg: MessageLikeRepresentation, content: str) -> MessageLikeRepresentation:
+    if isinstance(msg, BaseMessage):
+        return msg.model_copy(update={"content": content})
+    updated = dict(msg)
+    updated["content"] = content
+    return updated
+
+
+def fit_messages_to_limit(
+    messages: List[MessageLikeRepresentation],
+    max_prompt_tokens: int,
+    model_name: Optional[str] = None,
+) -> List[MessageLikeRepresentation]:
+    """
+    Pre-flight truncation so the prompt fits max_prompt_tokens before it is sent.
+    Drops history with the same strategies as the retry path, then trims the
+    longest non-system message as a last resort.
+    """
+    current = list(messages)
+    while len(current) > 2 and estimate_message_tokens(current, model_name) > max_prompt_tokens:
+        truncated = remove_up_to_last_ai_message(current)
+        if truncated == current or not truncated:
+            truncated = _drop_oldest_non_system(current)
+        if truncated == current or not truncated:
+            break
+        current = truncated
+
+    overflow = estimate_message_tokens(current, model_name) - max_prompt_tokens
+    if overflow <= 0:
+        return current
+
+    longest_idx, longest_tokens = None, 0
+    for i, msg in enumerate(current):
+        role = msg.type if isinstance(msg, BaseMessage) else (msg.get("role") if isinstance(msg, dict) else None)
+        content = msg.content if isinstance(msg, BaseMessage) else (msg.get("content") if isinstance(msg, dict) else None)
+        if role == "system" or not isinstance(content, str):
+            continue
+        tokens = estimate_tokens(content, model_name)
+        if tokens > longest_tokens:
+            longest_idx, longest_tokens = i, tokens
+    if longest_idx is None:
+        return current
+
+    msg = current[longest_idx]
+    content = msg.content if isinstance(msg, BaseMessage) else msg.get("content", "")
+    current[longest_idx] = _with_content(
+        msg, truncate_to_tokens(content, max(longest_tokens - overflow, 0), model_name)
+    )
+    return current
+
+
+def _record_usage(response, messages, model_name: Optional[str], call_site: Optional[str]) -> None:
+    usage = extract_usage(response)
+    if usage is not None:
+        token_ledger.record(model_name, usage[0], usage[1], call_site=call_site)
+        return
+    content = getattr(response, "content", "")
+    token_ledger.record(
+        model_name,
+        estimate_message_tokens(messages, model_name),
+        estimate_tokens(content if isinstance(content, str) else "", model_name),
+        call_site=call_site,
+        estimated=True,
+    )
+
+
 async def safe_ainvoke(
     runnable,
     messages: List[MessageLikeRepresentation],
     model_name: Optional[str] = None,
     max_retries: int = 3,
+    call_site: Optional[str] = None,
+    hedge_after: Optional[float] = None,
+    fallback=None,
+    fallback_model_name: Optional[str] = None,
 ):
     """
     Invoke an LLM with token-limit retries using recursive truncation.
+
+    When the model's context window is known, the prompt is fitted to it before
+    sending; token usage of the successful call is recorded in token_ledger.
+    Transient failures (429, timeouts, 5xx) are retried with jittered backoff behind
+    a per-provider circuit breaker (see llm_resilience); hedge_after launches a
+    duplicate request for latency-sensitive calls and fallback is tried last.
     """
     if not hasattr(runnable, "ainvoke"):
         raise TypeError("safe_ainvoke expects a runnable with .ainvoke()")
 
     current_messages = list(messages)
+    token_limit = get_model_token_limit(model_name) if model_name else None
+    if token_limit:
+        current_messages = fit_messages_to_limit(
+            current_messages, token_limit - OUTPUT_TOKEN_RESERVE, model_name
+        )
     last_error: Optional[Exception] = None
+    breaker = get_circuit_breaker(
+        provider_of(model_name, settings.openai_base_url),
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+    )
 
     for _ in range(max_retries):
         try:
-            return await runnable.ainvoke(current_messages)
+            response = await resilient_ainvoke(
+                runnable,
+                current_messages,
+                model_name=model_name,
+                call_site=call_site,
+                max_attempts=settings.LLM_MAX_ATTEMPTS,
+                base_delay=settings.LLM_BACKOFF_BASE_SECONDS,
+                max_delay=settings.LLM_BACKOFF_MAX_SECONDS,
+                hedge_after=hedge_after,
+                fallback=fallback,
+                fallback_model_name=fallback_model_name,
+                breaker=breaker,
+            )
+            _record_usage(response, current_messages, model_name, call_site)
+            return response
         except Exception as e:  # pragma: no cover - behavior validated in higher-level tests
             last_error = e
             if not is_token_limit_exceeded(e, model_name):
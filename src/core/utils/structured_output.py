@@ -0,0 +1,304 @@
+"""
+Structured Output Utilities for DeepTrace.
+Local JSON repair and schema-guided coercion for LLM outputs, with a short
+repair re-ask (broken output only, never the original context) as last resort.
+"""
+
+import ast
+import json
+import logging
+import re
+from typing import Any, Callable, List, Optional, Type, get_args, get_origin
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, ValidationError
+
+from src.core.utils.llm_safety import safe_ainvoke
+from src.core.utils.token_budget import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Max tokens of broken output echoed back in a repair prompt
+REPAIR_OUTPUT_TOKEN_LIMIT = 6000
+
+_FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when an LLM output cannot be repaired into the expected structure."""
+
+
+def _strip_fences(text: str) -> str:
+    match = _FENCE_PATTERN.search(text)
+    if match:
+        return match.group(1)
+    # Unterminated fence (truncated output)
+    if text.lstrip().startswith("```"):
+        return text.lstrip()[3:].lstrip("json").lstrip("JSON")
+    return text
+
+
+def _balanced_slice(text: str) -> Optional[str]:
+    """
+    Return the first JSON object/array in text, dropping leading/trailing prose.
+    Truncated structures are closed (open string, then open brackets).
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in ("}", "]"):
+            if stack and stack[-1] == ch:
+                stack.pop()
+                if not stack:
+                    return text[start : i + 1]
+    # Truncated: close what is open
+    tail = text[start:]
+    if in_string:
+        tail += '"'
+    tail = tail.rstrip()
+    while tail.endswith(","):
+        tail = tail[:-1].rstrip()
+    if tail.endswith(":"):
+        tail += " null"
+    return tail + "".join(reversed(stack))
+
+
+def _normalize_outside_strings(text: str) -> str:
+    """
+    Single pass fixing common LLM JSON mistakes outside string literals:
+    trailing commas, // and /* */ comments, Python literals (True/False/None),
+    and raw newlines inside strings.
+    """
+    out: List[str] = []
+    i, n = 0, len(text)
+    in_string = False
+    escaped = False
+    while i < n:
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                out.append("\\n")
+                i += 1
+                continue
+            out.append(ch)
+            i += 1
+            continue
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+            i += 1
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j].isspace():
+                j += 1
+            if j < n and text[j] in "}]":
+                i += 1  # drop trailing comma
+            else:
+                out.append(ch)
+                i += 1
+        elif ch.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append({"True": "true", "False": "false", "None": "null"}.get(word, word))
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse JSON from an LLM output, repairing it locally where possible.
+
+    Raises:
+        StructuredOutputError: if no JSON value can be recovered.
+    """
+    if not text or not text.strip():
+        raise StructuredOutputError("Empty output")
+    try:
+        return json.loads(text)
+    except Exception:
+        pass
+
+    body = _strip_fences(text)
+    sliced = _balanced_slice(body)
+    if sliced is None:
+        raise StructuredOutputError("No JSON object or array found in output")
+    for candidate in (sliced, _normalize_outside_strings(sliced)):
+        try:
+            return json.loads(candidate)
+        except Exception:
+            continue
+    # Single-quoted / Python-style dicts
+    try:
+        value = ast.literal_eval(sliced)
+        if isinstance(value, (dict, list)):
+            return value
+    except Exception:
+        pass
+    raise StructuredOutputError("Could not repair JSON output")
+
+
+def _list_item_model(annotation) -> Optional[Type[BaseModel]]:
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0]
+    return None
+
+
+def coerce_to_schema(data: Any, pydantic_object: Type[BaseModel]) -> BaseModel:
+    """
+    Schema-guided coercion into pydantic_object.
+    - unwraps single-key wrappers ({"result": {...}})
+    - wraps a bare list into the model's only list field
+    - wraps a single object where a list is expected
+    - drops invalid items of list-of-model fields instead of failing the whole output
+    """
+    fields = pydantic_object.model_fields
+    if isinstance(data, dict) and len(data) == 1:
+        (key, inner), = data.items()
+        if key not in fields and isinstance(inner, (dict, list)):
+            data = inner
+    list_fields = [name for name, f in fields.items() if get_origin(f.annotation) in (list, List)]
+    if isinstance(data, list) and len(list_fields) == 1:
+        data = {list_fields[0]: data}
+    if not isinstance(data, dict):
+        raise StructuredOutputError(f"Expected an object for {pydantic_object.__name__}")
+
+    try:
+        return pydantic_object.model_validate(data)
+    except ValidationError:
+        pass
+
+    data = dict(data)
+    for name in list_fields:
+        value = data.get(name)
+        if isinstance(value, dict):
+            value = [value]
+        item_model = _list_item_model(fields[name].annotation)
+        if isinstance(value, list) and item_model is not None:
+            kept = []
+            for item in value:
+                try:
+                    kept.append(item_model.model_validate(item))
+                except ValidationError:
+                    continue
+            value = kept
+        if value is not None:
+            data[name] = value
+    try:
+        return pydantic_object.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(f"Output does not match {pydantic_object.__name__}: {e}") from e
+
+
+def parse_structured(
+    text: str,
+    pydantic_object: Optional[Type[BaseModel]] = None,
+    validate: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """Repair and coerce an LLM output; raise StructuredOutputError on failure."""
+    data = repair_json(text)
+    result = coerce_to_schema(data, pydantic_object) if pydantic_object is not None else data
+    if validate is not None and not validate(result):
+        raise StructuredOutputError("Output failed validation")
+    return result
+
+
+def _format_instructions(pydantic_object: Optional[Type[BaseModel]], schema_hint: str) -> str:
+    if schema_hint:
+        return schema_hint
+    if pydantic_object is not None:
+        return json.dumps(pydantic_object.model_json_schema(), ensure_ascii=False)
+    return "Return a single valid JSON value."
+
+
+async def ainvoke_structured(
+    llm,
+    messages: List[Any],
+    pydantic_object: Optional[Type[BaseModel]] = None,
+    validate: Optional[Callable[[Any], bool]] = None,
+    schema_hint: str = "",
+    model_name: Optional[str] = None,
+    call_site: Optional[str] = None,
+    max_repairs: int = 1,
+    **invoke_kwargs,
+):
+    """
+    Invoke the LLM and return a parsed structured result.
+
+    Parse failures are first repaired locally; only then is the model re-asked with
+    a short repair prompt containing the broken output and schema (not the original
+    context), up to max_repairs times.
+
+    Raises:
+        StructuredOutputError: when local repair and all re-asks fail.
+    """
+    response = await safe_ainvoke(llm, messages, model_name=model_name, call_site=call_site, **invoke_kwargs)
+    content = getattr(response, "content", "") or ""
+    try:
+        return parse_structured(content, pydantic_object, validate)
+    except StructuredOutputError as e:
+        last_error: Exception = e
+
+    for _ in range(max_repairs):
+        logger.info(f"Structured output repair re-ask at {call_site or 'unknown'}: {last_error}")
+        broken = truncate_to_tokens(content, REPAIR_OUTPUT_TOKEN_LIMIT, model_name)
+        repair_prompt = [
+            SystemMessage(
+                content=(
+                    "Your previous output could not be parsed. Fix it so it is valid JSON "
+                    "matching the schema. Keep the content; do not add new facts. Output ONLY JSON.\n\n"
+                    f"Schema:\n{_format_instructions(pydantic_object, schema_hint)}"
+                )
+            ),
+            HumanMessage(content=f"Error: {last_error}\n\nPrevious output:\n{broken}"),
+        ]
+        response = await safe_ainvoke(
+            llm,
+            repair_prompt,
+            model_name=model_name,
+            call_site=f"{call_site}_repair" if call_site else "structured_repair",
+            **invoke_kwargs,
+        )
+        content = getattr(response, "content", "") or ""
+        try:
+            return parse_structured(content, pydantic_object, validate)
+        except StructuredOutputError as e:
+            last_error = e
+    raise last_error
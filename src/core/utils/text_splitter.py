@@ -0,0 +1,154 @@
+"""
+Offset-preserving chunk / sentence splitter.
+
+Works on (start, end) spans of the original text instead of substrings, so chunk and
+sentence offsets are exact by construction (no `text.find` recovery that can land on an
+earlier duplicate) and each sentence is linked to the chunk that contains it.
+
+Chunking reproduces RecursiveCharacterTextSplitter (keep_separator=True,
+strip_whitespace=True, len as length function): split on the first separator present,
+recurse into pieces that are still too long, merge adjacent pieces up to chunk_size
+keeping up to chunk_overlap characters of the previous chunk.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+Span = Tuple[int, int]
+
+# Sentence boundary: whitespace (group 1) after CJK (。！？) or ASCII (.?!) terminators
+_SENTENCE_BREAK = re.compile(r"[。！？!?.](\s+)")
+
+
+class TextSegment(NamedTuple):
+    start: int
+    end: int
+    chunk_index: Optional[int] = None  # sentences only: index of the containing chunk
+
+
+def _strip_span(text: str, start: int, end: int) -> Span:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+class OffsetTextSplitter:
+    """Chunks and sentences of a text as exact spans, in a single call."""
+
+    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100, separators: Sequence[str] = ("\n\n", "\n", " ", "")):
+        if chunk_overlap > chunk_size:
+            raise ValueError("chunk_overlap must not exceed chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators)
+
+    # --- chunks ---
+
+    def _pieces(self, text: str, start: int, end: int, separator: str) -> List[Span]:
+        """Split [start, end) before each occurrence of separator (separator kept at piece start)."""
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+        bounds = [start]
+        pos = text.find(separator, start, end)
+        while pos != -1:
+            bounds.append(pos)
+            pos = text.find(separator, pos + len(separator), end)
+        bounds.append(end)
+        return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    def _merge(self, text: str, pieces: List[Span], out: List[Span]) -> None:
+        # Pieces are contiguous, so a window of them is the span from its first start to its last end
+        window: List[Span] = []
+        total = 0
+        for piece in pieces:
+            length = piece[1] - piece[0]
+            if window and total + length > self.chunk_size:
+                self._emit(text, window[0][0], window[-1][1], out)
+                while window and (total > self.chunk_overlap or total + length > self.chunk_size):
+                    total -= window[0][1] - window[0][0]
+                    window.pop(0)
+            window.append(piece)
+            total += length
+        if window:
+            self._emit(text, window[0][0], window[-1][1], out)
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, out: List[Span]) -> None:
+        start, end = _strip_span(text, start, end)
+        if end > start:
+            out.append((start, end))
+
+    def _split(self, text: str, start: int, end: int, separators: List[str], out: List[Span]) -> None:
+        separator, remaining = separators[-1], []
+        for i, sep in enumerate(separators):
+            if not sep:
+                separator = sep
+                break
+            if text.find(sep, start, end) != -1:
+                separator, remaining = sep, separators[i + 1:]
+                break
+        good: List[Span] = []
+        for piece in self._pieces(text, start, end, separator):
+            if piece[1] - piece[0] < self.chunk_size:
+                good.append(piece)
+                continue
+            if good:
+                self._merge(text, good, out)
+                good = []
+            if remaining:
+                self._split(text, piece[0], piece[1], remaining, out)
+            else:
+                out.append(piece)
+        if good:
+            self._merge(text, good, out)
+
+    def chunk_spans(self, text: str) -> List[Span]:
+        out: List[Span] = []
+        if text:
+            self._split(text, 0, len(text), self.separators, out)
+        return out
+
+    # --- sentences ---
+
+    @staticmethod
+    def sentence_spans(text: str) -> List[Span]:
+        if not text:
+            return []
+        # Each break consumes its whitespace run and follows a terminator, so only the first
+        # sentence can start with whitespace and only the last can end with it
+        spans = []
+        cursor = 0
+        for match in _SENTENCE_BREAK.finditer(text):
+            spans.append((cursor, match.start(1)))
+            cursor = match.end(1)
+        spans.append((cursor, len(text)))
+        spans[0] = _strip_span(text, *spans[0])
+        spans[-1] = _strip_span(text, *spans[-1])
+        return [span for span in spans if span[1] > span[0]]
+
+    # --- both ---
+
+    def split(self, text: str) -> Tuple[List[TextSegment], List[TextSegment]]:
+        """(chunks, sentences); each sentence carries the index of the first chunk that contains it
+        (or, for a sentence longer than a chunk, the chunk where it starts)."""
+        chunks = self.chunk_spans(text)
+        sentences = []
+        first = 0
+        for start, end in self.sentence_spans(text):
+            # Chunks are ordered by start and end, so the search pointer only moves forward
+            while first < len(chunks) and chunks[first][1] <= start:
+                first += 1
+            chunk_index = None
+            for ci in range(first, len(chunks)):
+                c_start, c_end = chunks[ci]
+                if c_start > start:
+                    break
+                if c_end >= end:
+                    chunk_index = ci
+                    break
+                if chunk_index is None and c_end > start:
+                    chunk_index = ci
+            sentences.append(TextSegment(start, end, chunk_index))
+        return [TextSegment(s, e) for s, e in chunks], sentences
@@ -0,0 +1,261 @@
+"""
+Token Budget Utilities for DeepTrace.
+Pre-flight token estimation, budget-aware context packing and per-call token accounting.
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Sequence, TypeVar
+
+from langchain_core.messages import BaseMessage
+
+from src.core.profiling import record_llm_usage
+
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # Optional dependency; fall back to heuristics
+    tiktoken = None
+
+T = TypeVar("T")
+
+# Per-message framing overhead (role markers, separators) used by chat APIs
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Tokenizer encodings by model family (only used when tiktoken is installed)
+TIKTOKEN_ENCODINGS = {
+    "gpt-4o": "o200k_base",
+    "gpt-4.1": "o200k_base",
+    "gpt-5": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "o4": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+    "text-embedding": "cl100k_base",
+}
+
+# Approximate characters per token for non-CJK text by model family (fast fallback)
+CHARS_PER_TOKEN = {
+    "qwen": 3.5,
+    "deepseek": 3.5,
+    "claude": 3.5,
+    "anthropic": 3.5,
+    "gemini": 4.0,
+    "google": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# CJK ideographs/kana/hangul are roughly one token each for modern BPE vocabularies
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+_ENCODING_CACHE: Dict[str, object] = {}
+
+
+def _model_key(model_name: Optional[str]) -> str:
+    """Strip provider prefixes such as 'openai:' and lowercase the model name."""
+    name = (model_name or "").lower()
+    if ":" in name:
+        name = name.split(":", 1)[1]
+    return name
+
+
+def _get_encoding(model_name: Optional[str]):
+    """Return a cached tiktoken encoding for the model family, or None."""
+    if tiktoken is None:
+        return None
+    key = _model_key(model_name)
+    encoding_name = None
+    for prefix, enc in TIKTOKEN_ENCODINGS.items():
+        if key.startswith(prefix):
+            encoding_name = enc
+            break
+    if not encoding_name:
+        return None
+    if encoding_name not in _ENCODING_CACHE:
+        try:
+            _ENCODING_CACHE[encoding_name] = tiktoken.get_encoding(encoding_name)
+        except Exception:
+            # Encoding files unavailable (e.g. offline); remember the miss
+            _ENCODING_CACHE[encoding_name] = None
+    return _ENCODING_CACHE[encoding_name]
+
+
+def _heuristic_tokens(text: str, model_name: Optional[str]) -> int:
+    key = _model_key(model_name)
+    chars_per_token = DEFAULT_CHARS_PER_TOKEN
+    for family, ratio in CHARS_PER_TOKEN.items():
+        if family in key:
+            chars_per_token = ratio
+            break
+    cjk = len(_CJK_PATTERN.findall(text))
+    other = len(text) - cjk
+    return cjk + int(other / chars_per_token + 0.999)
+
+
+def estimate_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """
+    Estimate the token count of a text for the given model.
+    Uses the model family's tokenizer when available, otherwise a CJK-aware heuristic.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model_name)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _heuristic_tokens(text, model_name)
+
+
+def _message_text(msg) -> str:
+    if isinstance(msg, BaseMessage):
+        content = msg.content
+    elif isinstance(msg, dict):
+        content = msg.get("content", "")
+    else:
+        content = str(msg)
+    if isinstance(content, list):
+        # Multimodal content blocks: count text parts only
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and block.get("type") == "text":
+                parts.append(block.get("text", ""))
+        return "\n".join(parts)
+    return content or ""
+
+
+def estimate_message_tokens(messages: Sequence, model_name: Optional[str] = None) -> int:
+    """Estimate the prompt tokens of a chat message list, including framing overhead."""
+    return sum(
+        estimate_tokens(_message_text(m), model_name) + MESSAGE_OVERHEAD_TOKENS
+        for m in messages
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: Optional[str] = None) -> str:
+    """Truncate text so that it fits within max_tokens (keeps the head)."""
+    if max_tokens <= 0 or not text:
+        return ""
+    if estimate_tokens(text, model_name) <= max_tokens:
+        return text
+    encoding = _get_encoding(model_name)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    # Binary search on character length for the heuristic estimator
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _heuristic_tokens(text[:mid], model_name) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def pack_by_budget(
+    items: Sequence[T],
+    budget_tokens: int,
+    render: Callable[[T], str] = str,
+    score: Optional[Callable[[T], float]] = None,
+    model_name: Optional[str] = None,
+    keep_order: bool = True,
+) -> List[T]:
+    """
+    Greedily select the highest-scoring items that fit into a token budget.
+
+    Items are considered in descending score order (stable for ties); items that do
+    not fit are skipped so smaller, lower-ranked items can still fill the remainder.
+    When keep_order is True the selection is returned in the original input order.
+    """
+    if budget_tokens <= 0 or not items:
+        return []
+    indexed = list(enumerate(items))
+    if score is not None:
+        indexed.sort(key=lambda pair: score(pair[1]), reverse=True)
+
+    remaining = budget_tokens
+    selected = []
+    for idx, item in indexed:
+        cost = estimate_tokens(render(item), model_name)
+        if cost <= remaining:
+            selected.append((idx, item))
+            remaining -= cost
+    if keep_order:
+        selected.sort(key=lambda pair: pair[0])
+    return [item for _, item in selected]
+
+
+@dataclass
+class TokenUsageRecord:
+    """Token usage of a single LLM call."""
+    model_name: str
+    call_site: str
+    tokens_in: int
+    tokens_out: int
+    estimated: bool  # True when provider usage metadata was unavailable
+
+
+class TokenUsageLedger:
+    """
+    Thread-safe accumulator of per-call token usage.
+    Keeps the most recent records plus running per-call-site totals.
+    """
+
+    def __init__(self, max_records: int = 5000):
+        self.records: Deque[TokenUsageRecord] = deque(maxlen=max_records)
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        model_name: Optional[str],
+        tokens_in: int,
+        tokens_out: int,
+        call_site: Optional[str] = None,
+        estimated: bool = False,
+    ) -> TokenUsageRecord:
+        rec = TokenUsageRecord(
+            model_name=model_name or "unknown",
+            call_site=call_site or "unknown",
+            tokens_in=int(tokens_in or 0),
+            tokens_out=int(tokens_out or 0),
+            estimated=estimated,
+        )
+        with self._lock:
+            self.records.append(rec)
+            agg = self._totals.setdefault(rec.call_site, {"calls": 0, "tokens_in": 0, "tokens_out": 0})
+            agg["calls"] += 1
+            agg["tokens_in"] += rec.tokens_in
+            agg["tokens_out"] += rec.tokens_out
+        # Attribute the call to the graph node currently being profiled (if any)
+        record_llm_usage(rec.tokens_in, rec.tokens_out, estimated)
+        return rec
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Aggregate calls/tokens per call site."""
+        with self._lock:
+            return {site: dict(agg) for site, agg in self._totals.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._totals.clear()
+
+
+# Process-wide ledger populated by safe_ainvoke
+token_ledger = TokenUsageLedger()
+
+
+def extract_usage(response) -> Optional[tuple]:
+    """Return (tokens_in, tokens_out) from provider usage metadata if present."""
+    usage = getattr(response, "usage_metadata", None)
+    if isinstance(usage, dict) and "input_tokens" in usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    metadata = getattr(response, "response_metadata", None)
+    if isinstance(metadata, dict):
+        token_usage = metadata.get("token_usage") or metadata.get("usage")
+        if isinstance(token_usage, dict) and "prompt_tokens" in token_usage:
+            return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+    return None
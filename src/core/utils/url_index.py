@@ -0,0 +1,48 @@
+"""
+URL occurrence index over free text (research notes, search results).
+
+One regex pass builds url -> [(note_idx, offset)]; citation checks (finalizer Gate2
+url_not_in_sources) are then lookups instead of rescanning every note per URL.
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+# Allow typical URL characters; escape hyphen to avoid unintended ranges
+URL_PATTERN = re.compile(r"https?://[\w\-._~:/?#\[\]@!$&'()*+,;=%]+", re.IGNORECASE)
+# Trailing characters that belong to the surrounding prose / markup, not the URL
+_URL_TRAILING = ")].,>\"' "
+
+
+def extract_urls(text: str) -> List[str]:
+    """URLs in text, trailing punctuation stripped, first-seen order, no duplicates."""
+    return list(dict.fromkeys(
+        url for url in (m.rstrip(_URL_TRAILING) for m in URL_PATTERN.findall(text or "")) if url
+    ))
+
+
+class UrlOccurrenceIndex:
+    """Where each URL occurs in a list of notes (URLs kept in first-seen order)."""
+
+    def __init__(self, notes: Sequence[str]):
+        self.notes = [note or "" for note in notes]
+        self.occurrences: Dict[str, List[Tuple[int, int]]] = {}
+        for note_idx, note in enumerate(self.notes):
+            for match in URL_PATTERN.finditer(note):
+                url = match.group(0).rstrip(_URL_TRAILING)
+                if url:
+                    self.occurrences.setdefault(url, []).append((note_idx, match.start()))
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self.occurrences)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.occurrences
+
+    def __len__(self) -> int:
+        return len(self.occurrences)
+
+    def note_ids(self, url: str) -> List[int]:
+        """Indices of the notes citing url, in order, without duplicates."""
+        return list(dict.fromkeys(note_idx for note_idx, _ in self.occurrences.get(url, ())))
@@ -8,17 +8,22 @@ from urllib.parse import urlparse
 
 from ..models.claim import Claim
 from ..models.evidence import Evidence
+from .near_duplicate import SYNDICATION_TEXT_CHARS, NearDuplicateDetector
 from ...llm.factory import init_embeddings
 
+
 class SourceClusterer:
     """
     Groups Evidence into Source Clusters to detect syndication.
     Rule:
     1. Same Domain -> Same Cluster.
-    2. Different Domain but High Content Similarity (>0.95) -> Same Cluster (Syndication).
+    2. Different Domain but near-verbatim text (MinHash Jaccard >= dup_threshold) -> Same Cluster (Syndication).
+    3. Borderline MinHash pairs are confirmed by embedding cosine (> sim_threshold);
+       only the texts in those pairs are embedded.
     """
-    def __init__(self, sim_threshold: float = 0.95):
+    def __init__(self, sim_threshold: float = 0.95, dup_threshold: float = 0.8, borderline_threshold: float = 0.5):
         self.sim_threshold = sim_threshold
+        self.detector = NearDuplicateDetector(threshold=dup_threshold, borderline=borderline_threshold)
         self.embeddings_model = init_embeddings()
 
     async def cluster_sources(self, evidences: List[Evidence]) -> Dict[str, str]:
@@ -28,42 +33,11 @@ class SourceClusterer:
         if not evidences:
             return {}
 
-        # 1. Initial Grouping by Domain
-        domain_groups: Dict[str, List[Evidence]] = {}
-        for ev in evidences:
-            domain = self._extract_domain(ev.url)
-            if domain not in domain_groups:
-                domain_groups[domain] = []
-            domain_groups[domain].append(ev)
-
-        # 2. Assign Initial Cluster IDs (by Domain)
-        # ev_id -> cluster_id
-        cluster_map: Dict[str, str] = {}
-        # Keep track of representative embedding for each cluster
-        
-        # Prepare embeddings needed?
-        # Only if we suspect syndication. 
-        # Strategy: Embed ALL items.
-        # Merge clusters if their representatives are too similar.
-        
-        texts = [(ev.title or "") + " " + ev.content[:500] for ev in evidences]
-        try:
-            vectors_list = await self.embeddings_model.aembed_documents(texts)
-        except AttributeError:
-            vectors_list = self.embeddings_model.embed_documents(texts)
-        
-        vectors = np.array(vectors_list)
-        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-        norms[norms == 0] = 1e-10
-        norm_vectors = vectors / norms
-        
-        # Map ev_id to vector index
-        ev_idx_map = {ev.id: i for i, ev in enumerate(evidences)}
+        domains_by_idx = [self._extract_domain(ev.url) for ev in evidences]
 
         # Union-Find for Cluster Merging
         # Nodes are Domains.
-        domains = list(domain_groups.keys())
-        parent = {d: d for d in domains}
+        parent = {d: d for d in domains_by_idx}
 
         def find(d):
             if parent[d] != d:
@@ -75,38 +49,42 @@ class SourceClusterer:
             root2 = find(d2)
             if root1 != root2:
                 parent[root2] = root1
-        
-        # Compute "Domain Representative Vector" (Average of items in domain)
-        domain_vectors = {}
-        for domain, ev_list in domain_groups.items():
-            indices = [ev_idx_map[ev.id] for ev in ev_list]
-            # Average vector
-            avg_vec = np.mean(norm_vectors[indices], axis=0)
-            # Re-normalize
-            n = np.linalg.norm(avg_vec)
-            if n > 0:
-                avg_vec = avg_vec / n
-            domain_vectors[domain] = avg_vec
-
-        # Allow O(D^2) check where D is number of domains (usually small, <20)
-        d_keys = list(domain_vectors.keys())
-        for i in range(len(d_keys)):
-            for j in range(i + 1, len(d_keys)):
-                d1 = d_keys[i]
-                d2 = d_keys[j]
-                
-                # Check Similarity
-                sim = np.dot(domain_vectors[d1], domain_vectors[d2])
+
+        # 1. Near-duplicate candidates via MinHash-LSH (linear in the number of evidences)
+        texts = [(ev.title or "") + " " + (ev.content or "")[:SYNDICATION_TEXT_CHARS] for ev in evidences]
+        duplicates, borderline = self.detector.find_pairs(texts)
+        for i, j, _ in duplicates:
+            if domains_by_idx[i] != domains_by_idx[j]:
+                union(domains_by_idx[i], domains_by_idx[j])
+
+        # 2. Borderline cross-domain pairs: confirm with embeddings of just those texts
+        borderline = [
+            (i, j) for i, j, _ in borderline
+            if find(domains_by_idx[i]) != find(domains_by_idx[j])
+        ]
+        if borderline:
+            involved = sorted({idx for pair in borderline for idx in pair})
+            embed_texts = [(evidences[idx].title or "") + " " + (evidences[idx].content or "")[:500] for idx in involved]
+            try:
+                vectors_list = await self.embeddings_model.aembed_documents(embed_texts)
+            except AttributeError:
+                vectors_list = self.embeddings_model.embed_documents(embed_texts)
+
+            vectors = np.array(vectors_list, dtype=float)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1e-10
+            norm_vectors = vectors / norms
+            row_of = {idx: row for row, idx in enumerate(involved)}
+            for i, j in borderline:
+                sim = float(np.dot(norm_vectors[row_of[i]], norm_vectors[row_of[j]]))
                 if sim > self.sim_threshold:
-                    union(d1, d2)
+                    union(domains_by_idx[i], domains_by_idx[j])
 
         # Build Final Map
-        for ev in evidences:
-            domain = self._extract_domain(ev.url)
-            root_domain = find(domain)
-            cluster_map[ev.id] = f"cluster_{root_domain}"
-            
-        return cluster_map
+        return {
+            ev.id: f"cluster_{find(domain)}"
+            for ev, domain in zip(evidences, domains_by_idx)
+        }
 
     def _extract_domain(self, url: str) -> str:
         if not url:
@@ -1,10 +1,12 @@
 """
 Timeline Retrieval & Clustering Module.
 Implements 'Hardware Point 8': Time-Window (±7d) + Embedding Cosine + Union-Find.
+Events are sorted by time and only compared inside the sliding ±window, one block
+of rows at a time as a matrix product; components come from a vectorized union-find.
 """
 import numpy as np
 from datetime import timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pydantic import BaseModel, Field
 from ..models.events import EventNode
 from ...llm.factory import init_embeddings
@@ -21,6 +23,67 @@ class EventCluster(BaseModel):
     def __len__(self):
         return len(self.events)
 
+# Rows per similarity block; a block is compared against every event inside its time window
+SIMILARITY_BLOCK_SIZE = 512
+
+
+def window_edges(
+    timestamps: np.ndarray,
+    vectors: np.ndarray,
+    window_seconds: float,
+    sim_threshold: float,
+    block_size: int = SIMILARITY_BLOCK_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return index pairs (i, j), i < j, with |t_i - t_j| <= window and cosine >= threshold.
+    Inputs must be sorted by timestamp and L2-normalized.
+    """
+    n = len(timestamps)
+    rows: List[np.ndarray] = []
+    cols: List[np.ndarray] = []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        # Last event any row of this block can reach within the window
+        hi = int(np.searchsorted(timestamps, timestamps[end - 1] + window_seconds, side="right"))
+        sims = vectors[start:end] @ vectors[start:hi].T
+        mask = sims >= sim_threshold
+        mask &= (timestamps[start:hi][None, :] - timestamps[start:end][:, None]) <= window_seconds
+        # Upper triangle only: column index strictly after row index
+        mask &= np.arange(start, hi)[None, :] > np.arange(start, end)[:, None]
+        r, c = np.nonzero(mask)
+        if r.size:
+            rows.append(r + start)
+            cols.append(c + start)
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def connected_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Vectorized union-find (min-label hooking + pointer jumping).
+    Returns labels where each component is labelled by its smallest member index.
+    """
+    labels = np.arange(n)
+    if rows.size == 0:
+        return labels
+    while True:
+        hooked = np.minimum(labels[rows], labels[cols])
+        updated = labels.copy()
+        np.minimum.at(updated, labels[rows], hooked)
+        np.minimum.at(updated, labels[cols], hooked)
+        # Pointer jumping until every node points at its root
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
 class TimelineClusterer:
     """
     Clusters events based on:
@@ -55,55 +118,34 @@ class TimelineClusterer:
             vectors_list = self.embeddings_model.embed_documents(texts)
 
         # Convert to numpy for fast calc
-        vectors = np.array(vectors_list)
+        vectors = np.asarray(vectors_list, dtype=np.float32)
         # Normalize vectors for dot product = cosine similarity
         norms = np.linalg.norm(vectors, axis=1, keepdims=True)
         # Avoid divide by zero
         norms[norms == 0] = 1e-10
         normalized_vectors = vectors / norms
-        
-        # 3. Build Adjacency List (Union-Find Preparation)
-        n = len(valid_events)
-        parent = list(range(n))
-        
-        def find(i):
-            if parent[i] != i:
-                parent[i] = find(parent[i])
-            return parent[i]
-            
-        def union(i, j):
-            root_i = find(i)
-            root_j = find(j)
-            if root_i != root_j:
-                parent[root_j] = root_i
-                
-        # 4. Pairwise Check
-        # Optimization: Sort by time first to limit window check scanning?
-        # For small N (<200) O(N^2) is fine. For larger, sort helps.
-        # Let's simple bubble check for now, assuming N is per-topic (usually <100)
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                event_i = valid_events[i]
-                event_j = valid_events[j]
-                
-                # Check Time
-                if abs(event_i.time - event_j.time) > self.time_window:
-                    continue
-                    
-                # Check Semantic (Dot Product)
-                sim = np.dot(normalized_vectors[i], normalized_vectors[j])
-                if sim >= self.sim_threshold:
-                    union(i, j)
-        
-        # 5. Group by Component
+
+        # 3. Sort by time so the ±window is a contiguous slice
+        timestamps = np.array([e.time.timestamp() for e in valid_events], dtype=np.float64)
+        order = np.argsort(timestamps, kind="stable")
+        sorted_ts = timestamps[order]
+        sorted_vectors = normalized_vectors[order]
+
+        # 4. Windowed similarity blocks + Union-Find
+        rows, cols = window_edges(
+            sorted_ts,
+            sorted_vectors,
+            self.time_window.total_seconds(),
+            self.sim_threshold,
+        )
+        labels = connected_components(len(valid_events), rows, cols)
+
+        # 5. Group by Component (root = earliest event of the component)
         clusters_map: Dict[int, List[EventNode]] = {}
-        for i in range(n):
-            root = find(i)
-            if root not in clusters_map:
-                clusters_map[root] = []
-            clusters_map[root].append(valid_events[i])
-            
+        for pos, label in enumerate(labels.tolist()):
+            root = int(order[label])
+            clusters_map.setdefault(root, []).append(valid_events[int(order[pos])])
+
         # 6. Create EventCluster Objects
         results = []
         for root_id, cluster_events in clusters_map.items():
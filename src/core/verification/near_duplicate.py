@@ -0,0 +1,131 @@
+"""
+Near-Duplicate Detection Module.
+Shingled MinHash with LSH banding: syndicated / reposted copies are near-verbatim, so
+candidate pairs come from band-bucket collisions in roughly linear time and only pairs
+whose estimated Jaccard is borderline need an embedding check.
+"""
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .clustering import connected_components
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHINGLE_BASE = np.uint64(0x100000001B3)
+
+# Characters of content (after the title) compared for syndication
+SYNDICATION_TEXT_CHARS = 2000
+
+
+def _normalize(text: str) -> str:
+    # Lowercase, drop punctuation, collapse whitespace (copies often differ only in markup)
+    return " ".join(re.sub(r"[^\w]+", " ", (text or "").lower()).split())
+
+
+def shingle_hashes(text: str, k: int = 5) -> np.ndarray:
+    """Unique 32-bit hashes of the character k-grams of the normalized text."""
+    normalized = _normalize(text)
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    cps = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    k = min(k, len(cps))
+    count = len(cps) - k + 1
+    h = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(k):
+            h = h * _SHINGLE_BASE + cps[offset : offset + count]
+    return np.unique((h ^ (h >> np.uint64(32))) & _MAX_HASH)
+
+
+class NearDuplicateDetector:
+    """
+    MinHash-LSH near-duplicate detector over short documents.
+
+    - num_perm MinHash values per document, split into `bands` bands of num_perm // bands rows
+    - two documents become candidates when any band matches exactly
+    - candidates are scored by the fraction of equal MinHash values (Jaccard estimate):
+      >= threshold -> duplicate, >= borderline -> left for the caller to confirm
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        borderline: float = 0.5,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        seed: int = 7,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.borderline = min(borderline, threshold)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Universal hashing (a * x + b) mod p with p = 2^61 - 1; a, b < 2^29 keeps a * x < 2^61
+        self._a = rng.integers(1, 1 << 29, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 29, size=(num_perm, 1), dtype=np.uint64)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), num_perm) MinHash matrix; empty texts get a sentinel row that never matches."""
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for i, text in enumerate(texts):
+            shingles = shingle_hashes(text, self.shingle_size)
+            if shingles.size == 0:
+                sigs[i] = _MERSENNE_PRIME + np.uint64(i)
+                continue
+            sigs[i] = ((self._a * shingles[None, :] + self._b) % _MERSENNE_PRIME).min(axis=1)
+        return sigs
+
+    def _candidate_pairs(self, sigs: np.ndarray) -> np.ndarray:
+        pairs = set()
+        for band in range(self.bands):
+            block = np.ascontiguousarray(sigs[:, band * self.rows : (band + 1) * self.rows])
+            buckets: Dict[bytes, List[int]] = {}
+            for i, row in enumerate(block):
+                buckets.setdefault(row.tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) > 1:
+                    for x in range(len(members)):
+                        for y in range(x + 1, len(members)):
+                            pairs.add((members[x], members[y]))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.array(sorted(pairs), dtype=np.int64)
+
+    def find_pairs(self, texts: Sequence[str]) -> Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]]]:
+        """
+        Returns (duplicates, borderline) as lists of (i, j, estimated_jaccard), i < j.
+        """
+        if len(texts) < 2:
+            return [], []
+        sigs = self.signatures(texts)
+        candidates = self._candidate_pairs(sigs)
+        if candidates.size == 0:
+            return [], []
+        estimates = (sigs[candidates[:, 0]] == sigs[candidates[:, 1]]).mean(axis=1)
+        duplicates: List[Tuple[int, int, float]] = []
+        borderline: List[Tuple[int, int, float]] = []
+        for (i, j), score in zip(candidates.tolist(), estimates.tolist()):
+            if score >= self.threshold:
+                duplicates.append((i, j, score))
+            elif score >= self.borderline:
+                borderline.append((i, j, score))
+        return duplicates, borderline
+
+    def group(self, texts: Sequence[str]) -> List[List[int]]:
+        """Duplicate groups (indices, size >= 2) from the transitive closure of duplicate pairs."""
+        duplicates, _ = self.find_pairs(texts)
+        if not duplicates:
+            return []
+        pairs = np.array([(i, j) for i, j, _ in duplicates], dtype=np.int64)
+        labels = connected_components(len(texts), pairs[:, 0], pairs[:, 1])
+        groups: Dict[int, List[int]] = {}
+        for idx, label in enumerate(labels.tolist()):
+            groups.setdefault(label, []).append(idx)
+        return [members for members in groups.values() if len(members) > 1]
@@ -7,6 +7,9 @@ from bs4 import BeautifulSoup
 from typing import Optional, Dict
 import logging
 
+from ..core.profiling import record_http
+from ..core.replay import intercept_call
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -42,32 +45,38 @@ class ContentScraper:
                 self.semaphore = asyncio.Semaphore(self.max_concurrent)
             
         async with self.semaphore:
-            try:
-                async with httpx.AsyncClient(verify=False, follow_redirects=True) as client:
-                    response = await client.get(url, headers=self.headers, timeout=self.timeout)
-                    response.raise_for_status()
-                    
-                    html = response.text
-                    main_text = self._extract_main_text(html)
-                    
-                    return {
-                        "main_text": main_text,
-                        "raw_comments_html": None,  # 预留
-                        "error": None
-                    }
-            except Exception as e:
-                error_msg = str(e)
-                # 对于常见的 HTTP 错误，使用简短的警告
-                if "403" in error_msg or "404" in error_msg:
-                    logger.warning(f"[ContentScraper] Skipped {url} (Access Denied/Not Found)")
-                else:
-                    logger.warning(f"[ContentScraper] Failed to scrape {url}: {error_msg[:100]}")
+            # 录制/回放运行时由 src.core.replay 记录或直接返回录制结果
+            return await intercept_call("fetch", url, lambda: self._fetch(url))
+
+    async def _fetch(self, url: str) -> Dict[str, Optional[str]]:
+        """实际的 HTTP 请求与正文提取（错误折叠进返回值）。"""
+        try:
+            async with httpx.AsyncClient(verify=False, follow_redirects=True) as client:
+                response = await client.get(url, headers=self.headers, timeout=self.timeout)
+                record_http(len(response.content))
+                response.raise_for_status()
+                
+                html = response.text
+                main_text = self._extract_main_text(html)
                 
                 return {
-                    "main_text": None,
-                    "raw_comments_html": None,
-                    "error": str(e)
+                    "main_text": main_text,
+                    "raw_comments_html": None,  # 预留
+                    "error": None
                 }
+        except Exception as e:
+            error_msg = str(e)
+            # 对于常见的 HTTP 错误，使用简短的警告
+            if "403" in error_msg or "404" in error_msg:
+                logger.warning(f"[ContentScraper] Skipped {url} (Access Denied/Not Found)")
+            else:
+                logger.warning(f"[ContentScraper] Failed to scrape {url}: {error_msg[:100]}")
+            
+            return {
+                "main_text": None,
+                "raw_comments_html": None,
+                "error": str(e)
+            }
 
     def _extract_main_text(self, html: str) -> str:
         """
@@ -12,12 +12,14 @@ from src.graph.state_v2 import GlobalState, WorkerState
 from src.graph.nodes.clarify import clarify_node
 from src.graph.nodes.supervisor import supervisor_node
 from src.graph.nodes.finalizer import finalizer_node
+from src.graph.nodes.debater_node import debater_node
 from src.graph.nodes.debater_postprocess import debater_postprocess
 from src.graph.nodes.timeline_merge import timeline_merge_node
 from src.graph.nodes.archive_node import archive_run_node
 from src.graph.subgraphs.worker import worker_app
-from src.core.tools.debater import debater_tool
+from src.core.tools.debater import conflict_key
 from src.core.tools.thinking import think_tool
+from src.core.profiling import instrument_node
 from langchain_core.messages import ToolMessage
 
 MAX_CONFLICT_CANDIDATES = 200
@@ -38,13 +40,6 @@ def _candidate_identity(candidate: dict) -> str:
     return ""
 
 
-def _conflict_key(topic: str, claims: list, source_ids: list) -> tuple:
-    return (
-        (topic or "").strip().lower(),
-        tuple(sorted(set(source_ids or []))),
-        tuple(sorted(set(claims or []))),
-    )
-
 # Hard limit for graph iterations to prevent runaway loops
 MAX_GRAPH_ITERATIONS = 8
 
@@ -167,7 +162,7 @@ async def worker_node(state: GlobalState, config) -> dict:
         processed_candidate_ids = set(state.get("conflict_candidate_cache") or [])
         resolved_conflicts = state.get("conflicts") or []
         resolved_keys = {
-            _conflict_key(
+            conflict_key(
                 conf.get("topic"),
                 conf.get("claims") or [],
                 conf.get("source_ids") or [],
@@ -230,7 +225,7 @@ async def worker_node(state: GlobalState, config) -> dict:
                     candidate_id = candidate.get("candidate_id")
                     if candidate_id and candidate_id in processed_candidate_ids:
                         continue
-                    key = _conflict_key(
+                    key = conflict_key(
                         candidate.get("topic"),
                         candidate.get("claims") or [],
                         candidate.get("source_ids") or [],
@@ -286,22 +281,21 @@ def build_graph_v2():
     """Compiles the DeepTrace V2 Graph."""
     workflow = StateGraph(GlobalState)
     
-    # 1. Add Nodes
-    workflow.add_node("clarify", clarify_node)
-    workflow.add_node("supervisor", supervisor_node)
+    # 1. Add Nodes (instrumented: per-node spans land in profile.json when profiling is active)
+    workflow.add_node("clarify", instrument_node("clarify", clarify_node))
+    workflow.add_node("supervisor", instrument_node("supervisor", supervisor_node))
     
     # Worker Subgraph (Wrapped)
-    workflow.add_node("worker", worker_node)
+    workflow.add_node("worker", instrument_node("worker", worker_node))
     
-    # Debater Tool Node (Executes the tool logic)
-    # ToolNode automatically executes the tool call in the last message
-    # and returns a ToolMessage.
-    workflow.add_node("debater", ToolNode([debater_tool]))
-    workflow.add_node("thinking", ToolNode([think_tool]))
-    workflow.add_node("debater_postprocess", debater_postprocess)
-    workflow.add_node("timeline_merge", timeline_merge_node)
-    workflow.add_node("finalizer", finalizer_node)
-    workflow.add_node("archive", archive_run_node)
+    # Debater Node: resolves all ResolveConflict calls in the last message together
+    # (batched by topic, memoized) and returns one ToolMessage per call.
+    workflow.add_node("debater", instrument_node("debater", debater_node))
+    workflow.add_node("thinking", instrument_node("thinking", ToolNode([think_tool])))
+    workflow.add_node("debater_postprocess", instrument_node("debater_postprocess", debater_postprocess))
+    workflow.add_node("timeline_merge", instrument_node("timeline_merge", timeline_merge_node))
+    workflow.add_node("finalizer", instrument_node("finalizer", finalizer_node))
+    workflow.add_node("archive", instrument_node("archive", archive_run_node))
 
     # 2. Add Edges
     workflow.add_edge(START, "clarify")
@@ -1,14 +1,17 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from src.core.artifact_catalog import catalog_ingest
+from src.core.artifact_io import ROOT_COLLECTION, ArtifactWriter
 from src.graph.state_v2 import GlobalState
 
 
 def archive_run_node(state: GlobalState) -> Dict[str, Any]:
     """
     Archive artifacts from the run into data/runs/{run_id}/ and emit run_record_path.
+    The run is also ingested into the artifact catalog (data/catalog.sqlite3).
     This is deterministic and does not call any LLM.
     """
     run_id = state.get("run_id") or "run"
@@ -16,20 +19,19 @@ def archive_run_node(state: GlobalState) -> Dict[str, Any]:
     os.makedirs(base_dir, exist_ok=True)
 
     artifacts = {}
+    writer = ArtifactWriter(base_dir)
 
-    def _dump_json(name: str, payload: Any):
-        if payload is None:
-            return None
-        path = os.path.join(base_dir, f"{name}.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-        artifacts[f"{name}_path"] = path
+    def _dump(name: str, payload: Any, collection: Optional[str] = None):
+        # Collections are streamed as compressed JSON Lines and validated against schemas/<name>.schema.json
+        path = writer.write(name, payload, collection=collection, schema=name)
+        if path:
+            artifacts[f"{name}_path"] = path
         return path
 
-    _dump_json("facts_index", state.get("facts_index"))
-    _dump_json("structured_report", state.get("structured_report"))
-    _dump_json("report_citations", state.get("report_citations"))
-    _dump_json("gate_report", state.get("gate_report"))
+    _dump("facts_index", state.get("facts_index"), collection="facts")
+    _dump("structured_report", state.get("structured_report"))
+    _dump("report_citations", state.get("report_citations"), collection=ROOT_COLLECTION)
+    _dump("gate_report", state.get("gate_report"), collection="violations")
 
     # final_report markdown
     final_report_path = None
@@ -54,4 +56,7 @@ def archive_run_node(state: GlobalState) -> Dict[str, Any]:
     with open(run_record_path, "w", encoding="utf-8") as f:
         json.dump(run_record, f, ensure_ascii=False, indent=2)
 
+    # Incremental catalog ingest (cross-run queries without re-parsing every run)
+    catalog_ingest(run_dir=base_dir)
+
     return {"run_record_path": run_record_path}
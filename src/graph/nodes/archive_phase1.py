@@ -1,33 +1,39 @@
 """
 Phase1 - ArchiveRunNode
-Archives DocumentSnapshot, Indexes, facts_index_v2, gate1_report to files.
+Archives DocumentSnapshot, Indexes, facts_index_v2, gate1_report to files
+(collections as compressed JSON Lines, see src.core.artifact_io).
+cleaned_text goes to the content-addressed snapshot store (stored once per text_digest);
+the archived snapshot keeps only cleaned_text_ref unless the store is disabled.
 """
 
-import json
 from pathlib import Path
 from typing import Dict, Any
 from langchain_core.runnables import RunnableConfig
 
-def _write_json(path: Path, data: Any):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-
+from src.core.artifact_io import ROOT_COLLECTION, ArtifactWriter
+from src.core.snapshot_store import get_snapshot_store
 
 async def archive_phase1_node(state: Dict[str, Any], config: RunnableConfig):
     run_id = state.get("run_id", "run")
     base = Path("artifacts") / "phase1" / run_id
 
-    artifacts = {
-        "document_snapshot.json": state.get("document_snapshot"),
-        "chunk_meta.json": state.get("chunk_meta"),
-        "sentence_meta.json": state.get("sentence_meta"),
-        "index_manifest.json": state.get("index_manifest"),
-        "facts_index_v2.json": state.get("facts_index_v2"),
-        "gate1_report.json": state.get("gate1_report"),
-        "metrics_summary.json": state.get("metrics_summary"),
-    }
-    for name, data in artifacts.items():
-        if data is not None:
-            _write_json(base / name, data)
+    snapshot = state.get("document_snapshot")
+    store = get_snapshot_store()
+    if snapshot is not None and store is not None and snapshot.get("cleaned_text") is not None:
+        snapshot = {**snapshot, "cleaned_text": None, "cleaned_text_ref": store.put(snapshot["cleaned_text"])}
+
+    # (name, payload, streamed collection, schema)
+    artifacts = [
+        ("document_snapshot", snapshot, None, None),
+        ("chunk_meta", state.get("chunk_meta"), ROOT_COLLECTION, None),
+        ("sentence_meta", state.get("sentence_meta"), ROOT_COLLECTION, None),
+        ("index_manifest", state.get("index_manifest"), None, None),
+        ("facts_index_v2", state.get("facts_index_v2"), "items", "facts_index_v2"),
+        ("gate1_report", state.get("gate1_report"), "entries", "gate1_report"),
+        ("metrics_summary", state.get("metrics_summary"), None, None),
+    ]
+    writer = ArtifactWriter(base)
+    for name, data, collection, schema in artifacts:
+        writer.write(name, data, collection=collection, schema=schema)
 
     return {"archive_path": str(base)}
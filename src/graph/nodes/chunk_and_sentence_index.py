@@ -1,16 +1,17 @@
 """
 Phase1 - ChunkAndSentenceIndexNode
-Splits cleaned_text into chunks and sentences with fixed configs.
+Splits cleaned_text into chunks and sentences with fixed configs in one offset-preserving
+pass (src.core.utils.text_splitter); sentences are linked to their chunk.
 Outputs chunk_meta, sentence_meta, IndexManifest.
 """
 
 import hashlib
 import datetime
 from typing import Dict, Any, List
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_core.runnables import RunnableConfig
 
-from src.core.models.phase1 import ChunkMeta, SentenceMeta, IndexManifest
+from src.core.models.phase1 import IndexManifest
+from src.core.utils.text_splitter import OffsetTextSplitter
 
 DEFAULT_CHUNK_PARAMS = {
     "chunk_size": 800,
@@ -18,65 +19,68 @@ DEFAULT_CHUNK_PARAMS = {
     "separators": ["\n\n", "\n", " ", ""],
 }
 
+# Splitter identities recorded in the IndexManifest; any change here invalidates cached indexes
+CHUNK_SPLITTER_NAME = "recursive_character"
+CHUNK_SPLITTER_VERSION = "offset_v2"
+SENTENCE_SPLITTER_BACKEND = "rule_based"
+SENTENCE_SPLITTER_VERSION = "offset_v2"
+
+
+def splitter_descriptors() -> Dict[str, Dict[str, Any]]:
+    """chunk_splitter / sentence_splitter entries exactly as written to the IndexManifest."""
+    return {
+        "chunk_splitter": {
+            "name": CHUNK_SPLITTER_NAME,
+            "version": CHUNK_SPLITTER_VERSION,
+            "params": DEFAULT_CHUNK_PARAMS.copy(),
+        },
+        "sentence_splitter": {"backend": SENTENCE_SPLITTER_BACKEND, "version": SENTENCE_SPLITTER_VERSION},
+    }
+
 def _digest(text: str, algo: str = "sha256") -> str:
-    h = hashlib.new(algo)
+    h = hashlib.sha256() if algo == "sha256" else hashlib.new(algo)
     h.update((text or "").encode("utf-8"))
     return h.hexdigest()
 
 
 def _rule_based_sentence_split(text: str) -> List[str]:
     # simple rule-based splitter; can be swapped for BlingFire backend
-    import re
-    sentences = re.split(r"(?<=[。！？!?])\s+|(?<=[\.\?!])\s+", text)
-    return [s.strip() for s in sentences if s.strip()]
+    return [text[start:end] for start, end in OffsetTextSplitter.sentence_spans(text)]
 
 
 async def chunk_and_sentence_index_node(state: Dict[str, Any], config: RunnableConfig):
     cleaned_text = state.get("cleaned_text") or ""
     doc_id = state.get("doc_id") or _digest(cleaned_text)[:12]
 
-    # Chunking
-    splitter_params = DEFAULT_CHUNK_PARAMS.copy()
-    splitter = RecursiveCharacterTextSplitter(**splitter_params)
-    chunks = splitter.split_text(cleaned_text)
-    chunk_meta = []
-    offset = 0
-    for i, ch in enumerate(chunks):
-        start = cleaned_text.find(ch, offset)
-        end = start + len(ch)
-        offset = end
-        chunk_meta.append(
-            ChunkMeta(
-                chunk_id=f"{doc_id}_chunk_{i}",
-                start=start,
-                end=end,
-                text_digest=_digest(ch),
-            ).dict()
-        )
-
-    # Sentence splitting (rule-based by default)
-    sentences = _rule_based_sentence_split(cleaned_text)
-    sentence_meta = []
-    cur = 0
-    for idx, s in enumerate(sentences):
-        start = cleaned_text.find(s, cur)
-        end = start + len(s)
-        cur = end
-        sentence_meta.append(
-            SentenceMeta(
-                sentence_id=f"{doc_id}_sent_{idx}",
-                chunk_id="",  # optionally link to chunk later
-                start=start,
-                end=end,
-                text_digest=_digest(s),
-            ).dict()
-        )
+    # Chunks and sentences as exact spans of cleaned_text; each sentence knows its chunk
+    splitter = OffsetTextSplitter(**DEFAULT_CHUNK_PARAMS)
+    chunks, sentences = splitter.split(cleaned_text)
+    # Plain dicts with the ChunkMeta / SentenceMeta fields: building a model per sentence
+    # dominated indexing time on long documents
+    chunk_meta = [
+        {
+            "chunk_id": f"{doc_id}_chunk_{i}",
+            "start": ch.start,
+            "end": ch.end,
+            "text_digest": _digest(cleaned_text[ch.start:ch.end]),
+        }
+        for i, ch in enumerate(chunks)
+    ]
+    sentence_meta = [
+        {
+            "sentence_id": f"{doc_id}_sent_{idx}",
+            "chunk_id": f"{doc_id}_chunk_{s.chunk_index}" if s.chunk_index is not None else "",
+            "start": s.start,
+            "end": s.end,
+            "text_digest": _digest(cleaned_text[s.start:s.end]),
+        }
+        for idx, s in enumerate(sentences)
+    ]
 
     manifest = IndexManifest(
         run_id=state.get("run_id", "unknown"),
         normalization_version=state.get("normalization_version", "unknown"),
-        chunk_splitter={"name": "recursive_character", "version": "fixed", "params": splitter_params},
-        sentence_splitter={"backend": "rule_based", "version": "v1"},
+        **splitter_descriptors(),
         text_digest_algo="sha256",
         created_at=datetime.datetime.utcnow().isoformat(),
     )
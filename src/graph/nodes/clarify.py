@@ -3,6 +3,9 @@ Clarification Node for DeepTrace V2.
 Checks the initial query and refines it when ambiguous.
 """
 
+import re
+from typing import Optional
+
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.runnables import RunnableConfig
@@ -23,25 +26,27 @@ from src.config.settings import settings
 from src.graph.state_v2 import GlobalState
 from src.core.prompts.v2 import CLARIFY_SYSTEM_PROMPT
 from src.core.models.v2_structures import ClarificationResult
-from src.core.utils.llm_safety import safe_ainvoke
+from src.core.utils.structured_output import parse_structured
+from src.llm.router import cascade_ainvoke
 from src.core.utils.topic_filter import extract_tokens
 
 
-async def _get_clarification_result(query: str, config: RunnableConfig) -> ClarificationResult:
-    configurable = config.get("configurable", {}) if config else {}
-    model_name = configurable.get("clarify_model", settings.model_name or "gpt-4o")
-
+def _init_llm(model_name: str):
     if settings.openai_base_url and "openai.com" not in settings.openai_base_url:
         from langchain_openai import ChatOpenAI
 
-        llm = ChatOpenAI(
+        return ChatOpenAI(
             model=model_name,
             openai_api_key=settings.openai_api_key,
             openai_api_base=settings.openai_base_url,
             temperature=0,
         )
-    else:
-        llm = init_chat_model(model=model_name, temperature=0)
+    return init_chat_model(model=model_name, temperature=0)
+
+
+async def _get_clarification_result(query: str, config: RunnableConfig) -> ClarificationResult:
+    configurable = config.get("configurable", {}) if config else {}
+    model_name = configurable.get("clarify_model", settings.model_name or "gpt-4o")
 
     parser = PydanticOutputParser(pydantic_object=ClarificationResult)
     prompt = [
@@ -49,8 +54,13 @@ async def _get_clarification_result(query: str, config: RunnableConfig) -> Clari
         HumanMessage(content=f"User Query: {query}"),
     ]
 
-    response = await safe_ainvoke(llm, prompt, model_name=model_name)
-    return parser.parse(response.content)
+    return await cascade_ainvoke(
+        "clarify",
+        prompt,
+        llm_factory=_init_llm,
+        default_model=model_name,
+        parse=lambda response: parse_structured(response.content, ClarificationResult),
+    )
 
 
 async def interactive_clarify(query: str, config: RunnableConfig) -> tuple[str, list[str], list[str]]:
@@ -112,6 +122,15 @@ async def interactive_clarify(query: str, config: RunnableConfig) -> tuple[str,
     return clarified_objective, required_tokens, log_entries
 
 
+_YES_NO = re.compile(r"\b(yes|no)\b", re.IGNORECASE)
+
+
+def _parse_yes_no(text) -> Optional[str]:
+    """First standalone YES/NO word of the reply ("yes" / "no"), None if there is none."""
+    match = _YES_NO.search(str(text or ""))
+    return match.group(1).lower() if match else None
+
+
 async def _check_intent_drift(original: str, proposal: str, model_name: str = None) -> bool:
     """
     Lightweight guardrail: return True if proposal drifts away from the original intent.
@@ -128,9 +147,15 @@ Compare these two queries:
 Does the Optimized Query change the specific subject or product version of the User Query?
 Answer only YES or NO.
 """
-    llm = init_chat_model(model=model, temperature=0)
-    resp = await safe_ainvoke(llm, [HumanMessage(content=prompt)], model_name=model)
-    return "yes" in resp.content.lower()
+    answer = await cascade_ainvoke(
+        "clarify_drift_check",
+        [HumanMessage(content=prompt)],
+        llm_factory=lambda m: init_chat_model(model=m, temperature=0),
+        default_model=model,
+        parse=lambda resp: _parse_yes_no(resp.content),
+        validate=lambda verdict: verdict is not None,
+    )
+    return answer == "yes"
 
 
 async def clarify_node(state: GlobalState, config: RunnableConfig):
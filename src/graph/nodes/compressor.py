@@ -26,6 +26,7 @@ from src.core.prompts.v2 import (
     COMPRESS_RESEARCH_SIMPLE_HUMAN_MESSAGE,
 )
 from src.core.utils.llm_safety import safe_ainvoke
+from src.llm.factory import init_fallback_llm
 
 # Simple heuristic threshold to avoid unnecessary LLM calls when content is small
 COMPRESSION_CHAR_THRESHOLD = 12000
@@ -55,7 +56,7 @@ async def compress_node(state: WorkerState, config: RunnableConfig):
     configurable = config.get("configurable", {})
     model_name = configurable.get("summarization_model", settings.model_name or "gpt-4o")
 
-    # Initialize Model with Retry
+    # Initialize Model (transient failures are retried with backoff inside safe_ainvoke)
     # Robust initialization for Custom Endpoints
     if settings.openai_base_url and "openai.com" not in settings.openai_base_url:
         from langchain_openai import ChatOpenAI
@@ -64,11 +65,9 @@ async def compress_node(state: WorkerState, config: RunnableConfig):
             openai_api_key=settings.openai_api_key,
             openai_api_base=settings.openai_base_url,
             temperature=0
-        ).with_retry(stop_after_attempt=3)
-    else:
-        llm = init_chat_model(model=model_name, temperature=0).with_retry(
-            stop_after_attempt=3
         )
+    else:
+        llm = init_chat_model(model=model_name, temperature=0)
 
     # Prepare Prompt
     date_str = datetime.now().strftime("%Y-%m-%d")
@@ -89,7 +88,14 @@ Here is the raw research data found:
     ]
 
     # Execute
-    response = await safe_ainvoke(llm, prompt, model_name=model_name)
+    response = await safe_ainvoke(
+        llm,
+        prompt,
+        model_name=model_name,
+        call_site="compress",
+        fallback=init_fallback_llm(),
+        fallback_model_name=settings.LLM_FALLBACK_MODEL,
+    )
 
     # Return as 'research_notes' (which updates the specific key in WorkerState)
     return {"research_notes": response.content}
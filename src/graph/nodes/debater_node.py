@@ -0,0 +1,60 @@
+"""
+Debater Node for DeepTrace V2.
+Resolves every ResolveConflict call of the last Supervisor message in one batched pass.
+"""
+
+from typing import Any, Dict
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.core.tools.debater import DEFAULT_DEBATER_MODEL, adjudicate_conflicts, verdict_memo
+from src.core.tools.thinking import think_tool
+from src.graph.state_v2 import GlobalState
+
+
+async def debater_node(state: GlobalState, config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Adjudicate all pending ResolveConflict calls together (shared topics share a debate,
+    memoized verdicts skip the LLM) and answer each call with its own ToolMessage.
+    """
+    messages = state.get("messages", [])
+    if not messages:
+        return {}
+    all_calls = getattr(messages[-1], "tool_calls", None) or []
+    tool_calls = [tc for tc in all_calls if tc.get("name") == "ResolveConflict"]
+    if not tool_calls:
+        return {}
+
+    configurable = config.get("configurable", {}) if config else {}
+    conflicts = [
+        {
+            "topic": tc.get("args", {}).get("topic", ""),
+            "claims": tc.get("args", {}).get("claims") or [],
+            "source_ids": tc.get("args", {}).get("source_ids") or [],
+        }
+        for tc in tool_calls
+    ]
+    try:
+        verdicts = await adjudicate_conflicts(
+            conflicts,
+            model_name=configurable.get("debater_model", DEFAULT_DEBATER_MODEL),
+            debate_rounds=configurable.get("debate_rounds", 2),
+            memo=verdict_memo,
+        )
+    except Exception as e:
+        verdicts = [f"Debate failed: {str(e)}"] * len(tool_calls)
+    verdict_by_id = {tc.get("id"): verdict for tc, verdict in zip(tool_calls, verdicts)}
+
+    # Every tool call of the message needs an answer, or the next supervisor call is rejected
+    replies = []
+    for tc in all_calls:
+        name = tc.get("name")
+        if name == "ResolveConflict":
+            content = verdict_by_id.get(tc.get("id")) or ""
+        elif name == "think_tool":
+            content = await think_tool.ainvoke(tc.get("args") or {})
+        else:
+            content = f"Error: {name} is not a valid tool here, try one of [ResolveConflict, think_tool]."
+        replies.append(ToolMessage(tool_call_id=tc.get("id"), name=name, content=content))
+    return {"messages": replies}
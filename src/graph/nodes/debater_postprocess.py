@@ -4,6 +4,7 @@ Post-process Debater verdicts to update GlobalState.
 
 from typing import List, Dict, Any, Optional
 
+from src.core.tools.debater import conflict_key
 from src.graph.state_v2 import GlobalState
 
 
@@ -29,17 +30,40 @@ def _extract_winner(verdict_text: str) -> Optional[str]:
     return None
 
 
-def _conflict_key(topic: str, claims: List[str], source_ids: List[str]) -> tuple:
-    return (
-        (topic or "").strip().lower(),
-        tuple(sorted(set(source_ids or []))),
-        tuple(sorted(set(claims or []))),
-    )
+def _trailing_resolve_results(messages: List[Any]) -> List[tuple]:
+    """Pair each trailing ToolMessage with the args of the ResolveConflict call it answers."""
+    tool_msgs = []
+    idx = len(messages) - 1
+    while idx >= 0 and getattr(messages[idx], "type", None) == "tool":
+        tool_msgs.append(messages[idx])
+        idx -= 1
+    tool_msgs.reverse()
+
+    args_by_id: Dict[str, Dict[str, Any]] = {}
+    if idx >= 0 and getattr(messages[idx], "tool_calls", None):
+        for tc in messages[idx].tool_calls:
+            if tc.get("name") == "ResolveConflict" and tc.get("id"):
+                args_by_id[tc["id"]] = tc.get("args", {}) or {}
+
+    results = []
+    for msg in tool_msgs:
+        verdict = getattr(msg, "content", "") or ""
+        if not verdict:
+            continue
+        args = args_by_id.get(getattr(msg, "tool_call_id", None))
+        if args is None:
+            if args_by_id or len(tool_msgs) > 1:
+                continue
+            tool_call = _find_last_resolve_call(messages)
+            args = tool_call.get("args", {}) if tool_call else {}
+        results.append((args, verdict))
+    return results
 
 
 def debater_postprocess(state: GlobalState) -> Dict[str, Any]:
     """
     Append Debater verdicts into research_notes, timeline, and structured conflicts.
+    Handles every ResolveConflict result of a batched debater pass.
     """
     messages = state.get("messages", [])
     if not messages:
@@ -49,71 +73,73 @@ def debater_postprocess(state: GlobalState) -> Dict[str, Any]:
     if getattr(last_msg, "type", None) != "tool":
         return {}
 
-    verdict = getattr(last_msg, "content", "") or ""
-    if not verdict:
+    results = _trailing_resolve_results(messages)
+    if not results:
         return {}
 
-    tool_call = _find_last_resolve_call(messages)
-    tool_args = tool_call.get("args", {}) if tool_call else {}
-    topic = tool_args.get("topic", "Unknown")
-    claims = tool_args.get("claims", [])
-    source_ids = tool_args.get("source_ids", [])
-
-    note_lines = [
-        f"[Debater Verdict] Topic: {topic}",
-    ]
-    if claims:
-        for i, claim in enumerate(claims):
-            src = source_ids[i] if i < len(source_ids) else "Unknown"
-            note_lines.append(f"- Claim {i + 1}: {claim} (Source: {src})")
-    note_lines.append("Verdict:")
-    note_lines.append(verdict.strip())
-    note = "\n".join(note_lines)
-
-    conflict_entry = {
-        "topic": topic,
-        "claims": claims,
-        "source_ids": source_ids,
-        "verdict": verdict.strip(),
-        "winner": _extract_winner(verdict),
-    }
-
-    timeline_entry = {
-        "title": f"Conflict Resolution: {topic}",
-        "status": "resolved",
-        "verdict": verdict.strip(),
-        "claims": claims,
-        "sources": source_ids,
-    }
-
     existing_timeline = list(state.get("timeline", []))
-    existing_timeline.append(timeline_entry)
     conflicts = list(state.get("conflicts", []))
-    conflicts.append(conflict_entry)
     existing_candidates = list(state.get("conflict_candidates", []) or [])
+    existing_notes = state.get("research_notes", []) or []
+    new_notes: list[str] = []
+    resolved_keys = set()
+    log_lines = []
+
+    for tool_args, verdict in results:
+        topic = tool_args.get("topic", "Unknown")
+        claims = tool_args.get("claims", [])
+        source_ids = tool_args.get("source_ids", [])
+
+        note_lines = [
+            f"[Debater Verdict] Topic: {topic}",
+        ]
+        if claims:
+            for i, claim in enumerate(claims):
+                src = source_ids[i] if i < len(source_ids) else "Unknown"
+                note_lines.append(f"- Claim {i + 1}: {claim} (Source: {src})")
+        note_lines.append("Verdict:")
+        note_lines.append(verdict.strip())
+        note = "\n".join(note_lines)
+
+        conflicts.append(
+            {
+                "topic": topic,
+                "claims": claims,
+                "source_ids": source_ids,
+                "verdict": verdict.strip(),
+                "winner": _extract_winner(verdict),
+            }
+        )
+        existing_timeline.append(
+            {
+                "title": f"Conflict Resolution: {topic}",
+                "status": "resolved",
+                "verdict": verdict.strip(),
+                "claims": claims,
+                "sources": source_ids,
+            }
+        )
+        resolved_keys.add(conflict_key(topic, claims, source_ids))
+        # Avoid duplicate note insertion if already present
+        if note not in existing_notes and note not in new_notes:
+            new_notes.append(note)
+        log_lines.append(f"Conflict resolved for topic: {topic}")
 
-    resolved_key = _conflict_key(topic, claims, source_ids)
     pruned_candidates = []
     for candidate in existing_candidates:
         if not candidate:
             continue
-        candidate_key = _conflict_key(
+        candidate_key = conflict_key(
             candidate.get("topic", ""),
             candidate.get("claims") or [],
             candidate.get("source_ids") or [],
         )
-        if candidate_key == resolved_key:
+        if candidate_key in resolved_keys:
             continue
         pruned_candidates.append(candidate)
 
-    # Avoid duplicate note insertion if already present
-    existing_notes = state.get("research_notes", []) or []
-    new_notes: list[str] = []
-    if note not in existing_notes:
-        new_notes.append(note)
-
     update: Dict[str, Any] = {
-        "investigation_log": [f"Conflict resolved for topic: {topic}"],
+        "investigation_log": log_lines,
         "timeline": existing_timeline,
         "conflicts": conflicts,
     }
@@ -7,15 +7,51 @@ This is deterministic (no LLM) and enables later audits like:
 - "quote became unreproducible due to doc drift"
 
 Storage:
-  data/doc_versions/<doc_key_hash>.json
+  data/doc_versions.sqlite3 (SQLite, WAL; DEEPTRACE_DOC_VERSION_DB overrides the path)
+
+Each observation is an atomic upsert inside a BEGIN IMMEDIATE transaction, so concurrent
+runs serialize on the write lock instead of overwriting each other's history; lookups
+use the doc_key primary key. Legacy data/doc_versions/<doc_key_hash>.json records are
+imported when the database is first created, and export_doc_version_record() returns
+the same record shape for scripts and audits.
 """
 
 import hashlib
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doc_keys (
+    doc_key TEXT PRIMARY KEY,
+    latest_doc_version_id TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS doc_versions (
+    doc_key TEXT NOT NULL,
+    doc_version_id TEXT NOT NULL,
+    first_seen TEXT,
+    last_seen TEXT,
+    PRIMARY KEY (doc_key, doc_version_id)
+);
+CREATE INDEX IF NOT EXISTS idx_doc_versions_last_seen ON doc_versions (doc_key, last_seen);
+CREATE TABLE IF NOT EXISTS version_runs (
+    doc_key TEXT NOT NULL,
+    doc_version_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    UNIQUE (doc_key, doc_version_id, run_id)
+);
+CREATE TABLE IF NOT EXISTS version_doc_ids (
+    doc_key TEXT NOT NULL,
+    doc_version_id TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    UNIQUE (doc_key, doc_version_id, doc_id)
+);
+"""
 
 
 def _sha256(text: str) -> str:
@@ -25,109 +61,265 @@ def _sha256(text: str) -> str:
 def _now_iso() -> str:
     return datetime.utcnow().isoformat()
 
-def _load_record(path: Path, doc_key: str) -> dict:
-    record = {
-        "doc_key": doc_key,
-        "latest_doc_version_id": None,
-        "updated_at": None,
-        "versions": [],
-    }
-    if path.exists():
-        try:
-            loaded = json.loads(path.read_text(encoding="utf-8"))
-            if isinstance(loaded, dict):
-                record.update(loaded)
-        except Exception:
-            pass
-    return record
-
-
-def _trim_versions(record: dict, *, max_versions: int) -> dict:
-    versions = record.get("versions") or []
-    if max_versions <= 0 or len(versions) <= max_versions:
-        return record
-    # keep most recently seen versions (by last_seen)
-    def _key(v: dict) -> str:
-        return v.get("last_seen") or v.get("first_seen") or ""
-    versions_sorted = sorted(versions, key=_key, reverse=True)[:max_versions]
-    record["versions"] = versions_sorted
-    return record
 
+def _max_versions() -> int:
+    try:
+        return int(os.getenv("DEEPTRACE_DOC_VERSION_MAX_VERSIONS", "50"))
+    except Exception:
+        return 50
 
-def peek_doc_version(doc_key: str) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Return (cdc_path, latest_doc_version_id) if record exists.
-    """
-    base_dir = Path("data") / "doc_versions"
-    key_hash = _sha256(doc_key)[:16]
-    path = base_dir / f"{key_hash}.json"
-    if not path.exists():
-        return None, None
-    record = _load_record(path, doc_key)
-    return str(path), record.get("latest_doc_version_id")
 
+def _db_path() -> Path:
+    return Path(os.getenv("DEEPTRACE_DOC_VERSION_DB", str(Path("data") / "doc_versions.sqlite3")))
 
-def doc_version_cdc_node(state: Dict[str, Any]) -> Dict[str, Any]:
+
+def _observation(state: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
     snapshot = state.get("document_snapshot") or {}
     doc_key = snapshot.get("doc_key") or snapshot.get("final_url") or snapshot.get("doc_id") or "unknown"
     doc_version_id = snapshot.get("doc_version_id") or snapshot.get("doc_version_id_preview") or snapshot.get("text_digest")
     run_id = state.get("run_id") or snapshot.get("run_id")
-    doc_id = snapshot.get("doc_id")
-
-    base_dir = Path("data") / "doc_versions"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    key_hash = _sha256(doc_key)[:16]
-    path = base_dir / f"{key_hash}.json"
-
-    record = _load_record(path, doc_key)
-    previous_latest = record.get("latest_doc_version_id")
-    if previous_latest is None:
-        drift_status = "FIRST_SEEN"
-    elif previous_latest == doc_version_id:
-        drift_status = "UNCHANGED"
-    else:
-        drift_status = "CHANGED_SINCE_LAST_SEEN"
-
-    versions = record.get("versions") or []
-    found = None
-    for v in versions:
-        if v.get("doc_version_id") == doc_version_id:
-            found = v
-            break
-    if found is None:
-        found = {
+    return doc_key, doc_version_id, run_id, snapshot.get("doc_id")
+
+
+class DocVersionStore:
+    """SQLite-backed doc version history (one connection per store, writes serialized)."""
+
+    def __init__(self, path: Path, legacy_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        created = not self.path.exists()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if created and legacy_dir is not None and legacy_dir.is_dir():
+            self.import_legacy_json(legacy_dir)
+
+    # --- writes ---
+
+    def record_many(self, observations: Sequence[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> List[dict]:
+        """
+        Record (doc_key, doc_version_id, run_id, doc_id) observations in one transaction.
+        Results are in input order; later observations of a key see the earlier ones.
+        """
+        max_versions = _max_versions()
+        results = []
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for doc_key, doc_version_id, run_id, doc_id in observations:
+                    results.append(self._record(cur, doc_key, doc_version_id, run_id, doc_id, max_versions))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return results
+
+    def _record(self, cur, doc_key, doc_version_id, run_id, doc_id, max_versions) -> dict:
+        now = _now_iso()
+        row = cur.execute("SELECT latest_doc_version_id FROM doc_keys WHERE doc_key = ?", (doc_key,)).fetchone()
+        previous_latest = row[0] if row else None
+        if previous_latest is None:
+            drift_status = "FIRST_SEEN"
+        elif previous_latest == doc_version_id:
+            drift_status = "UNCHANGED"
+        else:
+            drift_status = "CHANGED_SINCE_LAST_SEEN"
+
+        cur.execute(
+            "INSERT INTO doc_keys (doc_key, latest_doc_version_id, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(doc_key) DO UPDATE SET latest_doc_version_id = excluded.latest_doc_version_id, "
+            "updated_at = excluded.updated_at",
+            (doc_key, doc_version_id, now),
+        )
+        cur.execute(
+            "INSERT INTO doc_versions (doc_key, doc_version_id, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(doc_key, doc_version_id) DO UPDATE SET last_seen = excluded.last_seen",
+            (doc_key, doc_version_id, now, now),
+        )
+        if run_id:
+            cur.execute("INSERT OR IGNORE INTO version_runs VALUES (?, ?, ?)", (doc_key, doc_version_id, run_id))
+        if doc_id:
+            cur.execute("INSERT OR IGNORE INTO version_doc_ids VALUES (?, ?, ?)", (doc_key, doc_version_id, doc_id))
+
+        versions_count = cur.execute("SELECT COUNT(*) FROM doc_versions WHERE doc_key = ?", (doc_key,)).fetchone()[0]
+        if 0 < max_versions < versions_count:
+            # keep most recently seen versions (by last_seen)
+            stale = [
+                r[0]
+                for r in cur.execute(
+                    "SELECT doc_version_id FROM doc_versions WHERE doc_key = ? ORDER BY last_seen DESC LIMIT -1 OFFSET ?",
+                    (doc_key, max_versions),
+                ).fetchall()
+            ]
+            for table in ("doc_versions", "version_runs", "version_doc_ids"):
+                cur.executemany(
+                    f"DELETE FROM {table} WHERE doc_key = ? AND doc_version_id = ?",
+                    [(doc_key, vid) for vid in stale],
+                )
+            versions_count -= len(stale)
+
+        return {
+            "doc_version_cdc_path": str(self.path),
+            "doc_key": doc_key,
             "doc_version_id": doc_version_id,
-            "first_seen": _now_iso(),
-            "last_seen": _now_iso(),
-            "seen_runs": [],
-            "doc_ids": [],
+            "doc_versions_count": versions_count,
+            "previous_latest_doc_version_id": previous_latest,
+            "drift_status": drift_status,
         }
-        versions.append(found)
-    else:
-        found["last_seen"] = _now_iso()
 
-    if run_id and run_id not in found["seen_runs"]:
-        found["seen_runs"].append(run_id)
-    if doc_id and doc_id not in found["doc_ids"]:
-        found["doc_ids"].append(doc_id)
+    def import_legacy_json(self, legacy_dir: Path) -> int:
+        """Load data/doc_versions/*.json records written by the previous file-per-key CDC."""
+        imported = 0
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for path in sorted(Path(legacy_dir).glob("*.json")):
+                    try:
+                        record = json.loads(path.read_text(encoding="utf-8"))
+                    except Exception:
+                        continue
+                    doc_key = record.get("doc_key") if isinstance(record, dict) else None
+                    if not doc_key:
+                        continue
+                    cur.execute(
+                        "INSERT OR REPLACE INTO doc_keys VALUES (?, ?, ?)",
+                        (doc_key, record.get("latest_doc_version_id"), record.get("updated_at")),
+                    )
+                    for v in record.get("versions") or []:
+                        vid = v.get("doc_version_id")
+                        cur.execute(
+                            "INSERT OR REPLACE INTO doc_versions VALUES (?, ?, ?, ?)",
+                            (doc_key, vid, v.get("first_seen"), v.get("last_seen")),
+                        )
+                        cur.executemany(
+                            "INSERT OR IGNORE INTO version_runs VALUES (?, ?, ?)",
+                            [(doc_key, vid, r) for r in v.get("seen_runs") or []],
+                        )
+                        cur.executemany(
+                            "INSERT OR IGNORE INTO version_doc_ids VALUES (?, ?, ?)",
+                            [(doc_key, vid, d) for d in v.get("doc_ids") or []],
+                        )
+                    imported += 1
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return imported
 
-    record["doc_key"] = doc_key
-    record["latest_doc_version_id"] = doc_version_id
-    record["updated_at"] = _now_iso()
-    record["versions"] = versions
+    # --- reads ---
 
-    try:
-        max_versions = int(os.getenv("DEEPTRACE_DOC_VERSION_MAX_VERSIONS", "50"))
-    except Exception:
-        max_versions = 50
-    record = _trim_versions(record, max_versions=max_versions)
-
-    path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
-    return {
-        "doc_version_cdc_path": str(path),
-        "doc_key": doc_key,
-        "doc_version_id": doc_version_id,
-        "doc_versions_count": len(versions),
-        "previous_latest_doc_version_id": previous_latest,
-        "drift_status": drift_status,
-    }
+    def latest(self, doc_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latest_doc_version_id FROM doc_keys WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def export_record(self, doc_key: str) -> Optional[dict]:
+        """Record in the legacy per-key JSON shape (None if the key was never seen)."""
+        with self._lock:
+            head = self._conn.execute(
+                "SELECT latest_doc_version_id, updated_at FROM doc_keys WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+            if head is None:
+                return None
+            versions = []
+            for vid, first_seen, last_seen in self._conn.execute(
+                "SELECT doc_version_id, first_seen, last_seen FROM doc_versions WHERE doc_key = ? ORDER BY rowid",
+                (doc_key,),
+            ).fetchall():
+                runs = self._conn.execute(
+                    "SELECT run_id FROM version_runs WHERE doc_key = ? AND doc_version_id = ? ORDER BY rowid",
+                    (doc_key, vid),
+                ).fetchall()
+                doc_ids = self._conn.execute(
+                    "SELECT doc_id FROM version_doc_ids WHERE doc_key = ? AND doc_version_id = ? ORDER BY rowid",
+                    (doc_key, vid),
+                ).fetchall()
+                versions.append(
+                    {
+                        "doc_version_id": vid,
+                        "first_seen": first_seen,
+                        "last_seen": last_seen,
+                        "seen_runs": [r[0] for r in runs],
+                        "doc_ids": [d[0] for d in doc_ids],
+                    }
+                )
+        return {"doc_key": doc_key, "latest_doc_version_id": head[0], "updated_at": head[1], "versions": versions}
+
+    def iter_records(self, limit: Optional[int] = None) -> Iterator[dict]:
+        with self._lock:
+            keys = [
+                r[0]
+                for r in self._conn.execute(
+                    "SELECT doc_key FROM doc_keys ORDER BY updated_at DESC LIMIT ?", (-1 if limit is None else limit,)
+                ).fetchall()
+            ]
+        for doc_key in keys:
+            record = self.export_record(doc_key)
+            if record is not None:
+                yield record
+
+    def export_json(self, out_dir: Path) -> int:
+        """Write every record as <out_dir>/<doc_key_hash>.json (the legacy layout)."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for record in self.iter_records():
+            path = out_dir / f"{_sha256(record['doc_key'])[:16]}.json"
+            path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+            count += 1
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, DocVersionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_doc_version_store() -> DocVersionStore:
+    path = _db_path()
+    key = str(path.resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or not path.exists():
+            if store is not None:
+                store.close()
+            store = DocVersionStore(path, legacy_dir=path.parent / "doc_versions")
+            _stores[key] = store
+    return store
+
+
+def peek_doc_version(doc_key: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return (cdc_path, latest_doc_version_id) if record exists.
+    """
+    if not _db_path().exists():
+        return None, None
+    store = get_doc_version_store()
+    latest = store.latest(doc_key)
+    if latest is None:
+        return None, None
+    return str(store.path), latest
+
+
+def export_doc_version_record(doc_key: str) -> Optional[dict]:
+    return get_doc_version_store().export_record(doc_key)
+
+
+def doc_version_cdc_batch(states: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """doc_version_cdc_node for many snapshots in a single transaction (results in input order)."""
+    if not states:
+        return []
+    return get_doc_version_store().record_many([_observation(state) for state in states])
+
+
+def doc_version_cdc_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    return doc_version_cdc_batch([state])[0]
@@ -5,8 +5,35 @@ from ...agents.event_extractor import extract_event_from_evidence
 from ...agents.comment_extractor import extract_comments_from_article
 from ...core.models.comments import Comment
 from ...core.models.evidence import Evidence
+from ...core.verification.near_duplicate import SYNDICATION_TEXT_CHARS, NearDuplicateDetector
 from ...config.settings import settings
 
+_near_duplicate_detector = NearDuplicateDetector()
+
+
+def _drop_near_duplicates(evidences: List[Evidence]) -> List[Evidence]:
+    """
+    Same-platform near-duplicates of an earlier evidence are dropped (nothing new to extract);
+    cross-platform copies are kept but marked as reposts, like the title check in extract_events_node.
+    """
+    groups = _near_duplicate_detector.group(
+        [(ev.title or "") + " " + (ev.content or "")[:SYNDICATION_TEXT_CHARS] for ev in evidences]
+    )
+    dropped = set()
+    for members in groups:
+        canonical = evidences[members[0]]
+        canonical_platform = canonical.metadata.get("platform", "unknown")
+        for idx in members[1:]:
+            ev = evidences[idx]
+            ev.metadata["near_duplicate_of"] = canonical.id
+            if ev.metadata.get("platform", "unknown") == canonical_platform:
+                dropped.add(idx)
+            else:
+                ev.metadata["is_repost"] = True
+                ev.metadata["repost_source_platform"] = canonical_platform
+    return [ev for idx, ev in enumerate(evidences) if idx not in dropped]
+
+
 async def extract_events_node(state: GraphState) -> GraphState:
     """
     Extract Events Node: 仅从证据中提取事件。
@@ -61,6 +88,9 @@ async def extract_events_node(state: GraphState) -> GraphState:
             
         unique_evidences.append(ev)
 
+    # Layer 2 Deduplication: near-verbatim copies (syndication / reposts) via MinHash-LSH
+    unique_evidences = _drop_near_duplicates(unique_evidences)
+
     if len(evidences) != len(unique_evidences):
         print(f"[Extract] Deduplicated evidences: {len(evidences)} -> {len(unique_evidences)}")
 
@@ -23,30 +23,23 @@ except ImportError:
         )
 
 from src.config.settings import settings
-from src.core.utils.llm_safety import safe_ainvoke
+from src.core.utils.structured_output import (
+    StructuredOutputError,
+    ainvoke_structured,
+    parse_structured,
+    repair_json,
+)
+from src.llm.router import cascade_ainvoke
 from src.graph.state_v2 import GlobalState
 from src.core.models.credibility import evaluate_credibility
 from src.core.utils.topic_filter import matches_tokens, extract_tokens
+from src.core.utils.url_index import UrlOccurrenceIndex, extract_urls
 
 import json
 import yaml
 
 RENDERER_VERSION = "phase0_markdown_renderer_v1"
 
-def _extract_urls(notes: List[str]) -> List[str]:
-    urls = []
-    seen = set()
-    # Allow typical URL characters; escape hyphen to avoid unintended ranges
-    pattern = re.compile(r"https?://[\w\-._~:/?#\[\]@!$&'()*+,;=%]+", re.IGNORECASE)
-    for note in notes:
-        for url in pattern.findall(note or ""):
-            normalized = url.rstrip(")].,>\"' ")
-            if normalized and normalized not in seen:
-                seen.add(normalized)
-                urls.append(normalized)
-    return urls
-
-
 def _topic_tokens(text: str) -> set:
     return set(extract_tokens(text))
 
@@ -120,22 +113,6 @@ def _filter_official_buckets(buckets: Dict[str, List[str]]) -> Dict[str, List[st
     return buckets
 
 
-def _build_snippet_map(urls: List[str], notes: List[str]) -> dict:
-    """
-    Map URL -> small snippet of note text containing it (for LLM verification).
-    """
-    snippets = {}
-    for url in urls:
-        for n in notes:
-            if url in n:
-                idx = n.find(url)
-                start = max(0, idx - 200)
-                end = min(len(n), idx + 200)
-                snippets[url] = n[start:end]
-                break
-    return snippets
-
-
 async def _llm_verify_official(url: str, topic: str, snippet: str, model_name: str):
     """
     Use LLM to verify if a source is an official announcement and whether it is confirmed vs speculative.
@@ -164,11 +141,14 @@ Return JSON ONLY:
   "reasoning": "short explanation"
 }}
 """
-    llm = init_chat_model(model=model_name, temperature=0)
     try:
-        resp = await safe_ainvoke(llm, [SystemMessage(content=system), HumanMessage(content=user)], model_name=model_name)
-        data = json.loads(resp.content)
-        return data if isinstance(data, dict) else {}
+        return await cascade_ainvoke(
+            "verify_official",
+            [SystemMessage(content=system), HumanMessage(content=user)],
+            llm_factory=lambda m: init_chat_model(model=m, temperature=0),
+            default_model=model_name,
+            parse=lambda resp: parse_structured(resp.content, validate=lambda data: isinstance(data, dict)),
+        )
     except Exception:
         return {}
 
@@ -485,6 +465,8 @@ async def finalizer_node(state: GlobalState, config: RunnableConfig) -> Dict[str
 
     cleaned_timeline = _clean_timeline_entries(timeline)
     facts_index = _build_facts_index(cleaned_timeline, objective, run_id)
+    # Notes are parsed once; Gate2's url_not_in_sources check looks cited URLs up here
+    url_index = UrlOccurrenceIndex(notes)
     allowed_event_ids = [f.get("event_id") for f in facts_index.get("facts", []) if f.get("event_id")]
 
     # If we have no grounded facts at all, short-circuit with a guarded minimal report.
@@ -551,7 +533,7 @@ async def finalizer_node(state: GlobalState, config: RunnableConfig) -> Dict[str
 
     report_citations = _export_sidecar(structured_report)
     _enforce_dispute_rules(structured_report)
-    gate_report = _gate2_audit(structured_report, facts_index, severity_map=severity_map)
+    gate_report = _gate2_audit(structured_report, facts_index, severity_map=severity_map, url_index=url_index)
     final_report = _render_markdown_from_structured(structured_report, gate_report, objective, current_ts)
 
     return {
@@ -617,20 +599,10 @@ def _build_facts_index(timeline: List[dict], objective: str, run_id: str) -> dic
 
 def _coerce_json(text: str) -> Optional[dict]:
     try:
-        return json.loads(text)
-    except Exception:
-        pass
-    # Try to extract the first JSON object substring
-    if "{" in text and "}" in text:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start >= 0 and end > start:
-            snippet = text[start : end + 1]
-            try:
-                return json.loads(snippet)
-            except Exception:
-                return None
-    return None
+        data = repair_json(text)
+    except StructuredOutputError:
+        return None
+    return data if isinstance(data, dict) else None
 
 
 async def _generate_structured_report(
@@ -645,7 +617,7 @@ async def _generate_structured_report(
     current_ts: str,
 ) -> tuple[dict, List[str]]:
     """
-    Ask LLM for structured JSON only; retry a couple times, then degrade deterministically.
+    Ask LLM for structured JSON only; repair locally / re-ask briefly, then degrade deterministically.
     """
     errors: List[str] = []
     timeline_excerpt = cleaned_timeline[:12]
@@ -653,32 +625,33 @@ async def _generate_structured_report(
     notes_blob = "\n".join(notes)[:3000]
     allowed_ids = allowed_event_ids or []
 
+    schema_hint = json.dumps(
+        {
+            "report_id": run_id,
+            "run_id": run_id,
+            "generated_at": current_ts,
+            "sections": [
+                {
+                    "section_id": "executive_summary",
+                    "title": "Executive Summary",
+                    "items": [
+                        {
+                            "item_id": 1,
+                            "item_text": "Short summary sentence.",
+                            "role": "analysis",
+                            "event_ids": [],
+                            "assertion_strength": "neutral",
+                            "dispute_status": "none",
+                            "conflict_group_id": None,
+                        }
+                    ],
+                }
+            ],
+        },
+        ensure_ascii=True,
+    )
+
     def _messages(extra_hint: str = "") -> List[Any]:
-        schema_hint = json.dumps(
-            {
-                "report_id": run_id,
-                "run_id": run_id,
-                "generated_at": current_ts,
-                "sections": [
-                    {
-                        "section_id": "executive_summary",
-                        "title": "Executive Summary",
-                        "items": [
-                            {
-                                "item_id": 1,
-                                "item_text": "Short summary sentence.",
-                                "role": "analysis",
-                                "event_ids": [],
-                                "assertion_strength": "neutral",
-                                "dispute_status": "none",
-                                "conflict_group_id": None,
-                            }
-                        ],
-                    }
-                ],
-            },
-            ensure_ascii=True,
-        )
         user = (
             f"Objective: {objective}\n"
             f"Today: {current_ts}\n"
@@ -711,15 +684,23 @@ async def _generate_structured_report(
             HumanMessage(content=user),
         ]
 
-    for attempt in range(3):
-        resp = await safe_ainvoke(llm, _messages("" if attempt == 0 else "Previous output was invalid. Return JSON only."), model_name=model_name)
-        parsed = _coerce_json(resp.content or "")
-        if isinstance(parsed, dict) and parsed.get("sections"):
-            parsed.setdefault("report_id", run_id)
-            parsed.setdefault("run_id", run_id)
-            parsed.setdefault("generated_at", current_ts)
-            return parsed, errors
-        errors.append(f"attempt {attempt+1} parse failed")
+    # One full call; parse failures are repaired locally, then via short repair prompts
+    try:
+        parsed = await ainvoke_structured(
+            llm,
+            _messages(),
+            validate=lambda data: isinstance(data, dict) and bool(data.get("sections")),
+            schema_hint=schema_hint,
+            model_name=model_name,
+            call_site="structured_report",
+            max_repairs=2,
+        )
+        parsed.setdefault("report_id", run_id)
+        parsed.setdefault("run_id", run_id)
+        parsed.setdefault("generated_at", current_ts)
+        return parsed, errors
+    except StructuredOutputError as e:
+        errors.append(f"structured output parse failed: {e}")
 
     fallback = {
         "report_id": run_id,
@@ -811,9 +792,22 @@ def _must_be_key_claim(text: str) -> bool:
     return any(re.search(p, text, flags=re.IGNORECASE) for p in patterns)
 
 
-def _gate2_audit(structured_report: dict, facts_index: dict, *, severity_map: Optional[dict] = None) -> dict:
+def _gate2_audit(
+    structured_report: dict,
+    facts_index: dict,
+    *,
+    severity_map: Optional[dict] = None,
+    url_index: Optional[UrlOccurrenceIndex] = None,
+) -> dict:
     severity_map = severity_map or _load_gate2_severity()
     allowed = {f.get("event_id") for f in facts_index.get("facts", []) if f.get("event_id")}
+    # URLs an item may cite: evidence URLs plus (when given) every URL in the research notes
+    known_urls = {
+        ev.get("url")
+        for f in facts_index.get("facts", [])
+        for ev in f.get("evidences", []) or []
+        if ev.get("url")
+    }
     violations = []
     summary = {"hard": 0, "soft": 0, "warn": 0}
 
@@ -873,6 +867,12 @@ def _gate2_audit(structured_report: dict, facts_index: dict, *, severity_map: Op
                         "strong confirmation wording used in disputed item",
                     )
 
+            # Cited URLs must come from the collected sources (checked only with a notes index)
+            if url_index is not None:
+                unknown_urls = [u for u in extract_urls(item_text) if u not in known_urls and u not in url_index]
+                if unknown_urls:
+                    add_violation("url_not_in_sources", "WARN", f"URLs not found in notes or facts_index: {unknown_urls}")
+
             # WARN: likely key claim but role not key_claim
             if _must_be_key_claim(item_text) and role != "key_claim":
                 add_violation("must_be_key_claim", "WARN", "item looks like a key claim but role is not key_claim")
@@ -896,6 +896,7 @@ def _load_gate2_severity() -> dict:
         "disputed_needs_multiple_events": "HARD",
         "strong_word_in_disputed": "HARD",
         "must_be_key_claim": "WARN",
+        "url_not_in_sources": "WARN",
     }
     path = getattr(settings, "gate2_severity_config", None)
     if not path:
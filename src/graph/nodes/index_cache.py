@@ -0,0 +1,150 @@
+"""
+Phase2 - Incremental Index Cache
+
+Chunk/sentence indexes and per-event facts_index_v2 items are pure functions of the
+document content (doc_version_id), the normalization version and the splitter
+versions. Cache them so unchanged documents are not re-split on every run and only
+events not seen before for that document version are re-located.
+
+Storage:
+  data/index_cache/<sha256(doc_version_id + index config)[:32]>.json
+
+IDs embed the doc_id of the run that built them (<doc_id>_chunk_<i>, <doc_id>_sent_<i>);
+they are rebased to the current doc_id on load.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.profiling import record_cache
+from src.graph.nodes.chunk_and_sentence_index import splitter_descriptors
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _cache_dir() -> Optional[Path]:
+    root = os.getenv("DEEPTRACE_INDEX_CACHE_DIR", str(Path("data") / "index_cache"))
+    return Path(root) if root else None
+
+
+def index_config_fingerprint(normalization_version: str) -> str:
+    config = {"normalization_version": normalization_version or "unknown", **splitter_descriptors()}
+    return _sha256(json.dumps(config, sort_keys=True, ensure_ascii=False))
+
+
+def event_payload_digest(event: Dict[str, Any]) -> str:
+    return _sha256(json.dumps(event, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _cache_path(doc_version_id: str, normalization_version: str) -> Optional[Path]:
+    base = _cache_dir()
+    if base is None or not doc_version_id:
+        return None
+    return base / f"{_sha256(doc_version_id + index_config_fingerprint(normalization_version))[:32]}.json"
+
+
+def _rebase_id(value: Optional[str], old: str, new: str) -> Optional[str]:
+    if value and old != new and value.startswith(old + "_"):
+        return new + value[len(old):]
+    return value
+
+
+def _rebase_meta(rows: List[dict], id_field: str, old: str, new: str) -> List[dict]:
+    return [{**row, id_field: _rebase_id(row.get(id_field), old, new)} for row in rows]
+
+
+def _rebase_fact(item: dict, old: str, new: str) -> dict:
+    ref = dict(item.get("doc_ref") or {})
+    if ref.get("doc_id") == old:
+        ref["doc_id"] = new
+    ref["chunk_id"] = _rebase_id(ref.get("chunk_id"), old, new)
+    ref["sentence_ids"] = [_rebase_id(sid, old, new) for sid in ref.get("sentence_ids") or []]
+    return {**item, "doc_ref": ref}
+
+
+class CachedIndex:
+    """Cached index for one document version, already rebased to the requesting doc_id."""
+
+    def __init__(self, doc_version_id: str, normalization_version: str, doc_id: str, record: Optional[dict] = None):
+        self.doc_version_id = doc_version_id
+        self.normalization_version = normalization_version
+        self.doc_id = doc_id
+        record = record or {}
+        old = record.get("doc_id") or doc_id
+        self.chunk_meta: Optional[List[dict]] = None
+        self.sentence_meta: Optional[List[dict]] = None
+        self.index_manifest: Optional[dict] = record.get("index_manifest")
+        if record.get("chunk_meta") is not None and record.get("sentence_meta") is not None:
+            self.chunk_meta = _rebase_meta(record["chunk_meta"], "chunk_id", old, doc_id)
+            self.sentence_meta = _rebase_meta(record["sentence_meta"], "sentence_id", old, doc_id)
+        self.facts: Dict[str, dict] = {
+            digest: _rebase_fact(item, old, doc_id) for digest, item in (record.get("facts") or {}).items()
+        }
+        self.dirty = not record
+
+    @property
+    def has_index(self) -> bool:
+        return self.chunk_meta is not None and self.sentence_meta is not None
+
+    def set_index(self, chunk_meta: List[dict], sentence_meta: List[dict], index_manifest: dict) -> None:
+        self.chunk_meta = chunk_meta
+        self.sentence_meta = sentence_meta
+        self.index_manifest = index_manifest
+        self.dirty = True
+
+    def manifest_for_run(self, run_id: str) -> Optional[dict]:
+        """Cached manifest re-stamped with the current run (created_at keeps the original build time)."""
+        if self.index_manifest is None:
+            return None
+        return {**self.index_manifest, "run_id": run_id}
+
+    def get_fact(self, event: Dict[str, Any]) -> Optional[dict]:
+        return self.facts.get(event_payload_digest(event))
+
+    def put_fact(self, event: Dict[str, Any], item: dict) -> None:
+        self.facts[event_payload_digest(event)] = item
+        self.dirty = True
+
+
+def load_cached_index(doc_version_id: str, normalization_version: str, doc_id: str) -> CachedIndex:
+    """Cached index for this document version (empty CachedIndex if none or the cache is disabled)."""
+    path = _cache_path(doc_version_id, normalization_version)
+    record = None
+    if path is not None and path.exists():
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict) and loaded.get("doc_version_id") == doc_version_id:
+                record = loaded
+        except Exception:
+            record = None
+    if path is not None:
+        record_cache("phase1_index", hits=int(record is not None), misses=int(record is None))
+    return CachedIndex(doc_version_id, normalization_version, doc_id, record)
+
+
+def save_cached_index(cached: CachedIndex) -> Optional[str]:
+    """Persist the cache entry if it changed; returns its path (None when disabled / nothing to store)."""
+    path = _cache_path(cached.doc_version_id, cached.normalization_version)
+    if path is None or not cached.has_index:
+        return None
+    if cached.dirty:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "doc_version_id": cached.doc_version_id,
+            "index_config": index_config_fingerprint(cached.normalization_version),
+            "doc_id": cached.doc_id,
+            "chunk_meta": cached.chunk_meta,
+            "sentence_meta": cached.sentence_meta,
+            "index_manifest": cached.index_manifest,
+            "facts": cached.facts,
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+        cached.dirty = False
+    return str(path)
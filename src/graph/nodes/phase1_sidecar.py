@@ -4,8 +4,10 @@ Minimal-intrusion post-processing hook:
 - Iterate evidences (with full_content/url)
 - For each: ExtractMainText -> DocumentSnapshot -> Chunk/Sentence Index
 - Aggregate events (with hints) -> FactsIndex_v2
+- Unchanged doc versions reuse the cached chunk/sentence index and per-event facts (index_cache)
 - Gate1 Audit
 - Archive artifacts under artifacts/phase1/<run_id>/<doc_id> and global facts/gate1.
+- Ingest the run-level aggregates into the artifact catalog.
 
 Assumptions:
 - state["evidences"]: list of dicts with keys: id?, full_content?, url?, title/description as hints
@@ -15,17 +17,19 @@ Assumptions:
 
 import hashlib
 from pathlib import Path
-import json
 from typing import Dict, Any, List, DefaultDict
 from collections import defaultdict
 
+from src.core.artifact_catalog import catalog_ingest
+from src.core.artifact_io import ArtifactWriter
 from src.graph.nodes.extract_main_text import extract_main_text_node
 from src.graph.nodes.build_document_snapshot import build_document_snapshot_node
 from src.graph.nodes.chunk_and_sentence_index import chunk_and_sentence_index_node
 from src.graph.nodes.build_facts_index_v2 import build_facts_index_v2_node
 from src.graph.nodes.gate1_evidence_audit import gate1_evidence_audit_node
 from src.graph.nodes.archive_phase1 import archive_phase1_node
-from src.graph.nodes.doc_version_cdc import doc_version_cdc_node
+from src.graph.nodes.doc_version_cdc import doc_version_cdc_batch
+from src.graph.nodes.index_cache import load_cached_index, save_cached_index
 
 
 def _hash(text: str) -> str:
@@ -129,6 +133,8 @@ async def phase1_sidecar_node(state: Dict[str, Any], config) -> Dict[str, Any]:
     all_reports = []
     doc_versions_summary = []
 
+    # Extract + snapshot every document first so CDC is recorded in one transaction
+    prepared = []
     for evd in evidences:
         raw_html = evd.get("full_content") or ""
         url = evd.get("url") or ""
@@ -149,8 +155,14 @@ async def phase1_sidecar_node(state: Dict[str, Any], config) -> Dict[str, Any]:
             "source": evd.get("source"),
         }
         snap = await build_document_snapshot_node(snapshot_input, config)
-        # Phase2 CDC: record this doc version per URL key
-        cdc_out = doc_version_cdc_node({"document_snapshot": snap["document_snapshot"], "run_id": run_id})
+        prepared.append((url, doc_id, emt, snap))
+
+    # Phase2 CDC: record each doc version per URL key
+    cdc_outs = doc_version_cdc_batch(
+        [{"document_snapshot": snap["document_snapshot"], "run_id": run_id} for _, _, _, snap in prepared]
+    )
+
+    for (url, doc_id, emt, snap), cdc_out in zip(prepared, cdc_outs):
         doc_versions_summary.append(
             {
                 "doc_id": snap["document_snapshot"].get("doc_id"),
@@ -162,16 +174,28 @@ async def phase1_sidecar_node(state: Dict[str, Any], config) -> Dict[str, Any]:
                 "final_url": snap["document_snapshot"].get("final_url"),
             }
         )
-        # Chunk/Sentence index
-        idx = await chunk_and_sentence_index_node(
-            {
-                "cleaned_text": emt["cleaned_text"],
-                "doc_id": doc_id,
-                "normalization_version": snap["document_snapshot"]["normalization_version"],
-                "run_id": run_id,
-            },
-            config,
-        )
+        # Chunk/Sentence index (reused when this doc version was indexed by an earlier run)
+        normalization_version = snap["document_snapshot"]["normalization_version"]
+        cached = load_cached_index(snap["document_snapshot"].get("doc_version_id"), normalization_version, doc_id)
+        index_reused = cached.has_index
+        if index_reused:
+            idx = {
+                "chunk_meta": cached.chunk_meta,
+                "sentence_meta": cached.sentence_meta,
+                "index_manifest": cached.manifest_for_run(run_id),
+            }
+        else:
+            idx = await chunk_and_sentence_index_node(
+                {
+                    "cleaned_text": emt["cleaned_text"],
+                    "doc_id": doc_id,
+                    "normalization_version": normalization_version,
+                    "run_id": run_id,
+                },
+                config,
+            )
+            cached.set_index(idx["chunk_meta"], idx["sentence_meta"], idx["index_manifest"])
+        doc_versions_summary[-1]["index_reused"] = index_reused
 
         # Build facts index for this doc:
         # Prefer finalizer facts_index (canonical event_id) filtered by this URL;
@@ -219,18 +243,31 @@ async def phase1_sidecar_node(state: Dict[str, Any], config) -> Dict[str, Any]:
                     }
                 )
 
-        facts_out = await build_facts_index_v2_node(
-            {
-                "cleaned_text": emt["cleaned_text"],
-                "sentence_meta": idx["sentence_meta"],
-                "events": events_payload,
-                "doc_id": doc_id,
-                "doc_key": snap["document_snapshot"].get("doc_key"),
-                "doc_version_id": snap["document_snapshot"].get("doc_version_id"),
-                "normalization_version": snap["document_snapshot"]["normalization_version"],
-            },
-            config,
-        )
+        # Only events not located in this doc version before go through the locator
+        new_events = [ev for ev in events_payload if cached.get_fact(ev) is None]
+        if new_events:
+            new_out = await build_facts_index_v2_node(
+                {
+                    "cleaned_text": emt["cleaned_text"],
+                    "sentence_meta": idx["sentence_meta"],
+                    "events": new_events,
+                    "doc_id": doc_id,
+                    "doc_key": snap["document_snapshot"].get("doc_key"),
+                    "doc_version_id": snap["document_snapshot"].get("doc_version_id"),
+                    "normalization_version": normalization_version,
+                },
+                config,
+            )
+            for ev, item in zip(new_events, new_out["facts_index_v2"]["items"]):
+                cached.put_fact(ev, item)
+        facts_out = {
+            "facts_index_v2": {
+                "items": [cached.get_fact(ev) for ev in events_payload],
+                "normalization_version": normalization_version,
+            }
+        }
+        doc_versions_summary[-1]["facts_reused"] = len(events_payload) - len(new_events)
+        save_cached_index(cached)
 
         # Gate1 audit for this doc (using structured_report if available)
         drift_map = {it.get("doc_key"): it.get("drift_status") for it in doc_versions_summary if it.get("doc_key")}
@@ -294,46 +331,38 @@ async def phase1_sidecar_node(state: Dict[str, Any], config) -> Dict[str, Any]:
             reason = msg.split("Unlocatable evidence: ", 1)[1].strip()
             reason_counts[reason] = reason_counts.get(reason, 0) + 1
 
-    (agg_dir / "facts_index_v2.json").write_text(
-        json.dumps({"items": all_facts_items}, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
-    (agg_dir / "gate1_report.json").write_text(
-        json.dumps(
-            {"entries": all_reports, "key_claim_locatable_rate": key_claim_locatable_rate},
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+    writer = ArtifactWriter(agg_dir)
+    writer.write("facts_index_v2", {"items": all_facts_items}, collection="items", schema="facts_index_v2")
+    writer.write(
+        "gate1_report",
+        {"entries": all_reports, "key_claim_locatable_rate": key_claim_locatable_rate},
+        collection="entries",
+        schema="gate1_report",
     )
-    (agg_dir / "metrics_summary.json").write_text(
-        json.dumps(
-            {
-                "key_claim_locatable_rate": key_claim_locatable_rate,
-                "locatable_rate_overall": locatable_rate_overall,
-                "reason_counts": reason_counts,
-            },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+    writer.write(
+        "metrics_summary",
+        {
+            "key_claim_locatable_rate": key_claim_locatable_rate,
+            "locatable_rate_overall": locatable_rate_overall,
+            "reason_counts": reason_counts,
+        },
     )
     # Phase2 CDC summary for this run
-    (agg_dir / "doc_versions_summary.json").write_text(
-        json.dumps(
-            {
-                "run_id": run_id,
-                "documents": doc_versions_summary,
-                "summary": {
-                    "docs_total": len(doc_versions_summary),
-                    "docs_changed": len([d for d in doc_versions_summary if d.get("drift_status") == "CHANGED_SINCE_LAST_SEEN"]),
-                    "docs_unchanged": len([d for d in doc_versions_summary if d.get("drift_status") == "UNCHANGED"]),
-                    "docs_first_seen": len([d for d in doc_versions_summary if d.get("drift_status") == "FIRST_SEEN"]),
-                },
+    writer.write(
+        "doc_versions_summary",
+        {
+            "run_id": run_id,
+            "documents": doc_versions_summary,
+            "summary": {
+                "docs_total": len(doc_versions_summary),
+                "docs_changed": len([d for d in doc_versions_summary if d.get("drift_status") == "CHANGED_SINCE_LAST_SEEN"]),
+                "docs_unchanged": len([d for d in doc_versions_summary if d.get("drift_status") == "UNCHANGED"]),
+                "docs_first_seen": len([d for d in doc_versions_summary if d.get("drift_status") == "FIRST_SEEN"]),
+                "docs_index_reused": len([d for d in doc_versions_summary if d.get("index_reused")]),
             },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+        },
     )
 
+    catalog_ingest(phase1_dir=agg_dir)
+
     return {"phase1_archive": str(agg_dir)}
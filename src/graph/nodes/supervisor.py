@@ -21,8 +21,10 @@ except ImportError:
 from src.graph.state_v2 import GlobalState
 from src.core.models_v2 import ConductResearch, FinalAnswer, ResolveConflict, BreadthResearch, DepthResearch
 from src.core.prompts.v2 import RESEARCH_SYSTEM_PROMPT
+from src.core.tools.debater import conflict_key
 from src.core.tools.thinking import think_tool
 from src.core.utils.llm_safety import safe_ainvoke
+from src.llm.factory import init_fallback_llm
 
 from src.config.settings import settings
 from src.core.utils.topic_filter import matches_tokens
@@ -124,10 +126,7 @@ async def supervisor_node(state: GlobalState, config: RunnableConfig):
     _logger.info(f"📊 Supervisor: research_calls={research_calls}/{MAX_RESEARCH_ROUNDS}, executed_tools={len(executed)}")
 
     def _conflict_key_from_payload(payload: dict) -> tuple:
-        topic = (payload.get("topic") or "").strip().lower()
-        sources = tuple(sorted(set(payload.get("source_ids") or [])))
-        claims = tuple(sorted(set(payload.get("claims") or [])))
-        return (topic, sources, claims)
+        return conflict_key(payload.get("topic"), payload.get("claims"), payload.get("source_ids"))
 
     def _conflict_key_from_executed(tool_entry: dict) -> tuple:
         args = tool_entry.get("args") or {}
@@ -148,8 +147,13 @@ async def supervisor_node(state: GlobalState, config: RunnableConfig):
         if t.get("name") == "ResolveConflict"
     }
     new_cache_ids = []
+    # Batch eligible candidates into one turn; the debater node groups shared topics
+    conflict_calls = []
+    batch_keys = set()
 
     for candidate in conflict_candidates:
+        if len(conflict_calls) >= max(settings.DEBATE_MAX_BATCH, 1):
+            break
         if not candidate:
             continue
         candidate_id = candidate.get("candidate_id")
@@ -172,7 +176,7 @@ async def supervisor_node(state: GlobalState, config: RunnableConfig):
         if len(set(source_ids)) < 2:
             continue
         candidate_key = _conflict_key_from_payload(candidate)
-        if candidate_key in executed_conflicts:
+        if candidate_key in executed_conflicts or candidate_key in batch_keys:
             if candidate_id:
                 conflict_cache_set.add(candidate_id)
                 new_cache_ids.append(candidate_id)
@@ -180,21 +184,24 @@ async def supervisor_node(state: GlobalState, config: RunnableConfig):
         if candidate_id:
             conflict_cache_set.add(candidate_id)
             new_cache_ids.append(candidate_id)
+        batch_keys.add(candidate_key)
+        conflict_calls.append(
+            {
+                "id": f"auto-conflict-{abs(hash(candidate_key))}",
+                "name": "ResolveConflict",
+                "args": {
+                    "topic": topic,
+                    "claims": claims,
+                    "source_ids": source_ids,
+                },
+            }
+        )
+
+    if conflict_calls:
         response = AIMessage(
             content="Auto-trigger conflict resolution for same-day multi-source discrepancy.",
-            tool_calls=[
-                {
-                    "id": f"auto-conflict-{abs(hash(candidate_key))}",
-                    "name": "ResolveConflict",
-                    "args": {
-                        "topic": topic,
-                        "claims": claims,
-                        "source_ids": source_ids,
-                    },
-                }
-            ],
+            tool_calls=conflict_calls,
         )
-        break
     else:
         response = None
 
@@ -319,7 +326,15 @@ async def supervisor_node(state: GlobalState, config: RunnableConfig):
         )
     else:
         # The supervisor returns a Message with Tool Calls.
-        response = await safe_ainvoke(supervisor, messages, model_name=model_name)
+        fallback_llm = init_fallback_llm()
+        response = await safe_ainvoke(
+            supervisor,
+            messages,
+            model_name=model_name,
+            call_site="supervisor",
+            fallback=fallback_llm.bind_tools(tools) if fallback_llm else None,
+            fallback_model_name=settings.LLM_FALLBACK_MODEL,
+        )
     
     # 6. Semantic Deduplication & state update
     messages_out = [response]
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any, List
 from ...graph.state import GraphState
 from ...core.models.credibility import evaluate_credibility
+from ...core.models.domain_registry import is_official_domain
 from ...config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -39,12 +40,7 @@ def is_official_source(evidence) -> bool:
     """Phase 17: Check if evidence comes from an Official Domain"""
     if not evidence.url:
         return False
-    from urllib.parse import urlparse
-    try:
-        domain = urlparse(evidence.url).netloc.lower()
-        return any(domain.endswith(d) for d in settings.OFFICIAL_DOMAINS)
-    except:
-        return False
+    return is_official_domain(evidence.url)
 
 
 def is_date_claim(claim) -> bool:
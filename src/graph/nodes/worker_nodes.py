@@ -4,6 +4,7 @@ Implements the core actions of the Investigator: Fetching and Extracting (Protot
 """
 
 from typing import List, Dict
+import asyncio
 import re
 import logging
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
@@ -27,12 +28,16 @@ except ImportError:
 
 from src.config.settings import settings
 from src.graph.state_v2 import WorkerState
-from src.core.tools.search import tavily_search_tool
-from src.core.models.v2_structures import SearchConfiguration, ExtractionResult
+from src.core.tools.search import tavily_search_tool, recency_bonus
+from src.core.models.v2_structures import SearchConfiguration, ExtractionResult, ExtractedEvent
 from src.core.prompts.v2_search import QUERY_GENERATOR_SYSTEM_PROMPT
 from src.core.prompts.v2_extraction import EXTRACTION_SYSTEM_PROMPT
-from src.core.utils.llm_safety import safe_ainvoke
+from src.core.utils.structured_output import ainvoke_structured, parse_structured
+from src.core.utils.token_budget import estimate_tokens, pack_by_budget, truncate_to_tokens
+from src.core.utils.url_index import extract_urls
 from src.llm.thinking import emit_think_plan
+from src.llm.factory import init_fallback_llm
+from src.llm.router import cascade_ainvoke
 from src.core.models.credibility import evaluate_credibility
 from src.core.utils.topic_filter import matches_tokens
 
@@ -128,6 +133,166 @@ def _build_conflict_candidates(timeline_entries: List[dict]) -> List[dict]:
     return candidates
 
 
+def _init_llm(model_name: str):
+    """Build the worker chat model (custom OpenAI-compatible endpoint or init_chat_model)."""
+    if settings.openai_base_url and "openai.com" not in settings.openai_base_url and ChatOpenAI:
+        return ChatOpenAI(
+            model=model_name,
+            openai_api_key=settings.openai_api_key,
+            openai_api_base=settings.openai_base_url,
+            temperature=0
+        )
+    return init_chat_model(model=model_name, temperature=0)
+
+
+# Boundaries of result items / query headers in tavily_search_tool output
+_SEARCH_BLOCK_SPLIT = re.compile(r"\n\n(?=- \*\*|### Results for query)")
+_SEARCH_BLOCK_SCORE = re.compile(r"\[credibility=([\d.]+), recency_days=(\w+)")
+
+
+def _split_search_blocks(search_content: str) -> List[str]:
+    """Split concatenated search messages into header and per-result blocks."""
+    return [b for b in _SEARCH_BLOCK_SPLIT.split(search_content) if b.strip()]
+
+
+def _score_search_block(block: str) -> float:
+    """
+    Score a formatted search-result block like score_result (credibility + recency).
+    Non-result blocks (headers, query lists) always rank first.
+    """
+    match = _SEARCH_BLOCK_SCORE.search(block)
+    if not block.startswith("- **") or not match:
+        return float("inf")
+    days = int(match.group(2)) if match.group(2).isdigit() else None
+    return float(match.group(1)) + recency_bonus(days)
+
+
+def _pack_search_content(search_content: str, budget_tokens: int, model_name: str) -> str:
+    """Keep the highest-value search results that fit the token budget, in original order."""
+    blocks = _split_search_blocks(search_content)
+    packed = pack_by_budget(
+        blocks, budget_tokens, score=_score_search_block, model_name=model_name
+    )
+    if not packed and search_content:
+        # Unstructured content larger than the budget: keep its head
+        return truncate_to_tokens(search_content, budget_tokens, model_name)
+    return "\n\n".join(packed)
+
+
+async def _extract_chunk(llm, parser, content: str, model_name: str, fallback_llm=None) -> ExtractionResult:
+    """Run one extraction call (with structured-output repair) over a content chunk."""
+    # Extract candidate URLs to constrain source_url choices (improves grounding + parse success)
+    available_urls = extract_urls(content)
+    url_hint = ""
+    if available_urls:
+        url_hint = "Available URLs (use one of these for source_url):\n" + "\n".join(available_urls[:40]) + "\n\n"
+
+    prompt = [
+        SystemMessage(
+            content=(
+                EXTRACTION_SYSTEM_PROMPT
+                + "\n\nReturn JSON only. "
+                + parser.get_format_instructions()
+            )
+        ),
+        HumanMessage(
+            content=(
+                f"{url_hint}Here are the search results:\n{content}"
+            )
+        ),
+    ]
+
+    # Local JSON repair first; re-ask with the broken output only (not the search results)
+    return await ainvoke_structured(
+        llm,
+        prompt,
+        pydantic_object=ExtractionResult,
+        schema_hint=parser.get_format_instructions(),
+        model_name=model_name,
+        call_site="extract",
+        fallback=fallback_llm,
+        fallback_model_name=settings.LLM_FALLBACK_MODEL,
+    )
+
+
+def _chunk_search_content(
+    search_content: str,
+    chunk_budget_tokens: int,
+    max_chunks: int,
+    model_name: str,
+) -> List[str]:
+    """
+    Split search content into extraction chunks along query/source boundaries.
+
+    Each query header starts a new group; a group's result blocks are packed into
+    chunks of at most chunk_budget_tokens (the header is repeated for context).
+    When there are more than max_chunks chunks, the ones holding the best-scoring
+    results are kept, in their original order.
+    """
+    groups: List[tuple] = []  # (header, [result blocks])
+    for block in _split_search_blocks(search_content):
+        if not block.startswith("- **"):
+            groups.append((block, []))
+        elif groups:
+            groups[-1][1].append(block)
+        else:
+            groups.append(("", [block]))
+
+    chunks: List[tuple] = []  # (best score, text)
+    for header, items in groups:
+        header = truncate_to_tokens(header, chunk_budget_tokens // 4, model_name)
+        if not items:
+            if header.strip():
+                chunks.append((-1.0, header))
+            continue
+        budget = max(chunk_budget_tokens - estimate_tokens(header, model_name), 1)
+        current: List[str] = []
+        used = 0
+        for item in items:
+            cost = estimate_tokens(item, model_name)
+            if cost > budget:
+                item = truncate_to_tokens(item, budget, model_name)
+                cost = budget
+            if current and used + cost > budget:
+                chunks.append((max(map(_score_search_block, current)), "\n\n".join(filter(None, [header] + current))))
+                current, used = [], 0
+            current.append(item)
+            used += cost
+        if current:
+            chunks.append((max(map(_score_search_block, current)), "\n\n".join(filter(None, [header] + current))))
+
+    # Header-only groups (e.g. "Search failed") carry no results unless nothing else exists
+    with_results = [c for c in chunks if c[0] >= 0.0] or chunks
+    if max_chunks and len(with_results) > max_chunks:
+        ranked = sorted(range(len(with_results)), key=lambda i: with_results[i][0], reverse=True)
+        keep = sorted(ranked[:max_chunks])
+        with_results = [with_results[i] for i in keep]
+    return [text for _, text in with_results]
+
+
+def _merge_extracted_events(event_lists: List[List[ExtractedEvent]]) -> List[ExtractedEvent]:
+    """
+    Deterministically merge per-chunk events.
+    Duplicates share (normalized date, normalized title, source_url); the most
+    confident copy wins and first-seen order (by chunk, then position) is kept.
+    """
+    merged: Dict[tuple, ExtractedEvent] = {}
+    for events in event_lists:
+        for ev in events:
+            key = (
+                _normalize_date_string(ev.date),
+                _normalize_topic(ev.title),
+                (ev.source_url or "").strip().rstrip("/").lower(),
+            )
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = ev
+            elif ev.confidence > existing.confidence:
+                # Replace in place to keep first-seen position
+                merged[key] = ev
+    return list(merged.values())
+
+
 async def fetch_node_v2(state: WorkerState, config: RunnableConfig):
     """
     Executes search based on the Topic.
@@ -151,22 +316,15 @@ async def fetch_node_v2(state: WorkerState, config: RunnableConfig):
     
     try:
         # Init LLM
-        if settings.openai_base_url and "openai.com" not in settings.openai_base_url and ChatOpenAI:
-            llm = ChatOpenAI(
-                model=model_name,
-                openai_api_key=settings.openai_api_key,
-                openai_api_base=settings.openai_base_url,
-                temperature=0
-            )
-        else:
-             llm = init_chat_model(model=model_name, temperature=0)
-             
+        llm = _init_llm(model_name)
+
         # Plan before action
         await emit_think_plan(
             llm,
             model_name,
             task="Generate search queries",
             context=f"Topic: {topic}",
+            llm_factory=_init_llm,
         )
 
         # Use PydanticOutputParser for compatibility
@@ -178,9 +336,19 @@ async def fetch_node_v2(state: WorkerState, config: RunnableConfig):
             HumanMessage(content=f"Topic: {topic}")
         ]
         
-        response = await safe_ainvoke(llm, prompt, model_name=model_name)
-        config_obj: SearchConfiguration = parser.parse(response.content)
-        
+        # Small model first; escalate to model_name if the output does not parse
+        config_obj: SearchConfiguration = await cascade_ainvoke(
+            "query_generation",
+            prompt,
+            llm_factory=_init_llm,
+            default_model=model_name,
+            parse=lambda response: parse_structured(response.content, SearchConfiguration),
+            validate=lambda result: bool(result and result.queries),
+            hedge_after=settings.LLM_HEDGE_AFTER_SECONDS,
+            fallback=init_fallback_llm(),
+            fallback_model_name=settings.LLM_FALLBACK_MODEL,
+        )
+
         if config_obj and config_obj.queries:
             queries = config_obj.queries
             
@@ -236,15 +404,7 @@ async def extract_node_v2(state: WorkerState, config: RunnableConfig):
 
 
     # 3. Init LLM
-    if settings.openai_base_url and "openai.com" not in settings.openai_base_url and ChatOpenAI:
-        llm = ChatOpenAI(
-            model=model_name,
-            openai_api_key=settings.openai_api_key,
-            openai_api_base=settings.openai_base_url,
-            temperature=0
-        )
-    else:
-        llm = init_chat_model(model=model_name, temperature=0)
+    llm = _init_llm(model_name)
 
     # Plan before action
     await emit_think_plan(
@@ -252,54 +412,51 @@ async def extract_node_v2(state: WorkerState, config: RunnableConfig):
         model_name,
         task="Extract timeline events",
         context=f"Topic: {state.get('topic', '')}",
+        llm_factory=_init_llm,
     )
 
     # Use OutputParser instead of tool calling
     from langchain_core.output_parsers import PydanticOutputParser
     parser = PydanticOutputParser(pydantic_object=ExtractionResult)
 
-    # Extract candidate URLs to constrain source_url choices (improves grounding + parse success)
-    url_pattern = re.compile(r"https?://[\w\-._~:/?#\[\]@!$&'()*+,;=%]+", re.IGNORECASE)
-    available_urls = list(dict.fromkeys([u.rstrip(")].,>\"' ") for u in url_pattern.findall(search_content)]))
-    url_hint = ""
-    if available_urls:
-        url_hint = "Available URLs (use one of these for source_url):\n" + "\n".join(available_urls[:40]) + "\n\n"
+    if settings.EXTRACTION_CHUNKED:
+        # Map: one extraction call per query/source chunk, bounded concurrency
+        chunks = _chunk_search_content(
+            search_content,
+            settings.EXTRACTION_CHUNK_TOKEN_BUDGET,
+            settings.EXTRACTION_MAX_CHUNKS,
+            model_name,
+        )
+    else:
+        # Pack the most credible/recent results into the token budget instead of a blind character cut
+        chunks = [
+            _pack_search_content(search_content, settings.EXTRACTION_CONTEXT_TOKEN_BUDGET, model_name)
+        ]
 
-    # 4. Invoke
-    prompt = [
-        SystemMessage(
-            content=(
-                EXTRACTION_SYSTEM_PROMPT
-                + "\n\nReturn JSON only. "
-                + parser.get_format_instructions()
-            )
-        ),
-        HumanMessage(
-            content=(
-                f"{url_hint}Here are the search results:\n{search_content[:20000]}"
-            )
-        ),  # Limit context to avoid overflow
-    ]
-    
     try:
-        response = await safe_ainvoke(llm, prompt, model_name=model_name)
-        try:
-            result: ExtractionResult = parser.parse(response.content)
-        except Exception:
-            # One repair attempt: ask for JSON only
-            repair_prompt = [
-                SystemMessage(
-                    content=(
-                        "Your previous output could not be parsed. "
-                        "Output ONLY valid JSON that matches the schema.\n\n"
-                        + parser.get_format_instructions()
-                    )
-                ),
-                HumanMessage(content=f"{url_hint}Search results:\n{search_content[:20000]}"),
-            ]
-            response = await safe_ainvoke(llm, repair_prompt, model_name=model_name)
-            result = parser.parse(response.content)
-        
+        fallback_llm = init_fallback_llm()
+        sem = asyncio.Semaphore(settings.EXTRACTION_BATCH_SIZE)
+
+        async def _bounded_extract(chunk: str) -> ExtractionResult:
+            async with sem:
+                return await _extract_chunk(llm, parser, chunk, model_name, fallback_llm)
+
+        chunk_results = await asyncio.gather(
+            *[_bounded_extract(chunk) for chunk in chunks], return_exceptions=True
+        )
+        failures = [r for r in chunk_results if isinstance(r, Exception)]
+        if len(failures) == len(chunk_results):
+            raise failures[0]
+        if failures:
+            logger.warning(f"Extraction failed for {len(failures)}/{len(chunk_results)} chunks: {failures[0]}")
+
+        # Reduce: deterministic merge of per-chunk events
+        result = ExtractionResult(
+            events=_merge_extracted_events(
+                [r.events for r in chunk_results if not isinstance(r, Exception)]
+            )
+        )
+
         # 5. Format Output for Pipeline
         event_lines = []
         timeline_entries = []
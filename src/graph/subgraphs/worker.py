@@ -7,6 +7,7 @@ from langgraph.graph import StateGraph, START, END
 from src.graph.state_v2 import WorkerState
 from src.graph.nodes.worker_nodes import fetch_node_v2, extract_node_v2
 from src.graph.nodes.compressor import compress_node
+from src.core.profiling import instrument_node
 
 
 def build_worker_subgraph():
@@ -14,9 +15,9 @@ def build_worker_subgraph():
     workflow = StateGraph(WorkerState)
 
     # 1. Add Nodes
-    workflow.add_node("fetch", fetch_node_v2)
-    workflow.add_node("extract", extract_node_v2)
-    workflow.add_node("compress", compress_node)
+    workflow.add_node("fetch", instrument_node("fetch", fetch_node_v2, graph="worker"))
+    workflow.add_node("extract", instrument_node("extract", extract_node_v2, graph="worker"))
+    workflow.add_node("compress", instrument_node("compress", compress_node, graph="worker"))
 
     # 2. Add Edges (Linear Pipeline)
     workflow.add_edge(START, "fetch")
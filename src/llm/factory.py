@@ -1,6 +1,8 @@
 """
 LLM 工厂模块：提供 LangChain ChatModel 实例。
 """
+from typing import Optional
+
 from langchain_openai import ChatOpenAI
 from langchain_core.language_models.chat_models import BaseChatModel
 from ..config.settings import settings
@@ -37,19 +39,65 @@ def init_llm(temperature: float = 0.0, timeout: int = 120, enable_thinking: bool
     )
 
 
-def init_embeddings():
+def init_fallback_llm(temperature: float = 0.0, timeout: int = 120) -> Optional[BaseChatModel]:
+    """
+    初始化备用（fallback）模型，用于主模型连续失败或熔断时的降级路由。
+
+    Returns:
+        未配置 LLM_FALLBACK_MODEL 时返回 None
+    """
+    if not settings.LLM_FALLBACK_MODEL:
+        return None
+    return ChatOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        model=settings.LLM_FALLBACK_MODEL,
+        temperature=temperature,
+        request_timeout=timeout,
+        openai_api_key=settings.openai_api_key,
+        openai_api_base=settings.openai_base_url,
+    )
+
+
+def init_embeddings(use_cache: bool = True, backend: Optional[str] = None):
     """
     初始化 Embedding 模型。
-    优先使用 OpenAI/DashScope 兼容的 Embedding 服务。
+    默认使用 OpenAI/DashScope 兼容的 Embedding 服务；EMBEDDING_BACKEND=local 时使用
+    本地 CPU 哈希 n-gram TF-IDF 后端（离线、确定性；IDF 按每批文本估计）。
+
+    Args:
+        use_cache: 配置了 EMBEDDING_CACHE_DIR 时，包装持久化 Embedding 缓存（按模型名 + 文本摘要）
+        backend: 覆盖 settings.EMBEDDING_BACKEND（openai / local）
     """
+    backend = (backend or settings.EMBEDDING_BACKEND or "openai").lower()
+    if backend == "local":
+        from .local_embeddings import HashedNgramEmbeddings
+
+        # 本地计算足够便宜，无需缓存
+        return HashedNgramEmbeddings(
+            n_features=settings.LOCAL_EMBEDDING_FEATURES,
+            reduced_dim=settings.LOCAL_EMBEDDING_REDUCED_DIM,
+        )
+
     from langchain_openai import OpenAIEmbeddings
     
-    return OpenAIEmbeddings(
+    embeddings = OpenAIEmbeddings(
         api_key=settings.openai_api_key,
         base_url=settings.openai_base_url,
         model=settings.embedding_model_name, 
         check_embedding_ctx_length=False
     )
+    if not use_cache or not settings.EMBEDDING_CACHE_DIR:
+        return embeddings
+
+    from ..core.utils.embedding_cache import CachedEmbeddings, get_embedding_store
+
+    store = get_embedding_store(
+        settings.EMBEDDING_CACHE_DIR,
+        settings.embedding_model_name,
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    )
+    return CachedEmbeddings(embeddings, store)
 
 
 def init_json_llm(temperature: float = 0.0, timeout: int = 120) -> BaseChatModel:
@@ -0,0 +1,139 @@
+"""
+本地 CPU Embedding 后端：哈希字符 n-gram TF-IDF 向量（IDF 按每次调用的批次估计）。
+无需网络、结果确定，适用于聚类 / 去重等高频候选过滤与测试。
+"""
+import asyncio
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 与 token_budget 一致的 CJK 区间（统一表意文字、扩展 A、兼容表意、假名、韩文音节）
+_CJK_RANGES = (
+    (0x3040, 0x30FF),
+    (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF),
+    (0xAC00, 0xD7AF),
+    (0xF900, 0xFAFF),
+)
+
+_HASH_BASE = np.uint64(0x100000001B3)
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _codepoints(text: str) -> np.ndarray:
+    # 小写 + 合并空白，并以空格包围（词边界 n-gram）
+    words = (text or "").lower().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    normalized = " " + " ".join(words) + " "
+    return np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def _is_cjk(cps: np.ndarray) -> np.ndarray:
+    mask = np.zeros(cps.shape, dtype=bool)
+    for lo, hi in _CJK_RANGES:
+        mask |= (cps >= lo) & (cps <= hi)
+    return mask
+
+
+def _ngram_hashes(cps: np.ndarray, n: int) -> np.ndarray:
+    """n 个字符的滚动多项式哈希（uint64 溢出即取模），全部向量化。"""
+    count = len(cps) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    h = np.full(count, np.uint64(n), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for k in range(n):
+            h = h * _HASH_BASE + cps[k : k + count]
+        return h * _HASH_MIX
+
+
+class HashedNgramEmbeddings:
+    """
+    哈希字符 n-gram TF-IDF Embedding（与 OpenAIEmbeddings 相同的 embed_documents / aembed_documents 接口）。
+
+    - 字符 n-gram（默认 2-4）经带符号特征哈希映射到 n_features 维
+    - CJK 字符额外计入单字 unigram（中文无空格分词）
+    - 次线性 TF（1 + log tf）× 按桶平滑 IDF；IDF 以本次 embed_documents 的批次为语料
+      （聚类 / 去重总是整批向量化），因此同一文本在不同批次中的向量可能不同；
+      单条文本（embed_query）的 IDF 恒为 1，即纯 TF
+    - reduced_dim > 0 时使用固定种子的高斯随机投影降维
+    - 输出 L2 归一化，点积即余弦相似度
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2048,
+        ngram_range: Tuple[int, int] = (2, 4),
+        reduced_dim: int = 0,
+        seed: int = 13,
+    ):
+        self.n_features = int(n_features)
+        self.ngram_range = ngram_range
+        self.reduced_dim = int(reduced_dim)
+        self.seed = seed
+        self._projection: Optional[np.ndarray] = None
+
+    @property
+    def model(self) -> str:
+        suffix = f"-rp{self.reduced_dim}" if self.reduced_dim else ""
+        return f"local-hashed-ngram-{self.n_features}{suffix}"
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """返回 (bucket, signed count) 对。"""
+        cps = _codepoints(text)
+        parts = [_ngram_hashes(cps, n) for n in range(self.ngram_range[0], self.ngram_range[1] + 1)]
+        cjk = _is_cjk(cps)
+        if cjk.any():
+            parts.append(_ngram_hashes(cps[cjk], 1))
+        hashes = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+        buckets = (hashes >> np.uint64(1)) % np.uint64(self.n_features)
+        signs = np.where(hashes & np.uint64(1), 1.0, -1.0)
+        return buckets.astype(np.int64), signs
+
+    def _term_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets, signs = self._features(text)
+            if buckets.size:
+                matrix[row] = np.bincount(buckets, weights=signs, minlength=self.n_features)
+        # 次线性 TF，保留哈希符号
+        return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+    @staticmethod
+    def _batch_idf(matrix: np.ndarray) -> np.ndarray:
+        """以批次为语料估计每个哈希桶的 IDF（平滑 IDF，同 sklearn）。"""
+        df = np.count_nonzero(matrix, axis=0)
+        return (np.log((1 + matrix.shape[0]) / (1 + df)) + 1).astype(np.float32)
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        if not self.reduced_dim:
+            return matrix
+        if self._projection is None:
+            rng = np.random.default_rng(self.seed)
+            self._projection = (
+                rng.standard_normal((self.n_features, self.reduced_dim)) / np.sqrt(self.reduced_dim)
+            ).astype(np.float32)
+        return matrix @ self._projection
+
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """批量向量化，返回 float32 矩阵（行已 L2 归一化）。"""
+        matrix = self._term_matrix(texts)
+        matrix *= self._batch_idf(matrix)
+        matrix = self._project(matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # CPU 计算，放入线程池避免阻塞事件循环
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
@@ -0,0 +1,176 @@
+"""
+Model cascade routing for DeepTrace.
+Maps each LLM call site to a tier, tries the small model first and escalates to the
+large model only when parsing or validation fails. Per-site success rates auto-tune
+the starting tier.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.config.settings import settings
+from src.core.utils.llm_safety import safe_ainvoke
+
+logger = logging.getLogger(__name__)
+
+TIER_SMALL = "small"
+TIER_LARGE = "large"
+
+# Call sites whose output is short/simple enough to start on the small model
+DEFAULT_CALL_SITE_TIERS = {
+    "query_generation": TIER_SMALL,
+    "think_plan": TIER_SMALL,
+    "clarify": TIER_SMALL,
+    "clarify_drift_check": TIER_SMALL,
+    "verify_official": TIER_SMALL,
+    "supervisor": TIER_LARGE,
+    "extract": TIER_LARGE,
+    "compress": TIER_LARGE,
+    "structured_report": TIER_LARGE,
+    "debate_role": TIER_LARGE,
+    "debate_judge": TIER_LARGE,
+}
+
+
+class ModelRouter:
+    """
+    Tier router with sliding-window success tracking.
+
+    A small-tier site whose small-model success rate drops below min_success_rate
+    (after min_samples attempts) is promoted to start on the large model; every
+    reprobe_interval calls it probes the small model again and is demoted back once
+    the rate recovers.
+    """
+
+    def __init__(
+        self,
+        small_model: Optional[str] = None,
+        site_tiers: Optional[Dict[str, str]] = None,
+        min_samples: int = 20,
+        min_success_rate: float = 0.8,
+        window: int = 50,
+        reprobe_interval: int = 25,
+    ):
+        self.small_model = small_model or ""
+        self.site_tiers = dict(DEFAULT_CALL_SITE_TIERS if site_tiers is None else site_tiers)
+        self.min_samples = min_samples
+        self.min_success_rate = min_success_rate
+        self.window = window
+        self.reprobe_interval = reprobe_interval
+        self._outcomes: Dict[Tuple[str, str], Deque[bool]] = {}
+        self._totals: Dict[Tuple[str, str], List[int]] = {}
+        self._promoted: Dict[str, int] = {}  # call_site -> calls since promotion
+        self._lock = threading.Lock()
+
+    def tier_for(self, call_site: str) -> str:
+        with self._lock:
+            if call_site in self._promoted:
+                return TIER_LARGE
+        return self.site_tiers.get(call_site, TIER_LARGE)
+
+    def ladder(self, call_site: str, default_model: str) -> List[Tuple[str, str]]:
+        """Return the (tier, model) sequence to try for a call site."""
+        large = [(TIER_LARGE, default_model)]
+        if not self.small_model or self.small_model == default_model:
+            return large
+        if self.site_tiers.get(call_site, TIER_LARGE) != TIER_SMALL:
+            return large
+        with self._lock:
+            if call_site in self._promoted:
+                self._promoted[call_site] += 1
+                if self._promoted[call_site] % self.reprobe_interval != 0:
+                    return large
+        return [(TIER_SMALL, self.small_model)] + large
+
+    def success_rate(self, call_site: str, tier: str) -> Optional[float]:
+        with self._lock:
+            outcomes = self._outcomes.get((call_site, tier))
+            if not outcomes:
+                return None
+            return sum(outcomes) / len(outcomes)
+
+    def record(self, call_site: str, tier: str, success: bool) -> None:
+        key = (call_site, tier)
+        with self._lock:
+            outcomes = self._outcomes.setdefault(key, deque(maxlen=self.window))
+            outcomes.append(bool(success))
+            totals = self._totals.setdefault(key, [0, 0])
+            totals[0] += 1
+            totals[1] += int(bool(success))
+            if tier != TIER_SMALL or len(outcomes) < self.min_samples:
+                return
+            rate = sum(outcomes) / len(outcomes)
+            if call_site not in self._promoted and rate < self.min_success_rate:
+                self._promoted[call_site] = 0
+                logger.info(f"Model router: promoting '{call_site}' to large tier (small success={rate:.2f})")
+            elif call_site in self._promoted and rate >= self.min_success_rate:
+                self._promoted.pop(call_site, None)
+                logger.info(f"Model router: demoting '{call_site}' back to small tier (small success={rate:.2f})")
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-site attempts/successes per tier plus the current starting tier."""
+        out: Dict[str, dict] = {}
+        with self._lock:
+            for (site, tier), (attempts, successes) in self._totals.items():
+                entry = out.setdefault(site, {"promoted": site in self._promoted})
+                entry[tier] = {
+                    "attempts": attempts,
+                    "successes": successes,
+                    "success_rate": successes / attempts if attempts else None,
+                }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._outcomes.clear()
+            self._totals.clear()
+            self._promoted.clear()
+
+
+# Process-wide router; cascade is disabled until SMALL_MODEL_NAME is configured
+model_router = ModelRouter(small_model=settings.SMALL_MODEL_NAME)
+
+
+async def cascade_ainvoke(
+    call_site: str,
+    messages: Sequence,
+    llm_factory: Callable[[str], Any],
+    default_model: str,
+    parse: Callable[[Any], Any] = lambda response: response,
+    validate: Optional[Callable[[Any], bool]] = None,
+    router: Optional[ModelRouter] = None,
+    **invoke_kwargs,
+):
+    """
+    Invoke the cheapest model for call_site and escalate on parse/validation failure.
+
+    Args:
+        llm_factory: builds a ready-to-invoke runnable for a model name
+        parse: turns the raw response into the result (raise to signal failure)
+        validate: optional predicate on the parsed result
+        invoke_kwargs: forwarded to safe_ainvoke
+
+    Returns:
+        The parsed result of the first model that succeeds.
+    """
+    router = router or model_router
+    last_error: Optional[Exception] = None
+    for tier, model in router.ladder(call_site, default_model):
+        try:
+            response = await safe_ainvoke(
+                llm_factory(model), list(messages), model_name=model, call_site=call_site, **invoke_kwargs
+            )
+            result = parse(response)
+            if validate is not None and not validate(result):
+                raise ValueError(f"Validation failed for {call_site} output from {model}")
+        except Exception as e:
+            last_error = e
+            router.record(call_site, tier, False)
+            if tier == TIER_SMALL:
+                logger.info(f"Model router: escalating '{call_site}' from {model}: {e}")
+            continue
+        router.record(call_site, tier, True)
+        return result
+    raise last_error
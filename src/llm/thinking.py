@@ -3,24 +3,36 @@ Helper for emitting think_tool plans before actions.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from src.config.settings import settings
 from src.core.tools.thinking import think_tool
 from src.core.utils.llm_safety import safe_ainvoke
+from src.llm.router import cascade_ainvoke
 
 logger = logging.getLogger(__name__)
 
 
+def _reflection_of(response) -> Optional[str]:
+    if hasattr(response, "tool_calls") and response.tool_calls:
+        return response.tool_calls[0].get("args", {}).get("reflection")
+    if getattr(response, "content", None):
+        return response.content.strip()
+    return None
+
+
 async def emit_think_plan(
     llm,
     model_name: Optional[str],
     task: str,
     context: Optional[str] = None,
+    llm_factory: Optional[Callable[[str], Any]] = None,
 ) -> Optional[str]:
     """
     Ask the model to call think_tool with a short plan, then log the result.
+    With llm_factory, the plan is routed through the model cascade (small model first).
     """
     if not hasattr(llm, "bind_tools"):
         return None
@@ -37,14 +49,34 @@ async def emit_think_plan(
         HumanMessage(content=user_prompt),
     ]
 
-    planner = llm.bind_tools([think_tool])
-    response = await safe_ainvoke(planner, messages, model_name=model_name)
+    if llm_factory is not None and model_name:
+        def _planner(model: str):
+            base = llm if model == model_name else llm_factory(model)
+            return base.bind_tools([think_tool])
 
-    reflection = None
-    if hasattr(response, "tool_calls") and response.tool_calls:
-        reflection = response.tool_calls[0].get("args", {}).get("reflection")
-    elif getattr(response, "content", None):
-        reflection = response.content.strip()
+        try:
+            reflection = await cascade_ainvoke(
+                "think_plan",
+                messages,
+                llm_factory=_planner,
+                default_model=model_name,
+                parse=_reflection_of,
+                validate=bool,
+                hedge_after=settings.LLM_HEDGE_AFTER_SECONDS,
+            )
+        except ValueError:
+            # Every tier answered without a plan
+            reflection = None
+    else:
+        planner = llm.bind_tools([think_tool])
+        response = await safe_ainvoke(
+            planner,
+            messages,
+            model_name=model_name,
+            call_site="think_plan",
+            hedge_after=settings.LLM_HEDGE_AFTER_SECONDS,
+        )
+        reflection = _reflection_of(response)
 
     if not reflection:
         return None
@@ -79,3 +79,37 @@ async def test_deduplicate_events_logic():
         assert len(deduplicated_l2) == 1
         assert set(deduplicated_l2[0].evidence_ids) == {"ev4", "ev5"}
         mock_llm.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_events_blocks_and_batches_llm_checks():
+    from datetime import datetime, timedelta
+    from src.agents.timeline_deduplicator import block_candidate_pairs
+
+    base = datetime(2024, 3, 1, 9, 0)
+    pairs = [
+        ("Company X launches product Y", "Company X unveils product Y"),
+        ("City council passes budget", "City council approves budget"),
+    ]
+    events = []
+    for k, (a, b) in enumerate(pairs):
+        day = base + timedelta(days=10 * k)
+        events.append(EventNode(title=a, description=a, time=day, source="News", evidence_ids=[f"{k}a"]))
+        events.append(EventNode(title=b, description=b, time=day, source="News", evidence_ids=[f"{k}b"]))
+    # Same title as the first event but far outside the time window
+    events.append(EventNode(title=pairs[0][0], description="later", time=base + timedelta(days=60), source="News"))
+
+    sorted_events = sorted(events, key=lambda e: e.time)
+    candidates = block_candidate_pairs(sorted_events, [e.title for e in sorted_events])
+    assert candidates == [(0, 1), (2, 3)]
+
+    with patch(
+        "src.agents.timeline_deduplicator.are_event_pairs_duplicate_llm", new_callable=AsyncMock
+    ) as mock_batch, patch("src.agents.timeline_deduplicator.init_llm"):
+        mock_batch.return_value = [True, False]
+        merged, _ = await deduplicate_events(events)
+
+    mock_batch.assert_awaited_once()
+    assert len(mock_batch.await_args.args[0]) == 2
+    assert len(merged) == 4
+    assert set(merged[0].evidence_ids) == {"0a", "0b"}
@@ -1,9 +1,11 @@
 """
 测试 EvidenceStore
 """
+from datetime import datetime
+
 import pytest
-from src.core.evidence_store import EvidenceStore
-from src.core.models.evidence import Evidence
+from src.core.evidence_store import EvidenceStore, evidence_content_hash
+from src.core.models.evidence import Evidence, EvidenceSource
 from src.core.models.comments import Comment
 
 
@@ -51,7 +53,7 @@ class TestEvidenceStore:
         ev = Evidence(content="父证据")
         store.add_evidence(ev)
         
-        comment = Comment(content="测试评论", evidence_id=ev.id)
+        comment = Comment(content="测试评论", source_evidence_id=ev.id)
         store.add_comment(comment)
         
         # 通过 ID 获取
@@ -71,7 +73,7 @@ class TestEvidenceStore:
     def test_clear(self, store):
         """测试清空存储"""
         store.add_evidence(Evidence(content="ev"))
-        store.add_comment(Comment(content="cm", evidence_id="ev"))
+        store.add_comment(Comment(content="cm", source_evidence_id="ev"))
         
         assert len(store.list_evidence()) == 1
         
@@ -79,3 +81,69 @@ class TestEvidenceStore:
         
         assert len(store.list_evidence()) == 0
         assert store.get_evidence("ev") is None
+
+    def test_secondary_indexes(self, store):
+        """测试按 URL、域名、来源、发布时间和内容哈希查询"""
+        ev1 = Evidence(
+            content="官方通报",
+            url="https://www.Example.com/news/1?utm=x",
+            source=EvidenceSource.NEWS,
+            publish_time=datetime(2024, 5, 1, 8, 0),
+        )
+        ev2 = Evidence(
+            content="转载",
+            url="https://example.com/news/2/",
+            source=EvidenceSource.WEIBO,
+            publish_time=datetime(2024, 5, 3, 8, 0),
+        )
+        ev3 = Evidence(content="官方通报", url="https://other.org/a", source=EvidenceSource.NEWS)
+        assert store.add_evidences([ev1, ev2, ev3]) == 3
+
+        assert [e.id for e in store.find_evidence(url="https://www.example.com/news/1")] == [ev1.id]
+        assert [e.id for e in store.find_evidence(domain="example.com")] == [ev1.id, ev2.id]
+        assert [e.id for e in store.find_evidence(source="news")] == [ev1.id, ev3.id]
+        assert [e.id for e in store.find_evidence(content_hash=evidence_content_hash(ev1))] == [ev1.id, ev3.id]
+        in_range = store.find_evidence(published_after=datetime(2024, 5, 2), published_before=datetime(2024, 6, 1))
+        assert [e.id for e in in_range] == [ev2.id]
+        assert store.count_evidence(source=EvidenceSource.NEWS, domain="other.org") == 1
+
+    def test_cursor_pagination(self, store):
+        """测试游标分页与流式遍历"""
+        evidences = [Evidence(content=f"证据{i}", source=EvidenceSource.NEWS if i % 2 else EvidenceSource.XHS) for i in range(7)]
+        store.add_evidences(evidences)
+
+        page, cursor = store.list_evidence_page(limit=3)
+        assert [e.content for e in page] == ["证据0", "证据1", "证据2"]
+        page, cursor = store.list_evidence_page(cursor=cursor, limit=3)
+        assert [e.content for e in page] == ["证据3", "证据4", "证据5"]
+        page, cursor = store.list_evidence_page(cursor=cursor, limit=3)
+        assert [e.content for e in page] == ["证据6"]
+        assert cursor is None
+
+        assert [e.content for e in store.iter_evidence(page_size=2, source="news")] == ["证据1", "证据3", "证据5"]
+
+    def test_upsert_keeps_order(self, store):
+        """测试重复写入同一 ID 时覆盖内容并保留顺序"""
+        ev1 = Evidence(content="旧内容")
+        ev2 = Evidence(content="证据2")
+        store.add_evidences([ev1, ev2])
+        store.add_evidence(ev1.model_copy(update={"content": "新内容"}))
+
+        assert [e.content for e in store.list_evidence()] == ["新内容", "证据2"]
+        assert store.count_evidence() == 2
+
+
+def test_persistent_store(tmp_path):
+    """测试文件存储在重新打开后仍可读取"""
+    path = tmp_path / "evidence.sqlite3"
+    store = EvidenceStore(path)
+    ev = Evidence(content="持久化证据", url="https://example.com/p")
+    store.add_evidence(ev)
+    store.add_comment(Comment(content="评论", source_evidence_id=ev.id))
+    store.close()
+
+    reopened = EvidenceStore(path)
+    assert reopened.get_evidence(ev.id).content == "持久化证据"
+    assert [c.content for c in reopened.get_comments_by_evidence(ev.id)] == ["评论"]
+    assert len(reopened.find_evidence(url="https://example.com/p/")) == 1
+    reopened.close()
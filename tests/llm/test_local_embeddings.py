@@ -0,0 +1,59 @@
+"""
+测试本地 CPU Embedding 后端
+"""
+import asyncio
+
+import numpy as np
+
+from src.llm.factory import init_embeddings
+from src.llm.local_embeddings import HashedNgramEmbeddings
+
+
+class TestHashedNgramEmbeddings:
+    """测试哈希 n-gram TF-IDF 向量"""
+
+    def test_deterministic_and_normalized(self):
+        """测试结果确定且 L2 归一化"""
+        emb = HashedNgramEmbeddings(n_features=512)
+        a = emb.embed_documents(["OpenAI releases GPT-5", ""])
+        b = HashedNgramEmbeddings(n_features=512).embed_documents(["OpenAI releases GPT-5", ""])
+        assert a == b
+        assert np.isclose(np.linalg.norm(a[0]), 1.0, atol=1e-5)
+        assert np.allclose(a[1], 0.0)
+
+    def test_similarity_ordering_latin_and_cjk(self):
+        """测试近似文本相似度高于无关文本（含中文）"""
+        emb = HashedNgramEmbeddings()
+        m = emb.embed_matrix([
+            "Apple announces new iPhone in September",
+            "Apple announced the new iPhone this September",
+            "Heavy rainfall floods the northern valley",
+            "苹果公司发布新款手机",
+            "苹果发布新款手机产品",
+            "北方山谷遭遇暴雨洪水",
+        ])
+        sims = m @ m.T
+        assert sims[0, 1] > 0.5 > sims[0, 2]
+        assert sims[3, 4] > sims[3, 5] + 0.3
+
+    def test_batch_idf_downweights_shared_ngrams(self):
+        """测试批次 IDF：批内共有的 n-gram 权重降低，单条文本退化为纯 TF"""
+        emb = HashedNgramEmbeddings(n_features=4096)
+        batch = emb.embed_matrix(["the cat sat on the mat", "the dog sat on the mat", "a bird flew away"])
+        cat, dog = emb.embed_query("the cat sat on the mat"), emb.embed_query("the dog sat on the mat")
+        assert float(batch[0] @ batch[1]) < float(np.dot(cat, dog))
+        assert np.allclose(emb.embed_matrix(["the cat sat on the mat"])[0], cat)
+
+    def test_projection(self):
+        """测试随机投影降维"""
+        corpus = ["the cat sat", "the dog sat", "the bird flew"]
+        emb = HashedNgramEmbeddings(n_features=1024, reduced_dim=64)
+        vectors = np.array(asyncio.run(emb.aembed_documents(corpus)))
+        assert vectors.shape == (3, 64)
+        assert emb.model == "local-hashed-ngram-1024-rp64"
+
+    def test_factory_selects_local_backend(self):
+        """测试 factory 可选择本地后端"""
+        emb = init_embeddings(backend="local")
+        assert isinstance(emb, HashedNgramEmbeddings)
+        assert len(emb.embed_query("DeepTrace")) == emb.n_features
@@ -0,0 +1,83 @@
+"""
+测试 Model Cascade Router
+"""
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.llm.router import TIER_LARGE, TIER_SMALL, ModelRouter, cascade_ainvoke
+
+
+class _FixedLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.content)
+
+
+def _parse_int(response):
+    return int(response.content)
+
+
+class TestModelRouter:
+    """测试分级路由与自动调优"""
+
+    def test_ladder_small_first_for_small_sites(self):
+        router = ModelRouter(small_model="mini")
+        assert router.ladder("query_generation", "big") == [(TIER_SMALL, "mini"), (TIER_LARGE, "big")]
+        assert router.ladder("supervisor", "big") == [(TIER_LARGE, "big")]
+
+    def test_ladder_disabled_without_small_model(self):
+        router = ModelRouter(small_model="")
+        assert router.ladder("query_generation", "big") == [(TIER_LARGE, "big")]
+
+    def test_auto_promote_and_reprobe(self):
+        router = ModelRouter(small_model="mini", min_samples=3, window=3, reprobe_interval=2)
+        for _ in range(3):
+            router.record("clarify", TIER_SMALL, False)
+        assert router.tier_for("clarify") == TIER_LARGE
+        assert router.stats()["clarify"]["promoted"] is True
+        # First call after promotion skips the small model, the next one re-probes it
+        assert router.ladder("clarify", "big") == [(TIER_LARGE, "big")]
+        assert router.ladder("clarify", "big")[0] == (TIER_SMALL, "mini")
+        for _ in range(3):
+            router.record("clarify", TIER_SMALL, True)
+        assert router.tier_for("clarify") == TIER_SMALL
+
+
+@pytest.mark.asyncio
+async def test_cascade_escalates_on_parse_failure():
+    small, large = _FixedLLM("not a number"), _FixedLLM("42")
+    router = ModelRouter(small_model="mini")
+    result = await cascade_ainvoke(
+        "query_generation",
+        [HumanMessage(content="hi")],
+        llm_factory=lambda m: small if m == "mini" else large,
+        default_model="big",
+        parse=_parse_int,
+        router=router,
+    )
+    assert result == 42
+    assert small.calls == 1 and large.calls == 1
+    stats = router.stats()["query_generation"]
+    assert stats[TIER_SMALL]["successes"] == 0
+    assert stats[TIER_LARGE]["successes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cascade_stays_on_small_model_when_valid():
+    small, large = _FixedLLM("7"), _FixedLLM("42")
+    router = ModelRouter(small_model="mini")
+    result = await cascade_ainvoke(
+        "clarify",
+        [HumanMessage(content="hi")],
+        llm_factory=lambda m: small if m == "mini" else large,
+        default_model="big",
+        parse=_parse_int,
+        validate=lambda v: v > 0,
+        router=router,
+    )
+    assert result == 7
+    assert large.calls == 0
@@ -86,3 +86,46 @@ async def test_domain_extraction():
     clusterer = SourceClusterer()
     assert clusterer._extract_domain("https://www.google.com/news") == "google.com"
     assert clusterer._extract_domain("http://cn.nytimes.com/zh") == "nytimes.com"
+
+
+def test_near_duplicate_detector_groups_syndicated_copies():
+    from src.core.verification.near_duplicate import NearDuplicateDetector
+
+    article = (
+        "The city council approved the new transit budget on Monday after a six hour debate, "
+        "allocating funds for three bus lines and a light rail extension to the airport."
+    )
+    texts = [
+        article,
+        "Reuters - " + article + " (Reporting by staff)",
+        "An unrelated story about a football match that ended in a dramatic penalty shootout.",
+        article.upper(),
+        "",
+    ]
+    groups = NearDuplicateDetector().group(texts)
+    assert groups == [[0, 1, 3]]
+
+
+@pytest.mark.asyncio
+async def test_source_clusterer_embeds_only_borderline_pairs():
+    calls = []
+
+    class RecordingEmbeddings(MockEmbeddings):
+        def embed_documents(self, texts):
+            calls.append(list(texts))
+            return super().embed_documents(texts)
+
+    body = "Syndicated wire copy: officials confirmed the bridge will reopen next week after repairs."
+    evidences = [
+        Evidence(id="a", content=body, url="http://news.yahoo.com/a", title="Wire"),
+        Evidence(id="b", content=body, url="http://news.msn.com/b", title="Wire"),
+        Evidence(id="c", content="Independent Blog: a completely different take on local politics.",
+                 url="http://blog.independent.com/c", title="Blog"),
+    ]
+    clusterer = SourceClusterer()
+    clusterer.embeddings_model = RecordingEmbeddings()
+    cluster_map = await clusterer.cluster_sources(evidences)
+
+    assert cluster_map["a"] == cluster_map["b"]
+    assert cluster_map["c"] != cluster_map["a"]
+    assert calls == []
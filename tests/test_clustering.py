@@ -79,3 +79,36 @@ async def test_empty_events():
     clusterer = TimelineClusterer()
     clusters = await clusterer.cluster_events([])
     assert len(clusters) == 0
+
+def test_window_edges_match_bruteforce():
+    """Sliding-window block products + vectorized union-find == naive O(n^2) loop"""
+    import numpy as np
+    from src.core.verification.clustering import connected_components, window_edges
+
+    rng = np.random.default_rng(0)
+    n = 300
+    ts = np.sort(rng.uniform(0, 60 * 86400, n))
+    vecs = rng.normal(size=(n, 8)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    window, threshold = 7 * 86400, 0.6
+
+    rows, cols = window_edges(ts, vecs, window, threshold, block_size=37)
+    expected = {
+        (i, j)
+        for i in range(n)
+        for j in range(i + 1, n)
+        if ts[j] - ts[i] <= window and float(vecs[i] @ vecs[j]) >= threshold
+    }
+    assert set(zip(rows.tolist(), cols.tolist())) == expected
+
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, j in expected:
+        parent[max(find(i), find(j))] = min(find(i), find(j))
+    labels = connected_components(n, rows, cols)
+    assert labels.tolist() == [find(i) for i in range(n)]
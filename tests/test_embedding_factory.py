@@ -3,6 +3,13 @@ import pytest
 from src.llm.factory import init_embeddings
 from src.config.settings import settings
 
+
+@pytest.fixture(autouse=True)
+def _embedding_cache_in_tmp(tmp_path, monkeypatch):
+    """持久化 Embedding 缓存写到临时目录，避免在仓库 data/cache 下留下文件"""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_DIR", str(tmp_path / "embeddings"))
+
+
 def test_init_embeddings_config():
     """测试 embedding 初始化配置是否正确读取 settings"""
     embeddings = init_embeddings()
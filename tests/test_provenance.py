@@ -0,0 +1,68 @@
+import random
+
+from src.core.models.evidence import Evidence
+from src.core.verification.provenance import (
+    CorroborationLevel,
+    CrossVerifier,
+    FactIndex,
+    ProvenanceVerifier,
+    TrustScorer,
+)
+
+
+def _brute_force_candidates(facts, claim):
+    verifier = CrossVerifier()
+    return [
+        idx for idx, fact in enumerate(facts)
+        if verifier.verify_tokens(claim, fact)
+        in (CorroborationLevel.DIRECT_CONFIRMS, CorroborationLevel.CONSISTENT_DIRECTION)
+    ]
+
+
+def test_fact_index_never_misses_a_corroborating_fact():
+    rng = random.Random(3)
+    vocab = ["model", "release", "benchmark", "pricing", "latency", "context", "window", "safety", "agent", "api"]
+
+    def sentence(k):
+        return " ".join(rng.choice(vocab) for _ in range(k))
+
+    facts = [CrossVerifier.tokenize(sentence(rng.randint(1, 8))) for _ in range(60)]
+    index = FactIndex(facts)
+    for _ in range(200):
+        text = sentence(rng.randint(1, 8))
+        # Substrings cutting through words must still be found
+        claim = CrossVerifier.tokenize(text[rng.randint(0, 3):])
+        candidates = set(index.candidates(claim))
+        assert set(_brute_force_candidates(facts, claim)) <= candidates
+
+
+def test_verify_all_corroborates_rumors_against_indexed_facts():
+    facts = [
+        Evidence(id="a1", title="Pricing update", url="https://openai.com/pricing",
+                 content="The API pricing drops by half for the flagship model next month."),
+        Evidence(id="a2", title="Safety report", url="https://reuters.com/safety",
+                 content="Regulators published a safety report on frontier model evaluations."),
+    ]
+    rumors = [
+        Evidence(id="c1", title="Rumor pricing", url="https://weibo.com/1",
+                 content="Heard that flagship model pricing drops by half"),
+        Evidence(id="c2", title="Rumor denied", url="https://weibo.com/2",
+                 content="Pricing drops for the flagship model are fake"),
+        Evidence(id="c3", title="Unrelated", url="https://weibo.com/3",
+                 content="Weekend football scores"),
+    ]
+    result = ProvenanceVerifier().verify_all(facts + rumors)
+    corroborated = {r["claim"]: r for r in result.corroborated_rumors}
+    assert set(corroborated) == {"Rumor pricing"}
+    assert corroborated["Rumor pricing"]["matched_fact"] == "Pricing update"
+    assert CrossVerifier().verify("flagship model", facts[0].content) == CorroborationLevel.DIRECT_CONFIRMS
+
+
+def test_trust_tier_for_social_platforms_and_content_communities():
+    def trust(url):
+        return TrustScorer.calculate_trust(Evidence(id="t", title="t", url=url, content="plain text"))
+
+    assert trust("https://m.weibo.com/status/1") == 0.5
+    # Content communities keep the default tier despite their low registry score
+    assert trust("https://juejin.cn/post/1") == 0.6
+    assert trust("https://techcrunch.com/a") == 0.9
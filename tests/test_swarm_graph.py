@@ -191,3 +191,70 @@ async def test_full_graph_flow_with_retry(
     assert mock_critic.verify_section.call_count == 2
     assert mock_auditor.check_consistency.call_count == 1  # One section
     assert mock_editor.assemble_report.call_count == 1
+
+
+@patch("src.agents.swarm.graph.director")
+@patch("src.agents.swarm.graph.writer")
+@patch("src.agents.swarm.graph.critic")
+@patch("src.agents.swarm.graph.auditor")
+@patch("src.agents.swarm.graph.editor")
+@pytest.mark.asyncio
+async def test_parallel_graph_drafts_sections_concurrently(
+    mock_editor, mock_auditor, mock_critic, mock_writer, mock_director
+):
+    """Parallel mode: sections overlap in time, revision budget is per section, one audit pass."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from src.agents.swarm.auditor import AuditResult
+    from src.agents.swarm.graph import create_parallel_swarm_graph
+
+    mock_director.acreate_outline = AsyncMock(
+        return_value=ReportOutline(
+            title="T",
+            introduction="I",
+            sections=[
+                SectionPlan(id="s1", title="S1", description="D1"),
+                SectionPlan(id="s2", title="S2", description="D2"),
+                SectionPlan(id="s3", title="S3", description="D3"),
+            ],
+            conclusion="C",
+        )
+    )
+
+    in_flight = 0
+    peak = 0
+
+    async def _write(section, state):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"Draft_{section.id}"
+
+    async def _verify(draft, section, evidences):
+        # s2 never passes -> capped at MAX_REVISION_LOOPS_PER_SECTION drafts
+        failing = section.id == "s2"
+        return CritiqueResult(
+            score=4.0 if failing else 9.0,
+            feedback="Fix it" if failing else "",
+            nli_state="NEI" if failing else "ENTAIL",
+            revision_needed=failing,
+        )
+
+    mock_writer.awrite_section = AsyncMock(side_effect=_write)
+    mock_critic.averify_section = AsyncMock(side_effect=_verify)
+    mock_auditor.acheck_consistency = AsyncMock(
+        return_value=AuditResult(passed=True, conflict_detected=False)
+    )
+    mock_editor.assemble_report.return_value = "Final"
+
+    app = create_parallel_swarm_graph()
+    final_state = await app.ainvoke({"topic": "T", "events": [], "claims": [], "evidences": []})
+
+    assert peak >= 2
+    assert final_state["final_report"] == "Final"
+    assert set(final_state["draft_sections"]) == {"s1", "s2", "s3"}
+    assert mock_writer.awrite_section.await_count == 2 + MAX_REVISION_LOOPS_PER_SECTION
+    assert final_state["global_revision_count"] == MAX_REVISION_LOOPS_PER_SECTION
+    assert mock_auditor.acheck_consistency.await_count == 3
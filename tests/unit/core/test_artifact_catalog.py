@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+from src.core.artifact_catalog import ArtifactCatalog, get_artifact_catalog
+from src.graph.nodes.archive_node import archive_run_node
+
+
+def _archive(run_id, objective, urls, hard=0):
+    facts = [
+        {"event_id": f"ev-{i}", "title": f"Event {i}", "date": "2025-01-0%d" % (i + 1), "evidences": [{"url": u}]}
+        for i, u in enumerate(urls)
+    ]
+    return archive_run_node(
+        {
+            "run_id": run_id,
+            "objective": objective,
+            "facts_index": {"run_id": run_id, "facts": facts},
+            "gate_report": {
+                "summary": {"hard": hard, "soft": 0, "warn": 1},
+                "violations": [{"rule_id": "must_be_key_claim", "severity": "WARN", "details": "x"}],
+            },
+        }
+    )
+
+
+def _write_phase1(run_id, rate):
+    d = Path("artifacts") / "phase1" / run_id
+    d.mkdir(parents=True)
+    (d / "metrics_summary.json").write_text(json.dumps({"locatable_rate_overall": rate}), encoding="utf-8")
+    (d / "doc_versions_summary.json").write_text(
+        json.dumps(
+            {
+                "run_id": run_id,
+                "documents": [{"doc_id": "d1", "doc_key": "https://a.com/x", "drift_status": "FIRST_SEEN"}],
+                "summary": {"docs_total": 1},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_archive_ingests_runs_and_answers_queries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _archive("r1", "topic A", ["https://a.com/x?utm=1", "https://b.com/y"])
+    _archive("r2", "topic A", ["https://A.com/x/"])
+    _archive("r3", "topic B", ["https://c.com/z"], hard=2)
+    catalog = get_artifact_catalog()
+
+    assert sorted(r["run_id"] for r in catalog.runs_citing_url("https://a.com/x")) == ["r1", "r2"]
+    per_objective = {row["objective"]: row for row in catalog.events_per_objective()}
+    assert per_objective["topic A"]["runs"] == 2
+    assert per_objective["topic A"]["events"] == 3
+    assert catalog.get_run("r3")["gate_hard"] == 2
+
+    _write_phase1("r1", 0.5)
+    _write_phase1("r2", 0.75)
+    assert catalog.ingest_all() == {"runs": 0, "phase1": 2}
+    # Unchanged files are not re-read
+    assert catalog.ingest_all() == {"runs": 0, "phase1": 0}
+    trend = catalog.locatable_rate_trend(objective="topic A")
+    assert [(row["run_id"], row["locatable_rate_overall"]) for row in trend] == [("r1", 0.5), ("r2", 0.75)]
+    assert catalog.latest_run(with_phase1=True)["run_id"] == "r2"
+    assert [row["run_id"] for row in catalog.runs_with_document("https://a.com/x")] == ["r1", "r2"]
+
+
+def test_reingest_replaces_rows_for_changed_run(tmp_path):
+    run_dir = tmp_path / "runs" / "r1"
+    run_dir.mkdir(parents=True)
+    (run_dir / "run_record.json").write_text(json.dumps({"run_id": "r1", "objective": "o"}), encoding="utf-8")
+    facts_path = run_dir / "facts_index.json"
+    facts_path.write_text(json.dumps({"facts": [{"event_id": "e1", "evidences": [{"url": "https://a.com"}]}]}), encoding="utf-8")
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite3")
+    assert catalog.ingest_run_dir(run_dir)
+    facts_path.write_text(json.dumps({"facts": [{"event_id": "e2", "evidences": [{"url": "https://b.com"}]}]}) + " ", encoding="utf-8")
+    assert catalog.ingest_run_dir(run_dir)
+    assert catalog.runs_citing_url("https://a.com") == []
+    assert [r["event_ids"] for r in catalog.runs_citing_url("https://b.com")] == ["e2"]
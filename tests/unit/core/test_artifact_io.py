@@ -0,0 +1,82 @@
+import json
+import os
+
+from src.core.artifact_io import (
+    ROOT_COLLECTION,
+    ArtifactWriter,
+    iter_artifact_records,
+    load_artifact,
+    load_artifact_file,
+    read_manifest,
+    verify_artifact,
+)
+
+
+def _facts_index(n):
+    return {
+        "run_id": "r1",
+        "generated_at": "2025-01-01T00:00:00",
+        "facts": [
+            {
+                "event_id": f"ev-{i}",
+                "title": f"事件 {i}",
+                "evidences": [{"url": f"https://a.com/{i}", "credibility_tier": "news", "retrieval_ts": "t"}],
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def test_streamed_collection_round_trips_with_manifest(tmp_path):
+    payload = _facts_index(50)
+    path = ArtifactWriter(tmp_path).write("facts_index", payload, collection="facts", schema="facts_index")
+    assert path.endswith("facts_index.jsonl.gz")
+    assert load_artifact(tmp_path, "facts_index") == payload
+    assert load_artifact_file(path) == payload
+
+    records = iter_artifact_records(tmp_path, "facts_index")
+    assert next(records)["event_id"] == "ev-0"
+
+    entry = read_manifest(tmp_path)["artifacts"]["facts_index"]
+    assert entry["records"] == 50
+    assert entry["header"] == {"run_id": "r1", "generated_at": "2025-01-01T00:00:00"}
+    assert entry["schema"]["name"] == "facts_index"
+    assert entry["schema"]["errors"] == 0
+    assert verify_artifact(tmp_path, "facts_index")
+
+
+def test_schema_errors_are_recorded_not_raised(tmp_path):
+    payload = _facts_index(3)
+    payload["facts"][1]["evidences"] = []  # minItems: 1
+    writer = ArtifactWriter(tmp_path)
+    writer.write("facts_index", payload, collection="facts", schema="facts_index")
+    writer.write("chunk_meta", [{"chunk_id": "c0", "start": 0, "end": 3}], collection=ROOT_COLLECTION)
+    manifest = read_manifest(tmp_path)["artifacts"]
+    assert manifest["facts_index"]["schema"]["errors"] == 1
+    assert manifest["facts_index"]["schema"]["messages"][0].startswith("record 1")
+    # Both artifacts are kept in the same manifest
+    assert load_artifact(tmp_path, "chunk_meta") == [{"chunk_id": "c0", "start": 0, "end": 3}]
+
+
+def test_legacy_json_format(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEEPTRACE_ARTIFACT_FORMAT", "json")
+    payload = _facts_index(2)
+    path = ArtifactWriter(tmp_path).write("facts_index", payload, collection="facts", schema="facts_index")
+    assert path.endswith("facts_index.json")
+    assert json.loads((tmp_path / "facts_index.json").read_text(encoding="utf-8")) == payload
+    assert [r["event_id"] for r in iter_artifact_records(tmp_path, "facts_index")] == ["ev-0", "ev-1"]
+    assert verify_artifact(tmp_path, "facts_index")
+
+
+def test_newer_file_wins_when_both_formats_exist(tmp_path):
+    ArtifactWriter(tmp_path).write("facts_index", _facts_index(2), collection="facts")
+    newer = _facts_index(3)
+    ArtifactWriter(tmp_path, fmt="json").write("facts_index", newer, collection="facts")
+    streamed, legacy = tmp_path / "facts_index.jsonl.gz", tmp_path / "facts_index.json"
+    os.utime(streamed, ns=(1_000_000_000, 1_000_000_000))
+    assert load_artifact(tmp_path, "facts_index") == newer
+    assert len(list(iter_artifact_records(tmp_path, "facts_index"))) == 3
+
+    os.utime(legacy, ns=(500_000_000, 500_000_000))
+    ArtifactWriter(tmp_path).write("facts_index", _facts_index(1), collection="facts")
+    assert len(load_artifact(tmp_path, "facts_index")["facts"]) == 1
@@ -0,0 +1,38 @@
+from benchmarks import corpus
+from benchmarks.suite import CASES, BenchParams, append_history, compare, load_history, run_suite
+
+TINY = BenchParams(events=30, doc_chars=3000, cjk_ratio=0.5, seed=1)
+
+
+def test_corpus_is_deterministic_and_mixed():
+    doc = corpus.make_document(2000, cjk_ratio=0.5, seed=3)
+    assert doc.text == corpus.make_document(2000, cjk_ratio=0.5, seed=3).text
+    assert "。" in doc.text and "." in doc.text
+    start, end = doc.sentences[0]
+    assert doc.text[start:end].endswith(("。", "."))
+    assert [e.title for e in corpus.make_timeline_events(50, seed=2)] == [
+        e.title for e in corpus.make_timeline_events(50, seed=2)
+    ]
+
+
+def test_suite_runs_every_case_offline(tmp_path):
+    results = run_suite(params=TINY, repeat=1)
+    assert [r["case"] for r in results] == list(CASES)
+    for result in results:
+        assert result["seconds_median"] >= 0
+        assert result["peak_mem_bytes"] > 0
+        assert result["params"]["events"] == 30
+
+    history_path = tmp_path / "history.jsonl"
+    append_history(results, history_path)
+    history = load_history(history_path)
+    assert len(history) == len(results)
+
+    # A later, slower run of the same case is flagged against the recorded baseline
+    slower = dict(results[0], recorded_at="later", seconds_median=results[0]["seconds_median"] * 2 + 1)
+    rows = compare([slower], history, threshold=0.25)
+    assert rows[0]["baseline"] == results[0]["seconds_median"]
+    assert rows[0]["regression"] is True
+    # Different parameters have no baseline
+    other = dict(slower, params=dict(slower["params"], events=31))
+    assert compare([other], history)[0]["baseline"] is None
@@ -42,3 +42,113 @@ async def test_debater_tool_logic():
             found_sources = True
             break
     assert found_sources, "Judge prompt not found in LLM calls"
+
+
+@pytest.mark.asyncio
+async def test_role_turns_run_concurrently_within_round():
+    """Both roles of a round are in flight at the same time."""
+    import asyncio
+    from src.core.tools.debater import adjudicate_conflicts
+
+    in_flight = 0
+    peak = 0
+
+    async def _fake_invoke(llm, messages, model_name=None, call_site=None, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return AIMessage(content="Answer: claim 1. Explanation: official source.")
+
+    with patch("src.core.tools.debater.safe_ainvoke", side_effect=_fake_invoke):
+        verdicts = await adjudicate_conflicts(
+            [{"topic": "T", "claims": ["a", "b"], "source_ids": ["s1", "s2"]}],
+            llm=MagicMock(),
+        )
+    assert peak == 2
+    assert verdicts[0].startswith("Answer")
+
+
+@pytest.mark.asyncio
+async def test_shared_topic_conflicts_batched_and_memoized(tmp_path):
+    from src.core.tools.debater import VerdictMemo, adjudicate_conflicts
+
+    conflicts = [
+        {"topic": "Launch", "claims": ["May", "June"], "source_ids": ["s1", "s2"]},
+        {"topic": "launch ", "claims": ["$10", "$20"], "source_ids": ["s3", "s4"]},
+    ]
+    judge = "### Conflict 1\nMay wins.\n### Conflict 2\n$20 wins."
+    memo = VerdictMemo(str(tmp_path / "verdicts.json"))
+
+    with patch("src.core.tools.debater.safe_ainvoke", new_callable=AsyncMock) as mock_safe:
+        mock_safe.side_effect = lambda llm, messages, **kw: AIMessage(
+            content=judge if kw.get("call_site") == "debate_judge" else "Answer: claim 1. Explanation: x."
+        )
+        verdicts = await adjudicate_conflicts(conflicts, debate_rounds=1, memo=memo, llm=MagicMock())
+        # One session: 2 role turns + 1 judge for both conflicts
+        assert mock_safe.call_count == 3
+    assert "May wins" in verdicts[0] and "$20 wins" in verdicts[1]
+
+    # A new run reuses the persisted verdicts without any LLM call
+    with patch("src.core.tools.debater.safe_ainvoke", new_callable=AsyncMock) as mock_safe:
+        again = await adjudicate_conflicts(
+            conflicts, memo=VerdictMemo(str(tmp_path / "verdicts.json")), llm=MagicMock()
+        )
+        assert mock_safe.call_count == 0
+    assert again == verdicts
+
+
+def test_debater_postprocess_handles_batched_results():
+    from langchain_core.messages import ToolMessage
+    from src.graph.nodes.debater_postprocess import debater_postprocess
+
+    calls = [
+        {"id": "c1", "name": "ResolveConflict", "args": {"topic": "A", "claims": ["x", "y"], "source_ids": ["1", "2"]}},
+        {"id": "c2", "name": "ResolveConflict", "args": {"topic": "B", "claims": ["p", "q"], "source_ids": ["3", "4"]}},
+    ]
+    state = {
+        "messages": [
+            AIMessage(content="", tool_calls=calls),
+            ToolMessage(tool_call_id="c1", content="Claim 1 wins."),
+            ToolMessage(tool_call_id="c2", content="Claim 2 wins."),
+        ],
+        "conflict_candidates": [c["args"] for c in calls] + [{"topic": "C", "claims": [], "source_ids": []}],
+    }
+    update = debater_postprocess(state)
+    assert [c["topic"] for c in update["conflicts"]] == ["A", "B"]
+    assert [c["topic"] for c in update["conflict_candidates"]] == ["C"]
+    assert len(update["research_notes"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_debater_node_answers_every_tool_call():
+    from src.graph.nodes.debater_node import debater_node
+
+    calls = [
+        {"id": "t1", "name": "think_tool", "args": {"reflection": "compare sources"}},
+        {"id": "c1", "name": "ResolveConflict", "args": {"topic": "A", "claims": ["x", "y"], "source_ids": ["1", "2"]}},
+        {"id": "u1", "name": "Unknown", "args": {}},
+    ]
+    with patch("src.graph.nodes.debater_node.adjudicate_conflicts", new=AsyncMock(return_value=["Claim 1 wins."])):
+        update = await debater_node({"messages": [AIMessage(content="", tool_calls=calls)]})
+    replies = {m.tool_call_id: m.content for m in update["messages"]}
+    assert list(replies) == ["t1", "c1", "u1"]
+    assert replies["t1"] == "THINK: compare sources"
+    assert replies["c1"] == "Claim 1 wins."
+    assert replies["u1"].startswith("Error: Unknown")
+
+
+def test_verdict_memo_appends_and_sees_other_writers(tmp_path):
+    from src.core.tools.debater import VerdictMemo
+
+    path = tmp_path / "verdicts.jsonl"
+    first, second = VerdictMemo(str(path)), VerdictMemo(str(path))
+    assert second.get("T", ["a"], ["s"]) is None
+    first.put("T", ["a"], ["s"], "v1")
+    first.put("U", ["b"], ["s"], "v2")
+    # Another process' memo picks the new lines up on a miss
+    assert second.get("T", ["a"], ["s"]) == "v1"
+    second.put("T", ["a"], ["s"], "v3")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    assert VerdictMemo(str(path)).get("T", ["a"], ["s"]) == "v3"
@@ -0,0 +1,40 @@
+from src.core.models.credibility import evaluate_credibility
+from src.core.models.domain_registry import (
+    DomainResolver,
+    domain_resolver,
+    get_domain_score,
+    is_official_domain,
+    normalize_host,
+)
+
+
+def test_normalize_host():
+    assert normalize_host("https://WWW.Reuters.com:443/world?x=1") == "reuters.com"
+    assert normalize_host("news.bbc.com.") == "news.bbc.com"
+    assert normalize_host("") == ""
+
+
+def test_longest_suffix_match_on_label_boundaries():
+    assert domain_resolver.resolve_url("https://gemini.google.com/app").score == 98.0
+    assert domain_resolver.resolve_url("https://maps.google.com").domain == "google.com"
+    # Plain substring / suffix without a label boundary must not match
+    assert domain_resolver.resolve_url("https://notgoogle.com") is None
+    assert domain_resolver.resolve_url("https://dropbox.com") is None
+    assert get_domain_score("fakereuters.com") == (0.0, "unknown")
+
+
+def test_earlier_tier_wins_for_duplicate_domains():
+    resolver = DomainResolver([("official", {"a.com": 90.0}), ("mainstream", {"a.com": 10.0})])
+    assert resolver.resolve_host("a.com").domain_type == "official"
+
+
+def test_evaluate_credibility_tiers():
+    assert evaluate_credibility("https://blog.openai.com/post").source_type == "official"
+    assert evaluate_credibility("https://www.reuters.com/a").score == 90.0
+    assert evaluate_credibility("https://weibo.com/123").source_type == "user_generated"
+    assert evaluate_credibility("https://36kr.com/p/1").source_type == "mainstream"
+    unknown = evaluate_credibility("https://example.org")
+    assert (unknown.score, unknown.source_type) == (20.0, "unknown")
+    assert evaluate_credibility("").score == 0.0
+    assert is_official_domain("http://www.stats.gov.cn/data")
+    assert not is_official_domain("https://reuters.com")
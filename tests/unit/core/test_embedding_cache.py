@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from src.core.utils.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in texts]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+
+def test_store_roundtrip_and_persistence(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "m1")
+    store.put_many(["a", "b"], [[1, 0, 0], [0, 1, 0]])
+    hits = store.get_many(["b", "missing", "a"])
+    assert hits[1] is None
+    assert np.allclose(hits[0], [0, 1, 0]) and np.allclose(hits[2], [1, 0, 0])
+
+    reopened = EmbeddingStore(str(tmp_path), "m1")
+    assert len(reopened) == 2
+    assert np.allclose(reopened.get_many(["a"])[0], [1, 0, 0])
+    # Keys are per model
+    assert EmbeddingStore(str(tmp_path), "m2").get_many(["a"]) == [None]
+    # A lookup in a store that was never written leaves no files behind
+    assert not (tmp_path / "m2").exists()
+
+
+def test_store_grows_and_evicts_lru(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "m", max_entries=1500)
+    texts = [f"t{i}" for i in range(1500)]
+    store.put_many(texts, np.eye(1500, 4, dtype=np.float32))
+    assert len(store) == 1500
+    store.get_many(["t0"])  # refresh t0
+    store.put_many(["new"], [[1, 1, 1, 1]])
+    assert len(store) <= 1500
+    assert store.get_many(["t0"])[0] is not None
+    assert store.get_many(["t1"])[0] is None  # least recently used went first
+    assert EmbeddingStore(str(tmp_path), "m", max_entries=1500).get_many(["new"])[0] is not None
+
+
+@pytest.mark.asyncio
+async def test_cached_embeddings_only_embeds_misses(tmp_path):
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, EmbeddingStore(str(tmp_path), "m"))
+    first = await cached.aembed_documents(["x", "y", "x"])
+    second = await cached.aembed_documents(["y", "z"])
+    assert base.calls == [["x", "y"], ["z"]]
+    assert first[0] == first[2]
+    assert np.allclose(second[0], first[1])
+
+
+def test_stores_sharing_a_directory_stay_consistent(tmp_path):
+    # Two runs with their own store instance over the same cache directory
+    first = EmbeddingStore(str(tmp_path), "m", max_entries=1100)
+    second = EmbeddingStore(str(tmp_path), "m", max_entries=1100)
+    first.put_many(["a", "b"], [[1, 0], [0, 1]])
+    second.put_many(["c", "a"], [[2, 2], [3, 3]])
+    assert np.allclose(first.get_many(["c"])[0], [2, 2])
+    assert np.allclose(first.get_many(["a"])[0], [3, 3])
+    assert np.allclose(second.get_many(["b"])[0], [0, 1])
+
+    # Eviction in one process, row reuse in the other: keys never point at another text's vector
+    texts = [f"t{i}" for i in range(1200)]
+    first.put_many(texts, [[i, -i] for i in range(1200)])
+    second.put_many(["late"], [[7, 7]])
+    for store in (first, second):
+        for text, vector in zip(["late"] + texts, store.get_many(["late"] + texts)):
+            if vector is not None:
+                expected = [7, 7] if text == "late" else [int(text[1:]), -int(text[1:])]
+                assert np.allclose(vector, expected), text
+    assert len(first) == len(second) <= 1100
+
+
+def test_journal_is_compacted(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "m", max_entries=100)
+    for round_ in range(60):
+        store.put_many([f"r{round_}_{i}" for i in range(100)], np.ones((100, 2)))
+    journal = tmp_path / "m" / "index.bin"
+    assert journal.stat().st_size < 4 * 1024 * 48 * 2
+    reopened = EmbeddingStore(str(tmp_path), "m", max_entries=100)
+    assert len(reopened) == len(store)
+    assert reopened.get_many(["r59_99"])[0] is not None
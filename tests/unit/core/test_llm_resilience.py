@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from src.core.utils.llm_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    get_retry_after,
+    is_transient_error,
+    resilience_metrics,
+    resilient_ainvoke,
+)
+
+
+class RateLimitError(Exception):
+    def __init__(self, message, headers=None):
+        super().__init__(message)
+        self.status_code = 429
+        self.headers = headers or {}
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class _FlakyRunnable:
+    def __init__(self, failures, error=None, delay=0.0):
+        self.failures = failures
+        self.error = error or RateLimitError("Too many requests")
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise self.error
+        return f"ok-{self.calls}"
+
+
+def test_transient_error_classification():
+    assert is_transient_error(RateLimitError("slow down"))
+    assert is_transient_error(asyncio.TimeoutError())
+    assert not is_transient_error(BadRequestError("bad"))
+    assert not is_transient_error(CircuitOpenError("open"))
+
+
+def test_retry_after_is_lower_bound_of_backoff():
+    err = RateLimitError("slow down", headers={"retry-after": "7"})
+    assert get_retry_after(err) == 7.0
+    assert backoff_delay(0, base_delay=0.1, max_delay=30, retry_after=7.0) >= 7.0
+    assert backoff_delay(10, base_delay=1.0, max_delay=2.0) <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_resilient_ainvoke_retries_transient_errors():
+    resilience_metrics.reset()
+    runnable = _FlakyRunnable(failures=2)
+    result = await resilient_ainvoke(runnable, [], call_site="unit", base_delay=0, max_attempts=3)
+    assert result == "ok-3"
+    metrics = resilience_metrics.snapshot()["unit"]
+    assert metrics["retries"] == 2
+    assert metrics["successes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_propagate_without_retry():
+    runnable = _FlakyRunnable(failures=5, error=BadRequestError("context too long"))
+    with pytest.raises(BadRequestError):
+        await resilient_ainvoke(runnable, [], base_delay=0, max_attempts=3)
+    assert runnable.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_routes_to_fallback():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    primary = _FlakyRunnable(failures=100)
+    fallback = _FlakyRunnable(failures=0)
+
+    result = await resilient_ainvoke(
+        primary, [], base_delay=0, max_attempts=2, breaker=breaker, fallback=fallback
+    )
+    assert result == "ok-1"
+    assert breaker.state == "open"
+
+    # Open circuit: primary is not called again
+    calls_before = primary.calls
+    with pytest.raises(CircuitOpenError):
+        await resilient_ainvoke(primary, [], base_delay=0, max_attempts=2, breaker=breaker)
+    assert primary.calls == calls_before
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_returns_fastest_response():
+    class _SlowThenFast:
+        def __init__(self):
+            self.calls = 0
+
+        async def ainvoke(self, messages):
+            self.calls += 1
+            await asyncio.sleep(1.0 if self.calls == 1 else 0.0)
+            return f"call-{self.calls}"
+
+    resilience_metrics.reset()
+    result = await resilient_ainvoke(_SlowThenFast(), [], call_site="hedge", hedge_after=0.01)
+    assert result == "call-2"
+    assert resilience_metrics.snapshot()["hedge"]["hedge_wins"] == 1
@@ -0,0 +1,144 @@
+import json
+from typing import TypedDict
+
+import pytest
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+
+from src.core.profiling import (
+    PROFILE_NAME,
+    instrument_node,
+    profile_run,
+    record_cache,
+    record_http,
+)
+from src.core.utils.token_budget import TokenUsageLedger
+
+
+class _State(TypedDict, total=False):
+    value: int
+    notes: str
+
+
+def _build_graph():
+    ledger = TokenUsageLedger()
+
+    async def fetch(state: _State, config: RunnableConfig):
+        assert config is not None  # config still injected through the wrapper
+        record_http(1200)
+        ledger.record("gpt-4o", 100, 20, call_site="fetch")
+        return {"notes": "x" * 50}
+
+    def compress(state: _State):
+        record_cache("embeddings", hits=3, misses=1)
+        return {"value": state["value"] + 1}
+
+    inner = StateGraph(_State)
+    inner.add_node("fetch", instrument_node("fetch", fetch, graph="worker"))
+    inner.add_node("compress", instrument_node("compress", compress, graph="worker"))
+    inner.add_edge(START, "fetch")
+    inner.add_edge("fetch", "compress")
+    inner.add_edge("compress", END)
+    worker_app = inner.compile()
+
+    async def worker(state: _State):
+        result = await worker_app.ainvoke({"value": state["value"]})
+        return {"value": result["value"]}
+
+    def supervisor(state: _State):
+        ledger.record("gpt-4o", 10, 5, call_site="supervisor", estimated=True)
+        return {}
+
+    outer = StateGraph(_State)
+    outer.add_node("supervisor", instrument_node("supervisor", supervisor))
+    outer.add_node("worker", instrument_node("worker", worker))
+    outer.add_edge(START, "supervisor")
+    outer.add_edge("supervisor", "worker")
+    outer.add_edge("worker", END)
+    return outer.compile()
+
+
+@pytest.mark.asyncio
+async def test_profile_records_nested_node_spans(tmp_path, monkeypatch):
+    otel_path = tmp_path / "spans.jsonl"
+    monkeypatch.setenv("DEEPTRACE_PROFILE_OTEL_FILE", str(otel_path))
+    graph = _build_graph()
+
+    with profile_run("run-1", measure_state=True) as profiler:
+        result = await graph.ainvoke({"value": 1})
+        record_http(10)  # outside any node
+    assert result["value"] == 2
+
+    spans = {s.name: s for s in profiler.spans}
+    assert set(spans) == {"supervisor", "worker", "fetch", "compress"}
+    assert spans["fetch"].parent_id == spans["worker"].span_id
+    assert spans["compress"].parent_id == spans["worker"].span_id
+    assert spans["worker"].parent_id is None
+
+    # Counters go to the innermost span
+    assert (spans["fetch"].llm_calls, spans["fetch"].tokens_in, spans["fetch"].tokens_out) == (1, 100, 20)
+    assert (spans["fetch"].http_requests, spans["fetch"].http_bytes) == (1, 1200)
+    assert spans["worker"].tokens_in == 0
+    assert spans["supervisor"].tokens_estimated == 1
+    assert spans["compress"].cache_hits == {"embeddings": 3}
+    assert spans["compress"].cache_misses == {"embeddings": 1}
+    assert spans["fetch"].state_out_bytes == len(json.dumps({"notes": "x" * 50}))
+    assert spans["worker"].wall_ms >= spans["fetch"].wall_ms
+
+    path = profiler.write(tmp_path / "run")
+    assert path.endswith(PROFILE_NAME)
+    profile = json.loads((tmp_path / "run" / PROFILE_NAME).read_text(encoding="utf-8"))
+    assert profile["run_id"] == "run-1"
+    assert profile["nodes"]["worker/fetch"]["tokens_in"] == 100
+    assert profile["nodes"]["main/supervisor"]["calls"] == 1
+    assert profile["totals"]["tokens_in"] == 110
+    assert profile["totals"]["http_bytes"] == 1210
+    assert profile["outside_nodes"]["http_bytes"] == 10
+
+    export = json.loads(otel_path.read_text(encoding="utf-8").splitlines()[0])
+    otlp_spans = export["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(otlp_spans) == 4
+    fetch_span = next(s for s in otlp_spans if s["name"] == "fetch")
+    assert fetch_span["parentSpanId"] == spans["worker"].span_id
+    assert {"key": "llm.tokens_in", "value": {"intValue": "100"}} in fetch_span["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_instrumented_nodes_pass_through_without_profiler(monkeypatch):
+    graph = _build_graph()
+    result = await graph.ainvoke({"value": 5})
+    assert result["value"] == 6
+
+    monkeypatch.setenv("DEEPTRACE_PROFILE", "0")
+    with profile_run("run-2") as profiler:
+        assert profiler is None
+
+
+@pytest.mark.asyncio
+async def test_state_size_measurement_is_opt_in(monkeypatch):
+    graph = _build_graph()
+    with profile_run("run-4") as profiler:
+        await graph.ainvoke({"value": 1})
+    assert all(s.state_in_bytes is None and s.state_out_bytes is None for s in profiler.spans)
+
+    monkeypatch.setenv("DEEPTRACE_PROFILE_STATE", "1")
+    with profile_run("run-5") as profiler:
+        await graph.ainvoke({"value": 1})
+    assert all(s.state_in_bytes for s in profiler.spans)
+
+
+def test_failed_node_span_records_error():
+    def broken(state: _State):
+        raise ValueError("boom")
+
+    graph = StateGraph(_State)
+    graph.add_node("broken", instrument_node("broken", broken))
+    graph.add_edge(START, "broken")
+    graph.add_edge("broken", END)
+    app = graph.compile()
+
+    with profile_run("run-3") as profiler:
+        with pytest.raises(ValueError):
+            app.invoke({"value": 0})
+    assert profiler.spans[0].error == "ValueError: boom"
+    assert profiler.summary()["nodes"]["main/broken"]["errors"] == 1
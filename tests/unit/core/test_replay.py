@@ -0,0 +1,195 @@
+import asyncio
+from datetime import datetime
+from typing import TypedDict
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, START, StateGraph
+
+from src.core import replay
+from src.core.artifact_io import ArtifactWriter, load_artifact
+from src.core.replay import (
+    RECORDING_NAME,
+    LatencyModel,
+    ReplayMissError,
+    capture_graph_finished,
+    capture_graph_input,
+    record_run,
+    replay_run,
+)
+from src.core.tools import search
+from src.fetchers.content_scraper import ContentScraper
+
+
+class _State(TypedDict, total=False):
+    query: str
+    summary: str
+    pages: list
+    facts_index: dict
+    gate_report: dict
+
+
+class _FakeTavily:
+    calls = 0
+
+    def __init__(self, api_key=None):
+        pass
+
+    async def search(self, query, **kwargs):
+        _FakeTavily.calls += 1
+        return {"query": query, "results": [{"url": f"https://example.com/{query}", "content": "c"}]}
+
+
+def _build_graph(llm):
+    async def research(state: _State):
+        # The date stands in for prompts that embed "today"
+        prompt = f"Summarize {state['query']} as of {datetime.now().isoformat()}"
+        summary = (await llm.ainvoke([HumanMessage(content=prompt)])).content
+        results = await search.tavily_search_async([state["query"], state["query"] + " news"])
+        urls = [r["url"] for res in results for r in res["results"]]
+        pages = [await ContentScraper().scrape(url) for url in urls]
+        return {"summary": summary, "pages": pages}
+
+    def finalize(state: _State):
+        facts = [{"event_id": f"ev_{i}", "text": p["main_text"], "summary": state["summary"]}
+                 for i, p in enumerate(state["pages"])]
+        return {
+            "facts_index": {"generated_at": datetime.utcnow().isoformat(), "facts": facts},
+            "gate_report": {"summary": {"violations": 0}, "violations": []},
+        }
+
+    graph = StateGraph(_State)
+    graph.add_node("research", research)
+    graph.add_node("finalize", finalize)
+    graph.add_edge(START, "research")
+    graph.add_edge("research", "finalize")
+    graph.add_edge("finalize", END)
+    return graph.compile()
+
+
+async def _record(run_dir, monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    monkeypatch.setattr(search, "AsyncTavilyClient", _FakeTavily)
+
+    async def fake_fetch(self, url):
+        return {"main_text": f"page {url}", "raw_comments_html": None, "error": None}
+
+    monkeypatch.setattr(ContentScraper, "_fetch", fake_fetch)
+    graph = _build_graph(FakeListChatModel(responses=["recorded summary"]))
+    state = {"query": "gpt5"}
+    with record_run("run-1", enabled=True) as recorder:
+        capture_graph_input(state, {"recursion_limit": 10})
+        final = await graph.ainvoke(state)
+        capture_graph_finished()
+    writer = ArtifactWriter(run_dir)
+    writer.write("facts_index", final["facts_index"], collection="facts")
+    writer.write("gate_report", final["gate_report"], collection="violations")
+    recorder.write(run_dir)
+    return recorder
+
+
+def _offline(monkeypatch):
+    """Every external call fails unless it is served from the recording."""
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+
+    async def no_fetch(self, url):
+        raise AssertionError("network fetch during replay")
+
+    monkeypatch.setattr(ContentScraper, "_fetch", no_fetch)
+    _FakeTavily.calls = 0
+
+
+@pytest.mark.asyncio
+async def test_replay_reproduces_recorded_outputs(tmp_path, monkeypatch):
+    recorder = await _record(tmp_path, monkeypatch)
+    kinds = [i["kind"] for i in recorder.interactions]
+    assert sorted(kinds) == ["fetch", "fetch", "llm", "search", "search"]
+
+    recording = load_artifact(tmp_path, RECORDING_NAME)
+    assert recording["counts"] == {"llm": 1, "search": 2, "fetch": 2}
+    assert recording["graph_config"] == {"recursion_limit": 10}
+
+    _offline(monkeypatch)
+    # A model with other settings: served through the masked prompt key (date and model differ)
+    graph = _build_graph(FakeListChatModel(responses=["never used"]))
+    report = await replay_run(tmp_path, LatencyModel(llm="none", search="none", fetch=0.01), graph=graph)
+
+    assert report["identical"] is True
+    assert report["run_id"] == "run-1"
+    assert report["replay_run_id"].startswith("run-1-replay-")
+    assert _FakeTavily.calls == 0
+    stats = report["interactions"]
+    assert (stats["served"], stats["missed"], stats["unused"]) == (5, 0, 0)
+    assert stats["fallback_key"] == 1
+    assert stats["simulated_latency_s"] == pytest.approx(0.02)
+    assert report["profile_path"].startswith(str(tmp_path / "replays"))
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_differences(tmp_path, monkeypatch):
+    await _record(tmp_path, monkeypatch)
+    facts_index = load_artifact(tmp_path, "facts_index")
+    facts_index["facts"][0]["text"] = "tampered"
+    ArtifactWriter(tmp_path).write("facts_index", facts_index, collection="facts")
+
+    _offline(monkeypatch)
+    graph = _build_graph(FakeListChatModel(responses=["never used"]))
+    report = await replay_run(tmp_path, LatencyModel(llm="none", search="none", fetch="none"), graph=graph)
+
+    assert report["identical"] is False
+    assert report["comparisons"]["gate_report"]["identical"] is True
+    diffs = report["comparisons"]["facts_index"]["differences"]
+    assert len(diffs) == 1 and diffs[0].startswith(".facts[0].text")
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_call_fails_replay(tmp_path, monkeypatch):
+    await _record(tmp_path, monkeypatch)
+    _offline(monkeypatch)
+
+    player = replay.ReplayPlayer(load_artifact(tmp_path, RECORDING_NAME)["interactions"], LatencyModel(search="none"))
+    with replay._activate(player):
+        with pytest.raises(ReplayMissError):
+            await search.tavily_search_async(["something else"])
+    assert player.stats["missed"] == 1
+
+
+def test_latency_model():
+    assert LatencyModel().delay("llm", 1.5) == 1.5
+    assert LatencyModel(scale=0.5).delay("search", 1.0) == 0.5
+    assert LatencyModel(fetch="none").delay("fetch", 2.0) == 0.0
+    assert LatencyModel(llm=LatencyModel.parse("0.2")).delay("llm", 9.0) == 0.2
+
+
+@pytest.mark.asyncio
+async def test_only_calls_in_the_session_context_are_intercepted():
+    go = asyncio.Event()
+    bystander_llm = FakeListChatModel(responses=["bystander"])
+
+    async def other_run():
+        await go.wait()
+        return (await bystander_llm.ainvoke("other run")).content
+
+    # Started outside the recording context, like another graph run in the same process
+    other = asyncio.create_task(other_run())
+    uncached = FakeListChatModel(responses=["uncached answer"], cache=False)
+    with record_run("run-2", enabled=True) as recorder:
+        go.set()
+        assert (await uncached.ainvoke("recorded prompt")).content == "uncached answer"
+        assert await other == "bystander"
+    assert [i["kind"] for i in recorder.interactions] == ["llm"]
+
+    player = replay.ReplayPlayer(recorder.interactions, LatencyModel(llm="none"))
+    with replay._activate(player):
+        replayed = FakeListChatModel(responses=["live answer"], cache=False)
+        assert (await replayed.ainvoke("recorded prompt")).content == "uncached answer"
+        assert replayed.invoke("recorded prompt").content == "uncached answer"
+        with pytest.raises(ReplayMissError):
+            await replayed.ainvoke("new prompt")
+    assert FakeListChatModel(responses=["live"]).invoke("new prompt").content == "live"
+
+
+def test_session_is_abstract():
+    with pytest.raises(TypeError):
+        replay._Session()
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.core.snapshot_store import SnapshotStore, resolve_snapshot_text, text_digest
+from src.graph.nodes.archive_phase1 import archive_phase1_node
+
+
+def test_put_is_content_addressed_and_deduplicated(tmp_path):
+    store = SnapshotStore(tmp_path / "store", block_chars=16)
+    text = "政策发布。The agency announced the new policy on Monday. " * 5
+    digest = store.put(text)
+    assert digest == text_digest(text)
+    size = store.stats()["stored_bytes"]
+    assert store.put(text) == digest
+    assert store.stats() == {"documents": 1, "stored_bytes": size}
+    assert store.get(digest) == text
+    store.put("")
+    assert store.get(text_digest("")) == ""
+
+
+def test_slice_reads_only_covering_blocks_and_survives_reopen(tmp_path):
+    root = tmp_path / "store"
+    texts = [f"doc {i}: " + "abcdefghij中文" * (i + 3) for i in range(5)]
+    store = SnapshotStore(root, block_chars=7)
+    digests = [store.put(t) for t in texts]
+    store.close()
+
+    reopened = SnapshotStore(root)
+    for digest, text in zip(digests, texts):
+        assert digest in reopened
+        assert reopened.char_length(digest) == len(text)
+        for start, end in [(0, 5), (3, 20), (6, 8), (len(text) - 4, len(text) + 10), (9, 9)]:
+            assert reopened.slice(digest, start, end) == text[start:end]
+    with pytest.raises(KeyError):
+        reopened.get("0" * 64)
+
+
+@pytest.mark.asyncio
+async def test_archive_references_stored_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    snapshot = {"doc_id": "d1", "cleaned_text": "Hello world. Second sentence.", "text_digest": "x"}
+    out = await archive_phase1_node({"run_id": "r1_d1", "document_snapshot": snapshot}, config={})
+    archived = json.loads((Path(out["archive_path"]) / "document_snapshot.json").read_text(encoding="utf-8"))
+    assert archived["cleaned_text"] is None
+    assert archived["cleaned_text_ref"] == text_digest(snapshot["cleaned_text"])
+    assert resolve_snapshot_text(archived) == snapshot["cleaned_text"]
+    # The in-memory snapshot is left untouched
+    assert snapshot["cleaned_text"] == "Hello world. Second sentence."
+
+
+def test_concurrent_stores_share_one_index(tmp_path):
+    root = tmp_path / "store"
+    first, second = SnapshotStore(root), SnapshotStore(root)  # e.g. two runs opened before either wrote
+    shared = "shared text " * 50
+    a = first.put("only in first " * 40)
+    assert second.put(shared) == first.put(shared)
+    # second's stale index is refreshed under the lock: the text is stored once, offsets stay valid
+    assert first.stats()["documents"] == 2 == len(second)
+    assert second.get(a) == "only in first " * 40
+    assert first.get(text_digest(shared)) == shared
+    assert len((root / "index.tsv").read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.core.models.v2_structures import ExtractionResult, SearchConfiguration
+from src.core.utils.structured_output import (
+    StructuredOutputError,
+    ainvoke_structured,
+    coerce_to_schema,
+    parse_structured,
+    repair_json,
+)
+
+
+def test_repair_json_strips_fences_and_prose():
+    text = 'Sure! Here is the JSON:\n```json\n{"a": 1, "b": [1, 2]}\n```\nHope this helps.'
+    assert repair_json(text) == {"a": 1, "b": [1, 2]}
+    assert repair_json('Result: {"a": "x}"} trailing words') == {"a": "x}"}
+
+
+def test_repair_json_fixes_common_mistakes():
+    text = '{"a": True, "b": None, // comment\n "c": [1, 2,], "d": "line1\nline2",}'
+    assert repair_json(text) == {"a": True, "b": None, "c": [1, 2], "d": "line1\nline2"}
+    assert repair_json("{'a': 'single'}") == {"a": "single"}
+
+
+def test_repair_json_closes_truncated_output():
+    assert repair_json('{"queries": ["q1", "q2"') == {"queries": ["q1", "q2"]}
+    assert repair_json('{"events": [{"title": "trunc') == {"events": [{"title": "trunc"}]}
+    with pytest.raises(StructuredOutputError):
+        repair_json("no json here")
+
+
+def test_coerce_to_schema_unwraps_and_drops_invalid_items():
+    config = coerce_to_schema({"result": {"queries": ["a"], "reasoning": "r"}}, SearchConfiguration)
+    assert config.queries == ["a"]
+
+    data = [
+        {"title": "ok", "date": "2024-01-01", "description": "d", "source_url": "https://a.com"},
+        {"date": "missing title"},
+    ]
+    result = coerce_to_schema(data, ExtractionResult)
+    assert len(result.events) == 1
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_structured_repairs_locally_without_reask():
+    with patch(
+        "src.core.utils.structured_output.safe_ainvoke", new_callable=AsyncMock
+    ) as mock_invoke:
+        mock_invoke.return_value = AIMessage(content='```json\n{"queries": ["q"], "reasoning": "r",}\n```')
+        result = await ainvoke_structured(object(), [], pydantic_object=SearchConfiguration, call_site="unit")
+    assert result.queries == ["q"]
+    assert mock_invoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_structured_reask_sends_only_broken_output():
+    original = [HumanMessage(content="HUGE ORIGINAL CONTEXT")]
+    with patch(
+        "src.core.utils.structured_output.safe_ainvoke", new_callable=AsyncMock
+    ) as mock_invoke:
+        mock_invoke.side_effect = [
+            AIMessage(content="I cannot answer in JSON"),
+            AIMessage(content='{"queries": ["fixed"], "reasoning": "r"}'),
+        ]
+        result = await ainvoke_structured(object(), original, pydantic_object=SearchConfiguration, call_site="unit")
+    assert result.queries == ["fixed"]
+    repair_messages = mock_invoke.await_args_list[1].args[1]
+    assert "HUGE ORIGINAL CONTEXT" not in "".join(m.content for m in repair_messages)
+    assert "I cannot answer in JSON" in repair_messages[-1].content
+    assert mock_invoke.await_args_list[1].kwargs["call_site"] == "unit_repair"
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_structured_raises_after_repairs_exhausted():
+    with patch(
+        "src.core.utils.structured_output.safe_ainvoke", new_callable=AsyncMock
+    ) as mock_invoke:
+        mock_invoke.return_value = AIMessage(content="still not json")
+        with pytest.raises(StructuredOutputError):
+            await ainvoke_structured(object(), [], validate=lambda d: isinstance(d, dict), max_repairs=2)
+    assert mock_invoke.await_count == 3
+
+
+def test_parse_structured_applies_validate():
+    with pytest.raises(StructuredOutputError):
+        parse_structured('{"sections": []}', validate=lambda d: bool(d.get("sections")))
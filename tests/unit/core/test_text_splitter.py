@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from src.core.utils.text_splitter import OffsetTextSplitter
+
+
+def _random_text(rng, n):
+    words = ["alpha", "beta", "政策", "发布。", "done.", "x" * 30, "\n", "\n\n", " ", "end!", "y" * 120]
+    return "".join(rng.choice(words) + rng.choice([" ", "", "\n"]) for _ in range(n))
+
+
+def test_chunk_spans_match_recursive_character_splitter():
+    splitters = pytest.importorskip("langchain_text_splitters")
+    rng = random.Random(1)
+    for _ in range(100):
+        text = _random_text(rng, rng.randint(0, 300))
+        for size, overlap in [(800, 100), (60, 10)]:
+            expected = splitters.RecursiveCharacterTextSplitter(
+                chunk_size=size, chunk_overlap=overlap, separators=["\n\n", "\n", " ", ""]
+            ).split_text(text)
+            spans = OffsetTextSplitter(size, overlap).chunk_spans(text)
+            assert [text[s:e] for s, e in spans] == expected
+
+
+def test_sentence_offsets_exact_for_repeated_sentences():
+    text = "Same line.\n\nSame line.  你好，世界。 再见！\nSame line."
+    chunks, sentences = OffsetTextSplitter(chunk_size=15, chunk_overlap=0).split(text)
+    assert [text[s.start:s.end] for s in sentences] == ["Same line.", "Same line.", "你好，世界。", "再见！", "Same line."]
+    assert [s.start for s in sentences] == [0, 12, 24, 31, 35]
+    for sent in sentences:
+        chunk = chunks[sent.chunk_index]
+        assert chunk.start <= sent.start and sent.end <= chunk.end
@@ -0,0 +1,84 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.core.utils.llm_safety import fit_messages_to_limit, safe_ainvoke
+from src.core.utils.token_budget import (
+    TokenUsageLedger,
+    estimate_message_tokens,
+    estimate_tokens,
+    pack_by_budget,
+    token_ledger,
+    truncate_to_tokens,
+)
+from src.graph.nodes.worker_nodes import _pack_search_content, _score_search_block
+
+
+def test_estimate_tokens_cjk_aware_fallback():
+    # Unknown model family -> heuristic; CJK characters count roughly one token each
+    assert estimate_tokens("", "qwen-plus") == 0
+    assert estimate_tokens("中文测试", "qwen-plus") == 4
+    assert estimate_tokens("a" * 40, "unknown-model") == 10
+
+
+def test_truncate_to_tokens_fits_budget():
+    text = "word " * 500
+    truncated = truncate_to_tokens(text, 50, "unknown-model")
+    assert estimate_tokens(truncated, "unknown-model") <= 50
+    assert text.startswith(truncated)
+
+
+def test_pack_by_budget_prefers_high_score_and_keeps_order():
+    items = [("low", 1.0), ("high", 9.0), ("mid", 5.0)]
+    packed = pack_by_budget(
+        items,
+        budget_tokens=estimate_tokens("x" * 40, "m") * 2,
+        render=lambda it: "x" * 40,
+        score=lambda it: it[1],
+        model_name="m",
+    )
+    assert [name for name, _ in packed] == ["high", "mid"]
+
+
+def test_pack_search_content_keeps_credible_results():
+    content = (
+        "Search Queries Used: ['q']\n\n"
+        "### Results for query: 'q'\n\n"
+        "- **Low** (https://reddit.com/r/x) [credibility=25.0, recency_days=unknown, published_date=unknown]: "
+        + "noise " * 200
+        + "\n\n- **High** (https://openai.com/blog) [credibility=95.0, recency_days=3, published_date=2025-01-01]: "
+        + "signal " * 200
+    )
+    assert _score_search_block("### Results for query: 'q'") == float("inf")
+    packed = _pack_search_content(content, budget_tokens=400, model_name="unknown-model")
+    assert "### Results for query" in packed
+    assert "openai.com" in packed
+    assert "reddit.com" not in packed
+
+
+def test_fit_messages_to_limit_trims_longest_message():
+    messages = [SystemMessage(content="sys"), HumanMessage(content="x" * 4000)]
+    fitted = fit_messages_to_limit(messages, 200, "unknown-model")
+    assert estimate_message_tokens(fitted, "unknown-model") <= 200
+    assert fitted[0].content == "sys"
+
+
+def test_ledger_summary_aggregates_per_call_site():
+    ledger = TokenUsageLedger(max_records=1)
+    ledger.record("m", 10, 2, call_site="extract")
+    ledger.record("m", 5, 1, call_site="extract")
+    assert len(ledger.records) == 1
+    assert ledger.summary() == {"extract": {"calls": 2, "tokens_in": 15, "tokens_out": 3}}
+
+
+@pytest.mark.asyncio
+async def test_safe_ainvoke_records_usage():
+    class _Runnable:
+        async def ainvoke(self, messages):
+            return AIMessage(
+                content="ok",
+                usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15},
+            )
+
+    token_ledger.reset()
+    await safe_ainvoke(_Runnable(), [HumanMessage(content="hi")], model_name="m", call_site="unit")
+    assert token_ledger.summary()["unit"] == {"calls": 1, "tokens_in": 12, "tokens_out": 3}
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+from unittest.mock import patch
+
+from src.core.models.v2_structures import ExtractedEvent
+from src.graph.nodes.worker_nodes import (
+    _chunk_search_content,
+    _merge_extracted_events,
+    extract_node_v2,
+)
+
+
+def _item(title, url, cred, body="text"):
+    return (
+        f"- **{title}** ({url}) "
+        f"[credibility={cred}, recency_days=unknown, published_date=unknown]: {body}"
+    )
+
+
+def _search_message(query, items):
+    return "\n\n".join([f"### Results for query: '{query}'"] + items)
+
+
+def test_chunks_follow_query_boundaries():
+    content = "\n\n".join(
+        [
+            _search_message("q1", [_item("A", "https://a.com/1", 90.0)]),
+            _search_message("q2", [_item("B", "https://b.com/1", 50.0)]),
+        ]
+    )
+    chunks = _chunk_search_content(content, 2000, 10, "unknown-model")
+    assert len(chunks) == 2
+    assert "q1" in chunks[0] and "a.com" in chunks[0] and "b.com" not in chunks[0]
+    assert "q2" in chunks[1] and "b.com" in chunks[1]
+
+
+def test_chunks_split_large_groups_and_keep_best():
+    items = [_item(f"T{i}", f"https://s{i}.com/x", float(i), "word " * 200) for i in range(6)]
+    content = _search_message("q", items)
+    chunks = _chunk_search_content(content, 400, 2, "unknown-model")
+    assert len(chunks) == 2
+    # The highest-credibility results survive the chunk cap and keep the query header
+    assert all(c.startswith("### Results for query: 'q'") for c in chunks)
+    assert "s5.com" in "".join(chunks)
+    assert "s0.com" not in "".join(chunks)
+
+
+def test_merge_extracted_events_is_deterministic():
+    a = ExtractedEvent(date="2024-01-01", title="Launch!", description="x", source_url="https://a.com/", confidence=0.4)
+    a2 = ExtractedEvent(date="2024-01-01T10:00", title="launch", description="y", source_url="https://a.com", confidence=0.9)
+    b = ExtractedEvent(date="2024-01-02", title="Other", description="z", source_url="https://b.com", confidence=0.5)
+    merged = _merge_extracted_events([[a, b], [a2]])
+    assert [e.title for e in merged] == ["launch", "Other"]
+    assert merged[0].confidence == 0.9
+
+
+@pytest.mark.asyncio
+async def test_extract_node_v2_runs_one_call_per_chunk():
+    state = {
+        "messages": [
+            AIMessage(content=_search_message("q1", [_item("A", "https://openai.com/a", 95.0)])),
+            AIMessage(content=_search_message("q2", [_item("B", "https://reuters.com/b", 90.0)])),
+        ],
+        "topic": "t",
+    }
+    prompts = []
+
+    class _FakeLLM:
+        async def ainvoke(self, messages):
+            content = messages[-1].content
+            prompts.append(content)
+            url = "https://openai.com/a" if "openai.com" in content else "https://reuters.com/b"
+            events = [{"date": "2024-01-01", "title": f"Event {url}", "description": "d", "source_url": url}]
+            return AIMessage(content=json.dumps({"events": events}))
+
+    with patch("src.graph.nodes.worker_nodes._init_llm", return_value=_FakeLLM()), patch(
+        "src.graph.nodes.worker_nodes.emit_think_plan", return_value=None
+    ):
+        output = await extract_node_v2(state, config={})
+
+    assert len(prompts) == 2
+    assert {e["source"] for e in output["timeline"]} == {"https://openai.com/a", "https://reuters.com/b"}
@@ -0,0 +1,10 @@
+from src.graph.nodes.clarify import _parse_yes_no
+
+
+def test_parse_yes_no_matches_whole_words_only():
+    assert _parse_yes_no("Yes, it drifts.") == "yes"
+    assert _parse_yes_no("NO") == "no"
+    # Substrings such as "know" / "eyes" are not an answer
+    assert _parse_yes_no("I don't know") is None
+    assert _parse_yes_no("in the eyes of the user") is None
+    assert _parse_yes_no(None) is None
@@ -48,3 +48,45 @@ def test_clean_timeline_entries_filters_low_and_marks_disputed():
     assert not any("twitter.com" in (item.get("source") or "") for item in cleaned)
     # No-source entry is kept but marked disputed
     assert any(item["title"].startswith("[Disputed]") for item in cleaned)
+
+
+def test_url_index_occurrences_and_ordering():
+    from src.core.utils.url_index import UrlOccurrenceIndex
+
+    notes = [
+        "See (https://a.com/page). Also https://b.com/x, more text",
+        "Repeat https://a.com/page and shorter https://a.com",
+    ]
+    index = UrlOccurrenceIndex(notes)
+    assert index.urls == ["https://a.com/page", "https://b.com/x", "https://a.com"]
+    assert index.occurrences["https://a.com/page"] == [(0, 5), (1, 7)]
+    assert index.note_ids("https://a.com/page") == [0, 1]
+    assert "https://a.com" in index and "https://missing.com" not in index
+
+
+def test_gate2_warns_on_urls_missing_from_sources():
+    from src.core.utils.url_index import UrlOccurrenceIndex
+
+    facts_index = {"facts": [{"event_id": "ev-0001", "evidences": [{"url": "https://reuters.com/a"}]}]}
+    report = {
+        "sections": [
+            {
+                "section_id": "s",
+                "items": [
+                    {"item_id": 1, "item_text": "Per https://reuters.com/a and https://notes.com/b.", "role": "analysis"},
+                    {"item_id": 2, "item_text": "Invented https://made-up.com/c", "role": "analysis"},
+                ],
+            }
+        ]
+    }
+    url_index = UrlOccurrenceIndex(["collected https://notes.com/b"])
+    gate = finalizer._gate2_audit(report, facts_index, severity_map={}, url_index=url_index)
+    flagged = [v for v in gate["violations"] if v["rule_id"] == "url_not_in_sources"]
+    assert [v["item_id"] for v in flagged] == [2]
+    # Without a notes index the rule is not applied
+    gate = finalizer._gate2_audit(report, facts_index, severity_map={})
+    assert not any(v["rule_id"] == "url_not_in_sources" for v in gate["violations"])
+    # Configurable like every other Gate2 rule
+    assert finalizer._load_gate2_severity()["url_not_in_sources"] == "WARN"
+    gate = finalizer._gate2_audit(report, facts_index, severity_map={"url_not_in_sources": "DISABLE"}, url_index=url_index)
+    assert not any(v["rule_id"] == "url_not_in_sources" for v in gate["violations"])
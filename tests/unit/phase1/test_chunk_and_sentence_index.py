@@ -14,3 +14,16 @@ async def test_chunk_and_sentence_index_basic():
     manifest = out["index_manifest"]
     assert manifest["chunk_splitter"]["params"]["chunk_size"] == DEFAULT_CHUNK_PARAMS["chunk_size"]
     assert manifest["sentence_splitter"]["backend"] == "rule_based"
+
+
+@pytest.mark.asyncio
+async def test_chunk_and_sentence_index_links_sentences_to_chunks():
+    text = "Repeated sentence here. " * 60
+    out = await chunk_and_sentence_index_node({"cleaned_text": text, "doc_id": "doc1"}, config={})
+    chunks = {c["chunk_id"]: c for c in out["chunk_meta"]}
+    assert len(chunks) > 1
+    for sent in out["sentence_meta"]:
+        assert text[sent["start"]:sent["end"]] == "Repeated sentence here."
+        chunk = chunks[sent["chunk_id"]]
+        assert chunk["start"] <= sent["start"] and sent["end"] <= chunk["end"]
+    assert out["sentence_meta"][-1]["start"] == len(text) - len("Repeated sentence here. ")
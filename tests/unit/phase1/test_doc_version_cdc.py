@@ -1,7 +1,14 @@
 import json
+import threading
 from pathlib import Path
 
-from src.graph.nodes.doc_version_cdc import doc_version_cdc_node
+from src.graph.nodes.doc_version_cdc import (
+    doc_version_cdc_batch,
+    doc_version_cdc_node,
+    export_doc_version_record,
+    get_doc_version_store,
+    peek_doc_version,
+)
 
 
 def test_doc_version_cdc_writes_and_appends(tmp_path, monkeypatch):
@@ -17,7 +24,7 @@ def test_doc_version_cdc_writes_and_appends(tmp_path, monkeypatch):
     p = Path(out1["doc_version_cdc_path"])
     assert p.exists()
     assert out1["drift_status"] == "FIRST_SEEN"
-    data = json.loads(p.read_text(encoding="utf-8"))
+    data = export_doc_version_record("https://example.com/a")
     assert data["doc_key"] == "https://example.com/a"
     assert data["latest_doc_version_id"] == "v1"
     assert len(data["versions"]) == 1
@@ -25,9 +32,11 @@ def test_doc_version_cdc_writes_and_appends(tmp_path, monkeypatch):
 
     out2 = doc_version_cdc_node({"document_snapshot": snap, "run_id": "run2"})
     assert out2["drift_status"] == "UNCHANGED"
-    data2 = json.loads(Path(out2["doc_version_cdc_path"]).read_text(encoding="utf-8"))
+    data2 = export_doc_version_record("https://example.com/a")
     assert len(data2["versions"]) == 1
     assert sorted(data2["versions"][0]["seen_runs"]) == ["run1", "run2"]
+    assert peek_doc_version("https://example.com/a") == (str(p), "v1")
+    assert peek_doc_version("https://example.com/missing") == (None, None)
 
 
 def test_doc_version_cdc_detects_change(tmp_path, monkeypatch):
@@ -38,3 +47,42 @@ def test_doc_version_cdc_detects_change(tmp_path, monkeypatch):
     assert out1["drift_status"] == "FIRST_SEEN"
     out2 = doc_version_cdc_node({"document_snapshot": snap2, "run_id": "r2"})
     assert out2["drift_status"] == "CHANGED_SINCE_LAST_SEEN"
+
+
+def test_doc_version_cdc_batch_trims_and_keeps_concurrent_updates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DEEPTRACE_DOC_VERSION_MAX_VERSIONS", "2")
+    outs = doc_version_cdc_batch(
+        [{"document_snapshot": {"doc_key": "k", "doc_version_id": f"v{i}"}, "run_id": "r0"} for i in range(4)]
+    )
+    assert [o["drift_status"] for o in outs] == ["FIRST_SEEN"] + ["CHANGED_SINCE_LAST_SEEN"] * 3
+    assert [v["doc_version_id"] for v in export_doc_version_record("k")["versions"]] == ["v2", "v3"]
+
+    def run(i):
+        doc_version_cdc_node({"document_snapshot": {"doc_key": "shared", "doc_version_id": "v"}, "run_id": f"run{i}"})
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(export_doc_version_record("shared")["versions"][0]["seen_runs"]) == [f"run{i}" for i in range(8)]
+
+
+def test_doc_version_cdc_imports_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    legacy = Path("data") / "doc_versions"
+    legacy.mkdir(parents=True)
+    record = {
+        "doc_key": "https://example.com/old",
+        "latest_doc_version_id": "v9",
+        "updated_at": "2025-01-01T00:00:00",
+        "versions": [
+            {"doc_version_id": "v9", "first_seen": "2025-01-01", "last_seen": "2025-01-01", "seen_runs": ["r9"], "doc_ids": ["d9"]}
+        ],
+    }
+    (legacy / "abc.json").write_text(json.dumps(record), encoding="utf-8")
+    out = doc_version_cdc_node({"document_snapshot": {"doc_key": "https://example.com/old", "doc_version_id": "v9"}, "run_id": "r10"})
+    assert out["drift_status"] == "UNCHANGED"
+    assert export_doc_version_record("https://example.com/old")["versions"][0]["seen_runs"] == ["r9", "r10"]
+    assert get_doc_version_store().export_json(tmp_path / "export") == 1
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import src.graph.nodes.phase1_sidecar as sidecar
+from src.core.artifact_io import load_artifact
+from src.graph.nodes.phase1_sidecar import phase1_sidecar_node
+
+HTML = (
+    "<html><body><article><p>The agency announced the new policy on Monday after a long review process. "
+    "Officials said the rules take effect next month and apply to all regional offices.</p></article></body></html>"
+)
+
+
+def _state(run_id, doc_id, timeline):
+    return {
+        "run_id": run_id,
+        "evidences": [{"id": doc_id, "url": "https://example.com/news/1", "full_content": HTML}],
+        "timeline": timeline,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sidecar_reuses_index_for_unchanged_doc_version(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    event_a = {"event_id": "ev_a", "title": "The agency announced the new policy on Monday after a long review process."}
+    event_b = {"event_id": "ev_b", "title": "Officials said the rules take effect next month and apply to all regional offices."}
+
+    await phase1_sidecar_node(_state("r1", "doc1", [dict(event_a)]), config={})
+    first = json.loads(Path("artifacts/phase1/r1/doc_versions_summary.json").read_text(encoding="utf-8"))
+    assert first["documents"][0]["index_reused"] is False
+
+    calls = []
+    real_index = sidecar.chunk_and_sentence_index_node
+    real_facts = sidecar.build_facts_index_v2_node
+
+    async def counting_index(state, config):
+        calls.append("index")
+        return await real_index(state, config)
+
+    async def counting_facts(state, config):
+        calls.append([ev["event_id"] for ev in state["events"]])
+        return await real_facts(state, config)
+
+    monkeypatch.setattr(sidecar, "chunk_and_sentence_index_node", counting_index)
+    monkeypatch.setattr(sidecar, "build_facts_index_v2_node", counting_facts)
+
+    await phase1_sidecar_node(_state("r2", "doc2", [dict(event_a), dict(event_b)]), config={})
+    # Index reused; only the new event is located
+    assert calls == [["ev_b"]]
+    second = json.loads(Path("artifacts/phase1/r2/doc_versions_summary.json").read_text(encoding="utf-8"))
+    assert second["documents"][0]["index_reused"] is True
+    assert second["documents"][0]["facts_reused"] == 1
+    assert second["summary"]["docs_index_reused"] == 1
+
+    items = load_artifact(Path("artifacts/phase1/r2"), "facts_index_v2")["items"]
+    assert [it["event_id"] for it in items] == ["ev_a", "ev_b"]
+    # Cached ids are rebased onto this run's doc_id
+    assert items[0]["doc_ref"]["doc_id"] == "doc2"
+    assert items[0]["doc_ref"]["sentence_ids"]
+    assert all(sid.startswith("doc2_sent_") for sid in items[0]["doc_ref"]["sentence_ids"])